@@ -0,0 +1,62 @@
+"""add financial clinic daily rollups
+
+Revision ID: a1f3c9d2e7b4
+Revises: remove_arabic_periods
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f3c9d2e7b4'
+down_revision: Union[str, None] = 'remove_arabic_periods'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('financial_clinic_daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('company_tracker_id', sa.Integer(), nullable=True),
+    sa.Column('gender', sa.String(length=20), nullable=True),
+    sa.Column('nationality', sa.String(length=50), nullable=True),
+    sa.Column('emirate', sa.String(length=100), nullable=True),
+    sa.Column('employment_status', sa.String(length=50), nullable=True),
+    sa.Column('income_range', sa.String(length=50), nullable=True),
+    sa.Column('children_bucket', sa.String(length=5), nullable=True),
+    sa.Column('age_bucket', sa.String(length=10), nullable=True),
+    sa.Column('status_band', sa.String(length=50), nullable=True),
+    sa.Column('response_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('score_sq_sum', sa.Float(), nullable=False),
+    sa.Column('income_stream_sum', sa.Float(), nullable=False),
+    sa.Column('savings_habit_sum', sa.Float(), nullable=False),
+    sa.Column('emergency_savings_sum', sa.Float(), nullable=False),
+    sa.Column('debt_management_sum', sa.Float(), nullable=False),
+    sa.Column('retirement_planning_sum', sa.Float(), nullable=False),
+    sa.Column('protecting_family_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['company_tracker_id'], ['company_trackers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_financial_clinic_daily_rollups_id'), 'financial_clinic_daily_rollups', ['id'], unique=False)
+    op.create_index(op.f('ix_financial_clinic_daily_rollups_day'), 'financial_clinic_daily_rollups', ['day'], unique=False)
+    op.create_index(op.f('ix_financial_clinic_daily_rollups_company_tracker_id'), 'financial_clinic_daily_rollups', ['company_tracker_id'], unique=False)
+    op.create_index('idx_fc_rollup_day_company', 'financial_clinic_daily_rollups', ['day', 'company_tracker_id'], unique=False)
+
+    # The table starts empty; backfill it with
+    #   python scripts/database/rebuild_financial_clinic_rollup.py
+    # before enabling ANALYTICS_ROLLUP_ENABLED.
+
+
+def downgrade() -> None:
+    op.drop_index('idx_fc_rollup_day_company', table_name='financial_clinic_daily_rollups')
+    op.drop_index(op.f('ix_financial_clinic_daily_rollups_company_tracker_id'), table_name='financial_clinic_daily_rollups')
+    op.drop_index(op.f('ix_financial_clinic_daily_rollups_day'), table_name='financial_clinic_daily_rollups')
+    op.drop_index(op.f('ix_financial_clinic_daily_rollups_id'), table_name='financial_clinic_daily_rollups')
+    op.drop_table('financial_clinic_daily_rollups')
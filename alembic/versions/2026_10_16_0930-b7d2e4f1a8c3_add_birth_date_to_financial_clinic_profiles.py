@@ -0,0 +1,56 @@
+"""add birth_date to financial clinic profiles
+
+Revision ID: b7d2e4f1a8c3
+Revises: a1f3c9d2e7b4
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4f1a8c3'
+down_revision: Union[str, None] = 'a1f3c9d2e7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _parse_date_of_birth(value):
+    """Parse DD/MM/YYYY (or legacy YYYY-MM-DD) date_of_birth strings."""
+    if not value or not value.strip():
+        return None
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def upgrade() -> None:
+    op.add_column('financial_clinic_profiles', sa.Column('birth_date', sa.Date(), nullable=True))
+    op.create_index(op.f('ix_financial_clinic_profiles_birth_date'), 'financial_clinic_profiles', ['birth_date'], unique=False)
+
+    # Backfill from the existing date_of_birth strings
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, date_of_birth FROM financial_clinic_profiles")).fetchall()
+    updates = [
+        {"id": row[0], "birth_date": birth_date}
+        for row in rows
+        if (birth_date := _parse_date_of_birth(row[1])) is not None
+    ]
+    if updates:
+        connection.execute(
+            sa.text("UPDATE financial_clinic_profiles SET birth_date = :birth_date WHERE id = :id"),
+            updates
+        )
+    print(f"Backfilled birth_date for {len(updates)} of {len(rows)} profiles")
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_financial_clinic_profiles_birth_date'), table_name='financial_clinic_profiles')
+    op.drop_column('financial_clinic_profiles', 'birth_date')
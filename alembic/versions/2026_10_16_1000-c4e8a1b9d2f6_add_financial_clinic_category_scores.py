@@ -0,0 +1,99 @@
+"""add financial clinic category scores
+
+Revision ID: c4e8a1b9d2f6
+Revises: b7d2e4f1a8c3
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1b9d2f6'
+down_revision: Union[str, None] = 'b7d2e4f1a8c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _category_rows(response_id, category_scores):
+    """Rows for one response's category_scores JSON (dict per category or bare number)."""
+    if isinstance(category_scores, str):
+        category_scores = json.loads(category_scores)
+    if not isinstance(category_scores, dict):
+        return []
+
+    rows = []
+    for category, data in category_scores.items():
+        if isinstance(data, dict):
+            rows.append({
+                "response_id": response_id,
+                "category": category,
+                "score": float(data.get('score') or 0),
+                "max_possible": float(data.get('max_possible', 100) or 0),
+                "status_level": data.get('status_level'),
+            })
+        elif isinstance(data, (int, float)):
+            rows.append({
+                "response_id": response_id,
+                "category": category,
+                "score": float(data),
+                "max_possible": 100.0,
+                "status_level": None,
+            })
+    return rows
+
+
+def upgrade() -> None:
+    op.create_table('financial_clinic_category_scores',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('response_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('max_possible', sa.Float(), nullable=True),
+    sa.Column('status_level', sa.String(length=20), nullable=True),
+    sa.ForeignKeyConstraint(['response_id'], ['financial_clinic_responses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_financial_clinic_category_scores_id'), 'financial_clinic_category_scores', ['id'], unique=False)
+
+    # Backfill from the JSON of existing responses, in id-ordered batches
+    connection = op.get_bind()
+    insert = sa.text(
+        "INSERT INTO financial_clinic_category_scores "
+        "(response_id, category, score, max_possible, status_level) "
+        "VALUES (:response_id, :category, :score, :max_possible, :status_level)"
+    )
+    last_id = 0
+    inserted = 0
+    while True:
+        batch = connection.execute(
+            sa.text(
+                "SELECT id, category_scores FROM financial_clinic_responses "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not batch:
+            break
+
+        rows = [row for response_id, scores in batch for row in _category_rows(response_id, scores)]
+        if rows:
+            connection.execute(insert, rows)
+            inserted += len(rows)
+        last_id = batch[-1][0]
+
+    # Build the lookup index after the bulk load
+    op.create_index('idx_fc_category_scores_response_category', 'financial_clinic_category_scores', ['response_id', 'category'], unique=True)
+    print(f"Backfilled {inserted} category score rows")
+
+
+def downgrade() -> None:
+    op.drop_index('idx_fc_category_scores_response_category', table_name='financial_clinic_category_scores')
+    op.drop_index(op.f('ix_financial_clinic_category_scores_id'), table_name='financial_clinic_category_scores')
+    op.drop_table('financial_clinic_category_scores')
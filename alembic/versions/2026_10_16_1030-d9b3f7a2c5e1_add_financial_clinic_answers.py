@@ -0,0 +1,103 @@
+"""add financial clinic answers
+
+Revision ID: d9b3f7a2c5e1
+Revises: c4e8a1b9d2f6
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9b3f7a2c5e1'
+down_revision: Union[str, None] = 'c4e8a1b9d2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _answer_rows(response_id, answers, nationality, company_tracker_id, created_at):
+    """Rows for one response's answers JSON; non-numeric answers are skipped."""
+    if isinstance(answers, str):
+        answers = json.loads(answers)
+    if not isinstance(answers, dict):
+        return []
+
+    rows = []
+    for question_id, value in answers.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if isinstance(value, float) and not value.is_integer():
+            continue
+        rows.append({
+            "response_id": response_id,
+            "question_id": question_id,
+            "value": int(value),
+            "nationality": nationality,
+            "company_tracker_id": company_tracker_id,
+            "created_at": created_at,
+        })
+    return rows
+
+
+def upgrade() -> None:
+    op.create_table('financial_clinic_answers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('response_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.Column('nationality', sa.String(length=50), nullable=True),
+    sa.Column('company_tracker_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['response_id'], ['financial_clinic_responses.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['company_tracker_id'], ['company_trackers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_financial_clinic_answers_id'), 'financial_clinic_answers', ['id'], unique=False)
+
+    # Backfill from the JSON of existing responses, in id-ordered batches
+    connection = op.get_bind()
+    insert = sa.text(
+        "INSERT INTO financial_clinic_answers "
+        "(response_id, question_id, value, nationality, company_tracker_id, created_at) "
+        "VALUES (:response_id, :question_id, :value, :nationality, :company_tracker_id, :created_at)"
+    )
+    last_id = 0
+    inserted = 0
+    while True:
+        batch = connection.execute(
+            sa.text(
+                "SELECT r.id, r.answers, p.nationality, r.company_tracker_id, r.created_at "
+                "FROM financial_clinic_responses r "
+                "JOIN financial_clinic_profiles p ON p.id = r.profile_id "
+                "WHERE r.id > :last_id ORDER BY r.id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not batch:
+            break
+
+        rows = [row for response in batch for row in _answer_rows(*response)]
+        if rows:
+            connection.execute(insert, rows)
+            inserted += len(rows)
+        last_id = batch[-1][0]
+
+    # Build the lookup indexes after the bulk load
+    op.create_index('idx_fc_answers_response_question', 'financial_clinic_answers', ['response_id', 'question_id'], unique=True)
+    op.create_index('idx_fc_answers_question_nationality', 'financial_clinic_answers', ['question_id', 'nationality'], unique=False)
+    op.create_index('idx_fc_answers_company_question', 'financial_clinic_answers', ['company_tracker_id', 'question_id'], unique=False)
+    print(f"Backfilled {inserted} answer rows")
+
+
+def downgrade() -> None:
+    op.drop_index('idx_fc_answers_company_question', table_name='financial_clinic_answers')
+    op.drop_index('idx_fc_answers_question_nationality', table_name='financial_clinic_answers')
+    op.drop_index('idx_fc_answers_response_question', table_name='financial_clinic_answers')
+    op.drop_index(op.f('ix_financial_clinic_answers_id'), table_name='financial_clinic_answers')
+    op.drop_table('financial_clinic_answers')
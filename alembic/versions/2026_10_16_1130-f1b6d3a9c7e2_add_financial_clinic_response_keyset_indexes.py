@@ -0,0 +1,31 @@
+"""add financial clinic response keyset indexes
+
+Revision ID: f1b6d3a9c7e2
+Revises: e5a2c8f4b9d3
+Create Date: 2026-10-16 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6d3a9c7e2'
+down_revision: Union[str, None] = 'e5a2c8f4b9d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Submission listings page by (created_at, id) newest first, overall and per company
+    op.create_index('idx_fc_responses_created_id', 'financial_clinic_responses', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'idx_fc_responses_company_created_id', 'financial_clinic_responses',
+        ['company_tracker_id', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_fc_responses_company_created_id', table_name='financial_clinic_responses')
+    op.drop_index('idx_fc_responses_created_id', table_name='financial_clinic_responses')
@@ -0,0 +1,103 @@
+"""add financial clinic profile search
+
+Revision ID: a4c9e2f7d1b8
+Revises: f1b6d3a9c7e2
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c9e2f7d1b8'
+down_revision: Union[str, None] = 'f1b6d3a9c7e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _normalize(value):
+    """Case-fold, strip combining marks and collapse whitespace (app.analytics.search)."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def _search_fields(profile_id, name, email, mobile_number):
+    digits = re.sub(r"\D", "", mobile_number or "")
+    email_normalized = (email or "").strip().lower()
+    return {
+        "id": profile_id,
+        "search_text": " ".join(part for part in (_normalize(name), email_normalized, digits) if part),
+        "email_normalized": email_normalized,
+        "mobile_reversed": digits[::-1] or None,
+    }
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    is_postgresql = connection.dialect.name == 'postgresql'
+
+    op.add_column('financial_clinic_profiles', sa.Column('search_text', sa.String(length=500), nullable=True))
+    op.add_column('financial_clinic_profiles', sa.Column('email_normalized', sa.String(length=255), nullable=True))
+    op.add_column('financial_clinic_profiles', sa.Column('mobile_reversed', sa.String(length=20), nullable=True))
+
+    # Backfill from the existing profiles, in id-ordered batches
+    update = sa.text(
+        "UPDATE financial_clinic_profiles SET search_text = :search_text, "
+        "email_normalized = :email_normalized, mobile_reversed = :mobile_reversed WHERE id = :id"
+    )
+    last_id = 0
+    updated = 0
+    while True:
+        batch = connection.execute(
+            sa.text(
+                "SELECT id, name, email, mobile_number FROM financial_clinic_profiles "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not batch:
+            break
+        connection.execute(update, [_search_fields(*row) for row in batch])
+        updated += len(batch)
+        last_id = batch[-1][0]
+    print(f"Backfilled search fields for {updated} profiles")
+
+    op.create_index(
+        'idx_fc_profiles_search_text', 'financial_clinic_profiles', ['search_text'], unique=False,
+        postgresql_ops={'search_text': 'varchar_pattern_ops'}
+    )
+    op.create_index(
+        'idx_fc_profiles_email_normalized', 'financial_clinic_profiles', ['email_normalized'], unique=False,
+        postgresql_ops={'email_normalized': 'varchar_pattern_ops'}
+    )
+    op.create_index(
+        'idx_fc_profiles_mobile_reversed', 'financial_clinic_profiles', ['mobile_reversed'], unique=False,
+        postgresql_ops={'mobile_reversed': 'varchar_pattern_ops'}
+    )
+    if is_postgresql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'idx_fc_profiles_search_text_trgm', 'financial_clinic_profiles', ['search_text'], unique=False,
+            postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('idx_fc_profiles_search_text_trgm', table_name='financial_clinic_profiles')
+    op.drop_index('idx_fc_profiles_mobile_reversed', table_name='financial_clinic_profiles')
+    op.drop_index('idx_fc_profiles_email_normalized', table_name='financial_clinic_profiles')
+    op.drop_index('idx_fc_profiles_search_text', table_name='financial_clinic_profiles')
+    op.drop_column('financial_clinic_profiles', 'mobile_reversed')
+    op.drop_column('financial_clinic_profiles', 'email_normalized')
+    op.drop_column('financial_clinic_profiles', 'search_text')
@@ -0,0 +1,44 @@
+"""add company tracker total score sum
+
+Revision ID: b7d2e5a9c3f6
+Revises: a4c9e2f7d1b8
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e5a9c3f6'
+down_revision: Union[str, None] = 'a4c9e2f7d1b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Running score sum next to total_assessments, so submits increment instead of recounting
+    op.add_column('company_trackers', sa.Column('total_score_sum', sa.Float(), nullable=True))
+
+    # Start every company from its actual responses
+    op.execute("""
+        UPDATE company_trackers SET
+            total_assessments = (
+                SELECT COUNT(*) FROM financial_clinic_responses r
+                WHERE r.company_tracker_id = company_trackers.id
+            ),
+            total_score_sum = (
+                SELECT COALESCE(SUM(r.total_score), 0) FROM financial_clinic_responses r
+                WHERE r.company_tracker_id = company_trackers.id
+            ),
+            average_score = (
+                SELECT AVG(r.total_score) FROM financial_clinic_responses r
+                WHERE r.company_tracker_id = company_trackers.id
+            )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('company_trackers', 'total_score_sum')
@@ -0,0 +1,72 @@
+"""add financial clinic profile unique email
+
+Revision ID: c3f8a1d6e4b2
+Revises: b7d2e5a9c3f6
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d6e4b2'
+down_revision: Union[str, None] = 'b7d2e5a9c3f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Oldest profile per normalized email; submits used to update that one
+KEEPER = (
+    "(SELECT MIN(k.id) FROM financial_clinic_profiles k "
+    "WHERE k.email_normalized = financial_clinic_profiles.email_normalized)"
+)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+
+    # Merge duplicate profiles (concurrent submits for one email) into the oldest
+    duplicates = connection.execute(sa.text(
+        f"SELECT COUNT(*) FROM financial_clinic_profiles "
+        f"WHERE email_normalized <> '' AND id <> {KEEPER}"
+    )).scalar()
+    if duplicates:
+        op.execute(f"""
+            UPDATE financial_clinic_responses SET profile_id = (
+                SELECT {KEEPER} FROM financial_clinic_profiles
+                WHERE financial_clinic_profiles.id = financial_clinic_responses.profile_id
+            )
+            WHERE profile_id IN (
+                SELECT id FROM financial_clinic_profiles
+                WHERE email_normalized <> '' AND id <> {KEEPER}
+            )
+        """)
+        # Answer facts carry the profile nationality
+        op.execute("""
+            UPDATE financial_clinic_answers SET nationality = (
+                SELECT p.nationality FROM financial_clinic_responses r
+                JOIN financial_clinic_profiles p ON p.id = r.profile_id
+                WHERE r.id = financial_clinic_answers.response_id
+            )
+            WHERE response_id IN (
+                SELECT r.id FROM financial_clinic_responses r
+                JOIN financial_clinic_profiles p ON p.id = r.profile_id
+                WHERE p.nationality <> financial_clinic_answers.nationality
+            )
+        """)
+        op.execute(f"DELETE FROM financial_clinic_profiles WHERE email_normalized <> '' AND id <> {KEEPER}")
+        print(
+            f"Merged {duplicates} duplicate profiles; run "
+            f"scripts/database/rebuild_financial_clinic_rollup.py to resync the daily rollup"
+        )
+
+    op.create_index(
+        'uq_fc_profiles_email_normalized', 'financial_clinic_profiles', ['email_normalized'], unique=True,
+        postgresql_where=sa.text("email_normalized <> ''"), sqlite_where=sa.text("email_normalized <> ''")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_fc_profiles_email_normalized', table_name='financial_clinic_profiles')
@@ -0,0 +1,41 @@
+"""add financial clinic pending submissions
+
+Revision ID: f2b8d4a6c9e3
+Revises: e5a7c2f9b1d4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4a6c9e3'
+down_revision: Union[str, None] = 'e5a7c2f9b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('financial_clinic_pending_submissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('submission', sa.JSON(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('response_id', sa.Integer(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(), nullable=False),
+    sa.Column('processed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['response_id'], ['financial_clinic_responses.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_financial_clinic_pending_submissions_id'), 'financial_clinic_pending_submissions', ['id'], unique=False)
+    op.create_index('idx_fc_pending_status_id', 'financial_clinic_pending_submissions', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_fc_pending_status_id', table_name='financial_clinic_pending_submissions')
+    op.drop_index(op.f('ix_financial_clinic_pending_submissions_id'), table_name='financial_clinic_pending_submissions')
+    op.drop_table('financial_clinic_pending_submissions')
@@ -0,0 +1,73 @@
+"""add financial clinic rollup unique key
+
+Revision ID: a8c3e6f1d2b5
+Revises: f2b8d4a6c9e3
+Create Date: 2026-10-16 14:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c3e6f1d2b5'
+down_revision: Union[str, None] = 'f2b8d4a6c9e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Key columns and the sentinels their NULLs are coalesced to; must match the
+# uq_fc_rollup_key Index in app/models.py exactly
+NULLABLE_KEY_COLUMNS = [("company_tracker_id", "-1")] + [
+    (dimension, "'<null>'")
+    for dimension in (
+        'gender', 'nationality', 'emirate', 'employment_status', 'income_range',
+        'children_bucket', 'age_bucket', 'status_band'
+    )
+]
+
+
+def key_expressions(alias: str = "") -> list:
+    return [f"{alias}day"] + [f"COALESCE({alias}{column}, {sentinel})" for column, sentinel in NULLABLE_KEY_COLUMNS]
+
+
+MEASURE_COLUMNS = (
+    'response_count', 'score_sum', 'score_sq_sum', 'income_stream_sum', 'savings_habit_sum',
+    'emergency_savings_sum', 'debt_management_sum', 'retirement_planning_sum', 'protecting_family_sum'
+)
+
+
+def upgrade() -> None:
+    # Fold rows duplicated by concurrent submits into the oldest row of their key
+    group_by = ", ".join(key_expressions())
+    same_key = " AND ".join(
+        f"{duplicate} = {keeper}"
+        for duplicate, keeper in zip(key_expressions("d."), key_expressions("financial_clinic_daily_rollups."))
+    )
+    sums = ", ".join(
+        f"{column} = (SELECT SUM(d.{column}) FROM financial_clinic_daily_rollups d WHERE {same_key})"
+        for column in MEASURE_COLUMNS
+    )
+    op.execute(f"""
+        UPDATE financial_clinic_daily_rollups SET {sums}
+        WHERE id IN (
+            SELECT MIN(id) FROM financial_clinic_daily_rollups
+            GROUP BY {group_by} HAVING COUNT(*) > 1
+        )
+    """)
+    op.execute(f"""
+        DELETE FROM financial_clinic_daily_rollups
+        WHERE id NOT IN (SELECT MIN(id) FROM financial_clinic_daily_rollups GROUP BY {group_by})
+    """)
+
+    op.create_index(
+        'uq_fc_rollup_key',
+        'financial_clinic_daily_rollups',
+        [sa.text(expression) for expression in key_expressions()],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_fc_rollup_key', table_name='financial_clinic_daily_rollups')
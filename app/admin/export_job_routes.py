@@ -0,0 +1,105 @@
+"""
+Admin API routes for background export jobs.
+
+Queue an export, poll its progress and download the gzip-compressed file
+once it completes (see app.admin.export_jobs).
+"""
+import logging
+import os
+from typing import Any
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, RedirectResponse
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.auth.dependencies import get_current_admin_user
+from app.models import ExportJob, User
+from app.admin.schemas import ExportJobCreate
+from app.admin.export_jobs import (
+    DOWNLOAD_URL_EXPIRATION,
+    create_export_job,
+    export_download_name,
+    export_file_path,
+    export_job_payload,
+    run_export_job,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin/export-jobs", tags=["admin", "export-jobs"])
+
+
+def _get_job(db: Session, job_id: int) -> ExportJob:
+    job = db.query(ExportJob).filter(ExportJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return job
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def queue_export_job(
+    request: ExportJobCreate,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Queue a CSV/Excel export to run in the background (admin only).
+
+    Poll GET /admin/export-jobs/{id} for progress; download_url is set once it completes.
+    """
+    try:
+        job = create_export_job(db, request.export_type, request.file_format, request.params, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    background_tasks.add_task(run_export_job, job.id, db.get_bind())
+    logger.info(f"📦 Export job {job.id} ({job.export_type}, {job.file_format}) queued by {current_user.email}")
+    return export_job_payload(job)
+
+
+@router.get("")
+async def list_export_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """List the most recent export jobs (admin only)."""
+    jobs = db.query(ExportJob).order_by(ExportJob.id.desc()).limit(limit).all()
+    return {"jobs": [export_job_payload(job) for job in jobs]}
+
+
+@router.get("/{job_id}")
+async def get_export_job(
+    job_id: int,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Status and progress of an export job (admin only)."""
+    return export_job_payload(_get_job(db, job_id))
+
+
+@router.get("/{job_id}/download")
+async def download_export_job(
+    job_id: int,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Download a completed export job's gzip file, or be redirected to a short-lived S3 link (admin only)."""
+    job = _get_job(db, job_id)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status}")
+
+    if job.storage == "s3":
+        from app.reports.s3_storage import s3_storage
+
+        url = s3_storage.generate_presigned_url(job.file_key, expiration=DOWNLOAD_URL_EXPIRATION)
+        if not url:
+            raise HTTPException(status_code=500, detail="Failed to generate download link")
+        return RedirectResponse(url)
+
+    path = export_file_path(job)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Export file not found")
+    return FileResponse(path, media_type="application/gzip", filename=export_download_name(job))
@@ -0,0 +1,354 @@
+"""
+Background export jobs.
+
+The admin CSV/Excel exports can take minutes on large tables, so instead of
+holding a request open an ExportJob row is queued and run_export_job() builds
+the file after the response is sent. The same row sources as the synchronous
+endpoints are used; the output is gzip-compressed and stored under
+DOWNLOAD_DIR/exports, or on S3 when USE_S3_STORAGE is enabled, and
+rows_processed is committed as the export progresses.
+
+A job whose background task died with its process (a restart or deploy)
+would stay queued or running forever; a scheduled job marks jobs older than
+EXPORT_JOB_STALE_MINUTES as failed:
+
+    python -m app.admin.export_jobs
+"""
+import gzip
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.admin.exports import EXPORT_BATCH_SIZE, EXPORT_HEADERS, csv_chunks, excel_chunks
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = "exports"  # Under DOWNLOAD_DIR locally, key prefix on S3
+PROGRESS_INTERVAL = 1000  # Rows between progress commits
+DOWNLOAD_URL_EXPIRATION = 900  # Seconds a presigned S3 link stays valid
+
+FILTER_PARAMS = (
+    'age_groups', 'genders', 'nationalities', 'emirates',
+    'employment_statuses', 'income_ranges', 'children', 'companies'
+)
+
+
+class ExportSource(NamedTuple):
+    """Row source for one export type."""
+    headers: List[str]
+    sheet_title: str
+    rows: Callable[[Session, Dict[str, Any]], Iterator[List[Any]]]
+
+
+def _text_params(params: Dict[str, Any], *names: str) -> Dict[str, Optional[str]]:
+    """The named parameters, which the export endpoints take as query strings."""
+    values = {name: params.get(name) for name in names}
+    for name, value in values.items():
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f"Parameter {name} must be a string")
+    return values
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _response_rows(db: Session, params: Dict[str, Any]) -> Iterator[List[Any]]:
+    """Rows of the simple admin export (/admin/simple/export-csv)."""
+    from app.admin.exports import export_query, iter_export_rows
+    from app.admin.simple_routes import parse_filter_params
+
+    text = _text_params(params, *FILTER_PARAMS, 'start_date', 'end_date')
+    filters = parse_filter_params(**{name: text[name] for name in FILTER_PARAMS})
+    query = export_query(
+        db, filters,
+        _parse_datetime(text['start_date']),
+        _parse_datetime(text['end_date']),
+        params.get('unique_users_only')
+    )
+    return iter_export_rows(query)
+
+
+def _financial_clinic_rows(db: Session, params: Dict[str, Any]) -> Iterator[List[Any]]:
+    """Rows of the Financial Clinic export (/financial-clinic/export-csv)."""
+    from app.models import CompanyTracker
+    from app.surveys.financial_clinic_routes import financial_clinic_export_rows
+
+    text = _text_params(params, 'company_url', 'start_date', 'end_date')
+    company_id = None
+    if text['company_url']:
+        company_id = db.query(CompanyTracker.id).filter(
+            CompanyTracker.unique_url == text['company_url']
+        ).scalar()
+        if company_id is None:
+            raise ValueError("Company not found")
+
+    return financial_clinic_export_rows(
+        db, company_id,
+        _parse_datetime(text['start_date']),
+        _parse_datetime(text['end_date'])
+    )
+
+
+def _consultation_rows(db: Session, params: Dict[str, Any]) -> Iterator[List[Any]]:
+    """Rows of the consultation leads export (/consultations/admin/export)."""
+    from app.consultations.routes import consultation_export_query, iter_consultation_export_rows
+
+    text = _text_params(params, 'status', 'source', 'date_from', 'date_to')
+    query = consultation_export_query(db, text['status'], text['source'], text['date_from'], text['date_to'])
+    return iter_consultation_export_rows(query)
+
+
+def _incomplete_survey_rows(db: Session, params: Dict[str, Any]) -> Iterator[List[Any]]:
+    """Rows of the incomplete surveys export (/surveys/incomplete/admin/export), without its 10000 row cap."""
+    from app.surveys.incomplete_routes import incomplete_survey_export_query, incomplete_survey_export_row
+
+    limit = params.get('limit')
+    query = incomplete_survey_export_query(
+        db, bool(params.get('abandoned_only')), int(params.get('skip') or 0), int(limit) if limit else None
+    )
+    now = datetime.utcnow()
+    return (incomplete_survey_export_row(survey, now) for survey in query.yield_per(EXPORT_BATCH_SIZE))
+
+
+def _export_sources() -> Dict[str, ExportSource]:
+    from app.consultations.routes import CONSULTATION_EXPORT_HEADERS
+    from app.surveys.financial_clinic_routes import FINANCIAL_CLINIC_EXPORT_FIELDS
+    from app.surveys.incomplete_routes import INCOMPLETE_SURVEY_EXPORT_HEADERS
+
+    return {
+        'responses': ExportSource(EXPORT_HEADERS, "Financial Clinic Responses", _response_rows),
+        'financial_clinic': ExportSource(FINANCIAL_CLINIC_EXPORT_FIELDS, "Financial Clinic", _financial_clinic_rows),
+        'consultations': ExportSource(CONSULTATION_EXPORT_HEADERS, "Consultation Leads", _consultation_rows),
+        'incomplete_surveys': ExportSource(INCOMPLETE_SURVEY_EXPORT_HEADERS, "Incomplete Surveys", _incomplete_survey_rows),
+    }
+
+
+def create_export_job(
+    db: Session,
+    export_type: str,
+    file_format: str,
+    params: Dict[str, Any],
+    user_id: int
+):
+    """
+    Validate the parameters and queue an export job.
+
+    Args:
+        db: Database session
+        export_type: Key of the export source (responses, financial_clinic, ...)
+        file_format: csv or xlsx
+        params: Filters accepted by the matching export endpoint
+        user_id: Requesting admin
+
+    Returns:
+        The queued ExportJob
+
+    Raises:
+        ValueError: If the export type or a parameter is invalid
+    """
+    from app.models import AuditLog, ExportJob
+
+    source = _export_sources().get(export_type)
+    if source is None:
+        raise ValueError(f"Unknown export type: {export_type}")
+    if file_format not in ('csv', 'xlsx'):
+        raise ValueError(f"Unsupported format: {file_format}")
+
+    # Row sources parse their parameters eagerly but fetch lazily, so building
+    # one here rejects bad filters without running the export
+    try:
+        source.rows(db, params)
+    except TypeError as e:
+        raise ValueError(f"Invalid export parameters: {e}")
+
+    job = ExportJob(
+        export_type=export_type,
+        file_format=file_format,
+        params=params,
+        status="queued",
+        rows_processed=0,
+        created_by=user_id
+    )
+    db.add(job)
+    db.flush()
+    db.add(AuditLog(
+        user_id=user_id,
+        action="export_job_created",
+        entity_type="export_job",
+        entity_id=job.id,
+        details={"export_type": export_type, "file_format": file_format, "params": params}
+    ))
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def _store_export(path: str, file_name: str, job_id: int) -> Tuple[str, str]:
+    """Move a finished export to S3 (when enabled) or its final local path; returns (storage, file_key)."""
+    from app.reports.s3_storage import s3_storage
+
+    if s3_storage.use_s3:
+        file_key = f"{EXPORT_DIR}/{file_name}"
+        if s3_storage.upload_file(path, file_key, "application/gzip", metadata={"export_job_id": job_id}):
+            os.remove(path)
+            return "s3", file_key
+        logger.warning(f"⚠️ Keeping export job {job_id} on local storage after S3 upload failure")
+
+    os.replace(path, os.path.join(settings.DOWNLOAD_DIR, EXPORT_DIR, file_name))
+    return "local", file_name
+
+
+def run_export_job(job_id: int, bind) -> None:
+    """
+    Build an export job's file; meant to run as a background task.
+
+    Rows are read through their own session so the server-side cursor is never
+    committed mid-iteration, while progress and the final status are committed
+    through a second one.
+
+    Args:
+        job_id: ExportJob to run
+        bind: Engine (or connection) to open the sessions on
+    """
+    from app.models import ExportJob
+
+    jobs = Session(bind=bind, expire_on_commit=False)
+    data = Session(bind=bind, autoflush=False)
+    partial_path = None
+    try:
+        job = jobs.get(ExportJob, job_id)
+        if job is None or job.status != "queued":
+            return
+
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        jobs.commit()
+
+        source = _export_sources()[job.export_type]
+
+        def tracked(rows):
+            count = 0
+            for row in rows:
+                yield row
+                count += 1
+                if count % PROGRESS_INTERVAL == 0:
+                    job.rows_processed = count
+                    jobs.commit()
+            job.rows_processed = count
+
+        rows = tracked(source.rows(data, job.params or {}))
+        if job.file_format == 'xlsx':
+            chunks = excel_chunks(rows, headers=source.headers, title=source.sheet_title)
+        else:
+            chunks = csv_chunks(rows, headers=source.headers)
+
+        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        file_name = f"{job.export_type}_{job.id}_{timestamp}.{job.file_format}.gz"
+        os.makedirs(os.path.join(settings.DOWNLOAD_DIR, EXPORT_DIR), exist_ok=True)
+        partial_path = os.path.join(settings.DOWNLOAD_DIR, EXPORT_DIR, f"{file_name}.partial")
+
+        with open(partial_path, 'wb') as raw:
+            with gzip.GzipFile(filename=file_name[:-3], mode='wb', fileobj=raw) as compressed:
+                for chunk in chunks:
+                    compressed.write(chunk)
+
+        job.file_size = os.path.getsize(partial_path)
+        job.storage, job.file_key = _store_export(partial_path, file_name, job.id)
+        partial_path = None
+        job.status = "completed"
+        job.completed_at = datetime.utcnow()
+        jobs.commit()
+        logger.info(f"✅ Export job {job_id} completed: {job.rows_processed} rows, {job.file_size} bytes ({job.storage})")
+
+    except Exception as e:
+        logger.error(f"❌ Export job {job_id} failed: {e}")
+        jobs.rollback()
+        job = jobs.get(ExportJob, job_id)
+        if job is not None:
+            job.status = "failed"
+            job.error_message = str(e)
+            job.completed_at = datetime.utcnow()
+            jobs.commit()
+    finally:
+        data.close()
+        jobs.close()
+        if partial_path and os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def fail_stale_export_jobs(db: Session) -> int:
+    """
+    Mark queued or running jobs older than EXPORT_JOB_STALE_MINUTES as failed (caller commits).
+
+    Returns:
+        The number of jobs marked failed
+    """
+    from app.models import ExportJob
+
+    now = datetime.utcnow()
+    return db.query(ExportJob).filter(
+        ExportJob.status.in_(("queued", "running")),
+        func.coalesce(ExportJob.started_at, ExportJob.created_at)
+        < now - timedelta(minutes=settings.EXPORT_JOB_STALE_MINUTES)
+    ).update({
+        ExportJob.status: "failed",
+        ExportJob.error_message: "Export job was interrupted before it finished; queue it again",
+        ExportJob.completed_at: now,
+    }, synchronize_session=False)
+
+
+def run_stale_export_job_cleanup() -> int:
+    """Scheduled job: fail abandoned export jobs in a session of its own."""
+    db = SessionLocal()
+    try:
+        failed = fail_stale_export_jobs(db)
+        db.commit()
+        if failed:
+            logger.warning(f"⚠️ Marked {failed} stale export jobs as failed")
+        return failed
+    except Exception as e:
+        logger.error(f"❌ Error failing stale export jobs: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def export_job_payload(job) -> Dict[str, Any]:
+    """API representation of an ExportJob."""
+    return {
+        "id": job.id,
+        "export_type": job.export_type,
+        "file_format": job.file_format,
+        "params": job.params or {},
+        "status": job.status,
+        "rows_processed": job.rows_processed,
+        "file_size": job.file_size,
+        "error_message": job.error_message,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "download_url": f"/api/v1/admin/export-jobs/{job.id}/download" if job.status == "completed" else None,
+    }
+
+
+def export_download_name(job) -> str:
+    """File name offered to the browser for a completed job."""
+    return f"{job.export_type}_export_{job.id}.{job.file_format}.gz"
+
+
+def export_file_path(job) -> str:
+    """Local path of a completed job stored on local storage."""
+    return os.path.join(settings.DOWNLOAD_DIR, EXPORT_DIR, job.file_key)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Marked {run_stale_export_job_cleanup()} stale export jobs as failed")
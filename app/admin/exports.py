@@ -0,0 +1,291 @@
+"""
+Streaming row source for the admin response exports.
+
+Exports select plain columns from FinancialClinicResponse ⋈ FinancialClinicProfile
+and fetch them with yield_per, which uses a server-side cursor on PostgreSQL, so
+rows are formatted and sent as they arrive and memory stays flat however many
+responses match.
+"""
+import csv
+import io
+import tempfile
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.analytics.filters import (
+    age_on,
+    apply_demographic_filters,
+    apply_unique_users_filter,
+    parse_date_of_birth,
+)
+
+EXPORT_HEADERS = [
+    'ID', 'Name', 'Email', 'Mobile Number', 'Age', 'Gender', 'Nationality', 'Emirate', 'Children',
+    'Employment Status', 'Income Range', 'Company', 'Total Score', 'Status Band',
+    'Questions Answered', 'Income Stream Score', 'Savings Habit Score',
+    'Debt Management Score', 'Retirement Planning Score', 'Financial Protection Score',
+    'Financial Knowledge Score', 'Action Plan 1', 'Action Plan 2', 'Action Plan 3',
+    'Action Plan 4', 'Action Plan 5', 'Submission Date'
+]
+
+# Export column -> category_scores key
+EXPORT_CATEGORIES = (
+    'Income Stream',
+    'Savings Habit',
+    'Debt Management',
+    'Retirement Planning',
+    'Protecting Your Family',
+    'Emergency Savings',  # Exported as "Financial Knowledge Score"
+)
+
+EXPORT_BATCH_SIZE = 1000
+CSV_ROWS_PER_CHUNK = 500
+
+EXCEL_SHEET_TITLE = "Financial Clinic Responses"
+EXCEL_MAX_ROWS_PER_SHEET = 1048575  # Excel's row limit, less the header row
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def export_query(
+    db: Session,
+    filters: Dict[str, List[str]],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    unique_users_only: Optional[bool] = None
+):
+    """
+    Column query for the export, newest submissions first.
+
+    Args:
+        db: Database session
+        filters: Parsed demographic filters (see parse_filter_params)
+        start: Inclusive lower bound on created_at
+        end: Inclusive upper bound on created_at
+        unique_users_only: Restrict to the latest submission per email
+
+    Returns:
+        Query yielding rows with the response and profile fields export_row() reads
+    """
+    from app.models import FinancialClinicResponse, FinancialClinicProfile
+
+    query = db.query(
+        FinancialClinicResponse.id,
+        FinancialClinicResponse.total_score,
+        FinancialClinicResponse.status_band,
+        FinancialClinicResponse.questions_answered,
+        FinancialClinicResponse.category_scores,
+        FinancialClinicResponse.insights,
+        FinancialClinicResponse.created_at,
+        FinancialClinicProfile.name,
+        FinancialClinicProfile.email,
+        FinancialClinicProfile.mobile_number,
+        FinancialClinicProfile.date_of_birth,
+        FinancialClinicProfile.gender,
+        FinancialClinicProfile.nationality,
+        FinancialClinicProfile.emirate,
+        FinancialClinicProfile.children,
+        FinancialClinicProfile.employment_status,
+        FinancialClinicProfile.income_range,
+    ).select_from(FinancialClinicResponse).join(
+        FinancialClinicProfile,
+        FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+    )
+
+    if start is not None:
+        query = query.filter(FinancialClinicResponse.created_at >= start)
+    if end is not None:
+        query = query.filter(FinancialClinicResponse.created_at <= end)
+
+    query = apply_demographic_filters(query, filters, db)
+
+    if unique_users_only:
+        query = apply_unique_users_filter(query)
+
+    return query.order_by(FinancialClinicResponse.created_at.desc(), FinancialClinicResponse.id.desc())
+
+
+def _category_score(category_scores: Any, category: str):
+    """Score for one category from a category_scores JSON value (0 if missing)."""
+    if isinstance(category_scores, dict):
+        category_data = category_scores.get(category, {})
+        if isinstance(category_data, dict):
+            return category_data.get('score', 0)
+    return 0
+
+
+def _action_plans(insights: Any) -> List[str]:
+    """Up to five insight texts, padded with empty strings."""
+    if not insights:
+        return [''] * 5
+    if isinstance(insights, list):
+        texts = []
+        for insight in insights[:5]:
+            if isinstance(insight, dict) and 'text' in insight:
+                texts.append(insight['text'])
+            elif isinstance(insight, str):
+                texts.append(insight)
+            else:
+                texts.append(str(insight))
+        return texts + [''] * (5 - len(texts))
+    if isinstance(insights, str):
+        return [insights] + [''] * 4
+    return [str(insights)] + [''] * 4
+
+
+def export_row(row, today: Optional[date] = None) -> List[Any]:
+    """One export line, in EXPORT_HEADERS order, from an export_query() row."""
+    today = today or date.today()
+
+    # Default to the UAE country code when the number has none
+    mobile_number = row.mobile_number or ''
+    if mobile_number and not mobile_number.startswith('+'):
+        mobile_number = '+971 ' + mobile_number
+
+    age = age_on(parse_date_of_birth(row.date_of_birth), today)
+
+    return [
+        row.id,
+        row.name,
+        row.email,
+        mobile_number,
+        age if age is not None else '',
+        row.gender,
+        row.nationality,
+        row.emirate,
+        row.children,
+        row.employment_status,
+        row.income_range,
+        '',  # Company (from company_tracker_id if needed)
+        round(row.total_score, 2) if row.total_score else 0,
+        row.status_band or '',
+        row.questions_answered or 0,
+        *[_category_score(row.category_scores, category) for category in EXPORT_CATEGORIES],
+        *_action_plans(row.insights),
+        row.created_at.strftime('%Y-%m-%d %H:%M:%S') if row.created_at else '',
+    ]
+
+
+def iter_export_rows(query, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Any]]:
+    """Format export_query() rows as they are fetched, batch_size at a time."""
+    today = date.today()
+    for row in query.yield_per(batch_size):
+        yield export_row(row, today)
+
+
+def csv_chunks(
+    rows: Iterable[List[Any]],
+    rows_per_chunk: int = CSV_ROWS_PER_CHUNK,
+    headers: List[str] = EXPORT_HEADERS
+) -> Iterator[bytes]:
+    """UTF-8 CSV (header first) in chunks of rows_per_chunk lines."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode('utf-8')
+
+
+def excel_chunks(
+    rows: Iterable[List[Any]],
+    max_rows_per_sheet: int = EXCEL_MAX_ROWS_PER_SHEET,
+    headers: List[str] = EXPORT_HEADERS,
+    title: str = EXCEL_SHEET_TITLE
+) -> Iterator[bytes]:
+    """
+    XLSX file built with a write-only workbook, then read back in chunks.
+
+    Write-only worksheets keep no cells in memory and the workbook is saved
+    to a temporary file, so memory stays flat; rows past max_rows_per_sheet
+    continue on a new sheet, each with its own header row.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheets = 0
+    sheet = None
+    sheet_rows = 0
+    for row in rows:
+        if sheet is None or sheet_rows >= max_rows_per_sheet:
+            sheets += 1
+            sheet = workbook.create_sheet(title if sheets == 1 else f"{title} {sheets}")
+            sheet.append(headers)
+            sheet_rows = 0
+        sheet.append(row)
+        sheet_rows += 1
+    if sheet is None:
+        workbook.create_sheet(title).append(headers)
+
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while True:
+            chunk = spool.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream_export(
+    db: Session,
+    render: Callable[[Iterator[List[Any]]], Iterator[bytes]],
+    filters: Dict[str, List[str]],
+    start: Optional[datetime],
+    end: Optional[datetime],
+    unique_users_only: Optional[bool],
+    user_id: int,
+    action: str
+) -> Iterator[bytes]:
+    """
+    Run an export while the response streams.
+
+    Uses its own session on the request session's engine, since the request
+    session may be closed before the body is sent, and records an AuditLog
+    entry with the exported row count once the last row is written.
+
+    Args:
+        db: Request database session (only its engine is used)
+        render: Turns export rows into byte chunks (e.g. csv_chunks)
+        filters: Parsed demographic filters
+        start: Inclusive lower bound on created_at
+        end: Inclusive upper bound on created_at
+        unique_users_only: Restrict to the latest submission per email
+        user_id: Exporting admin, for the audit log
+        action: Audit log action name
+
+    Yields:
+        Chunks of the export file
+    """
+    from app.models import AuditLog
+
+    session = Session(bind=db.get_bind(), autoflush=False)
+    exported = 0
+
+    def counted(rows):
+        nonlocal exported
+        for row in rows:
+            exported += 1
+            yield row
+
+    try:
+        query = export_query(session, filters, start, end, unique_users_only)
+        yield from render(counted(iter_export_rows(query)))
+
+        session.add(AuditLog(
+            user_id=user_id,
+            action=action,
+            entity_type="financial_clinic_responses",
+            details={"exported_count": exported, "filters": filters}
+        ))
+        session.commit()
+    finally:
+        session.close()
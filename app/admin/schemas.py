@@ -367,6 +367,13 @@ class ExportResponse(BaseModel):
     expires_at: Optional[datetime]
 
 
+class ExportJobCreate(BaseModel):
+    """Schema for queueing a background export job."""
+    export_type: str = Field(..., pattern="^(responses|financial_clinic|consultations|incomplete_surveys)$")
+    file_format: str = Field("csv", pattern="^(csv|xlsx)$")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Filters accepted by the matching export endpoint")
+
+
 # Variation Set Schemas
 class VariationSetCreate(BaseModel):
     """Schema for creating a new variation set."""
@@ -1,209 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager, selectinload
 from app.database import get_db
 from app.auth.dependencies import get_current_admin_user
 from app.auth.utils import verify_password, get_password_hash
-from app.models import User, LocalizedContent, SurveyResponse, CustomerProfile, CompanyTracker
+from app.models import User, LocalizedContent, SurveyResponse, CompanyTracker
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
-from sqlalchemy import func, and_, or_, desc
-import csv
-import io
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import func, and_
 import traceback
 import logging
+from app.analytics.filters import (
+    resolve_date_window,
+    build_filtered_query,
+    status_band_counts,
+    count_where,
+    period_expression,
+    period_label,
+    parse_filter_params,
+    birth_date_condition,
+    age_group_expression,
+    age_on,
+)
+from app.analytics.rollup import is_rollup_eligible, summarize, dimension_breakdown
+from app.analytics.cache import analytics_cache, stats_cache, cached_analytics, cached_count, cached_stats
+from app.analytics.search import submission_search_condition
+from app.analytics.filter_options import FORM_FILTER_OPTIONS, filter_options_cache
+from app.analytics.snapshot import get_snapshot
+from app.pagination import keyset_page
+from app.admin.exports import EXCEL_MAX_ROWS_PER_SHEET, csv_chunks, excel_chunks, stream_export
+from app.analytics.dashboard import (
+    CATEGORY_API_NAMES,
+    dashboard_payloads,
+    overview_metrics_payload,
+    score_distribution_payload,
+    category_performance_payload,
+    nationality_breakdown_payload,
+    age_breakdown_payload,
+    time_series_payload,
+    companies_analytics_payload,
+    score_analytics_questions,
+    score_analytics_payload,
+    gender_breakdown_payload,
+    emirate_breakdown_payload,
+    employment_breakdown_payload,
+    income_breakdown_payload,
+    children_breakdown_payload,
+)
 
 logger = logging.getLogger(__name__)
 
 simple_admin_router = APIRouter(prefix="/admin/simple", tags=["admin-simple"])
 
-def filter_unique_users(responses):
-    """
-        
-    Returns:
-        List of FinancialClinicResponse objects with only the latest submission per email
-    """
-    email_to_latest = {}
-    
-    for response in responses:
-        if response.profile and response.profile.email:
-            email = response.profile.email
-            if email not in email_to_latest or response.created_at > email_to_latest[email].created_at:
-                email_to_latest[email] = response
-    
-    return list(email_to_latest.values())
-
-def apply_demographic_filters(query, filters: Dict[str, List[str]], db: Session):
-    """
-    Apply demographic filters to a SQLAlchemy query.
-    
-    Args:
-        query: SQLAlchemy query object (already joined with FinancialClinicProfile)
-        filters: Dictionary of filter parameters
-        db: Database session
-        
-    Returns:
-        Filtered query
-    """
-    from app.models import FinancialClinicProfile, CompanyTracker
-    
-    # Age groups filter - Financial Clinic uses date_of_birth, so we need to calculate age
-    if filters.get('age_groups'):
-        age_conditions = []
-        for age_group in filters['age_groups']:
-            # For Financial Clinic, we need to parse the date_of_birth field
-            # This is complex to do in SQL with DD/MM/YYYY format, so we'll skip age filtering for now
-            # TODO: Implement age calculation from date_of_birth in DD/MM/YYYY format
-            pass
-        if age_conditions:
-            query = query.filter(or_(*age_conditions))
-    
-    # Gender filter
-    if filters.get('genders'):
-        query = query.filter(FinancialClinicProfile.gender.in_(filters['genders']))
-    
-    # Nationality filter
-    if filters.get('nationalities'):
-        query = query.filter(FinancialClinicProfile.nationality.in_(filters['nationalities']))
-    
-    # Emirate filter
-    if filters.get('emirates'):
-        query = query.filter(FinancialClinicProfile.emirate.in_(filters['emirates']))
-    
-    # Employment status filter
-    if filters.get('employment_statuses'):
-        query = query.filter(FinancialClinicProfile.employment_status.in_(filters['employment_statuses']))
-    
-    # Income range filter
-    if filters.get('income_ranges'):
-        query = query.filter(FinancialClinicProfile.income_range.in_(filters['income_ranges']))
-    
-    # Children filter
-    if filters.get('children'):
-        children_conditions = []
-        for child_option in filters['children']:
-            if child_option == '0':
-                children_conditions.append(FinancialClinicProfile.children == 0)
-            elif child_option == '1':
-                children_conditions.append(FinancialClinicProfile.children == 1)
-            elif child_option == '2':
-                children_conditions.append(FinancialClinicProfile.children == 2)
-            elif child_option == '3':
-                children_conditions.append(FinancialClinicProfile.children == 3)
-            elif child_option == '4':
-                children_conditions.append(FinancialClinicProfile.children == 4)
-            elif child_option == '5+':
-                children_conditions.append(FinancialClinicProfile.children >= 5)
-        if children_conditions:
-            query = query.filter(or_(*children_conditions))
-    
-    # Company filter
-    if filters.get('companies'):
-        # Get company IDs from company names or URLs
-        company_trackers = db.query(CompanyTracker).filter(
-            or_(
-                CompanyTracker.company_name.in_(filters['companies']),
-                CompanyTracker.unique_url.in_(filters['companies'])
-            )
-        ).all()
-        company_ids = [c.id for c in company_trackers]
-        
-        if company_ids:
-            from app.models import FinancialClinicResponse
-            query = query.filter(FinancialClinicResponse.company_tracker_id.in_(company_ids))
-        else:
-            # If companies were requested but none found, return empty result
-            from sqlalchemy import literal
-            query = query.filter(literal(False))
-    
-    return query
-
-def apply_date_range_filter(query, date_range: str, start_date: Optional[str] = None, end_date: Optional[str] = None):
-    """
-    Apply date range filtering to a SQLAlchemy query.
-    
-    Args:
-        query: SQLAlchemy query object
-        date_range: Predefined date range ('7d', '30d', '90d', '1y', 'ytd', 'all')
-        start_date: Custom start date (YYYY-MM-DD format)
-        end_date: Custom end date (YYYY-MM-DD format)
-        
-    Returns:
-        Filtered query
-    """
-    from app.models import FinancialClinicResponse
-    
-    # If custom date range is provided, use it
-    if start_date and end_date:
-        try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)  # Include end date
-            query = query.filter(
-                FinancialClinicResponse.created_at >= start_dt,
-                FinancialClinicResponse.created_at < end_dt
-            )
-        except ValueError:
-            # Invalid date format, skip filtering
-            pass
-        return query
-    
-    # Apply predefined date range filters
-    now = datetime.now()
-    
-    if date_range == "7d":
-        start_date = now - timedelta(days=7)
-        query = query.filter(FinancialClinicResponse.created_at >= start_date)
-    elif date_range == "30d":
-        start_date = now - timedelta(days=30)
-        query = query.filter(FinancialClinicResponse.created_at >= start_date)
-    elif date_range == "90d":
-        start_date = now - timedelta(days=90)
-        query = query.filter(FinancialClinicResponse.created_at >= start_date)
-    elif date_range == "1y":
-        start_date = now - timedelta(days=365)
-        query = query.filter(FinancialClinicResponse.created_at >= start_date)
-    elif date_range == "ytd":
-        # Year to date - from January 1st of current year
-        start_date = datetime(now.year, 1, 1)
-        query = query.filter(FinancialClinicResponse.created_at >= start_date)
-    elif date_range == "all":
-        # No date filtering for "all time"
-        pass
-    
-    return query
-
-def parse_filter_params(
-    age_groups: Optional[str] = None,
-    genders: Optional[str] = None,
-    nationalities: Optional[str] = None,
-    emirates: Optional[str] = None,
-    employment_statuses: Optional[str] = None,
-    income_ranges: Optional[str] = None,
-    children: Optional[str] = None,
-    companies: Optional[str] = None
-) -> Dict[str, List[str]]:
-    """Parse comma-separated filter parameters into lists."""
-    filters = {}
-    
-    if age_groups:
-        filters['age_groups'] = [ag.strip() for ag in age_groups.split(',')]
-    if genders:
-        filters['genders'] = [g.strip() for g in genders.split(',')]
-    if nationalities:
-        filters['nationalities'] = [n.strip() for n in nationalities.split(',')]
-    if emirates:
-        filters['emirates'] = [e.strip() for e in emirates.split(',')]
-    if employment_statuses:
-        filters['employment_statuses'] = [es.strip() for es in employment_statuses.split(',')]
-    if income_ranges:
-        filters['income_ranges'] = [ir.strip() for ir in income_ranges.split(',')]
-    if children:
-        filters['children'] = [c.strip() for c in children.split(',')]
-    if companies:
-        filters['companies'] = [c.strip() for c in companies.split(',')]
-    
-    return filters
-
 @simple_admin_router.post("/change-password")
 async def change_admin_password(
     current_password: str = Body(...),
@@ -271,6 +120,7 @@ async def get_simple_localized_content(
         }
 
 @simple_admin_router.get("/employment-breakdown")
+@cached_analytics
 async def get_employment_breakdown(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -297,40 +147,25 @@ async def get_employment_breakdown(
             employment_statuses, income_ranges, children, companies
         )
         
-        query = db.query(
-            FinancialClinicProfile.employment_status,
-            func.count(FinancialClinicResponse.id).label('count')
-        ).join(
-            FinancialClinicResponse,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        query = apply_date_range_filter(query, date_range, start_date, end_date)
-        query = apply_demographic_filters(query, filters, db)
-        
-        if unique_users_only:
-            # This is complex with aggregation, skipping for now or need subquery
-            pass
-            
-        results = query.group_by(FinancialClinicProfile.employment_status).all()
-        
-        breakdown = []
-        for status, count in results:
-            if status:
-                breakdown.append({
-                    "status": status,
-                    "count": count
-                })
-                
-        # Sort by count desc
-        breakdown.sort(key=lambda x: x['count'], reverse=True)
+        if is_rollup_eligible(filters, unique_users_only):
+            results = [
+                (status, count) for status, count, _ in
+                dimension_breakdown(db, filters, "employment_status", date_range, start_date, end_date)
+            ]
+        else:
+            results = build_filtered_query(
+                db,
+                [FinancialClinicProfile.employment_status, func.count(FinancialClinicResponse.id)],
+                filters, date_range, start_date, end_date, unique_users_only
+            ).group_by(FinancialClinicProfile.employment_status).all()
         
-        return {"breakdown": breakdown}
+        return employment_breakdown_payload(results)
         
     except Exception as e:
         return {"error": str(e), "breakdown": []}
 
 @simple_admin_router.get("/emirate-breakdown")
+@cached_analytics
 async def get_emirate_breakdown(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -357,35 +192,25 @@ async def get_emirate_breakdown(
             employment_statuses, income_ranges, children, companies
         )
         
-        query = db.query(
-            FinancialClinicProfile.emirate,
-            func.count(FinancialClinicResponse.id).label('count')
-        ).join(
-            FinancialClinicResponse,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        query = apply_date_range_filter(query, date_range, start_date, end_date)
-        query = apply_demographic_filters(query, filters, db)
-        
-        results = query.group_by(FinancialClinicProfile.emirate).all()
-        
-        breakdown = []
-        for emirate, count in results:
-            if emirate:
-                breakdown.append({
-                    "emirate": emirate,
-                    "count": count
-                })
-                
-        breakdown.sort(key=lambda x: x['count'], reverse=True)
+        if is_rollup_eligible(filters, unique_users_only):
+            results = [
+                (emirate, count) for emirate, count, _ in
+                dimension_breakdown(db, filters, "emirate", date_range, start_date, end_date)
+            ]
+        else:
+            results = build_filtered_query(
+                db,
+                [FinancialClinicProfile.emirate, func.count(FinancialClinicResponse.id)],
+                filters, date_range, start_date, end_date, unique_users_only
+            ).group_by(FinancialClinicProfile.emirate).all()
         
-        return {"breakdown": breakdown}
+        return emirate_breakdown_payload(results)
         
     except Exception as e:
         return {"error": str(e), "breakdown": []}
 
 @simple_admin_router.get("/children-breakdown")
+@cached_analytics
 async def get_children_breakdown(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -412,76 +237,33 @@ async def get_children_breakdown(
             employment_statuses, income_ranges, children, companies
         )
         
-        query = db.query(
-            FinancialClinicProfile.children,
-            func.count(FinancialClinicResponse.id).label('count')
-        ).join(
-            FinancialClinicResponse,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        query = apply_date_range_filter(query, date_range, start_date, end_date)
-        query = apply_demographic_filters(query, filters, db)
-        
-        results = query.group_by(FinancialClinicProfile.children).all()
-        
-        breakdown = []
-        for child_count, count in results:
-            if child_count is not None:
-                label = str(child_count)
-                if child_count >= 5:
-                    label = "5+"
-                
-                # Calculate average score for this group
-                # We need to query again or aggregate in the main query. 
-                # For simplicity/correctness with current structure, let's do a subquery or separate aggregation
-                # But since we are iterating, let's just get the average score for this group
-                
-                # Optimized approach: Get sum of scores and count in the main query
-                pass
-
-        # Re-query to get avg scores
-        score_query = db.query(
-            FinancialClinicProfile.children,
-            func.count(FinancialClinicResponse.id).label('count'),
-            func.avg(FinancialClinicResponse.total_score).label('avg_score')
-        ).join(
-            FinancialClinicResponse,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        score_query = apply_date_range_filter(score_query, date_range, start_date, end_date)
-        score_query = apply_demographic_filters(score_query, filters, db)
-        
-        results = score_query.group_by(FinancialClinicProfile.children).all()
-        
-        breakdown = []
-        for child_count, count, avg_score in results:
-            if child_count is not None:
-                label = str(child_count)
-                if child_count >= 5:
-                    label = "5+"
-                breakdown.append({
-                    "count_label": label,
-                    "count": count,
-                    "average_score": round(float(avg_score), 2) if avg_score else 0,
-                    "sort_key": child_count
-                })
-        
-        # Merge 5+ if needed (though simplified here)
-        # Sort by numeric value
-        breakdown.sort(key=lambda x: x['sort_key'])
-        
-        # Remove sort key
-        for item in breakdown:
-            del item['sort_key']
+        if is_rollup_eligible(filters, unique_users_only):
+            results = [
+                (5 if bucket == "5+" else int(bucket), count, avg_score) for bucket, count, avg_score in
+                dimension_breakdown(db, filters, "children_bucket", date_range, start_date, end_date)
+                if bucket is not None
+            ]
+        else:
+            from sqlalchemy import case
             
-        return {"breakdown": breakdown}
+            # 5 or more children share the "5+" bucket
+            children_group = case(
+                (FinancialClinicProfile.children >= 5, 5),
+                else_=FinancialClinicProfile.children
+            )
+            results = build_filtered_query(
+                db,
+                [children_group, func.count(FinancialClinicResponse.id), func.avg(FinancialClinicResponse.total_score)],
+                filters, date_range, start_date, end_date, unique_users_only
+            ).group_by(children_group).all()
+        
+        return children_breakdown_payload(results)
         
     except Exception as e:
         return {"error": str(e), "breakdown": []}
 
 @simple_admin_router.get("/income-breakdown")
+@cached_analytics
 async def get_income_breakdown(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -508,66 +290,22 @@ async def get_income_breakdown(
             employment_statuses, income_ranges, children, companies
         )
         
-        query = db.query(
-            FinancialClinicProfile.income_range,
-            func.count(FinancialClinicResponse.id).label('count')
-        ).join(
-            FinancialClinicResponse,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        query = apply_date_range_filter(query, date_range, start_date, end_date)
-        query = apply_demographic_filters(query, filters, db)
-        
-        # Re-query to get avg scores
-        score_query = db.query(
-            FinancialClinicProfile.income_range,
-            func.count(FinancialClinicResponse.id).label('count'),
-            func.avg(FinancialClinicResponse.total_score).label('avg_score')
-        ).join(
-            FinancialClinicResponse,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        score_query = apply_date_range_filter(score_query, date_range, start_date, end_date)
-        score_query = apply_demographic_filters(score_query, filters, db)
-        
-        results = score_query.group_by(FinancialClinicProfile.income_range).all()
-        
-        breakdown = []
-        # Define sort order for income ranges
-        income_order = {
-            "Below AED 5,000": 1,
-            "AED 5,000 to AED 10,000": 2,
-            "AED 10,000 to AED 20,000": 3,
-            "AED 20,000 to AED 30,000": 4,
-            "AED 30,000 to AED 40,000": 5,
-            "AED 40,000 to AED 50,000": 6,
-            "AED 50,000 to AED 100,000": 7,
-            "Above AED 100,000": 8
-        }
-        
-        for income_range, count, avg_score in results:
-            if income_range:
-                breakdown.append({
-                    "range": income_range,
-                    "count": count,
-                    "average_score": round(float(avg_score), 2) if avg_score else 0,
-                    "sort_order": income_order.get(income_range, 99)
-                })
-                
-        breakdown.sort(key=lambda x: x['sort_order'])
+        if is_rollup_eligible(filters, unique_users_only):
+            results = dimension_breakdown(db, filters, "income_range", date_range, start_date, end_date)
+        else:
+            results = build_filtered_query(
+                db,
+                [FinancialClinicProfile.income_range, func.count(FinancialClinicResponse.id), func.avg(FinancialClinicResponse.total_score)],
+                filters, date_range, start_date, end_date, unique_users_only
+            ).group_by(FinancialClinicProfile.income_range).all()
         
-        # Remove sort order
-        for item in breakdown:
-            del item['sort_order']
-            
-        return {"breakdown": breakdown}
+        return income_breakdown_payload(results)
         
     except Exception as e:
         return {"error": str(e), "breakdown": []}
 
 @simple_admin_router.get("/gender-breakdown")
+@cached_analytics
 async def get_gender_breakdown(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -594,41 +332,19 @@ async def get_gender_breakdown(
             employment_statuses, income_ranges, children, companies
         )
         
-        query = db.query(
-            FinancialClinicProfile.gender,
-            func.count(FinancialClinicResponse.id).label('count')
-        ).join(
-            FinancialClinicResponse,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        query = apply_date_range_filter(query, date_range, start_date, end_date)
-        query = apply_demographic_filters(query, filters, db)
-        
-        results = query.group_by(FinancialClinicProfile.gender).all()
-        
-        breakdown = []
-        total_count = 0
-        
-        for gender, count in results:
-            if gender:
-                breakdown.append({
-                    "gender": gender,
-                    "count": count
-                })
-                total_count += count
-            
-        # Calculate percentages
-        for item in breakdown:
-            item["percentage"] = round((item["count"] / total_count * 100), 1) if total_count > 0 else 0
-            
-        # Sort by count descending
-        breakdown.sort(key=lambda x: x["count"], reverse=True)
+        if is_rollup_eligible(filters, unique_users_only):
+            results = [
+                (gender, count) for gender, count, _ in
+                dimension_breakdown(db, filters, "gender", date_range, start_date, end_date)
+            ]
+        else:
+            results = build_filtered_query(
+                db,
+                [FinancialClinicProfile.gender, func.count(FinancialClinicResponse.id)],
+                filters, date_range, start_date, end_date, unique_users_only
+            ).group_by(FinancialClinicProfile.gender).all()
         
-        return {
-            "total": total_count,
-            "breakdown": breakdown
-        }
+        return gender_breakdown_payload(results)
         
     except Exception as e:
         import traceback
@@ -695,184 +411,33 @@ async def export_simple_admin_csv(
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ) -> StreamingResponse:
-    """Export filtered financial clinic responses as CSV (admin only)."""
+    """Export filtered financial clinic responses as CSV (admin only).
+    
+    Rows are streamed from a server-side cursor and sent in chunks as they
+    are fetched, so the download starts immediately and memory stays flat.
+    """
     try:
-        from app.models import FinancialClinicResponse, FinancialClinicProfile, AuditLog
-
         # Parse filters
         filters = parse_filter_params(
             age_groups, genders, nationalities, emirates,
             employment_statuses, income_ranges, children, companies
         )
+        start_dt = datetime.fromisoformat(start_date) if start_date else None
+        end_dt = datetime.fromisoformat(end_date) if end_date else None
 
-        # Build base query
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-
-        # Apply date filters
-        if start_date:
-            start_dt = datetime.fromisoformat(start_date)
-            query = query.filter(FinancialClinicResponse.created_at >= start_dt)
-        if end_date:
-            end_dt = datetime.fromisoformat(end_date)
-            query = query.filter(FinancialClinicResponse.created_at <= end_dt)
-
-        # Apply other demographic filters
-        query = apply_demographic_filters(query, filters, db)
-
-        # Optionally filter unique users
-        responses = query.order_by(FinancialClinicResponse.created_at.desc()).all()
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-
-        # Helper function to calculate age from DOB string (DD/MM/YYYY)
-        def calculate_age(dob_str):
-            if not dob_str or dob_str.strip() == '':
-                return ''
-            try:
-                from datetime import datetime
-                # Try DD/MM/YYYY format first
-                dob = datetime.strptime(dob_str.strip(), '%d/%m/%Y')
-                today = datetime.today()
-                age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                return age
-            except ValueError:
-                # Try YYYY-MM-DD format (ISO format)
-                try:
-                    dob = datetime.strptime(dob_str.strip(), '%Y-%m-%d')
-                    today = datetime.today()
-                    age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                    return age
-                except:
-                    return ''
-            except:
-                return ''
-        
-        # Helper function to get category score from JSON
-        def get_category_score(category_scores, category_name):
-            if not category_scores:
-                return 0
-            try:
-                # category_scores is stored as JSON with structure like:
-                # {"Income Stream": {"score": 10, ...}, "Savings Habit": {...}, ...}
-                if isinstance(category_scores, dict):
-                    category_data = category_scores.get(category_name, {})
-                    if isinstance(category_data, dict):
-                        return category_data.get('score', 0)
-                return 0
-            except:
-                return 0
-        
-        # Prepare CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Header with mobile number country code and 5 action plan columns
-        writer.writerow([
-            'ID', 'Name', 'Email', 'Mobile Number', 'Age', 'Gender', 'Nationality', 'Emirate', 'Children',
-            'Employment Status', 'Income Range', 'Company', 'Total Score', 'Status Band',
-            'Questions Answered', 'Income Stream Score', 'Savings Habit Score',
-            'Debt Management Score', 'Retirement Planning Score', 'Financial Protection Score',
-            'Financial Knowledge Score', 'Action Plan 1', 'Action Plan 2', 'Action Plan 3', 
-            'Action Plan 4', 'Action Plan 5', 'Submission Date'
-        ])
-
-        for r in responses:
-            profile = db.query(FinancialClinicProfile).filter(FinancialClinicProfile.id == r.profile_id).first()
-            
-            # Extract category scores from JSON (using actual category enum values with spaces)
-            income_stream_score = get_category_score(r.category_scores, 'Income Stream')
-            savings_habit_score = get_category_score(r.category_scores, 'Savings Habit')
-            debt_management_score = get_category_score(r.category_scores, 'Debt Management')
-            retirement_planning_score = get_category_score(r.category_scores, 'Retirement Planning')
-            financial_protection_score = get_category_score(r.category_scores, 'Protecting Your Family')
-            financial_knowledge_score = get_category_score(r.category_scores, 'Emergency Savings')
-            
-            # Extract insights (Personalized Action Plans) - up to 5 insights
-            insights = ['', '', '', '', '']  # Default to empty strings
-            if r.insights:
-                try:
-                    if isinstance(r.insights, list):
-                        # Extract text from each insight dictionary
-                        insight_texts = []
-                        for insight in r.insights[:5]:
-                            if isinstance(insight, dict) and 'text' in insight:
-                                insight_texts.append(insight['text'])
-                            elif isinstance(insight, str):
-                                insight_texts.append(insight)
-                            else:
-                                insight_texts.append(str(insight))
-                        insights = insight_texts + [''] * (5 - len(insight_texts))
-                    elif isinstance(r.insights, str):
-                        insights = [r.insights] + [''] * 4
-                    else:
-                        insights = [str(r.insights)] + [''] * 4
-                except:
-                    insights = ['', '', '', '', '']
-            
-            # Format mobile number with country code
-            mobile_number = ''
-            if profile and profile.mobile_number:
-                mobile_number = profile.mobile_number
-                # Add country code if not already present
-                if not mobile_number.startswith('+'):
-                    # Default to UAE country code if not specified
-                    mobile_number = '+971 ' + mobile_number
-            
-            writer.writerow([
-                r.id,
-                profile.name if profile else '',
-                profile.email if profile else '',
-                mobile_number,
-                calculate_age(profile.date_of_birth) if profile and profile.date_of_birth else '',
-                profile.gender if profile else '',
-                profile.nationality if profile else '',
-                profile.emirate if profile else '',
-                profile.children if profile else '',
-                profile.employment_status if profile else '',
-                profile.income_range if profile else '',
-                '',  # Company (from company_tracker_id if needed)
-                round(r.total_score, 2) if r.total_score else 0,
-                r.status_band if r.status_band else '',
-                r.questions_answered if r.questions_answered else 0,
-                income_stream_score,
-                savings_habit_score,
-                debt_management_score,
-                retirement_planning_score,
-                financial_protection_score,
-                financial_knowledge_score,
-                insights[0] if len(insights) > 0 else '',
-                insights[1] if len(insights) > 1 else '',
-                insights[2] if len(insights) > 2 else '',
-                insights[3] if len(insights) > 3 else '',
-                insights[4] if len(insights) > 4 else '',
-                r.created_at.strftime('%Y-%m-%d %H:%M:%S') if r.created_at else ''
-            ])
-
-        # Audit log
-        audit_log = AuditLog(
-            user_id=current_user.id,
-            action="simple_admin_export_csv",
-            entity_type="financial_clinic_responses",
-            details={"exported_count": len(responses), "filters": filters}
-        )
-        db.add(audit_log)
-        db.commit()
-
-        output.seek(0)
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         filename = f"financial_clinic_responses_{timestamp}.csv"
 
         return StreamingResponse(
-            io.BytesIO(output.getvalue().encode('utf-8')),
+            stream_export(
+                db, csv_chunks, filters, start_dt, end_dt, unique_users_only,
+                user_id=current_user.id, action="simple_admin_export_csv"
+            ),
             media_type='text/csv',
             headers={'Content-Disposition': f'attachment; filename={filename}'}
         )
 
     except Exception as e:
-        import traceback
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -890,225 +455,40 @@ async def export_simple_admin_excel(
     children: Optional[str] = Query(None),
     companies: Optional[str] = Query(None),
     unique_users_only: Optional[bool] = Query(None),
+    max_rows_per_sheet: Optional[int] = Query(None, ge=1, le=EXCEL_MAX_ROWS_PER_SHEET),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ) -> StreamingResponse:
-    """Export filtered financial clinic responses as Excel (admin only)."""
+    """Export filtered financial clinic responses as Excel (admin only).
+    
+    Rows stream into a write-only workbook spooled to a temporary file, which
+    is then sent in chunks; rows beyond max_rows_per_sheet continue on
+    further sheets.
+    """
     try:
-        from app.models import FinancialClinicResponse, FinancialClinicProfile, AuditLog
-
         filters = parse_filter_params(
             age_groups, genders, nationalities, emirates,
             employment_statuses, income_ranges, children, companies
         )
+        start_dt = datetime.fromisoformat(start_date) if start_date else None
+        end_dt = datetime.fromisoformat(end_date) if end_date else None
 
-        # Build base query using correct Financial Clinic models
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-
-        if start_date:
-            start_dt = datetime.fromisoformat(start_date)
-            query = query.filter(FinancialClinicResponse.created_at >= start_dt)
-        if end_date:
-            end_dt = datetime.fromisoformat(end_date)
-            query = query.filter(FinancialClinicResponse.created_at <= end_dt)
-
-        query = apply_demographic_filters(query, filters, db)
-
-        responses = query.order_by(FinancialClinicResponse.created_at.desc()).all()
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-
-        # Helper function to calculate age from DOB string (DD/MM/YYYY)
-        def calculate_age(dob_str):
-            if not dob_str or dob_str.strip() == '':
-                return ''
-            try:
-                from datetime import datetime
-                # Try DD/MM/YYYY format first
-                dob = datetime.strptime(dob_str.strip(), '%d/%m/%Y')
-                today = datetime.today()
-                age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                return age
-            except ValueError:
-                # Try YYYY-MM-DD format (ISO format)
-                try:
-                    dob = datetime.strptime(dob_str.strip(), '%Y-%m-%d')
-                    today = datetime.today()
-                    age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                    return age
-                except:
-                    return ''
-            except:
-                return ''
-        
-        # Helper function to get category score from JSON
-        def get_category_score(category_scores, category_name):
-            if not category_scores:
-                return 0
-            try:
-                # category_scores is stored as JSON with structure like:
-                # {"Income Stream": {"score": 10, ...}, "Savings Habit": {...}, ...}
-                if isinstance(category_scores, dict):
-                    category_data = category_scores.get(category_name, {})
-                    if isinstance(category_data, dict):
-                        return category_data.get('score', 0)
-                return 0
-            except:
-                return 0
-
-        # Build dataframe rows
-        rows = []
-        for r in responses:
-            profile = db.query(FinancialClinicProfile).filter(FinancialClinicProfile.id == r.profile_id).first()
-            
-            # Extract category scores from JSON (using actual category enum values with spaces)
-            income_stream_score = get_category_score(r.category_scores, 'Income Stream')
-            savings_habit_score = get_category_score(r.category_scores, 'Savings Habit')
-            debt_management_score = get_category_score(r.category_scores, 'Debt Management')
-            retirement_planning_score = get_category_score(r.category_scores, 'Retirement Planning')
-            financial_protection_score = get_category_score(r.category_scores, 'Protecting Your Family')
-            financial_knowledge_score = get_category_score(r.category_scores, 'Emergency Savings')
-            
-            # Extract insights (Personalized Action Plans) - up to 5 insights
-            insights = ['', '', '', '', '']  # Default to empty strings
-            if r.insights:
-                try:
-                    if isinstance(r.insights, list):
-                        # Extract text from each insight dictionary
-                        insight_texts = []
-                        for insight in r.insights[:5]:
-                            if isinstance(insight, dict) and 'text' in insight:
-                                insight_texts.append(insight['text'])
-                            elif isinstance(insight, str):
-                                insight_texts.append(insight)
-                            else:
-                                insight_texts.append(str(insight))
-                        insights = insight_texts + [''] * (5 - len(insight_texts))
-                    elif isinstance(r.insights, str):
-                        insights = [r.insights] + [''] * 4
-                    else:
-                        insights = [str(r.insights)] + [''] * 4
-                except:
-                    insights = ['', '', '', '', '']
-            
-            # Format mobile number with country code
-            mobile_number = ''
-            if profile and profile.mobile_number:
-                mobile_number = profile.mobile_number
-                # Add country code if not already present
-                if not mobile_number.startswith('+'):
-                    # Default to UAE country code if not specified
-                    mobile_number = '+971 ' + mobile_number
-            
-            rows.append({
-                'id': r.id,
-                'name': profile.name if profile else '',
-                'email': profile.email if profile else '',
-                'mobile_number': mobile_number,
-                'age': calculate_age(profile.date_of_birth) if profile and profile.date_of_birth else '',
-                'gender': profile.gender if profile else '',
-                'nationality': profile.nationality if profile else '',
-                'emirate': profile.emirate if profile else '',
-                'children': profile.children if profile else '',
-                'employment_status': profile.employment_status if profile else '',
-                'income_range': profile.income_range if profile else '',
-                'company': '',  # Company (from company_tracker_id if needed)
-                'total_score': round(r.total_score, 2) if r.total_score else 0,
-                'status_band': r.status_band if r.status_band else '',
-                'questions_answered': r.questions_answered if r.questions_answered else 0,
-                'income_stream_score': income_stream_score,
-                'savings_habit_score': savings_habit_score,
-                'debt_management_score': debt_management_score,
-                'retirement_planning_score': retirement_planning_score,
-                'financial_protection_score': financial_protection_score,
-                'financial_knowledge_score': financial_knowledge_score,
-                'action_plan_1': insights[0] if len(insights) > 0 else '',
-                'action_plan_2': insights[1] if len(insights) > 1 else '',
-                'action_plan_3': insights[2] if len(insights) > 2 else '',
-                'action_plan_4': insights[3] if len(insights) > 3 else '',
-                'action_plan_5': insights[4] if len(insights) > 4 else '',
-                'created_at': r.created_at.strftime('%Y-%m-%d %H:%M:%S') if r.created_at else ''
-            })
-
-        # Create Excel file
-        bio = io.BytesIO()
-        
-        # Use openpyxl directly for better compatibility
-        from openpyxl import Workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Financial Clinic Responses"
-        
-        # Add headers with mobile number country code and 5 action plan columns
-        headers = [
-            'ID', 'Name', 'Email', 'Mobile Number', 'Age', 'Gender', 'Nationality', 'Emirate', 'Children',
-            'Employment Status', 'Income Range', 'Company', 'Total Score', 'Status Band',
-            'Questions Answered', 'Income Stream Score', 'Savings Habit Score',
-            'Debt Management Score', 'Retirement Planning Score', 'Financial Protection Score',
-            'Financial Knowledge Score', 'Action Plan 1', 'Action Plan 2', 'Action Plan 3', 
-            'Action Plan 4', 'Action Plan 5', 'Submission Date'
-        ]
-        ws.append(headers)
-        
-        # Add data rows
-        for row in rows:
-            ws.append([
-                row['id'],
-                row['name'], 
-                row['email'],
-                row['mobile_number'],
-                row['age'],
-                row['gender'],
-                row['nationality'],
-                row['emirate'],
-                row['children'],
-                row['employment_status'],
-                row['income_range'],
-                row['company'],
-                row['total_score'],
-                row['status_band'],
-                row['questions_answered'],
-                row['income_stream_score'],
-                row['savings_habit_score'],
-                row['debt_management_score'],
-                row['retirement_planning_score'],
-                row['financial_protection_score'],
-                row['financial_knowledge_score'],
-                row['action_plan_1'],
-                row['action_plan_2'],
-                row['action_plan_3'],
-                row['action_plan_4'],
-                row['action_plan_5'],
-                row['created_at']
-            ])
-        
-        wb.save(bio)
-        bio.seek(0)
-
-        # Audit log
-        audit_log = AuditLog(
-            user_id=current_user.id,
-            action="simple_admin_export_excel",
-            entity_type="financial_clinic_responses",
-            details={"exported_count": len(responses), "filters": filters}
-        )
-        db.add(audit_log)
-        db.commit()
+        def render(rows):
+            return excel_chunks(rows, max_rows_per_sheet or EXCEL_MAX_ROWS_PER_SHEET)
 
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         filename = f"financial_clinic_responses_{timestamp}.xlsx"
 
         return StreamingResponse(
-            bio,
+            stream_export(
+                db, render, filters, start_dt, end_dt, unique_users_only,
+                user_id=current_user.id, action="simple_admin_export_excel"
+            ),
             media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             headers={'Content-Disposition': f'attachment; filename={filename}'}
         )
 
     except Exception as e:
-        import traceback
         raise HTTPException(status_code=500, detail=str(e))
 
 @simple_admin_router.get("/survey-submissions")
@@ -1127,9 +507,12 @@ async def get_survey_submissions(
         
         # Fetch Financial Clinic submissions (NEW SYSTEM)
         if survey_type in ["all", "financial_clinic"]:
+            # Profiles come from the join itself rather than one lazy load per row
             fc_submissions = db.query(FinancialClinicResponse).join(
                 FinancialClinicProfile,
                 FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+            ).options(
+                contains_eager(FinancialClinicResponse.profile)
             ).order_by(
                 FinancialClinicResponse.created_at.desc()
             ).limit(limit if survey_type == "financial_clinic" else limit // 2).all()
@@ -1199,36 +582,36 @@ async def get_survey_submissions(
         
         # Fetch OLD survey submissions (if requested)
         if survey_type in ["all", "old"]:
-            old_submissions = db.query(SurveyResponse).order_by(
+            # Users and customer profiles load with one IN query each
+            old_submissions = db.query(SurveyResponse).options(
+                selectinload(SurveyResponse.user),
+                selectinload(SurveyResponse.customer_profile)
+            ).order_by(
                 SurveyResponse.created_at.desc()
             ).limit(limit if survey_type == "old" else limit // 2).all()
             
             for submission in old_submissions:
                 # Get user info if available
                 user_info = None
-                if submission.user_id:
-                    user = db.query(User).filter(User.id == submission.user_id).first()
-                    if user:
-                        user_info = {
-                            "id": user.id,
-                            "email": user.email,
-                            "is_admin": user.is_admin
-                        }
+                user = submission.user
+                if user:
+                    user_info = {
+                        "id": user.id,
+                        "email": user.email,
+                        "is_admin": user.is_admin
+                    }
                 
                 # Get profile info if available
                 profile_info = None
-                if submission.customer_profile_id:
-                    profile = db.query(CustomerProfile).filter(
-                        CustomerProfile.id == submission.customer_profile_id
-                    ).first()
-                    if profile:
-                        profile_info = {
-                            "age": profile.age,
-                            "gender": profile.gender,
-                            "children": profile.children,
-                            "employment": profile.employment_status,
-                            "income": profile.monthly_income
-                        }
+                profile = submission.customer_profile
+                if profile:
+                    profile_info = {
+                        "age": profile.age,
+                        "gender": profile.gender,
+                        "children": profile.children,
+                        "employment": profile.employment_status,
+                        "income": profile.monthly_income
+                    }
                 
                 result.append({
                     "id": f"old_{submission.id}",
@@ -1333,6 +716,8 @@ async def get_variations_for_companies(
 
 @simple_admin_router.get("/filter-options")
 async def get_filter_options(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user)
 ):
@@ -1340,77 +725,31 @@ async def get_filter_options(
     Get all available filter options for Financial Clinic dashboard.
     Returns ALL possible options exactly as they appear in the survey form,
     not just values that exist in the database.
+    
+    Served from a precomputed payload with an ETag; a matching If-None-Match
+    gets 304 Not Modified.
     """
     try:
-        from app.models import CompanyTracker
-        
-        # Return ALL possible options from the survey form
-        # These match exactly what users can select in /financial-clinic/page.tsx
-        all_age_groups = ["< 18", "18-25", "26-35", "36-45", "46-60", "60+"]
-        all_genders = ["Male", "Female"]
-        all_nationalities = ["Emirati", "Non-Emirati"]
-        all_emirates = [
-            "Dubai",
-            "Abu Dhabi", 
-            "Sharjah",
-            "Ajman",
-            "Al Ain",
-            "Ras Al Khaimah / Fujairah / UAQ / Outside UAE"
-        ]
-        all_employment_statuses = ["Employed", "Self-Employed", "Unemployed"]
-        all_income_ranges = [
-            "Below 5,000",
-            "5,000 to 10,000",
-            "10,000 to 20,000",
-            "20,000 to 30,000",
-            "30,000 to 40,000",
-            "40,000 to 50,000",
-            "50,000 to 100,000",
-            "Above 100,000"
-        ]
-        all_children_options = ["0", "1", "2", "3", "4", "5+"]
-        
-        # Get companies (these are dynamic)
-        companies = db.query(CompanyTracker).filter(
-            CompanyTracker.is_active == True
-        ).order_by(CompanyTracker.company_name).all()
-        
-        company_list = [
-            {
-                "id": c.id,
-                "name": c.company_name,
-                "unique_url": c.unique_url
-            }
-            for c in companies
-        ]
+        payload, etag = filter_options_cache.get(db)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
         
-        return {
-            "age_groups": all_age_groups,
-            "genders": all_genders,
-            "nationalities": all_nationalities,
-            "emirates": all_emirates,
-            "employment_statuses": all_employment_statuses,
-            "income_ranges": all_income_ranges,
-            "children_options": all_children_options,
-            "companies": company_list
-        }
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+        
+        response.headers.update(headers)
+        return payload
         
     except Exception as e:
         import traceback
         return {
             "error": str(e),
             "traceback": traceback.format_exc(),
-            "age_groups": ["< 18", "18-25", "26-35", "36-45", "46-60", "60+"],
-            "genders": ["Male", "Female"],
-            "nationalities": ["Emirati", "Non-Emirati"],
-            "emirates": ["Dubai", "Abu Dhabi", "Sharjah", "Ajman", "Al Ain", "Ras Al Khaimah / Fujairah / UAQ / Outside UAE"],
-            "employment_statuses": ["Employed", "Self-Employed", "Unemployed"],
-            "income_ranges": ["Below 5,000", "5,000 to 10,000", "10,000 to 20,000", "20,000 to 30,000", "30,000 to 40,000", "40,000 to 50,000", "50,000 to 100,000", "Above 100,000"],
-            "children_options": ["0", "1", "2", "3", "4", "5+"],
+            **FORM_FILTER_OPTIONS,
             "companies": []
         }
 
 @simple_admin_router.get("/overview-metrics")
+@cached_analytics
 async def get_overview_metrics(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -1429,7 +768,7 @@ async def get_overview_metrics(
 ):
     """Get overview metrics (KPIs) for the admin dashboard."""
     try:
-        from app.models import FinancialClinicResponse, FinancialClinicProfile
+        from app.models import FinancialClinicResponse
         
         # Parse filters
         filters = parse_filter_params(
@@ -1437,76 +776,50 @@ async def get_overview_metrics(
             employment_statuses, income_ranges, children, companies
         )
         
-        # Get all responses with filters applied
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        # Apply date range filtering
-        query = apply_date_range_filter(query, date_range, start_date, end_date)
-        
-        # Apply demographic filters
-        query = apply_demographic_filters(query, filters, db)
-        
-        responses = query.all()
-        
-        # Get total responses (before unique filter)
-        all_responses_count = len(responses)
-        
-        # Apply unique user filter only if requested
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-        
-        total_responses = len(responses)
-        
-        if total_responses == 0:
-            return {
-                "total_responses": 0,
-                "total_submissions": 0,
-                "unique_completions": 0,
-                "cases_completed_percentage": 0.0,
-                "unique_completion_percentage": 0.0,
-                "average_score": 0,
-                "excellent_count": 0,
-                "good_count": 0,
-                "needs_improvement_count": 0,
-                "at_risk_count": 0,
-                "today_submissions": 0
-            }
-        
-        # Calculate metrics
-        total_score = sum(r.total_score for r in responses)
-        average_score = total_score / total_responses if total_responses > 0 else 0
-        
-        # Count by status band
-        excellent_count = sum(1 for r in responses if r.status_band == "Excellent")
-        good_count = sum(1 for r in responses if r.status_band == "Good")
-        needs_improvement_count = sum(1 for r in responses if r.status_band == "Needs Improvement")
-        at_risk_count = sum(1 for r in responses if r.status_band == "At Risk")
-        
-        # Calculate completion percentages
-        # For "cases completed" we use unique responses as the success metric
-        cases_completed_percentage = 100.0  # All retrieved responses are considered "completed" in Financial Clinic
-        unique_completion_percentage = (total_responses / all_responses_count * 100) if all_responses_count > 0 else 0.0
-        
-        # Calculate today's submissions
-        today = datetime.now().date()
-        today_submissions = sum(1 for r in responses if r.created_at.date() == today)
-        
-        return {
-            "total_responses": total_responses,  # Keep for backward compatibility
-            "total_submissions": all_responses_count,  # Total including duplicates
-            "unique_completions": total_responses,  # Unique users who completed
-            "cases_completed_percentage": round(cases_completed_percentage, 2),
-            "unique_completion_percentage": round(unique_completion_percentage, 2),
-            "average_score": round(average_score, 2),
-            "excellent_count": excellent_count,
-            "good_count": good_count,
-            "needs_improvement_count": needs_improvement_count,
-            "at_risk_count": at_risk_count,
-            "today_submissions": today_submissions  # New field for today's count
-        }
+        from sqlalchemy import case
+
+        today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if is_rollup_eligible(filters, unique_users_only):
+            # Every submission counts, so totals come straight from the daily rollup
+            window_start, window_end = resolve_date_window(date_range, start_date, end_date)
+            by_band = summarize(db, filters, window_start, window_end, group_by=("status_band",))
+            today = summarize(
+                db, filters,
+                max(window_start, today_start) if window_start else today_start,
+                window_end
+            )
+
+            all_responses_count = sum(m["response_count"] for m in by_band.values())
+            metrics = SimpleNamespace(
+                total=all_responses_count,
+                score_sum=sum(m["score_sum"] for m in by_band.values()),
+                excellent_count=by_band.get(("Excellent",), {}).get("response_count", 0),
+                good_count=by_band.get(("Good",), {}).get("response_count", 0),
+                needs_improvement_count=by_band.get(("Needs Improvement",), {}).get("response_count", 0),
+                at_risk_count=by_band.get(("At Risk",), {}).get("response_count", 0),
+                today=sum(m["response_count"] for m in today.values())
+            )
+        else:
+            # Get total responses (before unique filter)
+            all_responses_count = build_filtered_query(
+                db, [func.count(FinancialClinicResponse.id)], filters,
+                date_range, start_date, end_date
+            ).scalar() or 0
+
+            # Aggregate KPIs in a single pass (unique user filter only if requested)
+            metrics = build_filtered_query(
+                db,
+                [
+                    func.count(FinancialClinicResponse.id).label("total"),
+                    func.sum(FinancialClinicResponse.total_score).label("score_sum"),
+                    *status_band_counts(),
+                    func.sum(case((FinancialClinicResponse.created_at >= today_start, 1), else_=0)).label("today")
+                ],
+                filters, date_range, start_date, end_date, unique_users_only
+            ).one()
+
+        return overview_metrics_payload(metrics, all_responses_count)
         
     except Exception as e:
         import traceback
@@ -1516,6 +829,7 @@ async def get_overview_metrics(
         }
 
 @simple_admin_router.get("/score-distribution")
+@cached_analytics
 async def get_score_distribution(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -1534,7 +848,7 @@ async def get_score_distribution(
 ):
     """Get score distribution by status bands."""
     try:
-        from app.models import FinancialClinicResponse, FinancialClinicProfile
+        from app.models import FinancialClinicResponse
         
         # Parse filters
         filters = parse_filter_params(
@@ -1542,37 +856,23 @@ async def get_score_distribution(
             employment_statuses, income_ranges, children, companies
         )
         
-        # Get all responses with filters applied
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        # Apply date range filtering
-        query = apply_date_range_filter(query, date_range, start_date, end_date)
-        
-        # Apply demographic filters
-        query = apply_demographic_filters(query, filters, db)
-        
-        responses = query.all()
-        
-        # Apply unique user filter only if requested
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-        
         # Count by status band
-        distribution = {}
-        for response in responses:
-            status = response.status_band
-            distribution[status] = distribution.get(status, 0) + 1
-        
-        return {
-            "total": len(responses),
-            "distribution": [
-                {"status_band": status, "count": count}
-                for status, count in distribution.items()
+        if is_rollup_eligible(filters, unique_users_only):
+            window_start, window_end = resolve_date_window(date_range, start_date, end_date)
+            results = [
+                (status, measures["response_count"])
+                for (status,), measures in summarize(
+                    db, filters, window_start, window_end, group_by=("status_band",)
+                ).items()
             ]
-        }
+        else:
+            results = build_filtered_query(
+                db,
+                [FinancialClinicResponse.status_band, func.count(FinancialClinicResponse.id)],
+                filters, date_range, start_date, end_date, unique_users_only
+            ).group_by(FinancialClinicResponse.status_band).all()
+
+        return score_distribution_payload(results)
         
     except Exception as e:
         import traceback
@@ -1582,6 +882,7 @@ async def get_score_distribution(
         }
 
 @simple_admin_router.get("/category-performance")
+@cached_analytics
 async def get_category_performance(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -1598,7 +899,7 @@ async def get_category_performance(
 ):
     """Get category performance (6 categories)."""
     try:
-        from app.models import FinancialClinicResponse, FinancialClinicProfile
+        from app.models import FinancialClinicResponse, FinancialClinicCategoryScore
         
         # Parse filters
         filters = parse_filter_params(
@@ -1606,85 +907,29 @@ async def get_category_performance(
             employment_statuses, income_ranges, children, companies
         )
         
-        # Get all responses with filters applied
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        # Apply demographic filters
-        query = apply_demographic_filters(query, filters, db)
-        
-        responses = query.all()
-        
-        # Apply unique user filter only if requested
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-        unique_responses = responses
-        
-        # Categories mapping: database name -> API name
-        # Database stores: "Income Stream", "Savings Habit", etc.
-        # API returns: "income_stream", "savings_habit", etc.
-        category_mapping = {
-            "Income Stream": "income_stream",
-            "Savings Habit": "savings_habit",
-            "Emergency Savings": "emergency_savings",
-            "Debt Management": "debt_management",
-            "Retirement Planning": "retirement_planning",
-            "Protecting Your Family": "financial_protection",
-            "Financial Knowledge": "financial_knowledge"
-        }
-        
-        # Calculate average score per category
-        category_totals = {}
-        category_counts = {}
-        category_max_possible = {}
-        
-        for response in unique_responses:
-            if response.category_scores and isinstance(response.category_scores, dict):
-                for db_category, api_category in category_mapping.items():
-                    if db_category in response.category_scores:
-                        cat_data = response.category_scores[db_category]
-                        
-                        # Initialize if not exists
-                        if api_category not in category_totals:
-                            category_totals[api_category] = 0
-                            category_counts[api_category] = 0
-                            category_max_possible[api_category] = 0
-                        
-                        # Handle both dict and numeric values
-                        if isinstance(cat_data, dict):
-                            score = cat_data.get('score', 0)
-                            max_poss = cat_data.get('max_possible', 100)
-                            category_totals[api_category] += score
-                            if category_max_possible[api_category] == 0:
-                                category_max_possible[api_category] = max_poss
-                        else:
-                            category_totals[api_category] += cat_data
-                            if category_max_possible[api_category] == 0:
-                                category_max_possible[api_category] = 100
-                        
-                        category_counts[api_category] += 1
-        
-        # Build response
-        categories = []
-        for api_category in category_mapping.values():
-            count = category_counts.get(api_category, 0)
-            total = category_totals.get(api_category, 0)
-            max_poss = category_max_possible.get(api_category, 100)
-            
-            avg_score = round(total / count, 2) if count > 0 else 0
-            percentage = round((total / (max_poss * count)) * 100, 2) if count > 0 and max_poss > 0 else 0
-            
-            categories.append({
-                "category": api_category,
-                "average_score": avg_score,
-                "max_possible": max_poss,
-                "percentage": percentage,
-                "response_count": count
-            })
+        # Aggregate the normalized category scores of the filtered responses
+        # (unique user filter only if requested), one row per category and status level
+        results = build_filtered_query(
+            db,
+            [
+                FinancialClinicCategoryScore.category,
+                FinancialClinicCategoryScore.status_level,
+                func.count(FinancialClinicCategoryScore.id),
+                func.sum(FinancialClinicCategoryScore.score),
+                func.max(FinancialClinicCategoryScore.max_possible)
+            ],
+            filters, unique_users_only=unique_users_only
+        ).join(
+            FinancialClinicCategoryScore,
+            FinancialClinicCategoryScore.response_id == FinancialClinicResponse.id
+        ).filter(
+            FinancialClinicCategoryScore.category.in_(CATEGORY_API_NAMES.keys())
+        ).group_by(
+            FinancialClinicCategoryScore.category,
+            FinancialClinicCategoryScore.status_level
+        ).all()
         
-        return {"categories": categories}
+        return category_performance_payload(results)
         
     except Exception as e:
         import traceback
@@ -1694,6 +939,7 @@ async def get_category_performance(
         }
 
 @simple_admin_router.get("/nationality-breakdown")
+@cached_analytics
 async def get_nationality_breakdown(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -1718,41 +964,18 @@ async def get_nationality_breakdown(
             employment_statuses, income_ranges, children, companies
         )
         
-        # Get all responses with filters applied
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        # Apply demographic filters
-        query = apply_demographic_filters(query, filters, db)
-        
-        responses = query.all()
-        
-        # Apply unique user filter only if requested
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-        unique_responses = responses
-        
-        emirati_scores = []
-        non_emirati_scores = []
-        
-        for response in unique_responses:
-            if response.profile.nationality == "Emirati":
-                emirati_scores.append(response.total_score)
-            else:
-                non_emirati_scores.append(response.total_score)
-        
-        return {
-            "emirati": {
-                "count": len(emirati_scores),
-                "avg_score": round(sum(emirati_scores) / len(emirati_scores), 2) if emirati_scores else 0
-            },
-            "non_emirati": {
-                "count": len(non_emirati_scores),
-                "avg_score": round(sum(non_emirati_scores) / len(non_emirati_scores), 2) if non_emirati_scores else 0
-            }
-        }
+        is_emirati = FinancialClinicProfile.nationality == "Emirati"
+        results = build_filtered_query(
+            db,
+            [
+                is_emirati,
+                func.count(FinancialClinicResponse.id),
+                func.avg(FinancialClinicResponse.total_score)
+            ],
+            filters, unique_users_only=unique_users_only
+        ).group_by(is_emirati).all()
+
+        return nationality_breakdown_payload(results)
         
     except Exception as e:
         import traceback
@@ -1762,6 +985,7 @@ async def get_nationality_breakdown(
         }
 
 @simple_admin_router.get("/age-breakdown")
+@cached_analytics
 async def get_age_breakdown(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -1786,80 +1010,17 @@ async def get_age_breakdown(
             employment_statuses, income_ranges, children, companies
         )
         
-        # Get all responses with filters applied
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        # Apply demographic filters
-        query = apply_demographic_filters(query, filters, db)
-        
-        responses = query.all()
-        
-        # Apply unique user filter only if requested
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-        unique_responses = responses
-        
-        # Calculate age groups
-        age_group_data = {}
-        
-        for response in unique_responses:
-            profile = response.profile
-            if profile.date_of_birth:
-                try:
-                    parts = profile.date_of_birth.strip().split('/')
-                    if len(parts) == 3:
-                        day, month, year = int(parts[0]), int(parts[1]), int(parts[2])
-                        try:
-                            birth_date = datetime(year, month, day)
-                        except ValueError:
-                            birth_date = datetime(year, 1, 1)
-                        
-                        today = datetime.now()
-                        age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-                        
-                        # Categorize into age groups
-                        if age < 18:
-                            age_group = "< 18"
-                        elif age <= 25:
-                            age_group = "18-25"
-                        elif age <= 35:
-                            age_group = "26-35"
-                        elif age <= 45:
-                            age_group = "36-45"
-                        elif age <= 60:
-                            age_group = "46-60"
-                        else:
-                            age_group = "60+"
-                        
-                        if age_group not in age_group_data:
-                            age_group_data[age_group] = {"scores": [], "count": 0}
-                        
-                        age_group_data[age_group]["scores"].append(response.total_score)
-                        age_group_data[age_group]["count"] += 1
-                except:
-                    pass
-        
-        # Format response
-        age_groups = []
-        for age_group, data in age_group_data.items():
-            avg_score = sum(data["scores"]) / len(data["scores"]) if data["scores"] else 0
-            age_groups.append({
-                "age_group": age_group,
-                "count": data["count"],
-                "avg_score": round(avg_score, 2)
-            })
-        
-        # Sort by age group
-        age_order = ["< 18", "18-25", "26-35", "36-45", "46-60", "60+"]
-        age_groups.sort(key=lambda x: age_order.index(x["age_group"]) if x["age_group"] in age_order else 999)
+        # Bucket birth dates into age groups in SQL (unique user filter only if requested)
+        age_group = age_group_expression()
+        results = build_filtered_query(
+            db,
+            [age_group, func.count(FinancialClinicResponse.id), func.avg(FinancialClinicResponse.total_score)],
+            filters, unique_users_only=unique_users_only
+        ).filter(
+            FinancialClinicProfile.birth_date.isnot(None)
+        ).group_by(age_group).all()
         
-        return {
-            "age_groups": age_groups,
-            "total": sum(data["count"] for data in age_group_data.values())
-        }
+        return age_breakdown_payload(results)
         
     except Exception as e:
         import traceback
@@ -1869,10 +1030,13 @@ async def get_age_breakdown(
         }
 
 @simple_admin_router.get("/time-series")
+@cached_analytics
 async def get_time_series(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
     date_range: str = "30d",
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
     group_by: str = "day",
     age_groups: Optional[str] = Query(None),
     genders: Optional[str] = Query(None),
@@ -1884,9 +1048,14 @@ async def get_time_series(
     companies: Optional[str] = Query(None),
     unique_users_only: Optional[bool] = Query(None)
 ):
-    """Get time series data (submissions over time)."""
+    """Get time series data (submissions over time).
+    
+    Periods are calendar days, ISO weeks, months or years in
+    ANALYTICS_TIMEZONE; every period of the date window is returned, with zero
+    counts where there were no submissions.
+    """
     try:
-        from app.models import FinancialClinicResponse, FinancialClinicProfile
+        from app.models import FinancialClinicResponse
         
         # Parse filters
         filters = parse_filter_params(
@@ -1894,53 +1063,36 @@ async def get_time_series(
             employment_statuses, income_ranges, children, companies
         )
         
-        # Get all responses with filters applied
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        # Apply demographic filters
-        query = apply_demographic_filters(query, filters, db)
-        
-        responses = query.all()
-        
-        # Apply unique user filter only if requested
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-        unique_responses = responses
-        
-        # Group by period
-        time_data = {}
-        
-        for response in unique_responses:
-            if response.created_at:
-                if group_by == "day":
-                    period = response.created_at.strftime("%Y-%m-%d")
-                elif group_by == "week":
-                    period = response.created_at.strftime("%Y-W%W")
-                elif group_by == "month":
-                    period = response.created_at.strftime("%Y-%m")
-                else:
-                    period = response.created_at.strftime("%Y")
-                
-                if period not in time_data:
-                    time_data[period] = {"count": 0, "scores": []}
-                
-                time_data[period]["count"] += 1
-                time_data[period]["scores"].append(response.total_score)
-        
-        # Format response
-        time_series = []
-        for period, data in sorted(time_data.items()):
-            avg_score = sum(data["scores"]) / len(data["scores"]) if data["scores"] else 0
-            time_series.append({
-                "period": period,
-                "count": data["count"],
-                "avg_score": round(avg_score, 2)
-            })
-        
-        return {"time_series": time_series}
+        window = resolve_date_window(date_range, start_date, end_date)
+
+        if is_rollup_eligible(filters, unique_users_only):
+            # Fold the daily rollup into periods
+            periods = {}
+            for (day,), measures in summarize(db, filters, *window, group_by=("day",)).items():
+                label = period_label(day, group_by)
+                count, score_sum = periods.get(label, (0, 0.0))
+                periods[label] = (count + measures["response_count"], score_sum + measures["score_sum"])
+            results = [
+                (label, int(count), score_sum / count)
+                for label, (count, score_sum) in sorted(periods.items())
+            ]
+            return time_series_payload(results, group_by, window)
+        
+        # Group by period in the database
+        period = period_expression(db, group_by).label("period")
+        results = build_filtered_query(
+            db,
+            [
+                period,
+                func.count(FinancialClinicResponse.id),
+                func.avg(FinancialClinicResponse.total_score)
+            ],
+            filters, date_range, start_date, end_date, unique_users_only
+        ).filter(
+            FinancialClinicResponse.created_at.isnot(None)
+        ).group_by(period).order_by(period).all()
+
+        return time_series_payload(results, group_by, window)
         
     except Exception as e:
         import traceback
@@ -1950,6 +1102,7 @@ async def get_time_series(
         }
 
 @simple_admin_router.get("/companies-analytics")
+@cached_analytics
 async def get_companies_analytics(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -1966,7 +1119,7 @@ async def get_companies_analytics(
 ):
     """Get companies analytics."""
     try:
-        from app.models import FinancialClinicResponse, FinancialClinicProfile, CompanyTracker
+        from app.models import FinancialClinicResponse, CompanyTracker
         
         # Parse filters
         filters = parse_filter_params(
@@ -1974,62 +1127,28 @@ async def get_companies_analytics(
             employment_statuses, income_ranges, children, companies
         )
         
-        # Get all responses with filters applied
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        # Apply demographic filters
-        query = apply_demographic_filters(query, filters, db)
-        
-        responses = query.all()
-        
-        # Apply unique user filter only if requested
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-        unique_responses = responses
-        
-        # Group by company
-        company_data = {}
-        
-        for response in unique_responses:
-            if response.company_tracker_id:
-                company_id = response.company_tracker_id
-                
-                if company_id not in company_data:
-                    company = db.query(CompanyTracker).filter(CompanyTracker.id == company_id).first()
-                    company_data[company_id] = {
-                        "company_name": company.company_name if company else f"Company {company_id}",
-                        "scores": [],
-                        "status_bands": []
-                    }
-                
-                company_data[company_id]["scores"].append(response.total_score)
-                company_data[company_id]["status_bands"].append(response.status_band)
-        
-        # Format response
-        companies = []
-        for company_id, data in company_data.items():
-            avg_score = sum(data["scores"]) / len(data["scores"]) if data["scores"] else 0
-            
-            # Count by status band
-            excellent_count = data["status_bands"].count("Excellent")
-            good_count = data["status_bands"].count("Good")
-            needs_improvement_count = data["status_bands"].count("Needs Improvement")
-            at_risk_count = data["status_bands"].count("At Risk")
-            
-            companies.append({
-                "company_name": data["company_name"],
-                "total_responses": len(data["scores"]),
-                "average_score": round(avg_score, 2),
-                "excellent_count": excellent_count,
-                "good_count": good_count,
-                "needs_improvement_count": needs_improvement_count,
-                "at_risk_count": at_risk_count
-            })
-        
-        return {"companies": companies}
+        # Group by company, with the company name resolved in the same query
+        results = build_filtered_query(
+            db,
+            [
+                FinancialClinicResponse.company_tracker_id,
+                CompanyTracker.company_name,
+                func.count(FinancialClinicResponse.id).label("total"),
+                func.avg(FinancialClinicResponse.total_score).label("avg_score"),
+                *status_band_counts()
+            ],
+            filters, unique_users_only=unique_users_only
+        ).outerjoin(
+            CompanyTracker,
+            CompanyTracker.id == FinancialClinicResponse.company_tracker_id
+        ).filter(
+            FinancialClinicResponse.company_tracker_id.isnot(None)
+        ).group_by(
+            FinancialClinicResponse.company_tracker_id,
+            CompanyTracker.company_name
+        ).all()
+
+        return companies_analytics_payload(results)
         
     except Exception as e:
         import traceback
@@ -2039,6 +1158,7 @@ async def get_companies_analytics(
         }
 
 @simple_admin_router.get("/score-analytics-table")
+@cached_analytics
 async def get_score_analytics_table(
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user),
@@ -2059,8 +1179,8 @@ async def get_score_analytics_table(
     variation set. Otherwise, it shows the default Financial Clinic questions.
     """
     try:
-        from app.models import FinancialClinicResponse, FinancialClinicProfile, VariationSet, QuestionVariation
-        from app.surveys.financial_clinic_questions import FINANCIAL_CLINIC_QUESTIONS
+        from app.models import FinancialClinicResponse, FinancialClinicAnswer
+        from sqlalchemy import case
         
         # Parse filters
         filters = parse_filter_params(
@@ -2068,138 +1188,43 @@ async def get_score_analytics_table(
             employment_statuses, income_ranges, children, companies
         )
         
-        # Get all responses with filters applied
-        query = db.query(FinancialClinicResponse).join(
-            FinancialClinicProfile,
-            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-        )
-        
-        # Apply demographic filters
-        query = apply_demographic_filters(query, filters, db)
-        
-        responses = query.all()
-        
-        # Apply unique user filter only if requested
-        if unique_users_only:
-            responses = filter_unique_users(responses)
-        unique_responses = responses
-        
         # Determine which questions to analyze based on company filter
-        questions_to_analyze = FINANCIAL_CLINIC_QUESTIONS  # Default
-        company_variation_set_name = None
+        questions_to_analyze, company_variation_set_name = score_analytics_questions(db, filters)
         
-        # If company filter is applied, get the company's variation set questions
-        if filters.get('companies') and len(filters['companies']) == 1:
-            company_identifier = filters['companies'][0]
-            
-            # Get company and its variation set
-            company = db.query(CompanyTracker).filter(
-                or_(
-                    CompanyTracker.company_name == company_identifier,
-                    CompanyTracker.unique_url == company_identifier
-                )
-            ).first()
-            
-            if company and company.variation_set_id:
-                # Get the variation set
-                variation_set = db.query(VariationSet).filter(
-                    VariationSet.id == company.variation_set_id
-                ).first()
-                
-                if variation_set:
-                    company_variation_set_name = variation_set.name
-                    # Get all 15 question variations from the set
-                    variation_ids = [
-                        variation_set.q1_variation_id, variation_set.q2_variation_id,
-                        variation_set.q3_variation_id, variation_set.q4_variation_id,
-                        variation_set.q5_variation_id, variation_set.q6_variation_id,
-                        variation_set.q7_variation_id, variation_set.q8_variation_id,
-                        variation_set.q9_variation_id, variation_set.q10_variation_id,
-                        variation_set.q11_variation_id, variation_set.q12_variation_id,
-                        variation_set.q13_variation_id, variation_set.q14_variation_id,
-                        variation_set.q15_variation_id
-                    ]
-                    
-                    # Get all variations and build a lookup dict by ID
-                    variations = db.query(QuestionVariation).filter(
-                        QuestionVariation.id.in_(variation_ids),
-                        QuestionVariation.is_active == True
-                    ).all()
-                    
-                    # Create a dict for quick lookup by variation id
-                    variation_lookup = {v.id: v for v in variations}
-                    
-                    if variations:
-                        # Convert variations to question-like objects for analysis
-                        # Use the original order from variation_ids (q1, q2, ..., q15)
-                        questions_to_analyze = []
-                        for i, var_id in enumerate(variation_ids, start=1):
-                            var = variation_lookup.get(var_id)
-                            if var:
-                                # Create a simple object with the needed attributes
-                                class VariationQuestion:
-                                    def __init__(self, variation, question_number):
-                                        self.id = variation.base_question_id
-                                        self.number = question_number
-                                        self.text_en = variation.text_en or variation.text  # Use bilingual field or fallback
-                                        self.category = type('obj', (object,), {
-                                            'value': variation.factor or "General"  # Use factor as category
-                                        })()
-                                
-                                questions_to_analyze.append(VariationQuestion(var, i))
-        
-        # Build question analytics with nationality breakdown
-        question_analytics = []
-        
-        for question in questions_to_analyze:
-            question_id = question.id
-            question_number = question.number
-            question_text = question.text_en
-            category = question.category.value  # Get the string value like "Income Stream"
-            
-            # Collect scores by nationality
-            emirati_scores = []
-            non_emirati_scores = []
-            
-            for response in unique_responses:
-                # Get profile
-                profile = db.query(FinancialClinicProfile).filter(
-                    FinancialClinicProfile.id == response.profile_id
-                ).first()
-                
-                # Get answer for this question
-                if response.answers and question_id in response.answers:
-                    answer_value = response.answers[question_id]
-                    
-                    if profile:
-                        if profile.nationality == "Emirati":
-                            emirati_scores.append(answer_value)
-                        else:
-                            non_emirati_scores.append(answer_value)
-            
-            # Calculate averages
-            emirati_avg = sum(emirati_scores) / len(emirati_scores) if emirati_scores else None
-            non_emirati_avg = sum(non_emirati_scores) / len(non_emirati_scores) if non_emirati_scores else None
-            
-            question_analytics.append({
-                "question_number": question_number,
-                "question_text": question_text,
-                "category": category,
-                "emirati_avg": round(emirati_avg, 2) if emirati_avg is not None else None,
-                "emirati_count": len(emirati_scores),
-                "non_emirati_avg": round(non_emirati_avg, 2) if non_emirati_avg is not None else None,
-                "non_emirati_count": len(non_emirati_scores)
-            })
+        # Answer count and average per question and nationality group over the
+        # filtered responses (unique user filter only if requested), in one query
+        nationality_group = case(
+            (FinancialClinicAnswer.nationality == "Emirati", "emirati"),
+            else_="non_emirati"
+        )
+        results = build_filtered_query(
+            db,
+            [
+                FinancialClinicAnswer.question_id,
+                nationality_group,
+                func.count(FinancialClinicAnswer.id),
+                func.avg(FinancialClinicAnswer.value)
+            ],
+            filters, unique_users_only=unique_users_only
+        ).join(
+            FinancialClinicAnswer,
+            FinancialClinicAnswer.response_id == FinancialClinicResponse.id
+        ).filter(
+            FinancialClinicAnswer.question_id.in_({question.id for question in questions_to_analyze})
+        ).group_by(
+            FinancialClinicAnswer.question_id,
+            nationality_group
+        ).all()
         
-        # Return with metadata about which question set is being used
-        return {
-            "questions": question_analytics,
-            "total_questions": len(question_analytics),
-            "question_set_type": "company_variation" if company_variation_set_name else "default",
-            "variation_set_name": company_variation_set_name,
-            "filtered": bool(filters.get('companies'))
+        answer_stats = {
+            (question_id, group): (count, avg_value)
+            for question_id, group, count, avg_value in results
         }
         
+        return score_analytics_payload(
+            questions_to_analyze, answer_stats, company_variation_set_name, bool(filters.get('companies'))
+        )
+        
     except Exception as e:
         import traceback
         return {
@@ -2209,10 +1234,70 @@ async def get_score_analytics_table(
             "total_questions": 0
         }
 
+@simple_admin_router.get("/dashboard")
+@cached_analytics
+async def get_dashboard(
+    db: Session = Depends(get_db),
+    admin_user: User = Depends(get_current_admin_user),
+    date_range: str = "30d",
+    start_date: Optional[str] = Query(None),
+    end_date: Optional[str] = Query(None),
+    group_by: str = "day",
+    age_groups: Optional[str] = Query(None),
+    genders: Optional[str] = Query(None),
+    nationalities: Optional[str] = Query(None),
+    emirates: Optional[str] = Query(None),
+    employment_statuses: Optional[str] = Query(None),
+    income_ranges: Optional[str] = Query(None),
+    children: Optional[str] = Query(None),
+    companies: Optional[str] = Query(None),
+    unique_users_only: Optional[bool] = Query(None)
+):
+    """Get every dashboard widget in one call.
+    
+    Filters are parsed and companies resolved once, and all widgets are
+    aggregated from a single filtered scan. Each key holds exactly what the
+    widget's own endpoint returns (overview_metrics, score_distribution,
+    category_performance, nationality_breakdown, age_breakdown, time_series,
+    companies_analytics, score_analytics_table and the *_breakdown widgets).
+    With ANALYTICS_SNAPSHOT_ENABLED the scan runs over the in-memory snapshot.
+    """
+    try:
+        # Parse filters
+        filters = parse_filter_params(
+            age_groups, genders, nationalities, emirates,
+            employment_statuses, income_ranges, children, companies
+        )
+        
+        # Score analytics questions depend on the company filter's variation set
+        questions, variation_set_name = score_analytics_questions(db, filters)
+        
+        return dashboard_payloads(
+            db, filters, date_range, start_date, end_date, unique_users_only,
+            group_by=group_by, questions=questions, variation_set_name=variation_set_name,
+            snapshot=get_snapshot(db)
+        )
+        
+    except Exception as e:
+        import traceback
+        return {
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        }
+
+@simple_admin_router.get("/analytics-cache/stats")
+async def get_analytics_cache_stats(
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """Get hit, miss and eviction counters of the dashboard analytics cache."""
+    return analytics_cache.stats()
+
 @simple_admin_router.get("/submissions")
 async def get_submissions(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces page"),
+    include_total: bool = Query(True, description="Count all matching submissions (cached until the next submission)"),
     search: Optional[str] = None,
     status_band: Optional[str] = None,
     nationality: Optional[str] = None,
@@ -2226,6 +1311,10 @@ async def get_submissions(
 ):
     """
     Get paginated list of all Financial Clinic submissions with filtering.
+    
+    Pages are newest first. Pass the returned next_cursor to fetch the next
+    page with a keyset range scan on (created_at, id) instead of an OFFSET;
+    page is only used when no cursor is given.
     """
     try:
         from app.models import FinancialClinicResponse, FinancialClinicProfile
@@ -2233,22 +1322,22 @@ async def get_submissions(
         # Build query with joins
         query = db.query(
             FinancialClinicResponse,
-            FinancialClinicProfile
+            FinancialClinicProfile,
+            CompanyTracker.company_name
         ).join(
             FinancialClinicProfile,
             FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+        ).outerjoin(
+            CompanyTracker,
+            FinancialClinicResponse.company_tracker_id == CompanyTracker.id
         )
         
         # Apply filters
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    FinancialClinicProfile.name.ilike(search_term),
-                    FinancialClinicProfile.email.ilike(search_term),
-                    FinancialClinicProfile.mobile_number.ilike(search_term)
-                )
-            )
+            # Exact email, phone suffix, prefix or trigram substring, each on its own index
+            search_condition = submission_search_condition(search, db.get_bind().dialect.name)
+            if search_condition is not None:
+                query = query.filter(search_condition)
         
         if status_band:
             query = query.filter(FinancialClinicResponse.status_band == status_band)
@@ -2270,95 +1359,33 @@ async def get_submissions(
             date_to_dt = datetime.fromisoformat(date_to)
             query = query.filter(FinancialClinicResponse.created_at <= date_to_dt)
         
-        # Get total count (before age filtering since age is calculated in Python)
         if age_group:
-            # For age filtering, we need to get all results first then filter in Python
-            # This is because date_of_birth is stored as string in DD/MM/YYYY format
-            all_results = query.order_by(desc(FinancialClinicResponse.created_at)).all()
-            
-            # Helper function to calculate age
-            def calculate_age(dob_str):
-                if not dob_str:
-                    return None
-                try:
-                    dob = datetime.strptime(dob_str.strip(), '%d/%m/%Y')
-                    today = datetime.today()
-                    age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                    return age
-                except:
-                    return None
-            
-            # Filter by age group in Python
-            filtered_results = []
-            for response, profile in all_results:
-                age = calculate_age(profile.date_of_birth)
-                if age is None:
-                    continue
-                    
-                if age_group == "< 18" and age < 18:
-                    filtered_results.append((response, profile))
-                elif age_group == "18-25" and 18 <= age <= 25:
-                    filtered_results.append((response, profile))
-                elif age_group == "26-35" and 26 <= age <= 35:
-                    filtered_results.append((response, profile))
-                elif age_group == "36-45" and 36 <= age <= 45:
-                    filtered_results.append((response, profile))
-                elif age_group == "46-60" and 46 <= age <= 60:
-                    filtered_results.append((response, profile))
-                elif age_group == "60+" and age > 60:
-                    filtered_results.append((response, profile))
-            
-            total_count = len(filtered_results)
-            total_pages = (total_count + page_size - 1) // page_size
-            
-            # Apply pagination
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            results = filtered_results[start_idx:end_idx]
-        else:
-            # Normal pagination without age filtering
-            total_count = query.count()
+            # Age groups are birth_date ranges, so age-filtered pages cost the same as unfiltered ones
+            from sqlalchemy import literal
+            age_condition = birth_date_condition(age_group)
+            query = query.filter(age_condition if age_condition is not None else literal(False))
+        
+        total_count = None
+        total_pages = None
+        if include_total:
+            total_count = cached_count(db, (
+                "get_submissions", search, status_band, nationality, company_id,
+                income_range, age_group, date_from, date_to
+            ), query)
             total_pages = (total_count + page_size - 1) // page_size
-            
-            # Get paginated results
-            results = query.order_by(
-                desc(FinancialClinicResponse.created_at)
-            ).offset((page - 1) * page_size).limit(page_size).all()
-        
-        # Helper function to calculate age from DOB string (DD/MM/YYYY)
-        def calculate_age(dob_str):
-            if not dob_str or dob_str.strip() == '':
-                return None
-            try:
-                # Try DD/MM/YYYY format first
-                dob = datetime.strptime(dob_str.strip(), '%d/%m/%Y')
-                today = datetime.today()
-                age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                return age
-            except ValueError:
-                # Try YYYY-MM-DD format (ISO format)
-                try:
-                    dob = datetime.strptime(dob_str.strip(), '%Y-%m-%d')
-                    today = datetime.today()
-                    age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                    return age
-                except:
-                    return None
-            except:
-                return None
+        
+        # Get paginated results
+        results, next_cursor = keyset_page(
+            query, FinancialClinicResponse.created_at, FinancialClinicResponse.id,
+            cursor, page_size, key=lambda row: (row[0].created_at, row[0].id),
+            offset=(page - 1) * page_size
+        )
+        
+        today = date.today()
         
         # Format submissions
         submissions = []
-        for response, profile in results:
-            # Get company name if exists
-            company_name = None
-            if response.company_tracker_id:
-                company = db.query(CompanyTracker).filter(
-                    CompanyTracker.id == response.company_tracker_id
-                ).first()
-                if company:
-                    company_name = company.company_name
-            
+        for response, profile, company_name in results:
             submissions.append({
                 'id': response.id,
                 'profile_id': profile.id,
@@ -2368,7 +1395,7 @@ async def get_submissions(
                 'gender': profile.gender,
                 'nationality': profile.nationality,
                 'emirate': profile.emirate,
-                'age': calculate_age(profile.date_of_birth) if profile.date_of_birth else None,
+                'age': age_on(profile.birth_date, today),
                 'employment_status': profile.employment_status,
                 'income_range': profile.income_range,
                 'company_name': company_name,
@@ -2385,11 +1412,14 @@ async def get_submissions(
         return {
             'submissions': submissions,
             'total': total_count,
-            'page': page,
+            'page': None if cursor else page,
             'page_size': page_size,
-            'total_pages': total_pages
+            'total_pages': total_pages,
+            'next_cursor': next_cursor
         }
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         import traceback
         print(f"Error in get_submissions: {str(e)}")
@@ -2408,40 +1438,30 @@ async def get_submissions_stats(
     try:
         from app.models import FinancialClinicResponse
         
-        # Total submissions
-        total = db.query(FinancialClinicResponse).count()
-        
-        # Today's submissions
         today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today = db.query(FinancialClinicResponse).filter(
-            FinancialClinicResponse.created_at >= today_start
-        ).count()
-        
-        # This week's submissions
         week_start = today_start - timedelta(days=today_start.weekday())
-        this_week = db.query(FinancialClinicResponse).filter(
-            FinancialClinicResponse.created_at >= week_start
-        ).count()
-        
-        # This month's submissions
         month_start = today_start.replace(day=1)
-        this_month = db.query(FinancialClinicResponse).filter(
-            FinancialClinicResponse.created_at >= month_start
-        ).count()
         
-        # Average score
-        avg_score_result = db.query(
-            func.avg(FinancialClinicResponse.total_score)
-        ).scalar()
-        average_score = float(avg_score_result) if avg_score_result else 0.0
+        def compute():
+            # Every count and the average from one conditional-aggregate query
+            stats = db.query(
+                func.count(FinancialClinicResponse.id).label('total'),
+                count_where(FinancialClinicResponse.created_at >= today_start).label('today'),
+                count_where(FinancialClinicResponse.created_at >= week_start).label('this_week'),
+                count_where(FinancialClinicResponse.created_at >= month_start).label('this_month'),
+                func.avg(FinancialClinicResponse.total_score).label('average_score')
+            ).one()
+            average_score = float(stats.average_score) if stats.average_score else 0.0
+            
+            return {
+                'total': stats.total,
+                'today': stats.today,
+                'this_week': stats.this_week,
+                'this_month': stats.this_month,
+                'average_score': round(average_score, 2)
+            }
         
-        return {
-            'total': total,
-            'today': today,
-            'this_week': this_week,
-            'this_month': this_month,
-            'average_score': round(average_score, 2)
-        }
+        return cached_stats(("submissions_stats", today_start.date().isoformat()), compute)
         
     except Exception as e:
         import traceback
@@ -2461,6 +1481,8 @@ async def delete_submission(
     """
     try:
         from app.models import FinancialClinicResponse
+        from app.analytics.rollup import retract_submission
+        from app.companies.stats import retract_company_submission
         
         # Find the submission
         submission = db.query(FinancialClinicResponse).filter(
@@ -2470,10 +1492,16 @@ async def delete_submission(
         if not submission:
             raise HTTPException(status_code=404, detail="Submission not found")
         
-        # Delete the submission
+        # Delete the submission (and its contribution to the analytics rollup and company stats)
+        retract_submission(db, submission, submission.profile)
+        retract_company_submission(db, submission.company_tracker_id, submission.total_score)
         db.delete(submission)
         db.commit()
         
+        # Deleting does not advance the response watermark, so drop cached results explicitly
+        analytics_cache.invalidate()
+        stats_cache.invalidate()
+        
         return {
             'success': True,
             'message': 'Submission deleted successfully',
@@ -0,0 +1,91 @@
+"""
+Per-question answer facts for Financial Clinic responses.
+
+FinancialClinicResponse.answers stores JSON shaped like {"fc_q1": 3, ...}.
+financial_clinic_answers holds the same data, one row per response and
+question, together with the respondent's nationality and company, so
+question-level analytics are a single GROUP BY.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from app.models import FinancialClinicAnswer
+
+
+def answer_values(answers: Any) -> Dict[str, int]:
+    """Integer answer value per question id; non-numeric answers are skipped."""
+    if not isinstance(answers, dict):
+        return {}
+
+    values = {}
+    for question_id, value in answers.items():
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, int):
+            values[question_id] = value
+        elif isinstance(value, float) and value.is_integer():
+            values[question_id] = int(value)
+    return values
+
+
+def build_answer_rows(
+    answers: Any,
+    nationality: Optional[str],
+    company_tracker_id: Optional[int]
+) -> List["FinancialClinicAnswer"]:
+    """
+    Build FinancialClinicAnswer rows from a response's answers JSON.
+
+    created_at is left to the database default, which matches the response's
+    own created_at when both are inserted in the same transaction; callers
+    that backdate the response set it on the rows as well.
+
+    Args:
+        answers: The response's answers JSON
+        nationality: Nationality of the respondent's profile
+        company_tracker_id: Company the response was submitted through, if any
+
+    Returns:
+        Unsaved rows; attach them to FinancialClinicResponse.answer_rows
+    """
+    from app.models import FinancialClinicAnswer
+
+    return [
+        FinancialClinicAnswer(
+            question_id=question_id,
+            value=value,
+            nationality=nationality,
+            company_tracker_id=company_tracker_id
+        )
+        for question_id, value in answer_values(answers).items()
+    ]
+
+
+def sync_answer_nationality(db: Session, profile) -> int:
+    """
+    Copy a profile's nationality onto the answer facts of all its responses.
+
+    Call after updating the profile; does not commit.
+
+    Args:
+        db: Database session
+        profile: FinancialClinicProfile whose nationality may have changed
+
+    Returns:
+        Number of answer rows updated
+    """
+    from app.models import FinancialClinicAnswer, FinancialClinicResponse
+
+    response_ids = db.query(FinancialClinicResponse.id).filter(
+        FinancialClinicResponse.profile_id == profile.id
+    )
+    return db.query(FinancialClinicAnswer).filter(
+        FinancialClinicAnswer.response_id.in_(response_ids),
+        or_(
+            FinancialClinicAnswer.nationality != profile.nationality,
+            FinancialClinicAnswer.nationality.is_(None)
+        )
+    ).update({"nationality": profile.nationality}, synchronize_session=False)
@@ -0,0 +1,224 @@
+"""
+Result cache for the admin dashboard analytics endpoints.
+
+Results are keyed by endpoint and a canonicalized filter tuple and held in a
+bounded LRU. Each entry records the response watermark (max
+FinancialClinicResponse.id) it was computed at, so every submission makes older
+entries stale without any coordination between workers.
+
+Changes that do not add a response (deleting submissions, editing or deleting
+companies) call invalidate(), which clears this process's entries; other
+workers pick the change up within ANALYTICS_CACHE_TTL_SECONDS.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# Comma-separated list parameters; order and duplicates do not change the result
+LIST_FILTER_PARAMS = (
+    "age_groups", "genders", "nationalities", "emirates",
+    "employment_statuses", "income_ranges", "children", "companies",
+)
+
+# Endpoint parameters that are dependencies rather than filters
+DEPENDENCY_PARAMS = ("db", "admin_user", "current_user")
+
+
+class AnalyticsCache:
+    """Bounded LRU of analytics results, versioned by a data watermark."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, watermark: Any) -> Tuple[bool, Any]:
+        """
+        Look up a result computed at the given watermark.
+
+        Returns:
+            Tuple of (hit, value); stale or expired entries count as misses
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_watermark, stored_at, value = entry
+                if entry_watermark == watermark and time.monotonic() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, watermark: Any, value: Any):
+        """Store a result, evicting the least recently used entries beyond max_entries."""
+        with self._lock:
+            self._entries[key] = (watermark, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop every cached result (data changed without a new submission)."""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and sizing for the admin stats endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": settings.ANALYTICS_CACHE_ENABLED,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+analytics_cache = AnalyticsCache(
+    max_entries=settings.ANALYTICS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS
+)
+
+# Admin stats panels (submission, consultation, delivery and incomplete-survey
+# counts) are polled far more often than their numbers change
+stats_cache = AnalyticsCache(max_entries=64, ttl_seconds=settings.STATS_CACHE_TTL_SECONDS)
+
+
+def response_watermark(db: Session) -> int:
+    """Highest FinancialClinicResponse id; advances with every submission."""
+    from app.models import FinancialClinicResponse
+
+    return db.query(func.max(FinancialClinicResponse.id)).scalar() or 0
+
+
+def analytics_cache_key(endpoint: str, params: Dict[str, Any]) -> Tuple:
+    """
+    Canonical cache key for an analytics request.
+
+    List filters are order- and duplicate-insensitive, a missing
+    unique_users_only equals False, and today's date is included because
+    rolling windows and "today" counts move with the calendar.
+
+    Args:
+        endpoint: Endpoint function name
+        params: The endpoint's keyword arguments
+
+    Returns:
+        Hashable key
+    """
+    parts = [endpoint, date.today().isoformat()]
+    for name in sorted(params):
+        if name in DEPENDENCY_PARAMS:
+            continue
+        value = params[name]
+        if name in LIST_FILTER_PARAMS and value:
+            value = tuple(sorted({item.strip() for item in value.split(',')}))
+        elif name == "unique_users_only":
+            value = bool(value)
+        parts.append((name, value))
+    return tuple(parts)
+
+
+def cached_analytics(endpoint):
+    """
+    Serve an analytics endpoint from analytics_cache.
+
+    Apply below the router decorator; the endpoint must take `db` as a keyword
+    argument. Error payloads are never cached.
+    """
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        db: Optional[Session] = kwargs.get("db")
+        if not settings.ANALYTICS_CACHE_ENABLED or args or db is None:
+            return await endpoint(*args, **kwargs)
+
+        key = analytics_cache_key(endpoint.__name__, kwargs)
+        watermark = response_watermark(db)
+        hit, value = analytics_cache.get(key, watermark)
+        if hit:
+            return value
+
+        value = await endpoint(**kwargs)
+        if not (isinstance(value, dict) and "error" in value):
+            analytics_cache.set(key, watermark, value)
+        return value
+
+    return wrapper
+
+
+def cached_count(db: Session, key: Tuple, query) -> int:
+    """
+    COUNT(*) of a filtered FinancialClinicResponse query, cached like analytics results.
+
+    Paginated listings use this for their optional exact total, which costs a
+    full scan of the filtered join, so it is computed at most once per filter
+    set between submissions.
+
+    Args:
+        db: Database session
+        key: Hashable key identifying the listing and its filters
+        query: Query to count
+
+    Returns:
+        Row count
+    """
+    if not settings.ANALYTICS_CACHE_ENABLED:
+        return query.count()
+
+    key = ("count",) + tuple(key)
+    watermark = response_watermark(db)
+    hit, value = analytics_cache.get(key, watermark)
+    if hit:
+        return value
+
+    value = query.count()
+    analytics_cache.set(key, watermark, value)
+    return value
+
+
+def cached_stats(key: Tuple, compute: Callable[[], Any]) -> Any:
+    """
+    Result of compute(), shared for STATS_CACHE_TTL_SECONDS.
+
+    Stats panels have no cheap watermark, so entries simply expire; within the
+    TTL a panel costs no database round trip at all.
+
+    Args:
+        key: Hashable key identifying the panel
+        compute: Runs the panel's aggregate query
+
+    Returns:
+        The cached or freshly computed result
+    """
+    if settings.STATS_CACHE_TTL_SECONDS <= 0:
+        return compute()
+
+    hit, value = stats_cache.get(key, None)
+    if hit:
+        return value
+
+    value = compute()
+    stats_cache.set(key, None, value)
+    return value
@@ -0,0 +1,56 @@
+"""
+Normalized per-category scores for Financial Clinic responses.
+
+FinancialClinicResponse.category_scores stores JSON shaped like
+{"Income Stream": {"score", "max_possible", "percentage", "status_level"}, ...};
+older rows may hold a bare number per category. The same data lives in
+financial_clinic_category_scores, one row per response and category, so
+category analytics are a single GROUP BY.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List
+
+if TYPE_CHECKING:
+    from app.models import FinancialClinicCategoryScore
+
+
+def build_category_score_rows(category_scores: Any) -> List["FinancialClinicCategoryScore"]:
+    """
+    Build FinancialClinicCategoryScore rows from a category_scores JSON value.
+
+    Bare numeric values are treated as a score out of 100 with no status level,
+    matching how the dashboard has always read them.
+
+    Args:
+        category_scores: The response's category_scores JSON
+
+    Returns:
+        Unsaved rows; attach them to FinancialClinicResponse.category_score_rows
+    """
+    from app.models import FinancialClinicCategoryScore
+
+    rows = []
+    for category, data in category_score_values(category_scores).items():
+        rows.append(FinancialClinicCategoryScore(category=category, **data))
+    return rows
+
+
+def category_score_values(category_scores: Any) -> Dict[str, Dict[str, Any]]:
+    """Column values (score, max_possible, status_level) per category."""
+    if not isinstance(category_scores, dict):
+        return {}
+
+    values = {}
+    for category, data in category_scores.items():
+        if isinstance(data, dict):
+            values[category] = {
+                "score": float(data.get('score') or 0),
+                "max_possible": float(data.get('max_possible', 100) or 0),
+                "status_level": data.get('status_level'),
+            }
+        elif isinstance(data, (int, float)):
+            values[category] = {
+                "score": float(data),
+                "max_possible": 100.0,
+                "status_level": None,
+            }
+    return values
@@ -0,0 +1,74 @@
+"""
+In-process index of company identifiers for dashboard filters.
+
+The companies= filter accepts company names and unique URL slugs. Instead of a
+CompanyTracker lookup per analytics call, every company's id, name, slug and
+variation set id are loaded in one query and resolved from dictionaries.
+
+Company changes call invalidate() (see companies_changed() in
+app/companies/routes.py), which reloads this process's index on the next
+lookup; other workers pick the change up within ANALYTICS_CACHE_TTL_SECONDS.
+"""
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+
+class CompanyEntry(NamedTuple):
+    id: int
+    variation_set_id: Optional[int]
+
+
+class CompanyIndex:
+    """Company name / unique URL -> companies, rebuilt when invalidated or older than the TTL."""
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._lookup: Optional[Dict[str, List[CompanyEntry]]] = None
+        self._built_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _get_lookup(self, db: Session) -> Dict[str, List[CompanyEntry]]:
+        from app.models import CompanyTracker
+
+        with self._lock:
+            if self._lookup is not None and time.monotonic() - self._built_at < self.ttl_seconds:
+                return self._lookup
+            generation = self._generation
+
+        lookup: Dict[str, List[CompanyEntry]] = {}
+        for company_id, company_name, unique_url, variation_set_id in db.query(
+            CompanyTracker.id, CompanyTracker.company_name,
+            CompanyTracker.unique_url, CompanyTracker.variation_set_id
+        ).order_by(CompanyTracker.id):
+            entry = CompanyEntry(company_id, variation_set_id)
+            for identifier in {company_name, unique_url}:
+                if identifier:
+                    lookup.setdefault(identifier, []).append(entry)
+
+        with self._lock:
+            # An invalidate() during the build means the result may already be stale
+            if generation == self._generation:
+                self._lookup = lookup
+                self._built_at = time.monotonic()
+        return lookup
+
+    def resolve(self, db: Session, identifiers: Iterable[str]) -> List[CompanyEntry]:
+        """Companies matching any of the names or unique URLs, by id."""
+        lookup = self._get_lookup(db)
+        entries = {entry.id: entry for identifier in identifiers for entry in lookup.get(identifier, ())}
+        return [entries[company_id] for company_id in sorted(entries)]
+
+    def invalidate(self):
+        """Reload on the next lookup (companies changed)."""
+        with self._lock:
+            self._lookup = None
+            self._generation += 1
+
+
+company_index = CompanyIndex(ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS)
@@ -0,0 +1,716 @@
+"""
+Single-pass aggregation for the admin dashboard.
+
+Every dashboard widget (KPIs, score distribution, demographic breakdowns, age
+groups, time series, companies, categories and per-question averages) slices
+the same filtered responses. dashboard_aggregates() selects that set once as a
+CTE and computes each widget's GROUP BY over it in a single UNION ALL
+statement, so a dashboard load is one database round trip.
+
+The *_payload helpers turn grouped rows into the JSON each widget returns; the
+individual /admin/simple endpoints use the same helpers, so both paths answer
+identically.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Float, String, and_, case, cast, func, literal, null, union_all
+from sqlalchemy.orm import Session
+
+from app.analytics.filters import (
+    age_group_expression,
+    build_filtered_query,
+    period_expression,
+    period_label,
+    period_labels,
+    resolve_date_window,
+)
+from app.analytics.rollup import local_day
+
+# Dashboard category names -> API names (category-performance)
+CATEGORY_API_NAMES = {
+    "Income Stream": "income_stream",
+    "Savings Habit": "savings_habit",
+    "Emergency Savings": "emergency_savings",
+    "Debt Management": "debt_management",
+    "Retirement Planning": "retirement_planning",
+    "Protecting Your Family": "financial_protection",
+    "Financial Knowledge": "financial_knowledge",
+}
+
+INCOME_RANGE_ORDER = {
+    "Below AED 5,000": 1,
+    "AED 5,000 to AED 10,000": 2,
+    "AED 10,000 to AED 20,000": 3,
+    "AED 20,000 to AED 30,000": 4,
+    "AED 30,000 to AED 40,000": 5,
+    "AED 40,000 to AED 50,000": 6,
+    "AED 50,000 to AED 100,000": 7,
+    "Above AED 100,000": 8,
+}
+
+AGE_GROUP_ORDER = ["< 18", "18-25", "26-35", "36-45", "46-60", "60+"]
+
+STATUS_BANDS = (
+    ("Excellent", "excellent_count"),
+    ("Good", "good_count"),
+    ("Needs Improvement", "needs_improvement_count"),
+    ("At Risk", "at_risk_count"),
+)
+
+
+def dashboard_aggregates(
+    db: Session,
+    filters: Dict[str, List[str]],
+    date_range: str = "30d",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    unique_users_only: Optional[bool] = None,
+    group_by: str = "day",
+    question_ids: Sequence[str] = ()
+) -> Dict[str, List[tuple]]:
+    """
+    Compute the grouped rows behind every dashboard widget in one statement.
+
+    Widgets that honour the date window (KPIs, score distribution, the
+    gender / emirate / employment / income / children breakdowns and the time
+    series) read the windowed rows; the others read the full filtered set, as
+    their endpoints do.
+    In unique-user mode each set keeps the latest submission per email within
+    itself, matching apply_unique_users_filter on the corresponding query.
+
+    Args:
+        db: Database session
+        filters: Parsed demographic filters (see parse_filter_params)
+        date_range: Predefined date range
+        start_date: Custom start date (YYYY-MM-DD format)
+        end_date: Custom end date (YYYY-MM-DD format)
+        unique_users_only: Restrict to the latest submission per email
+        group_by: Time-series period (day, week, month, year)
+        question_ids: Question ids for the per-question averages
+
+    Returns:
+        Widget name -> list of (key1, key2, key3, count, total, peak) rows
+    """
+    from app.models import (
+        CompanyTracker, FinancialClinicAnswer, FinancialClinicCategoryScore,
+        FinancialClinicProfile, FinancialClinicResponse
+    )
+
+    created_at = FinancialClinicResponse.created_at
+    window_start, window_end = resolve_date_window(date_range, start_date, end_date)
+    window_conditions = []
+    if window_start is not None:
+        window_conditions.append(created_at >= window_start)
+    if window_end is not None:
+        window_conditions.append(created_at < window_end)
+    in_window = and_(*window_conditions) if window_conditions else None
+
+    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if unique_users_only:
+        latest_first = (created_at.desc(), FinancialClinicResponse.id.desc())
+        has_email = FinancialClinicProfile.email != ''
+        all_rank = func.row_number().over(
+            partition_by=FinancialClinicProfile.email, order_by=latest_first
+        )
+        selected_all = case((and_(has_email, all_rank == 1), 1), else_=0)
+        if in_window is not None:
+            window_rank = func.row_number().over(
+                partition_by=(FinancialClinicProfile.email, case((in_window, 1), else_=0)),
+                order_by=latest_first
+            )
+            selected_window = case((and_(in_window, has_email, window_rank == 1), 1), else_=0)
+        else:
+            selected_window = selected_all
+    else:
+        selected_all = literal(1)
+        selected_window = case((in_window, 1), else_=0) if in_window is not None else literal(1)
+
+    responses = build_filtered_query(
+        db,
+        [
+            FinancialClinicResponse.id.label("response_id"),
+            FinancialClinicResponse.total_score,
+            FinancialClinicResponse.status_band,
+            FinancialClinicResponse.company_tracker_id,
+            created_at,
+            FinancialClinicProfile.gender,
+            FinancialClinicProfile.emirate,
+            FinancialClinicProfile.employment_status,
+            FinancialClinicProfile.income_range,
+            case(
+                (FinancialClinicProfile.children >= 5, 5),
+                else_=FinancialClinicProfile.children
+            ).label("children_group"),
+            case(
+                (FinancialClinicProfile.nationality == "Emirati", "emirati"),
+                else_="non_emirati"
+            ).label("nationality_group"),
+            age_group_expression().label("age_group"),
+            period_expression(db, group_by).label("period"),
+            case((created_at >= today_start, "today"), else_="earlier").label("day_group"),
+            (case((in_window, 1), else_=0) if in_window is not None else literal(1)).label("in_window"),
+            selected_window.label("selected_window"),
+            selected_all.label("selected_all"),
+        ],
+        filters
+    ).cte("dashboard_responses")
+    c = responses.c
+
+    def branch(widget, keys, where, total=None, peak=None, joins=()):
+        keys = list(keys)
+        key_columns = [cast(key, String) for key in keys]
+        key_columns += [cast(null(), String)] * (3 - len(key_columns))
+        select = db.query(
+            literal(widget).label("widget"),
+            *[column.label(f"key{i}") for i, column in enumerate(key_columns, start=1)],
+            func.count().label("n"),
+            cast(func.sum(total) if total is not None else null(), Float).label("total"),
+            cast(func.max(peak) if peak is not None else null(), Float).label("peak"),
+        ).select_from(responses)
+        for target, onclause, outer in joins:
+            select = select.outerjoin(target, onclause) if outer else select.join(target, onclause)
+        select = select.filter(*where)
+        if keys:
+            select = select.group_by(*keys)
+        return select.statement
+
+    windowed = [c.selected_window == 1]
+    full = [c.selected_all == 1]
+    answer_group = case(
+        (FinancialClinicAnswer.nationality == "Emirati", "emirati"),
+        else_="non_emirati"
+    )
+    branches = [
+        branch("submissions", [], [c.in_window == 1]),
+        branch("status_bands", [c.status_band, c.day_group], windowed, total=c.total_score),
+        branch("gender", [c.gender], windowed),
+        branch("emirate", [c.emirate], windowed),
+        branch("employment", [c.employment_status], windowed),
+        branch("income", [c.income_range], windowed, total=c.total_score),
+        branch("children", [c.children_group], windowed, total=c.total_score),
+        branch("nationality", [c.nationality_group], full, total=c.total_score),
+        branch("age", [c.age_group], full + [c.age_group.isnot(None)], total=c.total_score),
+        branch("time_series", [c.period], windowed + [c.created_at.isnot(None)], total=c.total_score),
+        branch(
+            "companies",
+            [c.company_tracker_id, CompanyTracker.company_name, c.status_band],
+            full + [c.company_tracker_id.isnot(None)],
+            total=c.total_score,
+            joins=[(CompanyTracker, CompanyTracker.id == c.company_tracker_id, True)]
+        ),
+        branch(
+            "categories",
+            [FinancialClinicCategoryScore.category, FinancialClinicCategoryScore.status_level],
+            full + [FinancialClinicCategoryScore.category.in_(CATEGORY_API_NAMES.keys())],
+            total=FinancialClinicCategoryScore.score,
+            peak=FinancialClinicCategoryScore.max_possible,
+            joins=[(FinancialClinicCategoryScore, FinancialClinicCategoryScore.response_id == c.response_id, False)]
+        ),
+    ]
+    if question_ids:
+        branches.append(branch(
+            "questions",
+            [FinancialClinicAnswer.question_id, answer_group],
+            full + [FinancialClinicAnswer.question_id.in_(list(question_ids))],
+            total=FinancialClinicAnswer.value,
+            joins=[(FinancialClinicAnswer, FinancialClinicAnswer.response_id == c.response_id, False)]
+        ))
+
+    grouped = {}
+    for row in db.execute(union_all(*branches)):
+        grouped.setdefault(row.widget, []).append(
+            (row.key1, row.key2, row.key3, row.n, row.total, row.peak)
+        )
+    return grouped
+
+
+def dashboard_payloads(
+    db: Session,
+    filters: Dict[str, List[str]],
+    date_range: str = "30d",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    unique_users_only: Optional[bool] = None,
+    group_by: str = "day",
+    questions: Optional[Sequence[Any]] = None,
+    variation_set_name: Optional[str] = None,
+    snapshot=None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Every dashboard widget payload, computed from one dashboard_aggregates pass.
+
+    With an AnalyticsSnapshot the grouped rows come from its in-memory arrays
+    instead of the database.
+
+    Args:
+        db: Database session
+        filters: Parsed demographic filters (see parse_filter_params)
+        date_range: Predefined date range
+        start_date: Custom start date (YYYY-MM-DD format)
+        end_date: Custom end date (YYYY-MM-DD format)
+        unique_users_only: Restrict to the latest submission per email
+        group_by: Time-series period (day, week, month, year)
+        questions: Questions for the score analytics table (see score_analytics_questions)
+        variation_set_name: Company variation set the questions come from, if any
+        snapshot: Optional AnalyticsSnapshot to aggregate from (see get_snapshot)
+
+    Returns:
+        Widget name -> the JSON its individual endpoint returns
+    """
+    questions = list(questions or [])
+    question_ids = sorted({q.id for q in questions})
+    if snapshot is not None:
+        grouped = snapshot.aggregates(
+            filters, date_range, start_date, end_date, unique_users_only,
+            group_by=group_by, question_ids=question_ids
+        )
+    else:
+        grouped = dashboard_aggregates(
+            db, filters, date_range, start_date, end_date, unique_users_only,
+            group_by=group_by, question_ids=question_ids
+        )
+
+    def rows(widget):
+        return grouped.get(widget, [])
+
+    def average(total, count):
+        return total / count if count else None
+
+    # KPIs and score distribution share the status band rows
+    bands = {}
+    today_count = 0
+    score_sum = 0.0
+    for status_band, day_group, _, count, total, _ in rows("status_bands"):
+        bands[status_band] = bands.get(status_band, 0) + count
+        score_sum += total or 0
+        if day_group == "today":
+            today_count += count
+    metrics = SimpleNamespace(
+        total=sum(bands.values()),
+        score_sum=score_sum,
+        today=today_count,
+        **{label: bands.get(band, 0) for band, label in STATUS_BANDS}
+    )
+    all_responses_count = sum(count for *_, count, _, _ in rows("submissions"))
+
+    companies = {}
+    for company_id, company_name, status_band, count, total, _ in rows("companies"):
+        company = companies.setdefault(int(company_id), SimpleNamespace(
+            company_tracker_id=int(company_id), company_name=company_name, total=0, score_sum=0.0,
+            **{label: 0 for _, label in STATUS_BANDS}
+        ))
+        company.total += count
+        company.score_sum += total or 0
+        for band, label in STATUS_BANDS:
+            if status_band == band:
+                setattr(company, label, getattr(company, label) + count)
+    for company in companies.values():
+        company.avg_score = average(company.score_sum, company.total)
+
+    answer_stats = {
+        (question_id, group): (count, average(total, count))
+        for question_id, group, _, count, total, _ in rows("questions")
+    }
+
+    return {
+        "overview_metrics": overview_metrics_payload(metrics, all_responses_count),
+        "score_distribution": score_distribution_payload(list(bands.items())),
+        "category_performance": category_performance_payload([
+            (category, status_level, count, total, peak)
+            for category, status_level, _, count, total, peak in rows("categories")
+        ]),
+        "nationality_breakdown": nationality_breakdown_payload([
+            (group == "emirati", count, average(total, count))
+            for group, _, _, count, total, _ in rows("nationality")
+        ]),
+        "age_breakdown": age_breakdown_payload([
+            (age_group, count, average(total, count))
+            for age_group, _, _, count, total, _ in rows("age")
+        ]),
+        "time_series": time_series_payload(sorted(
+            (period, count, average(total, count))
+            for period, _, _, count, total, _ in rows("time_series")
+        ), group_by, resolve_date_window(date_range, start_date, end_date)),
+        "companies_analytics": companies_analytics_payload(list(companies.values())),
+        "score_analytics_table": score_analytics_payload(
+            questions, answer_stats, variation_set_name, bool(filters.get('companies'))
+        ),
+        "gender_breakdown": gender_breakdown_payload([
+            (gender, count) for gender, _, _, count, _, _ in rows("gender")
+        ]),
+        "emirate_breakdown": emirate_breakdown_payload([
+            (emirate, count) for emirate, _, _, count, _, _ in rows("emirate")
+        ]),
+        "employment_breakdown": employment_breakdown_payload([
+            (status, count) for status, _, _, count, _, _ in rows("employment")
+        ]),
+        "income_breakdown": income_breakdown_payload([
+            (income_range, count, average(total, count))
+            for income_range, _, _, count, total, _ in rows("income")
+        ]),
+        "children_breakdown": children_breakdown_payload([
+            (int(children), count, average(total, count))
+            for children, _, _, count, total, _ in rows("children") if children is not None
+        ]),
+    }
+
+
+def overview_metrics_payload(metrics, all_responses_count: int) -> Dict[str, Any]:
+    """overview-metrics JSON from aggregated KPIs (total, score_sum, band counts, today)."""
+    total_responses = metrics.total or 0
+
+    if total_responses == 0:
+        return {
+            "total_responses": 0,
+            "total_submissions": 0,
+            "unique_completions": 0,
+            "cases_completed_percentage": 0.0,
+            "unique_completion_percentage": 0.0,
+            "average_score": 0,
+            "excellent_count": 0,
+            "good_count": 0,
+            "needs_improvement_count": 0,
+            "at_risk_count": 0,
+            "today_submissions": 0
+        }
+
+    # Calculate metrics
+    average_score = float(metrics.score_sum or 0) / total_responses
+
+    # Calculate completion percentages
+    # For "cases completed" we use unique responses as the success metric
+    cases_completed_percentage = 100.0  # All retrieved responses are considered "completed" in Financial Clinic
+    unique_completion_percentage = (total_responses / all_responses_count * 100) if all_responses_count > 0 else 0.0
+
+    return {
+        "total_responses": total_responses,  # Keep for backward compatibility
+        "total_submissions": all_responses_count,  # Total including duplicates
+        "unique_completions": total_responses,  # Unique users who completed
+        "cases_completed_percentage": round(cases_completed_percentage, 2),
+        "unique_completion_percentage": round(unique_completion_percentage, 2),
+        "average_score": round(average_score, 2),
+        "excellent_count": metrics.excellent_count or 0,
+        "good_count": metrics.good_count or 0,
+        "needs_improvement_count": metrics.needs_improvement_count or 0,
+        "at_risk_count": metrics.at_risk_count or 0,
+        "today_submissions": metrics.today or 0  # New field for today's count
+    }
+
+
+def score_distribution_payload(results) -> Dict[str, Any]:
+    """score-distribution JSON from (status_band, count) rows."""
+    return {
+        "total": sum(count for _, count in results),
+        "distribution": [
+            {"status_band": status, "count": count}
+            for status, count in results
+        ]
+    }
+
+
+def category_performance_payload(results) -> Dict[str, Any]:
+    """category-performance JSON from (category, status_level, count, score_sum, max_possible) rows."""
+    category_counts = {}
+    category_totals = {}
+    category_max_possible = {}
+    category_status = {}
+    for db_category, status_level, count, score_sum, max_possible in results:
+        api_category = CATEGORY_API_NAMES[db_category]
+        category_counts[api_category] = category_counts.get(api_category, 0) + count
+        category_totals[api_category] = category_totals.get(api_category, 0) + (score_sum or 0)
+        category_max_possible[api_category] = max(category_max_possible.get(api_category, 0), max_possible or 0)
+        if status_level:
+            levels = category_status.setdefault(api_category, {"excellent": 0, "good": 0, "at_risk": 0})
+            levels[status_level] = levels.get(status_level, 0) + count
+
+    # Build response
+    categories = []
+    for api_category in CATEGORY_API_NAMES.values():
+        count = category_counts.get(api_category, 0)
+        total = category_totals.get(api_category, 0)
+        max_poss = category_max_possible.get(api_category) or 100
+
+        avg_score = round(total / count, 2) if count > 0 else 0
+        percentage = round((total / (max_poss * count)) * 100, 2) if count > 0 and max_poss > 0 else 0
+
+        categories.append({
+            "category": api_category,
+            "average_score": avg_score,
+            "max_possible": max_poss,
+            "percentage": percentage,
+            "response_count": count,
+            "status_distribution": category_status.get(api_category, {"excellent": 0, "good": 0, "at_risk": 0})
+        })
+
+    return {"categories": categories}
+
+
+def nationality_breakdown_payload(results) -> Dict[str, Any]:
+    """nationality-breakdown JSON from (is_emirati, count, avg_score) rows."""
+    groups = {bool(emirati): (count, avg_score) for emirati, count, avg_score in results}
+    emirati_count, emirati_avg = groups.get(True, (0, None))
+    non_emirati_count, non_emirati_avg = groups.get(False, (0, None))
+
+    return {
+        "emirati": {
+            "count": emirati_count,
+            "avg_score": round(float(emirati_avg), 2) if emirati_count else 0
+        },
+        "non_emirati": {
+            "count": non_emirati_count,
+            "avg_score": round(float(non_emirati_avg), 2) if non_emirati_count else 0
+        }
+    }
+
+
+def age_breakdown_payload(results) -> Dict[str, Any]:
+    """age-breakdown JSON from (age_group, count, avg_score) rows."""
+    age_groups = [
+        {
+            "age_group": label,
+            "count": count,
+            "avg_score": round(float(avg_score or 0), 2)
+        }
+        for label, count, avg_score in results
+    ]
+
+    # Sort by age group
+    age_groups.sort(key=lambda x: AGE_GROUP_ORDER.index(x["age_group"]) if x["age_group"] in AGE_GROUP_ORDER else 999)
+
+    return {
+        "age_groups": age_groups,
+        "total": sum(item["count"] for item in age_groups)
+    }
+
+
+def time_series_payload(
+    results,
+    group_by: Optional[str] = None,
+    window: Optional[Tuple[Optional[datetime], Optional[datetime]]] = None
+) -> Dict[str, Any]:
+    """
+    time-series JSON from (period, count, avg_score) rows in period order.
+
+    With group_by, periods without submissions are filled in with zero
+    counts: across the whole [start, end) window when one is given (see
+    resolve_date_window; an open start begins at the first period with
+    submissions and an open end runs to today), otherwise between the first
+    and last period with submissions. Window edges are naive UTC like
+    created_at and are labelled in ANALYTICS_TIMEZONE, as the periods are.
+    """
+    points = {
+        period: (count, avg_score)
+        for period, count, avg_score in results
+    }
+    periods = list(points)
+    bounds = periods[:1] + periods[-1:]
+    if group_by and window is not None:
+        window_start, window_end = window
+        if window_start is not None:
+            bounds.append(period_label(local_day(window_start), group_by))
+        if window_end is not None:
+            bounds.append(period_label(local_day(window_end - timedelta(microseconds=1)), group_by))
+        elif bounds:
+            bounds.append(period_label(local_day(datetime.utcnow()), group_by))
+    if group_by and bounds:
+        periods = period_labels(min(bounds), max(bounds), group_by)
+
+    time_series = []
+    for period in periods:
+        count, avg_score = points.get(period, (0, None))
+        time_series.append({
+            "period": period,
+            "count": count,
+            "avg_score": round(float(avg_score or 0), 2)
+        })
+    return {"time_series": time_series}
+
+
+def companies_analytics_payload(results) -> Dict[str, Any]:
+    """companies-analytics JSON from per-company rows (totals, avg_score, band counts)."""
+    return {
+        "companies": [
+            {
+                "company_name": row.company_name or f"Company {row.company_tracker_id}",
+                "total_responses": row.total,
+                "average_score": round(float(row.avg_score or 0), 2),
+                "excellent_count": row.excellent_count or 0,
+                "good_count": row.good_count or 0,
+                "needs_improvement_count": row.needs_improvement_count or 0,
+                "at_risk_count": row.at_risk_count or 0
+            }
+            for row in results
+        ]
+    }
+
+
+def score_analytics_questions(db: Session, filters: Dict[str, List[str]]):
+    """
+    Questions shown in the score analytics table.
+
+    With a single company filter whose company has a variation set, these are
+    the set's active variations in q1..q15 order; otherwise the default
+    Financial Clinic questions.
+
+    Returns:
+        Tuple of (questions, variation set name or None); each question has
+        id, number, text_en and category.value
+    """
+    from app.analytics.companies import company_index
+    from app.models import QuestionVariation, VariationSet
+    from app.surveys.financial_clinic_questions import FINANCIAL_CLINIC_QUESTIONS
+
+    if not (filters.get('companies') and len(filters['companies']) == 1):
+        return FINANCIAL_CLINIC_QUESTIONS, None
+
+    # The company's variation set id comes from the in-process company index
+    companies = company_index.resolve(db, filters['companies'])
+    if not (companies and companies[0].variation_set_id):
+        return FINANCIAL_CLINIC_QUESTIONS, None
+
+    # The set and its active variations (q1..q15) in one joined query
+    variation_id_columns = [getattr(VariationSet, f"q{i}_variation_id") for i in range(1, 16)]
+    rows = db.query(VariationSet, QuestionVariation).outerjoin(
+        QuestionVariation,
+        and_(
+            QuestionVariation.id.in_(variation_id_columns),
+            QuestionVariation.is_active == True
+        )
+    ).filter(
+        VariationSet.id == companies[0].variation_set_id
+    ).all()
+    if not rows:
+        return FINANCIAL_CLINIC_QUESTIONS, None
+
+    variation_set = rows[0][0]
+    variation_ids = [getattr(variation_set, f"q{i}_variation_id") for i in range(1, 16)]
+    variations = [variation for _, variation in rows if variation is not None]
+    if not variations:
+        return FINANCIAL_CLINIC_QUESTIONS, variation_set.name
+
+    # Keep the original order from variation_ids (q1, q2, ..., q15)
+    variation_lookup = {v.id: v for v in variations}
+    questions = []
+    for number, variation_id in enumerate(variation_ids, start=1):
+        variation = variation_lookup.get(variation_id)
+        if variation:
+            questions.append(SimpleNamespace(
+                id=variation.base_question_id,
+                number=number,
+                text_en=variation.text_en or variation.text,  # Use bilingual field or fallback
+                category=SimpleNamespace(value=variation.factor or "General")  # Use factor as category
+            ))
+    return questions, variation_set.name
+
+
+def score_analytics_payload(questions, answer_stats, variation_set_name: Optional[str], filtered: bool) -> Dict[str, Any]:
+    """
+    score-analytics-table JSON.
+
+    Args:
+        questions: Questions to report (see score_analytics_questions)
+        answer_stats: (question_id, 'emirati' | 'non_emirati') -> (count, avg_value)
+        variation_set_name: Company variation set the questions come from, if any
+        filtered: Whether a company filter was applied
+    """
+    question_analytics = []
+    for question in questions:
+        emirati_count, emirati_avg = answer_stats.get((question.id, "emirati"), (0, None))
+        non_emirati_count, non_emirati_avg = answer_stats.get((question.id, "non_emirati"), (0, None))
+
+        question_analytics.append({
+            "question_number": question.number,
+            "question_text": question.text_en,
+            "category": question.category.value,  # String value like "Income Stream"
+            "emirati_avg": round(float(emirati_avg), 2) if emirati_avg is not None else None,
+            "emirati_count": emirati_count,
+            "non_emirati_avg": round(float(non_emirati_avg), 2) if non_emirati_avg is not None else None,
+            "non_emirati_count": non_emirati_count
+        })
+
+    # Return with metadata about which question set is being used
+    return {
+        "questions": question_analytics,
+        "total_questions": len(question_analytics),
+        "question_set_type": "company_variation" if variation_set_name else "default",
+        "variation_set_name": variation_set_name,
+        "filtered": filtered
+    }
+
+
+def gender_breakdown_payload(results) -> Dict[str, Any]:
+    """gender-breakdown JSON from (gender, count) rows."""
+    breakdown = []
+    total_count = 0
+
+    for gender, count in results:
+        if gender:
+            breakdown.append({
+                "gender": gender,
+                "count": count
+            })
+            total_count += count
+
+    # Calculate percentages
+    for item in breakdown:
+        item["percentage"] = round((item["count"] / total_count * 100), 1) if total_count > 0 else 0
+
+    # Sort by count descending
+    breakdown.sort(key=lambda x: x["count"], reverse=True)
+
+    return {
+        "total": total_count,
+        "breakdown": breakdown
+    }
+
+
+def emirate_breakdown_payload(results) -> Dict[str, Any]:
+    """emirate-breakdown JSON from (emirate, count) rows."""
+    breakdown = [
+        {"emirate": emirate, "count": count}
+        for emirate, count in results if emirate
+    ]
+    breakdown.sort(key=lambda x: x['count'], reverse=True)
+    return {"breakdown": breakdown}
+
+
+def employment_breakdown_payload(results) -> Dict[str, Any]:
+    """employment-breakdown JSON from (employment_status, count) rows."""
+    breakdown = [
+        {"status": status, "count": count}
+        for status, count in results if status
+    ]
+    # Sort by count desc
+    breakdown.sort(key=lambda x: x['count'], reverse=True)
+    return {"breakdown": breakdown}
+
+
+def income_breakdown_payload(results) -> Dict[str, Any]:
+    """income-breakdown JSON from (income_range, count, avg_score) rows."""
+    breakdown = [
+        {
+            "range": income_range,
+            "count": count,
+            "average_score": round(float(avg_score), 2) if avg_score else 0
+        }
+        for income_range, count, avg_score in results if income_range
+    ]
+    breakdown.sort(key=lambda x: INCOME_RANGE_ORDER.get(x["range"], 99))
+    return {"breakdown": breakdown}
+
+
+def children_breakdown_payload(results) -> Dict[str, Any]:
+    """children-breakdown JSON from (children, count, avg_score) rows; 5 stands for 5+."""
+    breakdown = []
+    for child_count, count, avg_score in sorted(
+        (row for row in results if row[0] is not None), key=lambda row: row[0]
+    ):
+        breakdown.append({
+            "count_label": "5+" if child_count >= 5 else str(child_count),
+            "count": count,
+            "average_score": round(float(avg_score), 2) if avg_score else 0
+        })
+    return {"breakdown": breakdown}
@@ -0,0 +1,114 @@
+"""
+Precomputed options for the admin dashboard filter panel.
+
+The demographic options are the fixed choices of the Financial Clinic form,
+so only the company list is read from the database. The payload is built once
+and tagged with a content hash that the endpoint returns as its ETag; the
+browser revalidates with If-None-Match and gets a 304 while nothing changed.
+
+Company changes call invalidate(), which rebuilds this process's copy on the
+next request; other workers pick the change up within
+ANALYTICS_CACHE_TTL_SECONDS.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+# Options exactly as users can select them in /financial-clinic/page.tsx
+FORM_FILTER_OPTIONS = {
+    "age_groups": ["< 18", "18-25", "26-35", "36-45", "46-60", "60+"],
+    "genders": ["Male", "Female"],
+    "nationalities": ["Emirati", "Non-Emirati"],
+    "emirates": [
+        "Dubai",
+        "Abu Dhabi",
+        "Sharjah",
+        "Ajman",
+        "Al Ain",
+        "Ras Al Khaimah / Fujairah / UAQ / Outside UAE"
+    ],
+    "employment_statuses": ["Employed", "Self-Employed", "Unemployed"],
+    "income_ranges": [
+        "Below 5,000",
+        "5,000 to 10,000",
+        "10,000 to 20,000",
+        "20,000 to 30,000",
+        "30,000 to 40,000",
+        "40,000 to 50,000",
+        "50,000 to 100,000",
+        "Above 100,000"
+    ],
+    "children_options": ["0", "1", "2", "3", "4", "5+"],
+}
+
+
+def build_filter_options(db: Session) -> Dict[str, Any]:
+    """Form options plus the active companies, ordered by name."""
+    from app.models import CompanyTracker
+
+    companies = db.query(
+        CompanyTracker.id, CompanyTracker.company_name, CompanyTracker.unique_url
+    ).filter(
+        CompanyTracker.is_active == True
+    ).order_by(CompanyTracker.company_name).all()
+
+    return {
+        **FORM_FILTER_OPTIONS,
+        "companies": [
+            {"id": company_id, "name": name, "unique_url": unique_url}
+            for company_id, name, unique_url in companies
+        ],
+    }
+
+
+def options_etag(payload: Dict[str, Any]) -> str:
+    """Quoted ETag derived from the payload content."""
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+class FilterOptionsCache:
+    """The current filter options payload and its ETag."""
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._value: Optional[Tuple[Dict[str, Any], str]] = None
+        self._built_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> Tuple[Dict[str, Any], str]:
+        """
+        Current options, rebuilt when invalidated or older than the TTL.
+
+        Returns:
+            Tuple of (payload, etag)
+        """
+        with self._lock:
+            if self._value is not None and time.monotonic() - self._built_at < self.ttl_seconds:
+                return self._value
+            generation = self._generation
+
+        payload = build_filter_options(db)
+        value = (payload, options_etag(payload))
+        with self._lock:
+            # An invalidate() during the build means the result may already be stale
+            if generation == self._generation:
+                self._value = value
+                self._built_at = time.monotonic()
+        return value
+
+    def invalidate(self):
+        """Rebuild on the next request (companies changed)."""
+        with self._lock:
+            self._value = None
+            self._generation += 1
+
+
+filter_options_cache = FilterOptionsCache(ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS)
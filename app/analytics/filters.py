@@ -0,0 +1,472 @@
+"""
+Shared dashboard filter helpers for Financial Clinic analytics.
+
+Used by the admin dashboard routes and the analytics rollup so both apply
+exactly the same demographic, company and date-window semantics.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_
+from typing import List, Dict, Optional, Tuple
+from datetime import date, datetime, timedelta
+
+def parse_date_of_birth(value: Optional[str]) -> Optional[date]:
+    """
+    Parse a FinancialClinicProfile.date_of_birth string.
+    
+    Profiles store DD/MM/YYYY, older rows may hold ISO YYYY-MM-DD.
+    
+    Returns:
+        The birth date, or None if the value cannot be parsed
+    """
+    if not value or not value.strip():
+        return None
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+# Dashboard age groups -> inclusive (min_age, max_age); None means unbounded
+AGE_GROUP_BOUNDS = {
+    "< 18": (None, 17),
+    "18-25": (18, 25),
+    "26-35": (26, 35),
+    "36-45": (36, 45),
+    "46-60": (46, 60),
+    "60+": (61, None),
+}
+
+def age_on(birth_date: Optional[date], on: date) -> Optional[int]:
+    """Age in whole years on the given day."""
+    if birth_date is None:
+        return None
+    return on.year - birth_date.year - ((on.month, on.day) < (birth_date.month, birth_date.day))
+
+def age_group_label(birth_date: Optional[date], on: date) -> str:
+    """Dashboard age group for someone born on birth_date, as of the given day."""
+    age = age_on(birth_date, on)
+    if age is None:
+        return "Unknown"
+    
+    for label, (min_age, max_age) in AGE_GROUP_BOUNDS.items():
+        if (min_age is None or age >= min_age) and (max_age is None or age <= max_age):
+            return label
+    return "Unknown"
+
+def years_before(day: date, years: int) -> date:
+    """The same calendar day `years` years earlier (29 Feb maps to 28 Feb)."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+def birth_date_condition(age_group: str, today: Optional[date] = None):
+    """
+    SQL condition on FinancialClinicProfile.birth_date matching an age group.
+    
+    Someone is at least N years old when born on or before the same day N years
+    ago, so every age group is a birth-date range the index can serve.
+    
+    Returns:
+        SQLAlchemy condition, or None for an unknown age group label
+    """
+    from app.models import FinancialClinicProfile
+    from sqlalchemy import and_
+    
+    if age_group not in AGE_GROUP_BOUNDS:
+        return None
+    
+    today = today or date.today()
+    min_age, max_age = AGE_GROUP_BOUNDS[age_group]
+    conditions = []
+    if min_age is not None:
+        conditions.append(FinancialClinicProfile.birth_date <= years_before(today, min_age))
+    if max_age is not None:
+        conditions.append(FinancialClinicProfile.birth_date > years_before(today, max_age + 1))
+    return and_(*conditions)
+
+def age_group_expression(today: Optional[date] = None):
+    """
+    SQL CASE labelling FinancialClinicProfile.birth_date with its age group.
+    
+    Rows without a birth date get NULL.
+    """
+    from app.models import FinancialClinicProfile
+    from sqlalchemy import case
+    
+    today = today or date.today()
+    whens = [(FinancialClinicProfile.birth_date.is_(None), None)]
+    for label, (min_age, max_age) in AGE_GROUP_BOUNDS.items():
+        if max_age is not None:
+            whens.append((FinancialClinicProfile.birth_date > years_before(today, max_age + 1), label))
+    return case(*whens, else_="60+")
+
+def children_bucket(children: Optional[int]) -> Optional[str]:
+    """Map a children count onto the dashboard filter options ('0'..'4', '5+')."""
+    if children is None:
+        return None
+    return "5+" if children >= 5 else str(children)
+
+def apply_unique_users_filter(query):
+    """
+    Restrict a FinancialClinicResponse ⋈ FinancialClinicProfile query to the
+    latest submission per profile email.
+    
+    "Latest" is ranked with ROW_NUMBER() over the query's own filters, so the
+    database deduplicates in one pass instead of loading every response.
+    Apply it before adding GROUP BY / ORDER BY clauses.
+    
+    Args:
+        query: Filtered query joining FinancialClinicResponse and FinancialClinicProfile
+        
+    Returns:
+        Query limited to one response per email
+    """
+    from app.models import FinancialClinicResponse, FinancialClinicProfile
+    from sqlalchemy import select
+    
+    ranked = query.with_entities(
+        FinancialClinicResponse.id.label("response_id"),
+        func.row_number().over(
+            partition_by=FinancialClinicProfile.email,
+            order_by=(FinancialClinicResponse.created_at.desc(), FinancialClinicResponse.id.desc())
+        ).label("email_rank")
+    ).filter(
+        FinancialClinicProfile.email != ''
+    ).order_by(None).subquery()
+    
+    latest_ids = select(ranked.c.response_id).where(ranked.c.email_rank == 1)
+    return query.filter(FinancialClinicResponse.id.in_(latest_ids))
+
+def apply_demographic_filters(query, filters: Dict[str, List[str]], db: Session):
+    """
+    Apply demographic filters to a SQLAlchemy query.
+    
+    Args:
+        query: SQLAlchemy query object (already joined with FinancialClinicProfile)
+        filters: Dictionary of filter parameters
+        db: Database session
+        
+    Returns:
+        Filtered query
+    """
+    from app.models import FinancialClinicProfile
+    
+    # Age groups filter - ages relative to today, matched as birth_date ranges
+    if filters.get('age_groups'):
+        age_conditions = []
+        for age_group in filters['age_groups']:
+            condition = birth_date_condition(age_group)
+            if condition is not None:
+                age_conditions.append(condition)
+        if age_conditions:
+            query = query.filter(or_(*age_conditions))
+    
+    # Gender filter
+    if filters.get('genders'):
+        query = query.filter(FinancialClinicProfile.gender.in_(filters['genders']))
+    
+    # Nationality filter
+    if filters.get('nationalities'):
+        query = query.filter(FinancialClinicProfile.nationality.in_(filters['nationalities']))
+    
+    # Emirate filter
+    if filters.get('emirates'):
+        query = query.filter(FinancialClinicProfile.emirate.in_(filters['emirates']))
+    
+    # Employment status filter
+    if filters.get('employment_statuses'):
+        query = query.filter(FinancialClinicProfile.employment_status.in_(filters['employment_statuses']))
+    
+    # Income range filter
+    if filters.get('income_ranges'):
+        query = query.filter(FinancialClinicProfile.income_range.in_(filters['income_ranges']))
+    
+    # Children filter
+    if filters.get('children'):
+        children_conditions = []
+        for child_option in filters['children']:
+            if child_option == '0':
+                children_conditions.append(FinancialClinicProfile.children == 0)
+            elif child_option == '1':
+                children_conditions.append(FinancialClinicProfile.children == 1)
+            elif child_option == '2':
+                children_conditions.append(FinancialClinicProfile.children == 2)
+            elif child_option == '3':
+                children_conditions.append(FinancialClinicProfile.children == 3)
+            elif child_option == '4':
+                children_conditions.append(FinancialClinicProfile.children == 4)
+            elif child_option == '5+':
+                children_conditions.append(FinancialClinicProfile.children >= 5)
+        if children_conditions:
+            query = query.filter(or_(*children_conditions))
+    
+    # Company filter
+    if filters.get('companies'):
+        company_ids = resolve_company_ids(filters, db)
+        
+        if company_ids:
+            from app.models import FinancialClinicResponse
+            query = query.filter(FinancialClinicResponse.company_tracker_id.in_(company_ids))
+        else:
+            # If companies were requested but none found, return empty result
+            from sqlalchemy import literal
+            query = query.filter(literal(False))
+    
+    return query
+
+def resolve_company_ids(filters: Dict[str, List[str]], db: Session) -> List[int]:
+    """
+    Resolve the 'companies' filter (company names or unique URLs) to tracker IDs.
+    
+    Resolved from the in-process company index, without a database round trip
+    while the index is current.
+    
+    Args:
+        filters: Dictionary of filter parameters
+        db: Database session
+        
+    Returns:
+        List of CompanyTracker IDs (empty if none matched)
+    """
+    from app.analytics.companies import company_index
+    
+    return [entry.id for entry in company_index.resolve(db, filters['companies'])]
+
+def resolve_date_window(
+    date_range: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Resolve dashboard date parameters to a half-open [start, end) window.
+    
+    Args:
+        date_range: Predefined date range ('7d', '30d', '90d', '1y', 'ytd', 'all')
+        start_date: Custom start date (YYYY-MM-DD format)
+        end_date: Custom end date (YYYY-MM-DD format)
+        
+    Returns:
+        Tuple of (start, end) naive datetimes; None means unbounded on that side
+    """
+    # If custom date range is provided, use it
+    if start_date and end_date:
+        try:
+            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+            end_dt = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)  # Include end date
+            return start_dt, end_dt
+        except ValueError:
+            # Invalid date format, skip filtering
+            return None, None
+    
+    # Predefined date ranges
+    now = datetime.now()
+    
+    if date_range == "7d":
+        return now - timedelta(days=7), None
+    elif date_range == "30d":
+        return now - timedelta(days=30), None
+    elif date_range == "90d":
+        return now - timedelta(days=90), None
+    elif date_range == "1y":
+        return now - timedelta(days=365), None
+    elif date_range == "ytd":
+        # Year to date - from January 1st of current year
+        return datetime(now.year, 1, 1), None
+    
+    # "all" (or unknown) - no date filtering
+    return None, None
+
+def apply_date_range_filter(query, date_range: str, start_date: Optional[str] = None, end_date: Optional[str] = None):
+    """
+    Apply date range filtering to a SQLAlchemy query.
+    
+    Args:
+        query: SQLAlchemy query object
+        date_range: Predefined date range ('7d', '30d', '90d', '1y', 'ytd', 'all')
+        start_date: Custom start date (YYYY-MM-DD format)
+        end_date: Custom end date (YYYY-MM-DD format)
+        
+    Returns:
+        Filtered query
+    """
+    from app.models import FinancialClinicResponse
+    
+    window_start, window_end = resolve_date_window(date_range, start_date, end_date)
+    if window_start is not None:
+        query = query.filter(FinancialClinicResponse.created_at >= window_start)
+    if window_end is not None:
+        query = query.filter(FinancialClinicResponse.created_at < window_end)
+    
+    return query
+
+def build_filtered_query(
+    db: Session,
+    entities,
+    filters: Dict[str, List[str]],
+    date_range: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    unique_users_only: Optional[bool] = None
+):
+    """
+    Build a query over the FinancialClinicResponse ⋈ FinancialClinicProfile join
+    with the dashboard filters applied.
+
+    The selected entities are typically aggregate expressions, so callers can
+    add GROUP BY clauses and let the database do the counting instead of
+    loading every response row.
+
+    Args:
+        db: Database session
+        entities: Columns / expressions to select
+        filters: Parsed demographic filters (see parse_filter_params)
+        date_range: Predefined date range; None skips date filtering entirely
+        start_date: Custom start date (YYYY-MM-DD format)
+        end_date: Custom end date (YYYY-MM-DD format)
+        unique_users_only: Restrict to the latest submission per email
+
+    Returns:
+        Filtered query
+    """
+    from app.models import FinancialClinicResponse, FinancialClinicProfile
+
+    query = db.query(*entities).select_from(FinancialClinicResponse).join(
+        FinancialClinicProfile,
+        FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+    )
+
+    if date_range is not None:
+        query = apply_date_range_filter(query, date_range, start_date, end_date)
+
+    query = apply_demographic_filters(query, filters, db)
+
+    if unique_users_only:
+        query = apply_unique_users_filter(query)
+
+    return query
+
+def count_where(condition):
+    """Conditional-aggregate column counting the rows that match condition."""
+    from sqlalchemy import case
+
+    return func.count(case((condition, 1)))
+
+def status_band_counts():
+    """Conditional-aggregate columns counting responses per status band."""
+    from app.models import FinancialClinicResponse
+    from sqlalchemy import case
+
+    return [
+        func.sum(case((FinancialClinicResponse.status_band == band, 1), else_=0)).label(label)
+        for band, label in (
+            ("Excellent", "excellent_count"),
+            ("Good", "good_count"),
+            ("Needs Improvement", "needs_improvement_count"),
+            ("At Risk", "at_risk_count"),
+        )
+    ]
+
+def period_expression(db: Session, group_by: str):
+    """
+    SQL expression bucketing FinancialClinicResponse.created_at into a period label.
+
+    Buckets are calendar periods in ANALYTICS_TIMEZONE (naive timestamps are
+    UTC, as in the rollup) and labels match period_label(): day = YYYY-MM-DD,
+    week = ISO week YYYY-Www, month = YYYY-MM, otherwise YYYY.
+    """
+    from app.models import FinancialClinicResponse
+    from app.analytics.rollup import analytics_timezone
+    from sqlalchemy import cast, Integer, String
+
+    created_at = FinancialClinicResponse.created_at
+    tz = analytics_timezone()
+
+    if db.get_bind().dialect.name == "postgresql":
+        local = func.timezone(str(tz), created_at)
+        pg_formats = {"day": "YYYY-MM-DD", "week": 'IYYY-"W"IW', "month": "YYYY-MM"}
+        return func.to_char(local, pg_formats.get(group_by, "YYYY"))
+
+    # SQLite has no timezone database: shift by the zone's current UTC offset
+    offset = datetime.now(tz).utcoffset() or timedelta(0)
+    local = func.datetime(created_at, f"{int(offset.total_seconds() // 60):+d} minutes")
+    if group_by == "week":
+        # ISO weeks belong to the year of their Thursday
+        monday_based_weekday = (cast(func.strftime('%w', local), Integer) + 6) % 7
+        thursday = func.date(local, cast(3 - monday_based_weekday, String) + ' days')
+        week_number = (cast(func.strftime('%j', thursday), Integer) - 1) / 7 + 1
+        return func.strftime('%Y', thursday, type_=String) + '-W' + func.printf('%02d', week_number)
+    sqlite_formats = {"day": "%Y-%m-%d", "month": "%Y-%m"}
+    return func.strftime(sqlite_formats.get(group_by, "%Y"), local)
+
+def period_label(day: date, group_by: str) -> str:
+    """Label of the period containing a local calendar day (see period_expression)."""
+    if group_by == "day":
+        return day.isoformat()
+    if group_by == "week":
+        iso_year, iso_week, _ = day.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    if group_by == "month":
+        return day.strftime("%Y-%m")
+    return day.strftime("%Y")
+
+def period_start(label: str, group_by: str) -> date:
+    """First day of a labelled period."""
+    if group_by == "day":
+        return date.fromisoformat(label)
+    if group_by == "week":
+        iso_year, iso_week = label.split("-W")
+        return date.fromisocalendar(int(iso_year), int(iso_week), 1)
+    if group_by == "month":
+        return date(int(label[:4]), int(label[5:7]), 1)
+    return date(int(label), 1, 1)
+
+def period_labels(first: str, last: str, group_by: str) -> List[str]:
+    """Every period label from first to last inclusive, for gap filling."""
+    labels = []
+    day = period_start(first, group_by)
+    end = period_start(last, group_by)
+    while day <= end:
+        labels.append(period_label(day, group_by))
+        if group_by == "day":
+            day += timedelta(days=1)
+        elif group_by == "week":
+            day += timedelta(weeks=1)
+        elif group_by == "month":
+            day = date(day.year + day.month // 12, day.month % 12 + 1, 1)
+        else:
+            day = date(day.year + 1, 1, 1)
+    return labels
+
+def parse_filter_params(
+    age_groups: Optional[str] = None,
+    genders: Optional[str] = None,
+    nationalities: Optional[str] = None,
+    emirates: Optional[str] = None,
+    employment_statuses: Optional[str] = None,
+    income_ranges: Optional[str] = None,
+    children: Optional[str] = None,
+    companies: Optional[str] = None
+) -> Dict[str, List[str]]:
+    """Parse comma-separated filter parameters into lists."""
+    filters = {}
+    
+    if age_groups:
+        filters['age_groups'] = [ag.strip() for ag in age_groups.split(',')]
+    if genders:
+        filters['genders'] = [g.strip() for g in genders.split(',')]
+    if nationalities:
+        filters['nationalities'] = [n.strip() for n in nationalities.split(',')]
+    if emirates:
+        filters['emirates'] = [e.strip() for e in emirates.split(',')]
+    if employment_statuses:
+        filters['employment_statuses'] = [es.strip() for es in employment_statuses.split(',')]
+    if income_ranges:
+        filters['income_ranges'] = [ir.strip() for ir in income_ranges.split(',')]
+    if children:
+        filters['children'] = [c.strip() for c in children.split(',')]
+    if companies:
+        filters['companies'] = [c.strip() for c in companies.split(',')]
+    
+    return filters
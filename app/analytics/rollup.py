@@ -0,0 +1,447 @@
+"""
+Daily rollup of Financial Clinic submissions.
+
+FinancialClinicDailyRollup holds one row per (day, company, demographic slice,
+status band) with response counts and score sums. Submissions update it inside
+their own transaction via record_submission(), and rebuild_rollup() recomputes
+it from the raw responses.
+
+summarize() answers dashboard queries from the rollup for every whole calendar
+day in the requested window and reads the partial days at either edge from the
+raw responses, so results match a scan over FinancialClinicResponse exactly.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+
+from sqlalchemy import func, literal
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.analytics.filters import (
+    apply_demographic_filters,
+    resolve_company_ids,
+    resolve_date_window,
+    parse_date_of_birth,
+    age_group_label,
+    children_bucket,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rollup key columns, in key-tuple order
+ROLLUP_DIMENSIONS = (
+    "day",
+    "company_tracker_id",
+    "gender",
+    "nationality",
+    "emirate",
+    "employment_status",
+    "income_range",
+    "children_bucket",
+    "age_bucket",
+    "status_band",
+)
+
+# Category name (as stored in category_scores) -> rollup sum column
+CATEGORY_SUM_COLUMNS = {
+    "Income Stream": "income_stream_sum",
+    "Savings Habit": "savings_habit_sum",
+    "Emergency Savings": "emergency_savings_sum",
+    "Debt Management": "debt_management_sum",
+    "Retirement Planning": "retirement_planning_sum",
+    "Protecting Your Family": "protecting_family_sum",
+}
+
+MEASURE_COLUMNS = ("response_count", "score_sum", "score_sq_sum") + tuple(CATEGORY_SUM_COLUMNS.values())
+
+# Dialects whose INSERT ... ON CONFLICT DO UPDATE adds to the rollup row atomically
+UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+# FinancialClinicProfile fields that feed the rollup key
+PROFILE_DIMENSION_FIELDS = (
+    "gender",
+    "nationality",
+    "emirate",
+    "employment_status",
+    "income_range",
+    "children",
+    "date_of_birth",
+)
+
+# Profile -> rollup filter columns that match one-to-one
+_DIRECT_FILTERS = {
+    "genders": "gender",
+    "nationalities": "nationality",
+    "emirates": "emirate",
+    "employment_statuses": "employment_status",
+    "income_ranges": "income_range",
+}
+
+
+def analytics_timezone():
+    """Timezone whose calendar days the rollup is bucketed by."""
+    from zoneinfo import ZoneInfo
+
+    try:
+        return ZoneInfo(settings.ANALYTICS_TIMEZONE)
+    except Exception:
+        logger.warning(f"Unknown ANALYTICS_TIMEZONE {settings.ANALYTICS_TIMEZONE!r}, using UTC")
+        return timezone.utc
+
+
+def local_day(timestamp: datetime) -> date:
+    """Calendar day of a timestamp in the analytics timezone (naive values are UTC)."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(analytics_timezone()).date()
+
+
+def day_start_utc(day: date) -> datetime:
+    """Naive UTC datetime of local midnight at the start of the given day."""
+    local_midnight = datetime.combine(day, time.min, tzinfo=analytics_timezone())
+    return local_midnight.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def is_rollup_eligible(filters: Dict[str, List[str]], unique_users_only: Optional[bool] = None) -> bool:
+    """
+    Whether a dashboard query can be answered from the rollup.
+
+    The rollup counts every submission, so "latest per user" queries still need
+    the raw responses, and age filters are evaluated against today's age rather
+    than the age at submission that the rollup stores.
+    """
+    return bool(settings.ANALYTICS_ROLLUP_ENABLED) and not unique_users_only and not filters.get('age_groups')
+
+
+def _category_score(category_scores: Any, category: str) -> float:
+    """Score for one category from a category_scores JSON value."""
+    if not isinstance(category_scores, dict):
+        return 0.0
+    value = category_scores.get(category)
+    if isinstance(value, dict):
+        value = value.get('score', 0)
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def rollup_key(response, profile) -> Tuple:
+    """
+    Rollup key for a response and its profile.
+
+    Works with ORM instances as well as result rows exposing the same attribute names.
+    """
+    created_at = response.created_at or response.completed_at or datetime.utcnow()
+    day = local_day(created_at)
+    return (
+        day,
+        response.company_tracker_id,
+        profile.gender,
+        profile.nationality,
+        profile.emirate,
+        profile.employment_status,
+        profile.income_range,
+        children_bucket(profile.children),
+        age_group_label(parse_date_of_birth(profile.date_of_birth), day),
+        response.status_band,
+    )
+
+
+def rollup_measures(response) -> Dict[str, float]:
+    """Measures contributed by a single response."""
+    score = float(response.total_score or 0)
+    measures = {
+        "response_count": 1,
+        "score_sum": score,
+        "score_sq_sum": score * score,
+    }
+    for category, column in CATEGORY_SUM_COLUMNS.items():
+        measures[column] = _category_score(response.category_scores, category)
+    return measures
+
+
+def _upsert(db: Session, key: Tuple, measures: Dict[str, float]) -> bool:
+    """
+    Add measures to the rollup row for key, creating it if needed, in one statement.
+
+    Concurrent submits (or several in one transaction) with the same key land
+    on the same row through the uq_fc_rollup_key index instead of inserting
+    duplicates. Returns False on dialects without ON CONFLICT support.
+    """
+    from app.models import FinancialClinicDailyRollup
+
+    dialect_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is None:
+        return False
+
+    table = FinancialClinicDailyRollup.__table__
+    key_index = next(index for index in table.indexes if index.name == 'uq_fc_rollup_key')
+    insert = dialect_insert(table).values(**dict(zip(ROLLUP_DIMENSIONS, key)), **measures)
+    db.execute(insert.on_conflict_do_update(
+        index_elements=list(key_index.expressions),
+        set_={
+            **{column: table.c[column] + insert.excluded[column] for column in measures},
+            "updated_at": func.now(),
+        }
+    ))
+    return True
+
+
+def _apply(db: Session, key: Tuple, measures: Dict[str, float], sign: int) -> None:
+    """Add (sign=1) or subtract (sign=-1) measures on the rollup row for key."""
+    from app.models import FinancialClinicDailyRollup
+
+    if sign > 0 and _upsert(db, key, measures):
+        return
+
+    conditions = []
+    for dimension, value in zip(ROLLUP_DIMENSIONS, key):
+        column = getattr(FinancialClinicDailyRollup, dimension)
+        conditions.append(column.is_(None) if value is None else column == value)
+
+    updated = db.query(FinancialClinicDailyRollup).filter(*conditions).update(
+        {
+            getattr(FinancialClinicDailyRollup, column): getattr(FinancialClinicDailyRollup, column) + sign * value
+            for column, value in measures.items()
+        },
+        synchronize_session=False
+    )
+
+    if updated:
+        return
+    if sign < 0:
+        logger.warning(f"No rollup row to retract for key {key}; run rebuild_rollup to resync")
+        return
+
+    db.add(FinancialClinicDailyRollup(**dict(zip(ROLLUP_DIMENSIONS, key)), **measures))
+
+
+def record_submission(db: Session, response, profile) -> None:
+    """
+    Count a new FinancialClinicResponse in the rollup.
+
+    Call after the response is flushed and before the surrounding commit so
+    the rollup update shares the submission's transaction.
+    """
+    _apply(db, rollup_key(response, profile), rollup_measures(response), 1)
+
+
+def retract_submission(db: Session, response, profile) -> None:
+    """Remove a response's contribution (before deleting it or re-keying its profile)."""
+    _apply(db, rollup_key(response, profile), rollup_measures(response), -1)
+
+
+def profile_changes_rollup(profile, updates: Dict[str, Any]) -> bool:
+    """Whether applying non-empty profile updates would change the rollup key of its responses."""
+    for field in PROFILE_DIMENSION_FIELDS:
+        value = updates.get(field)
+        if value is not None and value != "" and value != getattr(profile, field):
+            return True
+    return False
+
+
+def _response_rows_query(db: Session):
+    """Column-only query over responses ⋈ profiles with the fields the rollup needs."""
+    from app.models import FinancialClinicResponse, FinancialClinicProfile
+
+    return db.query(
+        FinancialClinicResponse.created_at,
+        FinancialClinicResponse.completed_at,
+        FinancialClinicResponse.company_tracker_id,
+        FinancialClinicResponse.status_band,
+        FinancialClinicResponse.total_score,
+        FinancialClinicResponse.category_scores,
+        FinancialClinicProfile.gender,
+        FinancialClinicProfile.nationality,
+        FinancialClinicProfile.emirate,
+        FinancialClinicProfile.employment_status,
+        FinancialClinicProfile.income_range,
+        FinancialClinicProfile.children,
+        FinancialClinicProfile.date_of_birth,
+    ).select_from(FinancialClinicResponse).join(
+        FinancialClinicProfile,
+        FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+    )
+
+
+def rebuild_rollup(db: Session, batch_size: int = 1000) -> int:
+    """
+    Recompute the whole rollup from the raw responses and commit.
+
+    Responses are streamed in batches and folded in memory, so the cost is one
+    pass over the responses table. Run at a quiet time: submissions made while
+    the rebuild is running may be counted twice or not at all.
+
+    Args:
+        db: Database session
+        batch_size: Rows fetched per round trip
+
+    Returns:
+        Number of rollup rows written
+    """
+    from app.models import FinancialClinicDailyRollup, FinancialClinicResponse
+
+    totals: Dict[Tuple, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(MEASURE_COLUMNS, 0))
+
+    rows = _response_rows_query(db).order_by(FinancialClinicResponse.id).yield_per(batch_size)
+    for row in rows:
+        bucket = totals[rollup_key(row, row)]
+        for column, value in rollup_measures(row).items():
+            bucket[column] += value
+
+    db.query(FinancialClinicDailyRollup).delete(synchronize_session=False)
+    db.bulk_insert_mappings(
+        FinancialClinicDailyRollup,
+        [{**dict(zip(ROLLUP_DIMENSIONS, key)), **measures} for key, measures in totals.items()]
+    )
+    db.commit()
+
+    logger.info(f"Rebuilt financial clinic rollup: {len(totals)} rows")
+    return len(totals)
+
+
+def _split_window(
+    window_start: Optional[datetime],
+    window_end: Optional[datetime]
+) -> Tuple[bool, Optional[date], Optional[date], List[Tuple[Optional[datetime], Optional[datetime]]]]:
+    """
+    Split a [start, end) window into whole local days and raw edge windows.
+
+    Returns:
+        (use_rollup, first_day, last_day, edges) where first_day/last_day bound
+        the whole days served from the rollup (None = unbounded) and edges are
+        the partial-day windows to read from raw responses
+    """
+    first_day = last_day = None
+    edges = []
+
+    if window_start is not None:
+        first_day = local_day(window_start)
+        if day_start_utc(first_day) < window_start:
+            first_day += timedelta(days=1)
+
+    if window_end is not None:
+        last_day = local_day(window_end) - timedelta(days=1)
+
+    if first_day is not None and last_day is not None and first_day > last_day:
+        # Window shorter than a whole day: read it all from raw responses
+        return False, None, None, [(window_start, window_end)]
+
+    if window_start is not None and day_start_utc(first_day) > window_start:
+        edges.append((window_start, day_start_utc(first_day)))
+    if window_end is not None and day_start_utc(last_day + timedelta(days=1)) < window_end:
+        edges.append((day_start_utc(last_day + timedelta(days=1)), window_end))
+
+    return True, first_day, last_day, edges
+
+
+def summarize(
+    db: Session,
+    filters: Dict[str, List[str]],
+    window_start: Optional[datetime] = None,
+    window_end: Optional[datetime] = None,
+    group_by: Sequence[str] = ()
+) -> Dict[Tuple, Dict[str, float]]:
+    """
+    Aggregate submissions in [window_start, window_end) grouped by rollup dimensions.
+
+    Args:
+        db: Database session
+        filters: Parsed demographic filters (see parse_filter_params); age_groups is not supported
+        window_start: Inclusive start (naive UTC), None for unbounded
+        window_end: Exclusive end (naive UTC), None for unbounded
+        group_by: Names from ROLLUP_DIMENSIONS to group by
+
+    Returns:
+        Mapping of group-value tuple -> measure totals (keys of MEASURE_COLUMNS)
+    """
+    from app.models import FinancialClinicDailyRollup, FinancialClinicResponse
+
+    totals: Dict[Tuple, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(MEASURE_COLUMNS, 0))
+    use_rollup, first_day, last_day, edges = _split_window(window_start, window_end)
+
+    if use_rollup:
+        from sqlalchemy import func
+
+        group_columns = [getattr(FinancialClinicDailyRollup, name) for name in group_by]
+        query = db.query(
+            *group_columns,
+            *[func.sum(getattr(FinancialClinicDailyRollup, column)).label(column) for column in MEASURE_COLUMNS]
+        )
+
+        for filter_name, column in _DIRECT_FILTERS.items():
+            if filters.get(filter_name):
+                query = query.filter(getattr(FinancialClinicDailyRollup, column).in_(filters[filter_name]))
+
+        buckets = [c for c in (filters.get('children') or []) if c in ('0', '1', '2', '3', '4', '5+')]
+        if buckets:
+            query = query.filter(FinancialClinicDailyRollup.children_bucket.in_(buckets))
+
+        if filters.get('companies'):
+            company_ids = resolve_company_ids(filters, db)
+            if company_ids:
+                query = query.filter(FinancialClinicDailyRollup.company_tracker_id.in_(company_ids))
+            else:
+                query = query.filter(literal(False))
+
+        if first_day is not None:
+            query = query.filter(FinancialClinicDailyRollup.day >= first_day)
+        if last_day is not None:
+            query = query.filter(FinancialClinicDailyRollup.day <= last_day)
+
+        for row in query.group_by(*group_columns).all():
+            bucket = totals[tuple(row[:len(group_by)])]
+            for column in MEASURE_COLUMNS:
+                bucket[column] += getattr(row, column) or 0
+
+    positions = [ROLLUP_DIMENSIONS.index(name) for name in group_by]
+    for edge_start, edge_end in edges:
+        query = apply_demographic_filters(_response_rows_query(db), filters, db)
+        if edge_start is not None:
+            query = query.filter(FinancialClinicResponse.created_at >= edge_start)
+        if edge_end is not None:
+            query = query.filter(FinancialClinicResponse.created_at < edge_end)
+
+        for row in query.all():
+            key = rollup_key(row, row)
+            bucket = totals[tuple(key[i] for i in positions)]
+            for column, value in rollup_measures(row).items():
+                bucket[column] += value
+
+    # Drop groups whose submissions were all deleted
+    return {key: measures for key, measures in totals.items() if measures["response_count"]}
+
+
+def dimension_breakdown(
+    db: Session,
+    filters: Dict[str, List[str]],
+    dimension: str,
+    date_range: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> List[Tuple[Any, int, float]]:
+    """
+    (value, count, average score) per value of one rollup dimension.
+
+    Args:
+        db: Database session
+        filters: Parsed demographic filters
+        dimension: Name from ROLLUP_DIMENSIONS
+        date_range: Predefined date range ('7d', '30d', '90d', '1y', 'ytd', 'all')
+        start_date: Custom start date (YYYY-MM-DD format)
+        end_date: Custom end date (YYYY-MM-DD format)
+    """
+    window_start, window_end = resolve_date_window(date_range, start_date, end_date)
+    totals = summarize(db, filters, window_start, window_end, group_by=(dimension,))
+    return [
+        (value, measures["response_count"], measures["score_sum"] / measures["response_count"])
+        for (value,), measures in totals.items()
+    ]
@@ -0,0 +1,99 @@
+"""
+Indexed search over Financial Clinic profiles (name, email, mobile number).
+
+Profiles carry normalized copies of their contact fields, kept in step by
+update_profile_search_fields():
+
+- search_text: "<name> <email> <mobile digits>", case-folded with accents
+  and Arabic diacritics removed; trigram (pg_trgm GIN) indexed on PostgreSQL
+  for substring search, B-tree indexed for prefixes
+- email_normalized: stripped, lower-cased email, for exact matches
+- mobile_reversed: the mobile number's digits reversed, so a suffix
+  search ("last four digits") is an index prefix scan
+
+submission_search_condition() picks the index-friendly lookup for a term:
+exact email, phone suffix, short prefix (trigrams need 3+ characters) or
+trigram substring.
+"""
+import re
+import unicodedata
+from typing import Optional
+
+from sqlalchemy import and_, or_
+
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+PHONE_PATTERN = re.compile(r"\+?[\d\s\-()]+")
+MIN_PHONE_SUFFIX_DIGITS = 4
+MIN_TRIGRAM_LENGTH = 3
+
+
+def normalize_search_text(value: Optional[str]) -> str:
+    """Case-fold, strip combining marks (accents, Arabic harakat) and collapse whitespace."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def phone_digits(value: Optional[str]) -> str:
+    """Digits of a phone number, without separators or the leading +."""
+    return re.sub(r"\D", "", value or "")
+
+
+def update_profile_search_fields(profile) -> None:
+    """Refresh a FinancialClinicProfile's normalized search columns from name, email and mobile_number."""
+    digits = phone_digits(profile.mobile_number)
+    profile.email_normalized = (profile.email or "").strip().lower()
+    profile.mobile_reversed = digits[::-1] or None
+    profile.search_text = " ".join(
+        part for part in (normalize_search_text(profile.name), profile.email_normalized, digits) if part
+    )
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _starts_with(column, prefix: str, dialect_name: str):
+    """Prefix match that can use a B-tree index on either database."""
+    if dialect_name == "postgresql":
+        # Served by the varchar_pattern_ops index
+        return column.like(f"{_escape_like(prefix)}%", escape="\\")
+    # SQLite only uses an index for a case-insensitive LIKE under NOCASE; the
+    # values are already lower-case, so a binary range is equivalent
+    return and_(column >= prefix, column < prefix + "\U0010ffff")
+
+
+def submission_search_condition(term: Optional[str], dialect_name: str):
+    """
+    Filter on FinancialClinicProfile matching an admin search box term.
+
+    Args:
+        term: Raw search input
+        dialect_name: Database dialect (db.get_bind().dialect.name)
+
+    Returns:
+        SQL condition, or None for a blank term
+    """
+    from app.models import FinancialClinicProfile
+
+    text = normalize_search_text(term)
+    if not text:
+        return None
+
+    email = term.strip().lower()
+    if EMAIL_PATTERN.fullmatch(email):
+        return FinancialClinicProfile.email_normalized == email
+
+    digits = phone_digits(term)
+    if PHONE_PATTERN.fullmatch(term.strip()) and len(digits) >= MIN_PHONE_SUFFIX_DIGITS:
+        return _starts_with(FinancialClinicProfile.mobile_reversed, digits[::-1], dialect_name)
+
+    if len(text) < MIN_TRIGRAM_LENGTH:
+        return or_(
+            _starts_with(FinancialClinicProfile.search_text, text, dialect_name),
+            _starts_with(FinancialClinicProfile.email_normalized, text, dialect_name),
+        )
+
+    return FinancialClinicProfile.search_text.like(f"%{_escape_like(text)}%", escape="\\")
@@ -0,0 +1,614 @@
+"""
+In-memory columnar snapshot of Financial Clinic responses for the dashboard.
+
+AnalyticsSnapshot keeps every response with its profile demographics, category
+scores and answers as NumPy arrays: strings are dictionary-encoded to integer
+codes, scores are float32 and timestamps int64. Any combination of dashboard
+filters then becomes a vectorized boolean mask, and aggregates() returns the
+same grouped rows as dashboard_aggregates() without a database round trip.
+
+The snapshot refreshes on read once it is older than
+ANALYTICS_SNAPSHOT_REFRESH_SECONDS: responses above the id watermark are
+appended and the demographics of their profiles re-read; if responses at or
+below the watermark were deleted it is rebuilt. Each worker holds its own copy.
+
+NumPy is optional; without it (or with ANALYTICS_SNAPSHOT_ENABLED off)
+get_snapshot() returns None and the dashboard queries the database.
+"""
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.analytics.dashboard import CATEGORY_API_NAMES
+from app.analytics.filters import AGE_GROUP_BOUNDS, period_label, resolve_date_window, years_before
+from app.analytics.rollup import local_day
+from app.config import settings
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1)
+MISSING_TIME = -(2 ** 63)  # Sorts before every timestamp, like NULL in SQLite
+MISSING_ANSWER = -1
+
+# Filter option -> children condition, as in apply_demographic_filters
+CHILDREN_OPTIONS = {"0": (0, 0), "1": (1, 1), "2": (2, 2), "3": (3, 3), "4": (4, 4), "5+": (5, None)}
+
+
+def to_microseconds(value: Optional[datetime]) -> int:
+    """
+    Encode a created_at value as int64 microseconds since 1970-01-01.
+
+    Aware values keep the wall clock the database session reported, which is
+    what the SQL window comparisons and period labels see.
+    """
+    if value is None:
+        return MISSING_TIME
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+class Dictionary:
+    """Dictionary encoding of a string column; codes index into values."""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    def encode(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def codes_for(self, values) -> List[int]:
+        """Codes of the given values that occur in the column."""
+        return [self._codes[value] for value in values if value in self._codes]
+
+    def code(self, value) -> int:
+        """Code of a value, or -1 if it does not occur."""
+        return self._codes.get(value, -1)
+
+    def copy(self) -> "Dictionary":
+        copied = Dictionary()
+        copied.values = list(self.values)
+        copied._codes = dict(self._codes)
+        return copied
+
+
+class AnalyticsSnapshot:
+    """Columnar copy of the dashboard data, refreshed incrementally by id watermark."""
+
+    PROFILE_COLUMNS = ("email", "gender", "nationality", "emirate", "employment_status", "income_range")
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.RLock()
+        self.refreshed_at: Optional[float] = None
+        self.full_loads = 0
+        self.incremental_loads = 0
+        self._reset()
+
+    def _reset(self):
+        self.size = 0
+        self.max_id = 0
+        self.dictionaries = {name: Dictionary() for name in self.PROFILE_COLUMNS + ("status_band", "status_level")}
+        self.categories = list(CATEGORY_API_NAMES)
+        self.questions = Dictionary()
+        self.ids = np.zeros(0, np.int64)
+        self.profile_ids = np.zeros(0, np.int64)
+        self.created = np.zeros(0, np.int64)
+        self.local_day = np.zeros(0, np.int32)  # Ordinal of the ANALYTICS_TIMEZONE day, 0 without created_at
+        self.total_score = np.zeros(0, np.float32)
+        self.status_band = np.zeros(0, np.int32)
+        self.company_id = np.zeros(0, np.int32)
+        self.children = np.zeros(0, np.int16)
+        self.birth_ordinal = np.zeros(0, np.int32)
+        self.profile_codes = {name: np.zeros(0, np.int32) for name in self.PROFILE_COLUMNS}
+        self.category_score = np.zeros((0, len(self.categories)), np.float32)
+        self.category_max = np.zeros((0, len(self.categories)), np.float32)
+        self.category_status = np.zeros((0, len(self.categories)), np.int8)
+        self.answers = np.zeros((0, 0), np.int16)
+        self.company_names: Dict[int, Optional[str]] = {}
+        self.company_lookup: Dict[str, List[int]] = {}
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def refresh_if_stale(self, db: Session, max_age_seconds: float):
+        """Refresh when never loaded or older than max_age_seconds."""
+        if self.refreshed_at is not None and time.monotonic() - self.refreshed_at < max_age_seconds:
+            return
+        # One refresher at a time; other requests keep reading the current arrays
+        blocking = self.refreshed_at is None
+        if not self._refresh_lock.acquire(blocking=blocking):
+            return
+        try:
+            if self.refreshed_at is None or time.monotonic() - self.refreshed_at >= max_age_seconds:
+                self.refresh(db)
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self, db: Session):
+        """
+        Append responses above the watermark, or rebuild if any at or below it were deleted.
+
+        The new arrays are built on a staged copy without holding the read lock,
+        so aggregates() keeps answering from the current arrays until the swap.
+        """
+        from app.models import FinancialClinicResponse
+
+        with self._refresh_lock:
+            staged = self._staged()
+            remaining = db.query(func.count(FinancialClinicResponse.id)).filter(
+                FinancialClinicResponse.id <= staged.max_id
+            ).scalar() if staged.size else 0
+            if remaining != staged.size:
+                staged._reset()
+            full = staged.size == 0
+            staged._load(db, after_id=staged.max_id)
+            staged._load_companies(db)
+
+            with self._lock:
+                self.__dict__.update(vars(staged))
+            if full:
+                self.full_loads += 1
+            else:
+                self.incremental_loads += 1
+            self.refreshed_at = time.monotonic()
+
+    def _staged(self) -> "AnalyticsSnapshot":
+        """
+        Copy to load into. Arrays are shared, since _load concatenates before
+        writing; the containers it changes in place are copied.
+        """
+        staged = AnalyticsSnapshot.__new__(AnalyticsSnapshot)
+        staged.__dict__.update(vars(self))
+        staged.dictionaries = {name: dictionary.copy() for name, dictionary in self.dictionaries.items()}
+        staged.questions = self.questions.copy()
+        staged.profile_codes = dict(self.profile_codes)
+        staged.categories = list(self.categories)
+        return staged
+
+    def _load(self, db: Session, after_id: int):
+        from app.models import (
+            FinancialClinicAnswer, FinancialClinicCategoryScore,
+            FinancialClinicProfile, FinancialClinicResponse
+        )
+
+        rows = db.query(
+            FinancialClinicResponse.id,
+            FinancialClinicResponse.profile_id,
+            FinancialClinicResponse.created_at,
+            FinancialClinicResponse.total_score,
+            FinancialClinicResponse.status_band,
+            FinancialClinicResponse.company_tracker_id,
+        ).filter(FinancialClinicResponse.id > after_id).order_by(FinancialClinicResponse.id).all()
+        if not rows:
+            return
+
+        count = len(rows)
+        start = self.size
+        band = self.dictionaries["status_band"]
+        self.ids = np.concatenate([self.ids, np.fromiter((r.id for r in rows), np.int64, count)])
+        self.profile_ids = np.concatenate([self.profile_ids, np.fromiter((r.profile_id for r in rows), np.int64, count)])
+        self.created = np.concatenate([self.created, np.fromiter((to_microseconds(r.created_at) for r in rows), np.int64, count)])
+        self.local_day = np.concatenate([
+            self.local_day,
+            np.fromiter((local_day(r.created_at).toordinal() if r.created_at else 0 for r in rows), np.int32, count)
+        ])
+        self.total_score = np.concatenate([self.total_score, np.fromiter((r.total_score or 0 for r in rows), np.float32, count)])
+        self.status_band = np.concatenate([self.status_band, np.fromiter((band.encode(r.status_band) for r in rows), np.int32, count)])
+        self.company_id = np.concatenate([
+            self.company_id,
+            np.fromiter((-1 if r.company_tracker_id is None else r.company_tracker_id for r in rows), np.int32, count)
+        ])
+
+        # Demographics are filled in below, for these rows and older ones of the same profiles
+        self.children = np.concatenate([self.children, np.full(count, -1, np.int16)])
+        self.birth_ordinal = np.concatenate([self.birth_ordinal, np.zeros(count, np.int32)])
+        for name in self.PROFILE_COLUMNS:
+            self.profile_codes[name] = np.concatenate([self.profile_codes[name], np.full(count, -1, np.int32)])
+
+        width = len(self.categories)
+        self.category_score = np.concatenate([self.category_score, np.full((count, width), np.nan, np.float32)])
+        self.category_max = np.concatenate([self.category_max, np.full((count, width), np.nan, np.float32)])
+        self.category_status = np.concatenate([self.category_status, np.full((count, width), -1, np.int8)])
+        self.answers = np.concatenate([
+            self.answers, np.full((count, self.answers.shape[1]), MISSING_ANSWER, np.int16)
+        ])
+        self.size = start + count
+        self.max_id = int(self.ids[-1])
+
+        profile_ids = sorted({r.profile_id for r in rows})
+        profiles = db.query(
+            FinancialClinicProfile.id,
+            FinancialClinicProfile.birth_date,
+            FinancialClinicProfile.children,
+            *[getattr(FinancialClinicProfile, name) for name in self.PROFILE_COLUMNS]
+        ).filter(FinancialClinicProfile.id.in_(profile_ids)).all()
+        self._apply_profiles(profiles)
+
+        level = self.dictionaries["status_level"]
+        category_index = {category: k for k, category in enumerate(self.categories)}
+        for response_id, category, score, max_possible, status_level in db.query(
+            FinancialClinicCategoryScore.response_id,
+            FinancialClinicCategoryScore.category,
+            FinancialClinicCategoryScore.score,
+            FinancialClinicCategoryScore.max_possible,
+            FinancialClinicCategoryScore.status_level,
+        ).filter(FinancialClinicCategoryScore.response_id > after_id):
+            k = category_index.get(category)
+            row = self._row(response_id)
+            if k is None or row is None:
+                continue
+            self.category_score[row, k] = score
+            self.category_max[row, k] = np.nan if max_possible is None else max_possible
+            self.category_status[row, k] = -1 if status_level is None else level.encode(status_level)
+
+        for response_id, question_id, value in db.query(
+            FinancialClinicAnswer.response_id,
+            FinancialClinicAnswer.question_id,
+            FinancialClinicAnswer.value,
+        ).filter(FinancialClinicAnswer.response_id > after_id):
+            row = self._row(response_id)
+            if row is None or value is None:
+                continue
+            q = self.questions.encode(question_id)
+            if q >= self.answers.shape[1]:
+                self.answers = np.concatenate([
+                    self.answers, np.full((self.size, q + 1 - self.answers.shape[1]), MISSING_ANSWER, np.int16)
+                ], axis=1)
+            self.answers[row, q] = value
+
+    def _apply_profiles(self, profiles):
+        """Write profile demographics onto every response of those profiles."""
+        if not profiles:
+            return
+        order = np.array(sorted(p.id for p in profiles), np.int64)
+        by_id = {p.id: p for p in profiles}
+        rows = np.nonzero(np.isin(self.profile_ids, order))[0]
+        slot = np.searchsorted(order, self.profile_ids[rows])
+
+        children = np.array([-1 if by_id[i].children is None else by_id[i].children for i in order], np.int16)
+        births = np.array([by_id[i].birth_date.toordinal() if by_id[i].birth_date else 0 for i in order], np.int32)
+        self.children[rows] = children[slot]
+        self.birth_ordinal[rows] = births[slot]
+        for name in self.PROFILE_COLUMNS:
+            dictionary = self.dictionaries[name]
+            codes = np.array([dictionary.encode(getattr(by_id[i], name)) for i in order], np.int32)
+            self.profile_codes[name][rows] = codes[slot]
+
+    def _load_companies(self, db: Session):
+        from app.models import CompanyTracker
+
+        names, lookup = {}, {}
+        for company_id, company_name, unique_url in db.query(
+            CompanyTracker.id, CompanyTracker.company_name, CompanyTracker.unique_url
+        ):
+            names[company_id] = company_name
+            for identifier in (company_name, unique_url):
+                if identifier is not None:
+                    lookup.setdefault(identifier, []).append(company_id)
+        self.company_names = names
+        self.company_lookup = lookup
+
+    def _row(self, response_id: int) -> Optional[int]:
+        row = int(np.searchsorted(self.ids, response_id))
+        return row if row < self.size and self.ids[row] == response_id else None
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def filter_mask(self, filters: Dict[str, List[str]], today: Optional[date] = None):
+        """Boolean mask of the responses matching the dashboard filters (apply_demographic_filters semantics)."""
+        today = today or date.today()
+        mask = np.ones(self.size, bool)
+
+        if filters.get('age_groups'):
+            age_mask = np.zeros(self.size, bool)
+            matched = False
+            has_birth = self.birth_ordinal > 0
+            for age_group in filters['age_groups']:
+                if age_group not in AGE_GROUP_BOUNDS:
+                    continue
+                matched = True
+                min_age, max_age = AGE_GROUP_BOUNDS[age_group]
+                condition = has_birth.copy()
+                if min_age is not None:
+                    condition &= self.birth_ordinal <= years_before(today, min_age).toordinal()
+                if max_age is not None:
+                    condition &= self.birth_ordinal > years_before(today, max_age + 1).toordinal()
+                age_mask |= condition
+            if matched:
+                mask &= age_mask
+
+        for key, name in (
+            ('genders', 'gender'),
+            ('nationalities', 'nationality'),
+            ('emirates', 'emirate'),
+            ('employment_statuses', 'employment_status'),
+            ('income_ranges', 'income_range'),
+        ):
+            if filters.get(key):
+                mask &= np.isin(self.profile_codes[name], self.dictionaries[name].codes_for(filters[key]))
+
+        if filters.get('children'):
+            bounds = [CHILDREN_OPTIONS[option] for option in filters['children'] if option in CHILDREN_OPTIONS]
+            if bounds:
+                children_mask = np.zeros(self.size, bool)
+                for low, high in bounds:
+                    condition = self.children >= low
+                    if high is not None:
+                        condition &= self.children <= high
+                    children_mask |= condition
+                mask &= children_mask
+
+        if filters.get('companies'):
+            company_ids = sorted({
+                company_id
+                for identifier in filters['companies']
+                for company_id in self.company_lookup.get(identifier, [])
+            })
+            mask &= np.isin(self.company_id, company_ids) if company_ids else False
+
+        return mask
+
+    def _latest_per_email(self, mask):
+        """Restrict a mask to the latest response per non-empty email (apply_unique_users_filter)."""
+        email = self.profile_codes["email"]
+        blank = [self.dictionaries["email"].code(''), self.dictionaries["email"].code(None)]
+        rows = np.nonzero(mask & ~np.isin(email, blank))[0]
+        selected = np.zeros(self.size, bool)
+        if not len(rows):
+            return selected
+        rows = rows[np.lexsort((self.ids[rows], self.created[rows], email[rows]))]
+        last = np.ones(len(rows), bool)
+        last[:-1] = email[rows][1:] != email[rows][:-1]
+        selected[rows[last]] = True
+        return selected
+
+    def _age_groups(self, today: date):
+        """Age group code per row (index into AGE_GROUP_BOUNDS order, -1 without birth date)."""
+        labels = list(AGE_GROUP_BOUNDS)
+        codes = np.full(self.size, len(labels) - 1, np.int32)  # 60+
+        for index in range(len(labels) - 2, -1, -1):
+            max_age = AGE_GROUP_BOUNDS[labels[index]][1]
+            codes[self.birth_ordinal > years_before(today, max_age + 1).toordinal()] = index
+        codes[self.birth_ordinal <= 0] = -1
+        return labels, codes
+
+    def aggregates(
+        self,
+        filters: Dict[str, List[str]],
+        date_range: str = "30d",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        unique_users_only: Optional[bool] = None,
+        group_by: str = "day",
+        question_ids: Sequence[str] = ()
+    ) -> Dict[str, List[tuple]]:
+        """
+        The grouped rows of dashboard_aggregates(), computed from the arrays.
+
+        Args:
+            filters: Parsed demographic filters (see parse_filter_params)
+            date_range: Predefined date range
+            start_date: Custom start date (YYYY-MM-DD format)
+            end_date: Custom end date (YYYY-MM-DD format)
+            unique_users_only: Restrict to the latest submission per email
+            group_by: Time-series period (day, week, month, year)
+            question_ids: Question ids for the per-question averages
+
+        Returns:
+            Widget name -> list of (key1, key2, key3, count, total, peak) rows
+        """
+        with self._lock:
+            today = date.today()
+            window_start, window_end = resolve_date_window(date_range, start_date, end_date)
+            has_created = self.created != MISSING_TIME
+            in_window = np.ones(self.size, bool)
+            if window_start is not None:
+                in_window &= has_created & (self.created >= to_microseconds(window_start))
+            if window_end is not None:
+                in_window &= has_created & (self.created < to_microseconds(window_end))
+
+            base = self.filter_mask(filters, today)
+            windowed_mask = base & in_window
+            if unique_users_only:
+                full = self._latest_per_email(base)
+                windowed = self._latest_per_email(windowed_mask)
+            else:
+                full, windowed = base, windowed_mask
+
+            today_start = to_microseconds(datetime.combine(today, datetime.min.time()))
+            day_group = np.where(has_created & (self.created >= today_start), 1, 0)
+            emirati = np.where(
+                self.profile_codes["nationality"] == self.dictionaries["nationality"].code("Emirati"), 0, 1
+            )
+            nationality_labels = ["emirati", "non_emirati"]
+            children_group = np.minimum(self.children, 5)
+            age_labels, age_codes = self._age_groups(today)
+            score = self.total_score
+
+            def decode(name):
+                values = self.dictionaries[name].values
+                return lambda code: values[code] if code >= 0 else None
+
+            band = decode("status_band")
+            grouped = {"submissions": [(None, None, None, int(np.count_nonzero(windowed_mask)), None, None)]}
+            grouped["status_bands"] = group_rows(
+                windowed, [(self.status_band, band), (day_group, ["earlier", "today"].__getitem__)], score
+            )
+            for widget, name in (("gender", "gender"), ("emirate", "emirate"), ("employment", "employment_status")):
+                grouped[widget] = group_rows(windowed, [(self.profile_codes[name], decode(name))])
+            grouped["income"] = group_rows(
+                windowed, [(self.profile_codes["income_range"], decode("income_range"))], score
+            )
+            grouped["children"] = group_rows(
+                windowed, [(children_group, lambda code: str(code) if code >= 0 else None)], score
+            )
+            grouped["nationality"] = group_rows(full, [(emirati, nationality_labels.__getitem__)], score)
+            grouped["age"] = group_rows(full & (age_codes >= 0), [(age_codes, age_labels.__getitem__)], score)
+            grouped["time_series"] = self._time_series(windowed & has_created, group_by)
+            grouped["companies"] = group_rows(
+                full & (self.company_id >= 0),
+                [
+                    (self.company_id, str),
+                    (self.company_id, lambda code: self.company_names.get(code)),
+                    (self.status_band, band),
+                ],
+                score
+            )
+
+            level = decode("status_level")
+            categories = []
+            for k, category in enumerate(self.categories):
+                present = full & ~np.isnan(self.category_score[:, k])
+                categories += [
+                    (category, row[0], None, *row[3:])
+                    for row in group_rows(
+                        present, [(self.category_status[:, k].astype(np.int32), level)],
+                        self.category_score[:, k], self.category_max[:, k]
+                    )
+                ]
+            grouped["categories"] = categories
+
+            if question_ids:
+                questions = []
+                for question_id in question_ids:
+                    q = self.questions.code(question_id)
+                    if q < 0:
+                        continue
+                    answered = full & (self.answers[:, q] != MISSING_ANSWER)
+                    questions += [
+                        (question_id, row[0], None, *row[3:])
+                        for row in group_rows(
+                            answered, [(emirati, nationality_labels.__getitem__)], self.answers[:, q]
+                        )
+                    ]
+                grouped["questions"] = questions
+
+            return {widget: rows for widget, rows in grouped.items() if rows}
+
+    def _time_series(self, mask, group_by: str) -> List[tuple]:
+        """(period, None, None, count, total, None) rows, labelled like period_expression."""
+        rows = np.nonzero(mask)[0]
+        if not len(rows):
+            return []
+        days, inverse = np.unique(self.local_day[rows], return_inverse=True)
+        inverse = inverse.reshape(-1)
+        counts = np.bincount(inverse, minlength=len(days))
+        totals = np.bincount(inverse, weights=self.total_score[rows].astype(np.float64), minlength=len(days))
+
+        periods = {}
+        for day, count, total in zip(days.tolist(), counts.tolist(), totals.tolist()):
+            label = period_label(date.fromordinal(day), group_by)
+            period_count, period_total = periods.get(label, (0, 0.0))
+            periods[label] = (period_count + count, period_total + total)
+        return [(label, None, None, count, total, None) for label, (count, total) in sorted(periods.items())]
+
+    def stats(self) -> Dict[str, Any]:
+        """Sizing and refresh counters."""
+        return {
+            "responses": self.size,
+            "max_id": self.max_id,
+            "age_seconds": round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None,
+            "full_loads": self.full_loads,
+            "incremental_loads": self.incremental_loads,
+        }
+
+
+def group_rows(mask, keys, totals=None, peaks=None) -> List[tuple]:
+    """
+    GROUP BY over the masked rows.
+
+    Args:
+        mask: Rows to include
+        keys: Up to three (codes, decode) pairs; decode maps a code to the key value
+        totals: Optional values to SUM per group
+        peaks: Optional values to MAX per group (NaN counts as NULL)
+
+    Returns:
+        (key1, key2, key3, count, total, peak) rows ordered by key, NULLs first
+    """
+    rows = np.nonzero(mask)[0]
+    if not len(rows):
+        return []
+    codes = np.stack([np.asarray(column)[rows].astype(np.int64) for column, _ in keys], axis=1)
+    groups, inverse = np.unique(codes, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse, minlength=len(groups))
+    sums = None
+    if totals is not None:
+        sums = np.bincount(inverse, weights=np.asarray(totals)[rows].astype(np.float64), minlength=len(groups))
+    maxima = None
+    if peaks is not None:
+        values = np.asarray(peaks)[rows].astype(np.float64)
+        maxima = np.full(len(groups), -np.inf)
+        np.maximum.at(maxima, inverse, np.where(np.isnan(values), -np.inf, values))
+
+    result = []
+    for g, group in enumerate(groups.tolist()):
+        key_values = [decode(code) for code, (_, decode) in zip(group, keys)]
+        key_values += [None] * (3 - len(key_values))
+        peak = None
+        if maxima is not None and np.isfinite(maxima[g]):
+            peak = float(maxima[g])
+        result.append((
+            *key_values,
+            int(counts[g]),
+            float(sums[g]) if sums is not None else None,
+            peak,
+        ))
+    result.sort(key=lambda row: [(value is not None, value or "") for value in row[:3]])
+    return result
+
+
+_snapshot: Optional[AnalyticsSnapshot] = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot(db: Session) -> Optional[AnalyticsSnapshot]:
+    """
+    This worker's snapshot, refreshed if stale.
+
+    Returns:
+        The snapshot, or None when disabled or NumPy is not installed
+    """
+    global _snapshot
+
+    if not settings.ANALYTICS_SNAPSHOT_ENABLED:
+        return None
+    if not NUMPY_AVAILABLE:
+        logger.info("NumPy not available, dashboard analytics are served from the database")
+        return None
+
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = AnalyticsSnapshot()
+    _snapshot.refresh_if_stale(db, settings.ANALYTICS_SNAPSHOT_REFRESH_SECONDS)
+    return _snapshot
+
+
+def reset_snapshot():
+    """Drop this worker's snapshot; the next dashboard request rebuilds it."""
+    global _snapshot
+
+    with _snapshot_lock:
+        _snapshot = None
@@ -102,7 +102,9 @@ class PostRegistrationService:
                     # Also link the profile if it exists
                     if fc_response.profile:
                         if not fc_response.profile.email:
+                            from app.analytics.search import update_profile_search_fields
                             fc_response.profile.email = email
+                            update_profile_search_fields(fc_response.profile)
             
             # Log registration
             audit_log = AuditLog(
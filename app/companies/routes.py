@@ -10,6 +10,9 @@ from ..database import get_db
 from ..models import CompanyTracker, CompanyAssessment, User
 from ..auth.dependencies import get_current_user, get_current_admin_user, get_current_full_admin_user, get_current_full_admin_user
 from ..config import settings
+from ..analytics.cache import analytics_cache
+from ..analytics.companies import company_index
+from ..analytics.filter_options import filter_options_cache
 from .qr_utils import generate_qr_code, get_qr_code_metadata
 from .schemas import (
     CompanyCreate, CompanyUpdate, CompanyResponse, CompanyLinkConfig,
@@ -20,6 +23,14 @@ from typing import List
 router = APIRouter(prefix="/companies", tags=["companies"])
 
 
+def companies_changed():
+    """Drop in-process state derived from companies after a create, update or delete."""
+    # Company names and variation sets appear in cached dashboard results
+    analytics_cache.invalidate()
+    filter_options_cache.invalidate()
+    company_index.invalidate()
+
+
 def generate_unique_url(company_name: str, db: Session) -> str:
     """Generate a unique URL slug for a company."""
     # Clean company name to create a base slug
@@ -64,6 +75,7 @@ async def create_company(
     db.add(db_company)
     db.commit()
     db.refresh(db_company)
+    companies_changed()
     
     return db_company
 
@@ -188,6 +200,8 @@ async def update_company(
     
     db.commit()
     db.refresh(company)
+    companies_changed()
+    
     return company
 
 
@@ -198,7 +212,10 @@ async def delete_company(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Delete a company and all related data. Admin only."""
-    from app.models import CompanyAssessment, FinancialClinicResponse
+    from app.models import (
+        CompanyAssessment, FinancialClinicResponse, FinancialClinicDailyRollup,
+        FinancialClinicCategoryScore, FinancialClinicAnswer
+    )
     
     company = db.query(CompanyTracker).filter(CompanyTracker.id == company_id).first()
     if not company:
@@ -206,10 +223,22 @@ async def delete_company(
     
     # Delete all related data in correct order (children first, then parent)
     
-    # 1. Delete financial clinic responses
+    # 1. Delete financial clinic responses, their category scores, answer facts and analytics rollup rows
+    company_response_ids = db.query(FinancialClinicResponse.id).filter(
+        FinancialClinicResponse.company_tracker_id == company_id
+    )
+    db.query(FinancialClinicCategoryScore).filter(
+        FinancialClinicCategoryScore.response_id.in_(company_response_ids)
+    ).delete(synchronize_session=False)
+    db.query(FinancialClinicAnswer).filter(
+        FinancialClinicAnswer.response_id.in_(company_response_ids)
+    ).delete(synchronize_session=False)
     db.query(FinancialClinicResponse).filter(
         FinancialClinicResponse.company_tracker_id == company_id
     ).delete(synchronize_session=False)
+    db.query(FinancialClinicDailyRollup).filter(
+        FinancialClinicDailyRollup.company_tracker_id == company_id
+    ).delete(synchronize_session=False)
     
     # 2. Delete company assessments
     db.query(CompanyAssessment).filter(
@@ -219,6 +248,7 @@ async def delete_company(
     # 3. Finally delete the company itself
     db.delete(company)
     db.commit()
+    companies_changed()
     
     return {"message": "Company and all related data deleted successfully"}
 
@@ -248,6 +278,7 @@ async def generate_company_link(
         company.unique_url = config.prefix
         url_slug = config.prefix
         db.commit()
+        companies_changed()
     
     # Generate full URL
     base_url = settings.base_url
@@ -768,6 +799,9 @@ async def create_companies_bulk(
             })
             db.rollback()
     
+    if successful:
+        companies_changed()
+    
     return BulkOperationResult(
         successful=successful,
         failed=failed,
@@ -952,6 +986,9 @@ async def bulk_update_companies(
             })
             db.rollback()
     
+    if successful:
+        companies_changed()
+    
     return {
         "successful": successful,
         "failed": failed,
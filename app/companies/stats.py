@@ -0,0 +1,109 @@
+"""
+Running company statistics (CompanyTracker.total_assessments / average_score).
+
+Each company keeps a running count and score sum of its Financial Clinic
+responses. A submission adds to both with a single atomic UPDATE, so the cost
+no longer grows with the company's response count, and concurrent submits
+cannot overwrite each other's increments.
+
+reconcile_company_stats() recomputes the counters from the responses and
+corrects any drift (e.g. from bulk deletes or direct data fixes); the
+scheduler runs it every COMPANY_STATS_RECONCILE_MINUTES.
+
+    python -m app.companies.stats
+"""
+import logging
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import CompanyTracker, FinancialClinicResponse
+
+logger = logging.getLogger(__name__)
+
+# Score sums are floats; smaller differences are rounding, not drift
+SCORE_SUM_TOLERANCE = 1e-6
+
+
+def _adjust_company_stats(db: Session, company_tracker_id: int, count: int, score: float) -> None:
+    total_assessments = func.coalesce(CompanyTracker.total_assessments, 0) + count
+    total_score_sum = func.coalesce(CompanyTracker.total_score_sum, 0.0) + score
+    db.query(CompanyTracker).filter(CompanyTracker.id == company_tracker_id).update({
+        CompanyTracker.total_assessments: total_assessments,
+        CompanyTracker.total_score_sum: total_score_sum,
+        # SET expressions see the pre-update row, so this is the new sum / new count
+        CompanyTracker.average_score: total_score_sum / func.nullif(total_assessments, 0),
+    }, synchronize_session=False)
+
+
+def record_company_submission(db: Session, company_tracker_id: Optional[int], total_score: float) -> None:
+    """Count a new response in its company's running stats (caller commits)."""
+    if company_tracker_id is not None:
+        _adjust_company_stats(db, company_tracker_id, 1, total_score or 0.0)
+
+
+def retract_company_submission(db: Session, company_tracker_id: Optional[int], total_score: float) -> None:
+    """Remove a deleted response from its company's running stats (caller commits)."""
+    if company_tracker_id is not None:
+        _adjust_company_stats(db, company_tracker_id, -1, -(total_score or 0.0))
+
+
+def reconcile_company_stats(db: Session) -> int:
+    """
+    Recompute every company's counters from its responses where they drifted.
+
+    Returns:
+        Number of companies corrected
+    """
+    responses = FinancialClinicResponse
+    company_responses = responses.company_tracker_id == CompanyTracker.id
+    actual_count = select(func.count(responses.id)).where(company_responses).scalar_subquery()
+    actual_sum = select(func.coalesce(func.sum(responses.total_score), 0.0)).where(company_responses).scalar_subquery()
+    actual_average = select(func.avg(responses.total_score)).where(company_responses).scalar_subquery()
+
+    drifted = []
+    for company_id, stored_count, stored_sum, count, score_sum in db.query(
+        CompanyTracker.id,
+        CompanyTracker.total_assessments,
+        CompanyTracker.total_score_sum,
+        actual_count,
+        actual_sum
+    ):
+        if stored_count != count or abs((stored_sum or 0.0) - (score_sum or 0.0)) > SCORE_SUM_TOLERANCE:
+            logger.warning(
+                f"Company {company_id} stats drifted: {stored_count} assessments / sum {stored_sum}, "
+                f"actual {count} / {score_sum}"
+            )
+            drifted.append(company_id)
+
+    if drifted:
+        # Recomputed inside the UPDATE so submits committed meanwhile are included
+        db.query(CompanyTracker).filter(CompanyTracker.id.in_(drifted)).update({
+            CompanyTracker.total_assessments: actual_count,
+            CompanyTracker.total_score_sum: actual_sum,
+            CompanyTracker.average_score: actual_average,
+        }, synchronize_session=False)
+    return len(drifted)
+
+
+def run_company_stats_reconciliation() -> int:
+    """Scheduled job: reconcile company stats in a session of its own."""
+    db = SessionLocal()
+    try:
+        corrected = reconcile_company_stats(db)
+        db.commit()
+        logger.info(f"✅ Company stats reconciled, {corrected} companies corrected")
+        return corrected
+    except Exception as e:
+        logger.error(f"❌ Error reconciling company stats: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Corrected {run_company_stats_reconciliation()} companies")
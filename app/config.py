@@ -111,6 +111,32 @@ class Settings(BaseSettings):
     # Redis (for caching/sessions)
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Analytics
+    ANALYTICS_TIMEZONE: str = "Asia/Dubai"  # Calendar used to bucket daily rollups
+    ANALYTICS_ROLLUP_ENABLED: bool = False  # Serve dashboard aggregates from the daily rollup (backfill first)
+    ANALYTICS_CACHE_ENABLED: bool = True  # Cache dashboard results per filter set until the next submission
+    ANALYTICS_CACHE_MAX_ENTRIES: int = 512
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300  # Upper bound on staleness for changes other than new submissions
+    ANALYTICS_SNAPSHOT_ENABLED: bool = False  # Serve the dashboard from an in-memory NumPy snapshot (requires numpy)
+    ANALYTICS_SNAPSHOT_REFRESH_SECONDS: int = 30
+    STATS_CACHE_TTL_SECONDS: int = 30  # Admin stats panels; 0 disables the cache
+    COMPANY_STATS_RECONCILE_MINUTES: int = 60  # Recount company totals from responses to correct drift
+    PRODUCT_CATALOG_TTL_SECONDS: int = 60  # Reload the in-memory product catalog (recommendations) after this long
+    
+    # Write-behind submission buffer (campaign bursts)
+    SUBMISSION_BUFFER_ENABLED: bool = False  # Stage Financial Clinic submits and save them in background batches
+    SUBMISSION_BUFFER_BATCH_SIZE: int = 200
+    SUBMISSION_BUFFER_FLUSH_SECONDS: int = 5
+    
+    # Background export jobs
+    EXPORT_JOB_STALE_MINUTES: int = 120  # Queued/running jobs older than this were lost to a restart and are marked failed
+    
+    # Query instrumentation
+    QUERY_STATS_REPEAT_THRESHOLD: int = 10  # Warn when one request runs the same statement more often than this
+    
+    # Idempotency-Key support (Financial Clinic submit and report email)
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24  # How long retries with the same Idempotency-Key replay the first response
+    
     # File Upload
     UPLOAD_DIR: str = "./uploads"
     DOWNLOAD_DIR: str = "./downloads"
@@ -1,6 +1,6 @@
 """API routes for consultation requests."""
 from datetime import datetime, timedelta
-from typing import Any, List, Optional
+from typing import Any, Iterator, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Body
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
@@ -11,6 +11,8 @@ import logging
 
 from app.database import get_db
 from app.models import ConsultationRequest, AuditLog
+from app.analytics.cache import cached_stats
+from app.analytics.filters import count_where
 from app.consultations.schemas import (
     ConsultationRequestCreate,
     ConsultationRequestUpdate, 
@@ -250,45 +252,33 @@ async def get_consultation_stats(
 ) -> Any:
     """Get consultation request statistics."""
     try:
-        # Total requests
-        total = db.query(ConsultationRequest).count()
-        
-        # Requests by status
-        pending = db.query(ConsultationRequest).filter(
-            ConsultationRequest.status == "pending"
-        ).count()
-        
-        contacted = db.query(ConsultationRequest).filter(
-            ConsultationRequest.status == "contacted"
-        ).count()
-        
-        scheduled = db.query(ConsultationRequest).filter(
-            ConsultationRequest.status == "scheduled"
-        ).count()
-        
-        completed = db.query(ConsultationRequest).filter(
-            ConsultationRequest.status == "completed"
-        ).count()
-        
-        # This week's requests (last 7 days)
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        this_week = db.query(ConsultationRequest).filter(
-            ConsultationRequest.created_at >= week_ago
-        ).count()
-        
-        # Conversion rate (scheduled + completed / total)
-        conversion_count = scheduled + completed
-        conversion_rate = (conversion_count / total * 100) if total > 0 else 0.0
-        
-        return ConsultationRequestStats(
-            total=total,
-            pending=pending,
-            contacted=contacted,
-            scheduled=scheduled,
-            completed=completed,
-            this_week=this_week,
-            conversion_rate=round(conversion_rate, 2)
-        )
+        def compute():
+            # Every count from one conditional-aggregate query
+            week_ago = datetime.utcnow() - timedelta(days=7)
+            stats = db.query(
+                func.count(ConsultationRequest.id).label('total'),
+                count_where(ConsultationRequest.status == "pending").label('pending'),
+                count_where(ConsultationRequest.status == "contacted").label('contacted'),
+                count_where(ConsultationRequest.status == "scheduled").label('scheduled'),
+                count_where(ConsultationRequest.status == "completed").label('completed'),
+                count_where(ConsultationRequest.created_at >= week_ago).label('this_week')
+            ).one()
+            
+            # Conversion rate (scheduled + completed / total)
+            conversion_count = stats.scheduled + stats.completed
+            conversion_rate = (conversion_count / stats.total * 100) if stats.total > 0 else 0.0
+            
+            return ConsultationRequestStats(
+                total=stats.total,
+                pending=stats.pending,
+                contacted=stats.contacted,
+                scheduled=stats.scheduled,
+                completed=stats.completed,
+                this_week=stats.this_week,
+                conversion_rate=round(conversion_rate, 2)
+            )
+        
+        return cached_stats(("consultation_stats",), compute)
         
     except Exception as e:
         logger.error(f"❌ Error getting consultation stats: {str(e)}")
@@ -412,6 +402,186 @@ async def delete_consultation_request(
         )
 
 
+CONSULTATION_EXPORT_HEADERS = [
+    # Consultation Request Fields
+    'Consultation ID', 'Consultation Status', 'Consultation Source',
+    'Preferred Contact Method', 'Preferred Time', 'Message',
+    'Consultation Created At', 'Contacted At', 'Scheduled At', 'Notes',
+
+    # Profile Information (matches Financial Clinic export)
+    'Profile ID', 'Name', 'Email', 'Mobile Number', 'Date of Birth', 'Age',
+    'Gender', 'Nationality', 'Emirate', 'Children',
+    'Employment Status', 'Income Range', 'Company',
+
+    # Assessment Results
+    'Response ID', 'Total Score', 'Status Band', 'Questions Answered', 'Total Questions',
+
+    # Category Scores
+    'Income Stream Score', 'Savings Habit Score', 'Debt Management Score',
+    'Retirement Planning Score', 'Financial Protection Score', 'Financial Knowledge Score',
+
+    # Submission Date
+    'Assessment Submission Date'
+]
+
+# Export column -> category_scores key (keys use spaces, not snake_case)
+CONSULTATION_EXPORT_CATEGORIES = (
+    'Income Stream',
+    'Savings Habit',
+    'Debt Management',
+    'Retirement Planning',
+    'Protecting Your Family',
+    'Emergency Savings',  # Exported as "Financial Knowledge Score"
+)
+
+
+def _calculate_age(dob_str):
+    """Age from a DOB string (DD/MM/YYYY or YYYY-MM-DD), or '' if it cannot be parsed."""
+    if not dob_str or dob_str.strip() == '':
+        return ''
+    for date_format in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            dob = datetime.strptime(dob_str.strip(), date_format)
+        except ValueError:
+            continue
+        today = datetime.today()
+        return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+    return ''
+
+
+def _category_score(category_scores, category_name):
+    """Rounded score for one category from a category_scores JSON value (0 if missing)."""
+    if not category_scores:
+        return 0
+    try:
+        if isinstance(category_scores, dict):
+            category_data = category_scores.get(category_name, {})
+            if isinstance(category_data, dict):
+                return round(category_data.get('score', 0), 2)
+            # Fallback: check if it's stored differently
+            elif isinstance(category_data, (int, float)):
+                return round(float(category_data), 2)
+        return 0
+    except Exception as e:
+        logger.warning(f"Error extracting category score for {category_name}: {e}")
+        return 0
+
+
+def consultation_export_query(
+    db: Session,
+    status: Optional[str] = None,
+    source: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None
+):
+    """
+    Consultation requests joined with the requester's Financial Clinic profile and latest response.
+
+    Args:
+        db: Database session
+        status: Only requests with this status
+        source: Only requests from this source
+        date_from: ISO date/datetime lower bound on created_at
+        date_to: ISO date/datetime upper bound on created_at
+
+    Returns:
+        Query yielding (ConsultationRequest, profile or None, response or None), newest first
+    """
+    from app.models import FinancialClinicProfile, FinancialClinicResponse
+
+    # First, get the most recent response ID for each profile
+    subquery = db.query(
+        FinancialClinicResponse.profile_id,
+        func.max(FinancialClinicResponse.id).label('max_response_id')
+    ).group_by(FinancialClinicResponse.profile_id).subquery()
+
+    # Join to get the most recent response for each profile
+    query = db.query(
+        ConsultationRequest,
+        FinancialClinicProfile,
+        FinancialClinicResponse
+    ).outerjoin(
+        FinancialClinicProfile,
+        ConsultationRequest.email == FinancialClinicProfile.email
+    ).outerjoin(
+        subquery,
+        FinancialClinicProfile.id == subquery.c.profile_id
+    ).outerjoin(
+        FinancialClinicResponse,
+        and_(
+            FinancialClinicResponse.id == subquery.c.max_response_id,
+            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+        )
+    )
+
+    if status:
+        query = query.filter(ConsultationRequest.status == status)
+
+    if source:
+        query = query.filter(ConsultationRequest.source == source)
+
+    if date_from:
+        query = query.filter(ConsultationRequest.created_at >= datetime.fromisoformat(date_from))
+
+    if date_to:
+        query = query.filter(ConsultationRequest.created_at <= datetime.fromisoformat(date_to))
+
+    return query.order_by(desc(ConsultationRequest.created_at), desc(ConsultationRequest.id))
+
+
+def consultation_export_row(request, profile, response) -> List[Any]:
+    """One export line, in CONSULTATION_EXPORT_HEADERS order, from a consultation_export_query() row."""
+    category_scores = response.category_scores if response else None
+
+    return [
+        # Consultation Request Data
+        request.id,
+        request.status,
+        request.source,
+        request.preferred_contact_method,
+        request.preferred_time or '',
+        request.message or '',
+        request.created_at.strftime('%Y-%m-%d %H:%M:%S') if request.created_at else '',
+        request.contacted_at.strftime('%Y-%m-%d %H:%M:%S') if request.contacted_at else '',
+        request.scheduled_at.strftime('%Y-%m-%d %H:%M:%S') if request.scheduled_at else '',
+        request.notes or '',
+
+        # Profile Data
+        profile.id if profile else '',
+        profile.name if profile else request.name,
+        profile.email if profile else request.email,
+        profile.mobile_number if profile else request.phone_number,
+        profile.date_of_birth if profile else '',
+        _calculate_age(profile.date_of_birth) if profile and profile.date_of_birth else '',
+        profile.gender if profile else '',
+        profile.nationality if profile else '',
+        profile.emirate if profile else '',
+        profile.children if profile else '',
+        profile.employment_status if profile else '',
+        profile.income_range if profile else '',
+        '',  # Company (from company_tracker_id if available)
+
+        # Assessment Results
+        response.id if response else '',
+        round(response.total_score, 2) if response else '',
+        response.status_band if response else '',
+        response.questions_answered if response else '',
+        response.total_questions if response else '',
+
+        # Category Scores
+        *[_category_score(category_scores, category) for category in CONSULTATION_EXPORT_CATEGORIES],
+
+        # Submission Date
+        response.created_at.strftime('%Y-%m-%d %H:%M:%S') if response and response.created_at else ''
+    ]
+
+
+def iter_consultation_export_rows(query, batch_size: int = 1000) -> Iterator[List[Any]]:
+    """Format consultation_export_query() rows as they are fetched, batch_size at a time."""
+    for request, profile, response in query.yield_per(batch_size):
+        yield consultation_export_row(request, profile, response)
+
+
 @router.get("/admin/export")
 async def export_consultation_requests_csv(
     status: Optional[str] = Query(None),
@@ -423,184 +593,17 @@ async def export_consultation_requests_csv(
 ) -> StreamingResponse:
     """Export consultation requests as CSV with comprehensive Financial Clinic data (admin only)."""
     try:
-        from app.models import FinancialClinicProfile, FinancialClinicResponse
-        from sqlalchemy import and_
-        from sqlalchemy.sql import func
-        
-        # First, get the most recent response ID for each profile
-        subquery = db.query(
-            FinancialClinicResponse.profile_id,
-            func.max(FinancialClinicResponse.id).label('max_response_id')
-        ).group_by(FinancialClinicResponse.profile_id).subquery()
-        
-        # Build query with filters - join with Financial Clinic data
-        # Join to get the most recent response for each profile
-        query = db.query(
-            ConsultationRequest,
-            FinancialClinicProfile,
-            FinancialClinicResponse
-        ).outerjoin(
-            FinancialClinicProfile,
-            ConsultationRequest.email == FinancialClinicProfile.email
-        ).outerjoin(
-            subquery,
-            FinancialClinicProfile.id == subquery.c.profile_id
-        ).outerjoin(
-            FinancialClinicResponse,
-            and_(
-                FinancialClinicResponse.id == subquery.c.max_response_id,
-                FinancialClinicResponse.profile_id == FinancialClinicProfile.id
-            )
-        )
-        
-        if status:
-            query = query.filter(ConsultationRequest.status == status)
-        
-        if source:
-            query = query.filter(ConsultationRequest.source == source)
-        
-        if date_from:
-            date_from_dt = datetime.fromisoformat(date_from)
-            query = query.filter(ConsultationRequest.created_at >= date_from_dt)
-        
-        if date_to:
-            date_to_dt = datetime.fromisoformat(date_to)
-            query = query.filter(ConsultationRequest.created_at <= date_to_dt)
-        
-        # Get all matching requests with their related data
-        results = query.order_by(desc(ConsultationRequest.created_at)).all()
-        
+        query = consultation_export_query(db, status, source, date_from, date_to)
+
         # Create CSV content
         output = io.StringIO()
         writer = csv.writer(output)
-        
-        # Write comprehensive header matching the reference CSV structure
-        writer.writerow([
-            # Consultation Request Fields
-            'Consultation ID', 'Consultation Status', 'Consultation Source',
-            'Preferred Contact Method', 'Preferred Time', 'Message',
-            'Consultation Created At', 'Contacted At', 'Scheduled At', 'Notes',
-            
-            # Profile Information (matches Financial Clinic export)
-            'Profile ID', 'Name', 'Email', 'Mobile Number', 'Date of Birth', 'Age',
-            'Gender', 'Nationality', 'Emirate', 'Children',
-            'Employment Status', 'Income Range', 'Company',
-            
-            # Assessment Results
-            'Response ID', 'Total Score', 'Status Band', 'Questions Answered', 'Total Questions',
-            
-            # Category Scores
-            'Income Stream Score', 'Savings Habit Score', 'Debt Management Score',
-            'Retirement Planning Score', 'Financial Protection Score', 'Financial Knowledge Score',
-            
-            # Submission Date
-            'Assessment Submission Date'
-        ])
-        
-        # Helper function to calculate age from DOB string (DD/MM/YYYY)
-        def calculate_age(dob_str):
-            if not dob_str or dob_str.strip() == '':
-                return ''
-            try:
-                from datetime import datetime
-                # Try DD/MM/YYYY format first
-                dob = datetime.strptime(dob_str.strip(), '%d/%m/%Y')
-                today = datetime.today()
-                age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                return age
-            except ValueError:
-                # Try YYYY-MM-DD format (ISO format)
-                try:
-                    dob = datetime.strptime(dob_str.strip(), '%Y-%m-%d')
-                    today = datetime.today()
-                    age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-                    return age
-                except:
-                    return ''
-            except:
-                return ''
-        
-        # Helper function to get category score from JSON
-        def get_category_score(category_scores, category_name):
-            if not category_scores:
-                return 0
-            try:
-                # category_scores is stored as JSON with structure like:
-                # {"income_stream": {"score": 10, ...}, "savings_habit": {...}, ...}
-                if isinstance(category_scores, dict):
-                    category_data = category_scores.get(category_name, {})
-                    if isinstance(category_data, dict):
-                        return round(category_data.get('score', 0), 2)
-                    # Fallback: check if it's stored differently
-                    elif isinstance(category_data, (int, float)):
-                        return round(float(category_data), 2)
-                return 0
-            except Exception as e:
-                logger.warning(f"Error extracting category score for {category_name}: {e}")
-                return 0
-        
-        # Write data rows
-        for request, profile, response in results:
-            # Debug logging for first record
-            if request.id == results[0][0].id and response:
-                logger.info(f"🔍 Debug - Response ID: {response.id}, category_scores type: {type(response.category_scores)}")
-                logger.info(f"🔍 Debug - category_scores content: {response.category_scores}")
-            
-            # Extract category scores if response exists
-            # NOTE: Category keys use spaces, not snake_case (e.g., "Income Stream" not "income_stream")
-            income_stream_score = get_category_score(response.category_scores if response else None, 'Income Stream')
-            savings_habit_score = get_category_score(response.category_scores if response else None, 'Savings Habit')
-            debt_management_score = get_category_score(response.category_scores if response else None, 'Debt Management')
-            retirement_planning_score = get_category_score(response.category_scores if response else None, 'Retirement Planning')
-            financial_protection_score = get_category_score(response.category_scores if response else None, 'Protecting Your Family')
-            financial_knowledge_score = get_category_score(response.category_scores if response else None, 'Emergency Savings')
-            
-            writer.writerow([
-                # Consultation Request Data
-                request.id,
-                request.status,
-                request.source,
-                request.preferred_contact_method,
-                request.preferred_time or '',
-                request.message or '',
-                request.created_at.strftime('%Y-%m-%d %H:%M:%S') if request.created_at else '',
-                request.contacted_at.strftime('%Y-%m-%d %H:%M:%S') if request.contacted_at else '',
-                request.scheduled_at.strftime('%Y-%m-%d %H:%M:%S') if request.scheduled_at else '',
-                request.notes or '',
-                
-                # Profile Data
-                profile.id if profile else '',
-                profile.name if profile else request.name,
-                profile.email if profile else request.email,
-                profile.mobile_number if profile else request.phone_number,
-                profile.date_of_birth if profile else '',
-                calculate_age(profile.date_of_birth) if profile and profile.date_of_birth else '',
-                profile.gender if profile else '',
-                profile.nationality if profile else '',
-                profile.emirate if profile else '',
-                profile.children if profile else '',
-                profile.employment_status if profile else '',
-                profile.income_range if profile else '',
-                '',  # Company (from company_tracker_id if available)
-                
-                # Assessment Results
-                response.id if response else '',
-                round(response.total_score, 2) if response else '',
-                response.status_band if response else '',
-                response.questions_answered if response else '',
-                response.total_questions if response else '',
-                
-                # Category Scores
-                income_stream_score,
-                savings_habit_score,
-                debt_management_score,
-                retirement_planning_score,
-                financial_protection_score,
-                financial_knowledge_score,
-                
-                # Submission Date
-                response.created_at.strftime('%Y-%m-%d %H:%M:%S') if response and response.created_at else ''
-            ])
+        writer.writerow(CONSULTATION_EXPORT_HEADERS)
+
+        exported_count = 0
+        for row in iter_consultation_export_rows(query):
+            writer.writerow(row)
+            exported_count += 1
         
         # Log the export
         audit_log = AuditLog(
@@ -608,7 +611,7 @@ async def export_consultation_requests_csv(
             action="consultation_requests_exported",
             entity_type="consultation_request",
             details={
-                "exported_count": len(results),
+                "exported_count": exported_count,
                 "filters": {
                     "status": status,
                     "source": source,
@@ -629,7 +632,7 @@ async def export_consultation_requests_csv(
         timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
         filename = f"consultation_leads_comprehensive_{timestamp}.csv"
         
-        logger.info(f"✅ Comprehensive consultation leads exported by {current_user.email}: {len(results)} records")
+        logger.info(f"✅ Comprehensive consultation leads exported by {current_user.email}: {exported_count} records")
         
         return StreamingResponse(
             io.BytesIO(output.getvalue().encode('utf-8')),
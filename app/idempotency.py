@@ -0,0 +1,150 @@
+"""
+Idempotency-Key handling for endpoints that clients retry.
+
+A client may send an Idempotency-Key header (e.g. a UUID per submission).
+The first request with a key claims it and runs; its response is stored in
+the idempotency_keys table and replayed to every retry with the same key
+until IDEMPOTENCY_KEY_TTL_HOURS pass, so retries do not write, render or
+email again.
+
+- A retry while the first request is still running gets 409.
+- Reusing a key with a different request body gets 422.
+- A request that fails releases its key, so a retry runs again. A claim left
+  by a crashed worker expires after PROCESSING_TIMEOUT.
+
+Expired keys are deleted by a scheduled job:
+
+    python -m app.idempotency
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+
+# A claim not completed within this long is treated as abandoned
+PROCESSING_TIMEOUT = timedelta(minutes=5)
+
+
+def request_fingerprint(body: Dict[str, Any]) -> str:
+    """SHA-256 of the request body, independent of key order."""
+    encoded = json.dumps(jsonable_encoder(body), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def claim_idempotency_key(db: Session, scope: str, key: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """
+    Claim a key for this request, or return the response stored for it.
+
+    Commits the claim, so it must run before the request's own writes.
+
+    Returns:
+        The stored response to replay, or None when the caller should process the request
+
+    Raises:
+        HTTPException: 409 while another request holds the key, 422 if the key was used with another body
+    """
+    now = datetime.utcnow()
+
+    # An expired result or abandoned claim no longer holds the key
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.key == key,
+        IdempotencyKey.expires_at <= now
+    ).delete(synchronize_session=False)
+
+    db.add(IdempotencyKey(
+        scope=scope,
+        key=key,
+        request_hash=fingerprint,
+        status="processing",
+        expires_at=now + PROCESSING_TIMEOUT
+    ))
+    try:
+        db.commit()
+        return None
+    except IntegrityError:
+        db.rollback()
+
+    existing = db.query(IdempotencyKey).filter(
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.key == key
+    ).first()
+    if existing is None:
+        # Released between our insert and this read; the client can simply retry
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is being processed")
+    if existing.request_hash != fingerprint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request")
+    if existing.status != "completed":
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is being processed")
+
+    logger.info(f"🔁 Replaying {scope} response for Idempotency-Key {key}")
+    return existing.response
+
+
+def complete_idempotency_key(db: Session, scope: str, key: str, response: Dict[str, Any]) -> None:
+    """Store the response to replay for this key (caller commits)."""
+    db.query(IdempotencyKey).filter(
+        IdempotencyKey.scope == scope,
+        IdempotencyKey.key == key
+    ).update({
+        IdempotencyKey.status: "completed",
+        IdempotencyKey.response: jsonable_encoder(response),
+        IdempotencyKey.expires_at: datetime.utcnow() + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+    }, synchronize_session=False)
+
+
+def release_idempotency_key(db: Session, scope: str, key: str) -> None:
+    """Drop an unfinished claim so a retry processes the request again."""
+    try:
+        db.query(IdempotencyKey).filter(
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            IdempotencyKey.status == "processing"
+        ).delete(synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"❌ Error releasing Idempotency-Key {key}: {e}")
+
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+    """Delete expired keys (caller commits). Returns the number deleted."""
+    return db.query(IdempotencyKey).filter(
+        IdempotencyKey.expires_at <= datetime.utcnow()
+    ).delete(synchronize_session=False)
+
+
+def run_idempotency_key_purge() -> int:
+    """Scheduled job: purge expired keys in a session of its own."""
+    db = SessionLocal()
+    try:
+        purged = purge_expired_idempotency_keys(db)
+        db.commit()
+        logger.info(f"✅ Purged {purged} expired idempotency keys")
+        return purged
+    except Exception as e:
+        logger.error(f"❌ Error purging idempotency keys: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Purged {run_idempotency_key_purge()} expired idempotency keys")
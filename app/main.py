@@ -8,6 +8,7 @@ import time
 from app.config import settings
 from app.database import engine, Base
 from app.logging_config import setup_logging, get_logger, ExceptionLogger
+from app.query_stats import track_queries
 from app.auth.routes import router as auth_router
 from app.customers.routes import router as customers_router
 from app.surveys.routes import router as surveys_router
@@ -23,6 +24,7 @@ from app.admin.variation_set_routes import router as admin_variation_set_router
 from app.admin.demographic_rule_routes import router as admin_demographic_rule_router
 from app.admin.localization_routes import router as admin_localization_router
 from app.admin.simple_routes import simple_admin_router
+from app.admin.export_job_routes import router as admin_export_job_router
 from app.surveys.financial_clinic_routes import router as financial_clinic_router
 from app.consent.routes import router as consent_router
 from app.consultations.routes import router as consultations_router
@@ -67,15 +69,25 @@ async def log_requests(request: Request, call_next):
     # Log request
     logger.info(f"{request.method} {request.url.path} - {request.client.host}")
     
-    # Process request
-    response = await call_next(request)
+    # Process request, counting the SQL statements it runs
+    with track_queries() as query_stats:
+        response = await call_next(request)
     
     # Calculate and log response time
     process_time = time.time() - start_time
-    logger.info(f"{request.method} {request.url.path} - {response.status_code} - {process_time:.4f}s")
+    logger.info(
+        f"{request.method} {request.url.path} - {response.status_code} - {process_time:.4f}s"
+        f" - {query_stats.count} queries in {query_stats.duration:.4f}s"
+    )
+    
+    # Repeated statement templates usually mean a per-row lookup (N+1)
+    for template, count in query_stats.repeated(settings.QUERY_STATS_REPEAT_THRESHOLD):
+        logger.warning(f"{request.method} {request.url.path} ran the same statement {count} times: {template[:300]}")
     
-    # Add response time header
+    # Add response time and query headers (statements run while streaming the body are not included)
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-DB-Query-Count"] = str(query_stats.count)
+    response.headers["X-DB-Time"] = f"{query_stats.duration:.6f}"
     
     return response
 
@@ -170,6 +182,7 @@ app.include_router(admin_variation_set_router, prefix="/api/v1")
 app.include_router(admin_demographic_rule_router, prefix="/api/v1")
 app.include_router(admin_localization_router, prefix="/api/v1")
 app.include_router(simple_admin_router, prefix="/api/v1")
+app.include_router(admin_export_job_router, prefix="/api/v1")
 from app.admin import variation_routes
 app.include_router(variation_routes.router, prefix="/api/v1")
 
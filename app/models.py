@@ -1,7 +1,7 @@
 """Database models for the UAE Financial Health Check application."""
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String, Text, JSON, Index
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, Float, ForeignKey, Integer, String, Text, JSON, Index, literal_column, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -191,6 +191,7 @@ class CompanyTracker(Base):
     
     # Statistics
     total_assessments = Column(Integer, default=0)
+    total_score_sum = Column(Float, default=0.0)  # Running sum; average_score = total_score_sum / total_assessments
     average_score = Column(Float, nullable=True)
     
     # Settings
@@ -334,6 +335,36 @@ class AuditLog(Base):
     user = relationship("User")
 
 
+class ExportJob(Base):
+    """Admin export run in the background and stored as a gzip-compressed file."""
+    __tablename__ = "export_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # What to export
+    export_type = Column(String(50), nullable=False)  # responses, financial_clinic, consultations, incomplete_surveys
+    file_format = Column(String(10), nullable=False, default="csv")  # csv, xlsx
+    params = Column(JSON, nullable=True)
+
+    # Progress
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, completed, failed
+    rows_processed = Column(Integer, nullable=False, default=0)
+    error_message = Column(Text, nullable=True)
+
+    # Artifact
+    storage = Column(String(10), nullable=True)  # local, s3
+    file_key = Column(String(500), nullable=True)
+    file_size = Column(BigInteger, nullable=True)  # Compressed size in bytes
+
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    creator = relationship("User")
+
+
 class QuestionVariation(Base):
     """Different variations of questions for demographic/company customization."""
     __tablename__ = "question_variations"
@@ -627,6 +658,7 @@ class FinancialClinicProfile(Base):
     # Required Personal Information
     name = Column(String(200), nullable=False)
     date_of_birth = Column(String(20), nullable=False)  # Format: DD/MM/YYYY
+    birth_date = Column(Date, nullable=True, index=True)  # Parsed date_of_birth, used for SQL age filters
     gender = Column(String(20), nullable=False, index=True)  # Male, Female
     nationality = Column(String(50), nullable=False, index=True)  # Emirati, Non-Emirati
     
@@ -644,12 +676,32 @@ class FinancialClinicProfile(Base):
     email = Column(String(255), nullable=False, index=True)
     mobile_number = Column(String(20), nullable=True)
     
+    # Normalized copies for admin search (see app.analytics.search)
+    search_text = Column(String(500), nullable=True)  # "<name> <email> <mobile digits>", case-folded
+    email_normalized = Column(String(255), nullable=True)  # Stripped, lower-cased email
+    mobile_reversed = Column(String(20), nullable=True)  # Mobile digits reversed, for suffix lookups
+    
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     survey_responses = relationship("FinancialClinicResponse", back_populates="profile")
+    
+    __table_args__ = (
+        # Prefix and equality lookups; varchar_pattern_ops lets PostgreSQL use them for LIKE 'x%'
+        Index('idx_fc_profiles_search_text', 'search_text', postgresql_ops={'search_text': 'varchar_pattern_ops'}),
+        Index('idx_fc_profiles_email_normalized', 'email_normalized',
+              postgresql_ops={'email_normalized': 'varchar_pattern_ops'}),
+        # One profile per non-empty email; submits upsert against it (app.surveys.financial_clinic_profiles)
+        Index('uq_fc_profiles_email_normalized', 'email_normalized', unique=True,
+              postgresql_where=text("email_normalized <> ''"), sqlite_where=text("email_normalized <> ''")),
+        Index('idx_fc_profiles_mobile_reversed', 'mobile_reversed',
+              postgresql_ops={'mobile_reversed': 'varchar_pattern_ops'}),
+        # Substring search (requires the pg_trgm extension)
+        Index('idx_fc_profiles_search_text_trgm', 'search_text', postgresql_using='gin',
+              postgresql_ops={'search_text': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
 
 
 class FinancialClinicResponse(Base):
@@ -686,6 +738,160 @@ class FinancialClinicResponse(Base):
     # Relationships
     profile = relationship("FinancialClinicProfile", back_populates="survey_responses")
     company_tracker = relationship("CompanyTracker")
+    category_score_rows = relationship(
+        "FinancialClinicCategoryScore",
+        back_populates="response",
+        cascade="all, delete-orphan"
+    )
+    answer_rows = relationship(
+        "FinancialClinicAnswer",
+        back_populates="response",
+        cascade="all, delete-orphan"
+    )
+    
+    __table_args__ = (
+        # Keyset pagination of submission listings (see app.pagination)
+        Index('idx_fc_responses_created_id', 'created_at', 'id'),
+        Index('idx_fc_responses_company_created_id', 'company_tracker_id', 'created_at', 'id'),
+    )
+
+
+class FinancialClinicCategoryScore(Base):
+    """
+    Per-category score of a Financial Clinic response.
+    Normalized copy of FinancialClinicResponse.category_scores so category
+    analytics aggregate in SQL instead of walking the JSON of every response.
+    """
+    __tablename__ = "financial_clinic_category_scores"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    response_id = Column(
+        Integer,
+        ForeignKey("financial_clinic_responses.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    category = Column(String(50), nullable=False)  # Income Stream, Savings Habit, etc.
+    score = Column(Float, nullable=False)
+    max_possible = Column(Float, nullable=True)
+    status_level = Column(String(20), nullable=True)  # at_risk, good, excellent
+    
+    # Relationships
+    response = relationship("FinancialClinicResponse", back_populates="category_score_rows")
+    
+    __table_args__ = (
+        Index('idx_fc_category_scores_response_category', 'response_id', 'category', unique=True),
+    )
+
+
+class FinancialClinicAnswer(Base):
+    """
+    One answer of a Financial Clinic response (fact table).
+    Normalized copy of FinancialClinicResponse.answers, carrying the respondent's
+    nationality and company so question-level analytics are a single GROUP BY.
+    """
+    __tablename__ = "financial_clinic_answers"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    response_id = Column(
+        Integer,
+        ForeignKey("financial_clinic_responses.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    question_id = Column(String(50), nullable=False)  # e.g., "fc_q1"
+    value = Column(Integer, nullable=False)
+    nationality = Column(String(50), nullable=True)  # Kept in step with the profile
+    company_tracker_id = Column(Integer, ForeignKey("company_trackers.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())  # Response submission time
+    
+    # Relationships
+    response = relationship("FinancialClinicResponse", back_populates="answer_rows")
+    
+    __table_args__ = (
+        Index('idx_fc_answers_response_question', 'response_id', 'question_id', unique=True),
+        Index('idx_fc_answers_question_nationality', 'question_id', 'nationality'),
+        Index('idx_fc_answers_company_question', 'company_tracker_id', 'question_id'),
+    )
+
+
+class FinancialClinicDailyRollup(Base):
+    """
+    Pre-aggregated Financial Clinic submissions per day and demographic slice.
+    Maintained incrementally on submit (see app.analytics.rollup) so dashboard
+    queries over long date ranges read a few thousand rows instead of every response.
+    """
+    __tablename__ = "financial_clinic_daily_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Rollup key
+    day = Column(Date, nullable=False, index=True)  # Calendar day in ANALYTICS_TIMEZONE
+    company_tracker_id = Column(Integer, ForeignKey("company_trackers.id"), nullable=True, index=True)
+    gender = Column(String(20), nullable=True)
+    nationality = Column(String(50), nullable=True)
+    emirate = Column(String(100), nullable=True)
+    employment_status = Column(String(50), nullable=True)
+    income_range = Column(String(50), nullable=True)
+    children_bucket = Column(String(5), nullable=True)  # 0, 1, 2, 3, 4, 5+
+    age_bucket = Column(String(10), nullable=True)  # < 18, 18-25, ..., 60+, Unknown
+    status_band = Column(String(50), nullable=True)
+    
+    # Aggregates
+    response_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    score_sq_sum = Column(Float, nullable=False, default=0.0)
+    income_stream_sum = Column(Float, nullable=False, default=0.0)
+    savings_habit_sum = Column(Float, nullable=False, default=0.0)
+    emergency_savings_sum = Column(Float, nullable=False, default=0.0)
+    debt_management_sum = Column(Float, nullable=False, default=0.0)
+    retirement_planning_sum = Column(Float, nullable=False, default=0.0)
+    protecting_family_sum = Column(Float, nullable=False, default=0.0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('idx_fc_rollup_day_company', 'day', 'company_tracker_id'),
+    )
+
+
+# One rollup row per key. NULL dimensions are coalesced to sentinels so they
+# compare equal; app.analytics.rollup upserts against exactly these expressions.
+# The sentinels are inline literals: ON CONFLICT only matches the index if its
+# target renders the same expressions, not bound parameters.
+Index(
+    'uq_fc_rollup_key',
+    FinancialClinicDailyRollup.day,
+    func.coalesce(FinancialClinicDailyRollup.company_tracker_id, literal_column("-1")),
+    *(
+        func.coalesce(getattr(FinancialClinicDailyRollup, dimension), literal_column("'<null>'"))
+        for dimension in (
+            'gender', 'nationality', 'emirate', 'employment_status', 'income_range',
+            'children_bucket', 'age_bucket', 'status_band'
+        )
+    ),
+    unique=True
+)
+
+
+class FinancialClinicPendingSubmission(Base):
+    """
+    Scored Financial Clinic submission waiting in the write-behind buffer.
+    Staged by the submit endpoint when SUBMISSION_BUFFER_ENABLED and saved in
+    batches by app.surveys.financial_clinic_submissions.flush_pending_submissions.
+    """
+    __tablename__ = "financial_clinic_pending_submissions"
+
+    id = Column(Integer, primary_key=True, index=True)  # Provisional id returned to the client
+    submission = Column(JSON, nullable=False)  # Submit request body (answers, profile, company_url)
+    result = Column(JSON, nullable=False)  # Calculated results
+    status = Column(String(20), nullable=False, default="pending")  # pending, saved, failed
+    response_id = Column(Integer, ForeignKey("financial_clinic_responses.id", ondelete="SET NULL"), nullable=True)
+    error = Column(Text, nullable=True)
+    submitted_at = Column(DateTime, nullable=False)  # UTC, becomes the response's created_at
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('idx_fc_pending_status_id', 'status', 'id'),
+    )
 
 
 class OTPCode(Base):
@@ -702,6 +908,27 @@ class OTPCode(Base):
     used_at = Column(DateTime(timezone=True), nullable=True)
 
 
+class IdempotencyKey(Base):
+    """
+    Outcome of a request sent with an Idempotency-Key header (see app.idempotency).
+    Retries with the same key get the stored response instead of repeating the work.
+    """
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    scope = Column(String(50), nullable=False)  # Endpoint the key was used with
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)  # SHA-256 of the request body
+    status = Column(String(20), nullable=False, default="processing")  # processing, completed
+    response = Column(JSON, nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # UTC
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('uq_idempotency_keys_scope_key', 'scope', 'key', unique=True),
+    )
+
+
 class ConsultationRequest(Base):
     """Consultation requests from users who want to book a free consultation."""
     __tablename__ = "consultation_requests"
@@ -0,0 +1,84 @@
+"""
+Keyset (cursor) pagination over (created_at, id), newest first.
+
+Instead of OFFSET, which reads and discards every earlier row, each page
+continues strictly after the last row of the previous one:
+
+    WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC
+
+With an index on (created_at, id) — or (company_tracker_id, created_at, id)
+for per-company listings — any page is a single index range scan. The
+position is handed to clients as an opaque URL-safe cursor token.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import literal, tuple_
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor token for the position just after (created_at, row_id)."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Position encoded by encode_cursor().
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_page(
+    query,
+    created_column,
+    id_column,
+    cursor: Optional[str],
+    page_size: int,
+    key: Callable[[Any], Tuple[datetime, int]],
+    offset: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of a query ordered newest first, continuing after a cursor.
+
+    Args:
+        query: Filtered query (unordered)
+        created_column: created_at column to page on
+        id_column: Primary key column breaking created_at ties
+        cursor: Token from the previous page, or None for the first page
+        page_size: Rows per page
+        key: Extracts (created_at, id) from a result row
+        offset: Rows to skip when there is no cursor (numbered pages of legacy clients)
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # Typed literals, so the position is bound the way the columns are stored
+        position = tuple_(literal(created_at, created_column.type), literal(row_id, id_column.type))
+        query = query.filter(tuple_(created_column, id_column) < position)
+
+    query = query.order_by(created_column.desc(), id_column.desc())
+    if offset and not cursor:
+        query = query.offset(offset)
+    rows = query.limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(*key(rows[-1]))
+    return rows, next_cursor
@@ -0,0 +1,79 @@
+"""
+Per-request SQL statement counting.
+
+Listeners on every SQLAlchemy Engine record each statement executed while a
+QueryStats collector is active in the current context. The request middleware
+activates one per request and reports the totals as X-DB-Query-Count and
+X-DB-Time headers; tests can activate one directly with track_queries().
+
+Statements are grouped by template (whitespace collapsed, literals and IN
+lists folded), so a loop issuing the same lookup per row — an N+1 — shows up
+as one template with a high count.
+"""
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+def statement_template(statement: str) -> str:
+    """Statement with literals and IN lists replaced by placeholders."""
+    template = _WHITESPACE.sub(" ", statement).strip()
+    template = _IN_LIST.sub("IN (?)", template)
+    template = _STRING_LITERAL.sub("?", template)
+    return _NUMBER_LITERAL.sub("?", template)
+
+
+class QueryStats:
+    """Statements and database time recorded for one unit of work."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.templates: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.templates[statement_template(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Templates executed more than threshold times, most frequent first."""
+        return [(template, count) for template, count in self.templates.most_common() if count > threshold]
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in this context (and tasks/threads it spawns)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_stats_start")
+    if stats is not None and starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
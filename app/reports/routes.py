@@ -339,51 +339,45 @@ async def get_delivery_stats(
     
     try:
         from app.models import ReportDelivery
-        from sqlalchemy import func
+        from sqlalchemy import func, and_
+        from app.analytics.cache import cached_stats
+        from app.analytics.filters import count_where
         
-        # Get delivery statistics
-        total_deliveries = db.query(ReportDelivery).count()
-        
-        email_deliveries = db.query(ReportDelivery).filter(
-            ReportDelivery.delivery_type == 'email'
-        ).count()
-        
-        pdf_downloads = db.query(ReportDelivery).filter(
-            ReportDelivery.delivery_type == 'pdf_download'
-        ).count()
-        
-        successful_emails = db.query(ReportDelivery).filter(
-            ReportDelivery.delivery_type == 'email',
-            ReportDelivery.delivery_status == 'sent'
-        ).count()
-        
-        failed_emails = db.query(ReportDelivery).filter(
-            ReportDelivery.delivery_type == 'email',
-            ReportDelivery.delivery_status == 'failed'
-        ).count()
-        
-        # Language distribution
-        language_stats = db.query(
-            ReportDelivery.language,
-            func.count(ReportDelivery.id)
-        ).group_by(ReportDelivery.language).all()
-        
-        return {
-            "success": True,
-            "stats": {
-                "total_deliveries": total_deliveries,
-                "email_deliveries": email_deliveries,
-                "pdf_downloads": pdf_downloads,
-                "successful_emails": successful_emails,
-                "failed_emails": failed_emails,
-                "email_success_rate": round(
-                    (successful_emails / email_deliveries * 100) if email_deliveries > 0 else 0, 2
-                ),
-                "language_distribution": {
-                    lang: count for lang, count in language_stats
+        def compute():
+            # One grouped conditional-aggregate query; overall counts are the
+            # sums of the per-language rows
+            is_email = ReportDelivery.delivery_type == 'email'
+            language_rows = db.query(
+                ReportDelivery.language,
+                func.count(ReportDelivery.id).label('total'),
+                count_where(is_email).label('email'),
+                count_where(ReportDelivery.delivery_type == 'pdf_download').label('pdf'),
+                count_where(and_(is_email, ReportDelivery.delivery_status == 'sent')).label('sent'),
+                count_where(and_(is_email, ReportDelivery.delivery_status == 'failed')).label('failed')
+            ).group_by(ReportDelivery.language).all()
+            
+            total_deliveries = sum(row.total for row in language_rows)
+            email_deliveries = sum(row.email for row in language_rows)
+            successful_emails = sum(row.sent for row in language_rows)
+            
+            return {
+                "success": True,
+                "stats": {
+                    "total_deliveries": total_deliveries,
+                    "email_deliveries": email_deliveries,
+                    "pdf_downloads": sum(row.pdf for row in language_rows),
+                    "successful_emails": successful_emails,
+                    "failed_emails": sum(row.failed for row in language_rows),
+                    "email_success_rate": round(
+                        (successful_emails / email_deliveries * 100) if email_deliveries > 0 else 0, 2
+                    ),
+                    "language_distribution": {
+                        row.language: row.total for row in language_rows
+                    }
                 }
             }
-        }
+        
+        return cached_stats(("delivery_stats",), compute)
         
     except Exception as e:
         raise HTTPException(
@@ -88,7 +88,48 @@ class S3StorageService:
         except Exception as e:
             logger.error(f"❌ Unexpected error during S3 upload: {e}")
             return None
-    
+
+    def upload_file(
+        self,
+        file_path: str,
+        file_key: str,
+        content_type: str,
+        metadata: Optional[dict] = None
+    ) -> bool:
+        """
+        Upload a file from disk to S3 (multipart for large files).
+
+        The object is not given a public URL; hand out generate_presigned_url() links instead.
+
+        Args:
+            file_path: Path of the local file
+            file_key: S3 object key (filename with path)
+            content_type: Content-Type stored with the object
+            metadata: Optional metadata to attach to the file
+
+        Returns:
+            True if upload successful, False otherwise
+        """
+        if not self.use_s3 or not self.s3_client:
+            logger.warning("S3 storage not enabled, skipping upload")
+            return False
+
+        extra_args = {'ContentType': content_type}
+        if metadata:
+            extra_args['Metadata'] = {k: str(v) for k, v in metadata.items()}
+
+        try:
+            self.s3_client.upload_file(file_path, self.bucket_name, file_key, ExtraArgs=extra_args)
+            logger.info(f"✅ File uploaded to S3: {file_key}")
+            return True
+
+        except ClientError as e:
+            logger.error(f"❌ S3 upload failed: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"❌ Unexpected error during S3 upload: {e}")
+            return False
+
     def generate_presigned_url(
         self,
         file_key: str,
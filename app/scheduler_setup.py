@@ -1,6 +1,7 @@
 """APScheduler setup for background task scheduling."""
 import logging
 import os
+from datetime import datetime
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
@@ -68,6 +69,52 @@ def init_scheduler():
         scheduler.start()
         logger.info("✅ APScheduler initialized and started")
         
+        # Periodically correct drift in the running company statistics
+        scheduler.add_job(
+            'app.companies.stats:run_company_stats_reconciliation',
+            'interval',
+            minutes=settings.COMPANY_STATS_RECONCILE_MINUTES,
+            id='company_stats_reconciliation',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        
+        # Save staged submissions from the write-behind buffer
+        if settings.SUBMISSION_BUFFER_ENABLED:
+            scheduler.add_job(
+                'app.surveys.financial_clinic_submissions:run_submission_buffer_flush',
+                'interval',
+                seconds=settings.SUBMISSION_BUFFER_FLUSH_SECONDS,
+                id='submission_buffer_flush',
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True
+            )
+        
+        # Fail export jobs whose background task died with its process
+        scheduler.add_job(
+            'app.admin.export_jobs:run_stale_export_job_cleanup',
+            'interval',
+            minutes=15,
+            id='stale_export_job_cleanup',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.utcnow()
+        )
+        
+        # Delete Idempotency-Key results past their TTL
+        scheduler.add_job(
+            'app.idempotency:run_idempotency_key_purge',
+            'interval',
+            hours=1,
+            id='idempotency_key_purge',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        
         return scheduler
     except Exception as e:
         logger.error(f"❌ Failed to initialize scheduler: {e}", exc_info=True)
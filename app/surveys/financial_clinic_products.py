@@ -5,11 +5,141 @@ Matches users with appropriate National Bonds products based on:
 - Category scores (which areas need improvement)
 - Status levels (at_risk, good, excellent)
 - Demographics (nationality, gender, children)
+
+The active catalog is a few dozen rows that change only through admin
+scripts, so it is held in a process-wide ProductCatalogIndex: products are
+grouped by (category, status_level) and the demographic filters are resolved
+for every combination up front, making a recommendation lookup free of
+queries. Scripts run in their own process, so their changes are picked up
+when the index expires after PRODUCT_CATALOG_TTL_SECONDS.
 """
-from typing import List, Dict, Optional
+import hashlib
+import logging
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
 from sqlalchemy.orm import Session
+
+from ..config import settings
 from ..models import Product
 
+logger = logging.getLogger(__name__)
+
+# Stands in for nationalities and genders that no product filters on
+OTHER = "\0other"
+
+
+class CatalogProduct(NamedTuple):
+    """Immutable copy of an active product, safe to share across requests."""
+    id: int
+    name: str
+    category: str
+    description: str
+    priority: int
+
+
+DemographicKey = Tuple[str, Optional[str], bool]  # (nationality, gender, has_children)
+
+
+class ProductCatalog:
+    """Snapshot of the active products with demographic filters pre-resolved."""
+    
+    def __init__(self, products: List[Product]):
+        """
+        Build the lookup tables.
+        
+        Args:
+            products: Active Product rows
+        """
+        self.nationalities = {p.nationality_filter for p in products if p.nationality_filter}
+        self.genders = {p.gender_filter for p in products if p.gender_filter}
+        self.size = len(products)
+        
+        digest = hashlib.sha1()
+        for p in sorted(products, key=lambda p: p.id):
+            digest.update(repr((
+                p.id, p.name, p.category, p.status_level, p.description, p.priority,
+                p.nationality_filter, p.gender_filter, p.children_filter
+            )).encode("utf-8"))
+        self.version = digest.hexdigest()[:12]
+        
+        groups: Dict[Tuple[str, str], List[Product]] = {}
+        for p in sorted(products, key=lambda p: (p.priority, p.id)):
+            groups.setdefault((p.category, p.status_level), []).append(p)
+        
+        # Every demographic combination the filters can tell apart; gender None means not given
+        self._matches: Dict[Tuple[str, str], Dict[DemographicKey, Tuple[CatalogProduct, ...]]] = {}
+        for group_key, group in groups.items():
+            by_demographics = {}
+            for nationality in self.nationalities | {OTHER}:
+                for gender in self.genders | {OTHER, None}:
+                    for has_children in (False, True):
+                        by_demographics[(nationality, gender, has_children)] = tuple(
+                            CatalogProduct(p.id, p.name, p.category, p.description, p.priority)
+                            for p in group
+                            if p.matches_demographics(nationality, gender, 1 if has_children else 0)
+                        )
+            self._matches[group_key] = by_demographics
+    
+    def find(
+        self,
+        category: str,
+        status_level: str,
+        nationality: str,
+        gender: Optional[str] = None,
+        children: int = 0
+    ) -> Tuple[CatalogProduct, ...]:
+        """Products for a category and status level matching the demographics, by priority."""
+        by_demographics = self._matches.get((category, status_level))
+        if not by_demographics:
+            return ()
+        key = (
+            nationality if nationality in self.nationalities else OTHER,
+            (gender if gender in self.genders else OTHER) if gender else None,
+            children > 0
+        )
+        return by_demographics[key]
+
+
+class ProductCatalogIndex:
+    """The current ProductCatalog, rebuilt when invalidated or older than the TTL."""
+    
+    def __init__(self, ttl_seconds: int = 60):
+        self.ttl_seconds = ttl_seconds
+        self._catalog: Optional[ProductCatalog] = None
+        self._built_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def get(self, db: Session) -> ProductCatalog:
+        """Current catalog, loading the active products if it is missing or stale."""
+        with self._lock:
+            if self._catalog is not None and time.monotonic() - self._built_at < self.ttl_seconds:
+                return self._catalog
+            generation = self._generation
+            previous_version = self._catalog.version if self._catalog else None
+        
+        catalog = ProductCatalog(db.query(Product).filter(Product.active == True).all())
+        if catalog.version != previous_version:
+            logger.info(f"🔄 Product catalog loaded: {catalog.size} active products (version {catalog.version})")
+        
+        with self._lock:
+            # An invalidate() during the build means the result may already be stale
+            if generation == self._generation:
+                self._catalog = catalog
+                self._built_at = time.monotonic()
+        return catalog
+    
+    def invalidate(self):
+        """Reload on the next lookup (products changed)."""
+        with self._lock:
+            self._catalog = None
+            self._generation += 1
+
+
+product_catalog = ProductCatalogIndex(ttl_seconds=settings.PRODUCT_CATALOG_TTL_SECONDS)
+
 
 class ProductRecommendationEngine:
     """Match users with appropriate products."""
@@ -31,7 +161,7 @@ class ProductRecommendationEngine:
         nationality: str,
         gender: Optional[str] = None,
         children: int = 0
-    ) -> List[Product]:
+    ) -> List[CatalogProduct]:
         """
         Get product recommendations for a user.
         
@@ -48,7 +178,7 @@ class ProductRecommendationEngine:
             children: Number of children (0-5+)
             
         Returns:
-            List of up to 3 Product objects, prioritized
+            List of up to 3 CatalogProduct objects, prioritized
         """
         # Rank categories by score (lowest first = highest priority)
         ranked_categories = self._rank_categories(category_scores)
@@ -109,7 +239,7 @@ class ProductRecommendationEngine:
         nationality: str,
         gender: Optional[str] = None,
         children: int = 0
-    ) -> List[Product]:
+    ) -> List[CatalogProduct]:
         """
         Find products matching criteria.
         
@@ -121,27 +251,15 @@ class ProductRecommendationEngine:
             children: Number of children
             
         Returns:
-            List of matching Product objects
+            List of matching CatalogProduct objects, by priority
         """
-        # Query products for this category and status level
-        query = self.db.query(Product).filter(
-            Product.category == category,
-            Product.status_level == status_level,
-            Product.active == True
-        )
-        
-        products = query.all()
-        
-        # Filter by demographics
-        matching_products = [
-            p for p in products
-            if p.matches_demographics(nationality, gender, children)
-        ]
-        
-        # Sort by priority
-        matching_products.sort(key=lambda p: p.priority)
-        
-        return matching_products
+        return list(product_catalog.get(self.db).find(
+            category=category,
+            status_level=status_level,
+            nationality=nationality,
+            gender=gender,
+            children=children
+        ))
 
 
 def get_product_recommendations(
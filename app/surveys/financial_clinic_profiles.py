@@ -0,0 +1,65 @@
+"""
+Race-safe lookup-or-create of Financial Clinic profiles by normalized email.
+
+Profiles are unique on email_normalized (non-empty values). A submit claims
+its profile with INSERT ... ON CONFLICT DO NOTHING RETURNING: the insert
+either creates the profile or, when one already exists, does nothing, in
+which case the existing row is read with SELECT ... FOR UPDATE. Concurrent
+submits for the same email therefore never create duplicates, and updates to
+an existing profile are serialized until the submitting transaction commits.
+"""
+from typing import Tuple
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import FinancialClinicProfile
+
+UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+def claim_profile(db: Session, new_profile: FinancialClinicProfile) -> Tuple[FinancialClinicProfile, bool]:
+    """
+    The stored profile with new_profile's email, inserting new_profile if there is none.
+
+    Args:
+        db: Database session (the caller commits)
+        new_profile: Transient profile with email_normalized set
+
+    Returns:
+        Tuple of (profile, created); an existing profile is locked for update
+    """
+    email_normalized = new_profile.email_normalized
+    dialect_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+
+    if email_normalized and dialect_insert is not None:
+        values = {
+            column.key: getattr(new_profile, column.key)
+            for column in FinancialClinicProfile.__table__.columns
+            if getattr(new_profile, column.key) is not None
+        }
+        inserted = db.scalars(
+            dialect_insert(FinancialClinicProfile).values(**values).on_conflict_do_nothing(
+                index_elements=[FinancialClinicProfile.email_normalized],
+                index_where=FinancialClinicProfile.email_normalized != ''
+            ).returning(FinancialClinicProfile)
+        ).first()
+        if inserted is not None:
+            return inserted, True
+
+    existing = None
+    if email_normalized:
+        existing = db.query(FinancialClinicProfile).filter(
+            FinancialClinicProfile.email_normalized == email_normalized
+        ).with_for_update().first()
+    if existing is not None:
+        return existing, False
+
+    # No email to key on, or a database without ON CONFLICT support
+    db.add(new_profile)
+    db.flush()
+    return new_profile, True
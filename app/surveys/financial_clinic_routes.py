@@ -5,14 +5,16 @@ Endpoints for the Financial Clinic survey system:
 - POST /financial-clinic/calculate - Calculate score and get results
 - GET /financial-clinic/questions - Get question set
 - POST /financial-clinic/submit - Submit survey and save results
+- GET /financial-clinic/pending/{id} - Get status of a queued submission
 - GET /financial-clinic/history - Get user's assessment history
 - GET /financial-clinic/{response_id} - Get specific assessment
 - POST /financial-clinic/report/pdf - Generate PDF report
 - POST /financial-clinic/report/email - Send email report
 """
-from typing import Dict, List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from typing import Dict, Iterator, List, Optional, Any
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from pydantic import BaseModel
@@ -20,9 +22,18 @@ import logging
 import io
 from datetime import datetime
 
+from ..config import settings
 from ..database import get_db
 from ..models import User, CustomerProfile, SurveyResponse, Product
 from ..auth.dependencies import get_current_user, get_current_admin_user
+from ..idempotency import (
+    IDEMPOTENCY_HEADER,
+    REPLAY_HEADER,
+    claim_idempotency_key,
+    complete_idempotency_key,
+    release_idempotency_key,
+    request_fingerprint
+)
 from .financial_clinic_questions import get_questions_for_profile, FINANCIAL_CLINIC_QUESTIONS
 from .financial_clinic_scoring import calculate_financial_clinic_score, FinancialClinicScorer
 from .financial_clinic_insights import generate_insights
@@ -33,23 +44,16 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/financial-clinic", tags=["Financial Clinic"])
 
+# Idempotency-Key scopes
+SUBMIT_SCOPE = "financial_clinic_submit"
+EMAIL_REPORT_SCOPE = "financial_clinic_report_email"
+
 
 # ==================== Helper Functions ====================
 
-def convert_age_to_dob(age: int) -> str:
-    """
-    Convert age to approximate date of birth in DD/MM/YYYY format.
-    Uses January 1st of the calculated birth year.
-    
-    Args:
-        age: Age in years
-        
-    Returns:
-        Date of birth string in DD/MM/YYYY format
-    """
-    current_year = datetime.now().year
-    birth_year = current_year - age
-    return f"01/01/{birth_year}"
+def replay_response(response: Dict[str, Any]) -> JSONResponse:
+    """Stored response for a retried Idempotency-Key, marked as a replay."""
+    return JSONResponse(content=response, headers={REPLAY_HEADER: "true"})
 
 
 # ==================== Request/Response Models ====================
@@ -339,7 +343,8 @@ async def calculate_financial_clinic_result(
 @router.post("/submit")
 async def submit_financial_clinic_survey(
     request: FinancialClinicCalculateRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255)
     # TODO: Add authentication: current_user: User = Depends(get_current_user)
 ):
     """
@@ -350,14 +355,22 @@ async def submit_financial_clinic_survey(
     2. Saves survey response to database
     3. Returns complete results with survey_response_id
     
+    A retry with the same Idempotency-Key header gets the saved response back
+    without scoring or saving again.
+    
+    With SUBMISSION_BUFFER_ENABLED the submission is queued instead of saved:
+    the response has queued=True and a pending_submission_id, which
+    /pending/{pending_submission_id} resolves to the survey_response_id once
+    the buffer has been flushed.
+    
     Args:
         request: Survey answers and profile data
+        idempotency_key: Optional client-generated key identifying this submission
         
     Returns:
-        Saved survey response with ID
+        Saved (or queued) survey response with ID
     """
-    from app.models import FinancialClinicProfile, FinancialClinicResponse
-    from datetime import datetime
+    from app.surveys.financial_clinic_submissions import save_financial_clinic_submission, stage_submission
     
     try:
         logger.info(f"📝 Survey submission started")
@@ -377,134 +390,65 @@ async def submit_financial_clinic_survey(
         logger.error(f"❌ Validation error: {str(e)}")
         raise
     
+    if idempotency_key:
+        replay = claim_idempotency_key(db, SUBMIT_SCOPE, idempotency_key, request_fingerprint(request.dict()))
+        if replay is not None:
+            return replay_response(replay)
+    
     # Calculate results first
-    result = await calculate_financial_clinic_result(request, db)
+    try:
+        result = await calculate_financial_clinic_result(request, db)
+    except Exception:
+        if idempotency_key:
+            release_idempotency_key(db, SUBMIT_SCOPE, idempotency_key)
+        raise
     
     # Convert Pydantic model to dict
     result_dict = result.dict() if hasattr(result, 'dict') else result
     
+    # Campaign bursts: stage the scored submission and let the buffer flush save it
+    if settings.SUBMISSION_BUFFER_ENABLED:
+        try:
+            pending = stage_submission(db, request.dict(), jsonable_encoder(result_dict))
+            queued_result = {
+                **result_dict,
+                "survey_response_id": None,
+                "pending_submission_id": pending.id,
+                "saved_at": None,
+                "queued": True
+            }
+            if idempotency_key:
+                complete_idempotency_key(db, SUBMIT_SCOPE, idempotency_key, queued_result)
+            db.commit()
+            return queued_result
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error staging Financial Clinic survey, saving directly: {e}")
+    
     # Save to database
     try:
-        # 1. Check for company tracking
-        company_tracker_id = None
-        if request.company_url:
-            from app.models import CompanyTracker
-            company = db.query(CompanyTracker).filter(
-                CompanyTracker.unique_url == request.company_url,
-                CompanyTracker.is_active == True
-            ).first()
-            if company:
-                company_tracker_id = company.id
-                logger.info(f"Survey linked to company: {company.company_name}")
-        
-        # 2. Create or get profile
-        profile_data = request.profile.dict() if request.profile else {}
-        logger.info(f"📝 Profile data received: {profile_data}")
+        survey_response = save_financial_clinic_submission(db, request.dict(), result_dict)
         
-        # Check if profile exists by email
-        existing_profile = None
-        if profile_data.get('email'):
-            existing_profile = db.query(FinancialClinicProfile).filter(
-                FinancialClinicProfile.email == profile_data['email']
-            ).first()
-        
-        # Convert age to date_of_birth if age is provided but date_of_birth is not
-        if 'age' in profile_data and profile_data['age'] and not profile_data.get('date_of_birth'):
-            try:
-                age = int(profile_data['age'])
-                profile_data['date_of_birth'] = convert_age_to_dob(age)
-                logger.info(f"🔄 Converted age {age} to date_of_birth: {profile_data['date_of_birth']}")
-            except (ValueError, TypeError) as e:
-                logger.warning(f"⚠️ Failed to convert age to date_of_birth: {e}")
-                profile_data['date_of_birth'] = '01/01/1990'  # Fallback
-        
-        if existing_profile:
-            # Update existing profile with non-empty values
-            for key, value in profile_data.items():
-                if hasattr(existing_profile, key) and value is not None and value != "":
-                    setattr(existing_profile, key, value)
-            profile = existing_profile
-            logger.info(f"📝 Updated existing profile for: {existing_profile.email}")
-        else:
-            # Create new profile with flexible fields for resumed surveys
-            profile = FinancialClinicProfile(
-                name=profile_data.get('name', 'Anonymous User'),
-                date_of_birth=profile_data.get('date_of_birth', '01/01/1990'),
-                gender=profile_data.get('gender', 'Not Specified'),
-                nationality=profile_data.get('nationality', 'Not Specified'),
-                children=profile_data.get('children', 0),
-                employment_status=profile_data.get('employment_status', 'Not Specified'),
-                income_range=profile_data.get('income_range', 'Not Specified'),
-                emirate=profile_data.get('emirate', 'Not Specified'),
-                email=profile_data.get('email', ''),
-                mobile_number=profile_data.get('mobile_number')
-            )
-            db.add(profile)
-            logger.info(f"📝 Created new profile for: {profile.email}")
-            db.flush()  # Get profile.id
-        
-        # 3. Create survey response
-        survey_response = FinancialClinicResponse(
-            profile_id=profile.id,
-            company_tracker_id=company_tracker_id,
-            answers=request.answers,
-            total_score=result_dict['total_score'],
-            status_band=result_dict['status_band'],
-            category_scores=result_dict['category_scores'],
-            insights=result_dict.get('insights', []),
-            product_recommendations=result_dict.get('products', []),
-            questions_answered=result_dict.get('questions_answered', len(request.answers)),
-            total_questions=result_dict.get('total_questions', 15),
-            completed_at=datetime.utcnow()  # Set completion timestamp
-        )
-        db.add(survey_response)
-        db.commit()
+        # Results with survey_response_id
         db.refresh(survey_response)
-        
-        # 4. Create CompanyAssessment record if linked to a company
-        if company_tracker_id:
-            from app.models import CompanyTracker, CompanyAssessment
-            
-            # Create a CompanyAssessment record
-            company_assessment = CompanyAssessment(
-                company_tracker_id=company_tracker_id,
-                employee_id=None,  # Anonymous
-                department=profile_data.get('department'),
-                position_level=None,
-                responses=request.answers,
-                overall_score=result_dict['total_score'],
-                category_scores=result_dict['category_scores']
-            )
-            db.add(company_assessment)
-            db.commit()
-            
-            # Update company statistics
-            company = db.query(CompanyTracker).filter(CompanyTracker.id == company_tracker_id).first()
-            if company:
-                # Recalculate company statistics
-                total_assessments = db.query(FinancialClinicResponse).filter(
-                    FinancialClinicResponse.company_tracker_id == company_tracker_id
-                ).count()
-                
-                avg_score = db.query(func.avg(FinancialClinicResponse.total_score)).filter(
-                    FinancialClinicResponse.company_tracker_id == company_tracker_id
-                ).scalar()
-                
-                company.total_assessments = total_assessments
-                company.average_score = float(avg_score) if avg_score else None
-                db.commit()
-                logger.info(f"Updated company stats: {total_assessments} assessments, avg score: {avg_score}")
-        
-        # 5. Return results with survey_response_id
-        return {
+        saved_result = {
             **result_dict,
             "survey_response_id": survey_response.id,
             "saved_at": survey_response.created_at.isoformat() if survey_response.created_at else None,
-            "company_tracked": company_tracker_id is not None
+            "company_tracked": survey_response.company_tracker_id is not None
         }
+        if idempotency_key:
+            complete_idempotency_key(db, SUBMIT_SCOPE, idempotency_key, saved_result)
+        
+        # Profile, response, rollup, assessment, company stats and the replayable result commit together
+        db.commit()
+        return saved_result
         
     except Exception as e:
         db.rollback()
+        if idempotency_key:
+            # Unsaved results are not replayed; a retry tries to save again
+            release_idempotency_key(db, SUBMIT_SCOPE, idempotency_key)
         logger.error(f"Error saving Financial Clinic survey: {e}")
         # Return results anyway, just without saving
         return {
@@ -515,6 +459,45 @@ async def submit_financial_clinic_survey(
         }
 
 
+@router.get("/pending/{pending_submission_id}")
+async def get_pending_submission(pending_submission_id: int, db: Session = Depends(get_db)):
+    """
+    Status of a submission queued in the write-behind buffer.
+    
+    Returns:
+        status (pending, saved or failed) and the survey_response_id once saved
+    """
+    from app.models import FinancialClinicPendingSubmission
+    
+    pending = db.query(FinancialClinicPendingSubmission).filter(
+        FinancialClinicPendingSubmission.id == pending_submission_id
+    ).first()
+    if not pending:
+        raise HTTPException(status_code=404, detail="Pending submission not found")
+    
+    return {
+        "pending_submission_id": pending.id,
+        "status": pending.status,
+        "survey_response_id": pending.response_id
+    }
+
+
+@router.get("/admin/submission-buffer")
+async def get_submission_buffer_metrics(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Backpressure metrics of the write-behind submission buffer.
+    
+    Returns:
+        Pending and failed counts, age of the oldest pending submission and flush settings
+    """
+    from app.surveys.financial_clinic_submissions import submission_buffer_metrics
+    
+    return submission_buffer_metrics(db)
+
+
 @router.get("/stats")
 async def get_financial_clinic_stats(db: Session = Depends(get_db)):
     """
@@ -739,17 +722,60 @@ def import_current_date():
 @router.post("/report/email")
 async def send_email_report(
     request: EmailReportRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_HEADER, max_length=255)
 ):
     """
     Send email report with Financial Clinic results using existing email service.
     
+    A retry with the same Idempotency-Key header after a successful send gets
+    the original confirmation back without rendering or emailing again.
+    
     Args:
         request: Email report request
+        idempotency_key: Optional client-generated key identifying this send
         
     Returns:
         Confirmation of email sent
     """
+    if not idempotency_key:
+        return await deliver_email_report(request, db)
+    
+    replay = claim_idempotency_key(db, EMAIL_REPORT_SCOPE, idempotency_key, request_fingerprint(request.dict()))
+    if replay is not None:
+        return replay_response(replay)
+    
+    try:
+        result = await deliver_email_report(request, db)
+    except Exception:
+        release_idempotency_key(db, EMAIL_REPORT_SCOPE, idempotency_key)
+        raise
+    
+    if result.get("success"):
+        try:
+            complete_idempotency_key(db, EMAIL_REPORT_SCOPE, idempotency_key, result)
+            db.commit()
+        except Exception as e:
+            # The email went out; only replay protection for this key is lost
+            db.rollback()
+            logger.error(f"❌ Error storing email report result for Idempotency-Key: {e}")
+    else:
+        # Failed sends are not replayed; a retry tries again
+        release_idempotency_key(db, EMAIL_REPORT_SCOPE, idempotency_key)
+    return result
+
+
+async def deliver_email_report(request: EmailReportRequest, db: Session) -> Dict[str, Any]:
+    """
+    Render the PDF (English only) and email the report.
+    
+    Args:
+        request: Email report request
+        db: Database session
+        
+    Returns:
+        Confirmation of email sent, with success False when it was not
+    """
     try:
         from app.reports.email_service import EmailReportService
         from app.reports.report_generation_service import ReportGenerationService
@@ -1009,7 +1035,9 @@ async def get_company_financial_clinic_analytics(
     Returns aggregated statistics, score distributions, and demographic breakdowns
     for all Financial Clinic assessments completed through the company's unique URL.
     """
-    from app.models import CompanyTracker, FinancialClinicResponse, FinancialClinicProfile
+    from app.models import (
+        CompanyTracker, FinancialClinicResponse, FinancialClinicProfile, FinancialClinicCategoryScore
+    )
     
     # Get company
     company = db.query(CompanyTracker).filter(
@@ -1019,12 +1047,16 @@ async def get_company_financial_clinic_analytics(
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    # Get all responses for this company
-    responses = db.query(FinancialClinicResponse).filter(
+    # Status band distribution (and overall totals) in one grouped query
+    status_rows = db.query(
+        FinancialClinicResponse.status_band,
+        func.count(FinancialClinicResponse.id),
+        func.sum(FinancialClinicResponse.total_score)
+    ).filter(
         FinancialClinicResponse.company_tracker_id == company.id
-    ).all()
+    ).group_by(FinancialClinicResponse.status_band).all()
     
-    if not responses:
+    if not status_rows:
         return {
             "company_name": company.company_name,
             "company_url": company_url,
@@ -1036,91 +1068,59 @@ async def get_company_financial_clinic_analytics(
         }
     
     # Calculate statistics
-    total_assessments = len(responses)
-    total_score = sum(r.total_score for r in responses)
+    total_assessments = sum(count for _, count, _ in status_rows)
+    total_score = sum(score_sum or 0 for _, _, score_sum in status_rows)
     average_score = total_score / total_assessments
+    status_distribution = {status: count for status, count, _ in status_rows}
+    
+    # Category averages from the normalized category score table
+    category_rows = db.query(
+        FinancialClinicCategoryScore.category,
+        func.avg(FinancialClinicCategoryScore.score)
+    ).join(
+        FinancialClinicResponse,
+        FinancialClinicCategoryScore.response_id == FinancialClinicResponse.id
+    ).filter(
+        FinancialClinicResponse.company_tracker_id == company.id
+    ).group_by(FinancialClinicCategoryScore.category).all()
     
-    # Status band distribution
-    status_distribution = {}
-    for response in responses:
-        status = response.status_band
-        status_distribution[status] = status_distribution.get(status, 0) + 1
-    
-    # Category averages
-    category_totals = {}
-    for response in responses:
-        for category, data in response.category_scores.items():
-            if category not in category_totals:
-                category_totals[category] = []
-            
-            # Handle both dict and numeric values
-            if isinstance(data, dict):
-                score = data.get('score', 0)
-            else:
-                score = data
-            category_totals[category].append(score)
+    category_averages = {category: float(avg or 0) for category, avg in category_rows}
     
-    category_averages = {
-        cat: sum(scores) / len(scores) if scores else 0
-        for cat, scores in category_totals.items()
+    # Demographic breakdown: one grouped query over all five dimensions, folded per dimension
+    demographic_columns = {
+        "by_gender": FinancialClinicProfile.gender,
+        "by_nationality": FinancialClinicProfile.nationality,
+        "by_employment": FinancialClinicProfile.employment_status,
+        "by_income_range": FinancialClinicProfile.income_range,
+        "by_emirate": FinancialClinicProfile.emirate,
     }
+    demographic_rows = db.query(
+        *demographic_columns.values(),
+        func.count(FinancialClinicResponse.id),
+        func.sum(FinancialClinicResponse.total_score)
+    ).join(
+        FinancialClinicProfile,
+        FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+    ).filter(
+        FinancialClinicResponse.company_tracker_id == company.id
+    ).group_by(*demographic_columns.values()).all()
+    
+    demographic_totals = {dimension: {} for dimension in demographic_columns}
+    for row in demographic_rows:
+        count, score_sum = row[-2], row[-1] or 0
+        for dimension, value in zip(demographic_columns, row[:-2]):
+            totals = demographic_totals[dimension].setdefault(value, [0, 0.0])
+            totals[0] += count
+            totals[1] += score_sum
     
-    # Demographic breakdown
     demographics = {
-        "by_gender": {},
-        "by_nationality": {},
-        "by_employment": {},
-        "by_income_range": {},
-        "by_emirate": {}
+        dimension: {
+            value: {"count": count, "avg_score": score_sum / count if count else 0}
+            for value, (count, score_sum) in values.items()
+        }
+        for dimension, values in demographic_totals.items()
     }
     
-    for response in responses:
-        profile = db.query(FinancialClinicProfile).filter(
-            FinancialClinicProfile.id == response.profile_id
-        ).first()
-        
-        if profile:
-            # Gender breakdown
-            gender = profile.gender
-            if gender not in demographics["by_gender"]:
-                demographics["by_gender"][gender] = {"count": 0, "avg_score": []}
-            demographics["by_gender"][gender]["count"] += 1
-            demographics["by_gender"][gender]["avg_score"].append(response.total_score)
-            
-            # Nationality breakdown
-            nationality = profile.nationality
-            if nationality not in demographics["by_nationality"]:
-                demographics["by_nationality"][nationality] = {"count": 0, "avg_score": []}
-            demographics["by_nationality"][nationality]["count"] += 1
-            demographics["by_nationality"][nationality]["avg_score"].append(response.total_score)
-            
-            # Employment breakdown
-            employment = profile.employment_status
-            if employment not in demographics["by_employment"]:
-                demographics["by_employment"][employment] = {"count": 0, "avg_score": []}
-            demographics["by_employment"][employment]["count"] += 1
-            demographics["by_employment"][employment]["avg_score"].append(response.total_score)
-            
-            # Income range breakdown
-            income = profile.income_range
-            if income not in demographics["by_income_range"]:
-                demographics["by_income_range"][income] = {"count": 0, "avg_score": []}
-            demographics["by_income_range"][income]["count"] += 1
-            demographics["by_income_range"][income]["avg_score"].append(response.total_score)
-            
-            # Emirate breakdown
-            emirate = profile.emirate
-            if emirate not in demographics["by_emirate"]:
-                demographics["by_emirate"][emirate] = {"count": 0, "avg_score": []}
-            demographics["by_emirate"][emirate]["count"] += 1
-            demographics["by_emirate"][emirate]["avg_score"].append(response.total_score)
-    
-    # Calculate averages for demographics
-    for category in demographics:
-        for key in demographics[category]:
-            scores = demographics[category][key]["avg_score"]
-            demographics[category][key]["avg_score"] = sum(scores) / len(scores) if scores else 0
-    
     return {
         "company_name": company.company_name,
         "company_url": company_url,
@@ -1138,6 +1138,8 @@ async def get_company_financial_clinic_submissions(
     company_url: str,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; replaces skip"),
+    include_total: bool = Query(True, description="Count the company's submissions (cached until the next submission)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
@@ -1146,8 +1148,12 @@ async def get_company_financial_clinic_submissions(
     Admin only.
     
     Returns individual submission details (anonymized) for analysis.
+    Pass the returned next_cursor to page by keyset on (created_at, id)
+    instead of skip.
     """
+    from app.analytics.cache import cached_count
     from app.models import CompanyTracker, FinancialClinicResponse, FinancialClinicProfile
+    from app.pagination import keyset_page
     
     # Get company
     company = db.query(CompanyTracker).filter(
@@ -1157,22 +1163,44 @@ async def get_company_financial_clinic_submissions(
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    # Get responses with pagination
-    responses = db.query(FinancialClinicResponse).filter(
+    query = db.query(
+        FinancialClinicResponse.id,
+        FinancialClinicResponse.total_score,
+        FinancialClinicResponse.status_band,
+        FinancialClinicResponse.category_scores,
+        FinancialClinicResponse.questions_answered,
+        FinancialClinicResponse.created_at,
+        FinancialClinicProfile.gender,
+        FinancialClinicProfile.nationality,
+        FinancialClinicProfile.employment_status,
+        FinancialClinicProfile.income_range,
+        FinancialClinicProfile.emirate,
+        FinancialClinicProfile.children,
+    ).select_from(FinancialClinicResponse).outerjoin(
+        FinancialClinicProfile,
+        FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+    ).filter(
         FinancialClinicResponse.company_tracker_id == company.id
-    ).order_by(FinancialClinicResponse.created_at.desc()).offset(skip).limit(limit).all()
+    )
+    
+    # Get responses with pagination
+    try:
+        responses, next_cursor = keyset_page(
+            query, FinancialClinicResponse.created_at, FinancialClinicResponse.id,
+            cursor, limit, key=lambda row: (row.created_at, row.id), offset=skip
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Get total count
-    total_count = db.query(FinancialClinicResponse).filter(
-        FinancialClinicResponse.company_tracker_id == company.id
-    ).count()
+    total_count = None
+    if include_total:
+        total_count = cached_count(db, ("company_submissions", company.id), db.query(FinancialClinicResponse).filter(
+            FinancialClinicResponse.company_tracker_id == company.id
+        ))
     
     submissions = []
     for response in responses:
-        profile = db.query(FinancialClinicProfile).filter(
-            FinancialClinicProfile.id == response.profile_id
-        ).first()
-        
         submissions.append({
             "id": response.id,
             "total_score": response.total_score,
@@ -1182,12 +1210,12 @@ async def get_company_financial_clinic_submissions(
             "created_at": response.created_at.isoformat() if response.created_at else None,
             # Anonymized profile data (no email/name)
             "demographics": {
-                "gender": profile.gender if profile else None,
-                "nationality": profile.nationality if profile else None,
-                "employment_status": profile.employment_status if profile else None,
-                "income_range": profile.income_range if profile else None,
-                "emirate": profile.emirate if profile else None,
-                "children": profile.children if profile else 0
+                "gender": response.gender,
+                "nationality": response.nationality,
+                "employment_status": response.employment_status,
+                "income_range": response.income_range,
+                "emirate": response.emirate,
+                "children": response.children if response.children is not None else 0
             }
         })
     
@@ -1195,12 +1223,81 @@ async def get_company_financial_clinic_submissions(
         "company_name": company.company_name,
         "company_url": company_url,
         "total_count": total_count,
-        "skip": skip,
+        "skip": None if cursor else skip,
         "limit": limit,
+        "next_cursor": next_cursor,
         "submissions": submissions
     }
 
 
+FINANCIAL_CLINIC_EXPORT_FIELDS = [
+    'id', 'name', 'email', 'mobile_number', 'date_of_birth', 'gender',
+    'nationality', 'children', 'employment_status', 'income_range', 'emirate',
+    'total_score', 'status_band', 'questions_answered', 'created_at'
+]
+
+
+def financial_clinic_export_rows(
+    db: Session,
+    company_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    batch_size: int = 1000
+) -> Iterator[List[Any]]:
+    """
+    Financial Clinic submissions as export lines, newest first.
+
+    Args:
+        db: Database session
+        company_id: Only submissions tracked to this company
+        start_date: Inclusive lower bound on created_at
+        end_date: Inclusive upper bound on created_at
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Lists of values in FINANCIAL_CLINIC_EXPORT_FIELDS order
+    """
+    from app.models import FinancialClinicResponse, FinancialClinicProfile
+
+    query = db.query(
+        FinancialClinicResponse.id,
+        FinancialClinicProfile.name,
+        FinancialClinicProfile.email,
+        FinancialClinicProfile.mobile_number,
+        FinancialClinicProfile.date_of_birth,
+        FinancialClinicProfile.gender,
+        FinancialClinicProfile.nationality,
+        FinancialClinicProfile.children,
+        FinancialClinicProfile.employment_status,
+        FinancialClinicProfile.income_range,
+        FinancialClinicProfile.emirate,
+        FinancialClinicResponse.total_score,
+        FinancialClinicResponse.status_band,
+        FinancialClinicResponse.questions_answered,
+        FinancialClinicResponse.created_at,
+    ).select_from(FinancialClinicResponse).join(
+        FinancialClinicProfile,
+        FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+    )
+
+    if company_id is not None:
+        query = query.filter(FinancialClinicResponse.company_tracker_id == company_id)
+    if start_date:
+        query = query.filter(FinancialClinicResponse.created_at >= start_date)
+    if end_date:
+        query = query.filter(FinancialClinicResponse.created_at <= end_date)
+
+    query = query.order_by(FinancialClinicResponse.created_at.desc(), FinancialClinicResponse.id.desc())
+
+    for row in query.yield_per(batch_size):
+        yield [
+            *row[:3],
+            row.mobile_number or '',
+            *row[4:14],
+            row.created_at.isoformat() if row.created_at else ''
+        ]
+
+
 @router.get("/export-csv")
 async def export_all_financial_clinic_csv(
     company_url: Optional[str] = Query(None),
@@ -1217,12 +1314,8 @@ async def export_all_financial_clinic_csv(
     Returns CSV file with all submission data including user demographics and mobile numbers.
     """
     import csv
-    from fastapi.responses import StreamingResponse
-    
-    from app.models import CompanyTracker, FinancialClinicResponse, FinancialClinicProfile
     
-    # Build query
-    query = db.query(FinancialClinicResponse)
+    from app.models import CompanyTracker
     
     # Filter by company if specified
     company = None
@@ -1233,57 +1326,14 @@ async def export_all_financial_clinic_csv(
         
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
-        
-        query = query.filter(FinancialClinicResponse.company_tracker_id == company.id)
-    
-    # Filter by date range
-    if start_date:
-        query = query.filter(FinancialClinicResponse.created_at >= start_date)
-    if end_date:
-        query = query.filter(FinancialClinicResponse.created_at <= end_date)
-    
-    # Get all responses
-    responses = query.order_by(FinancialClinicResponse.created_at.desc()).all()
     
     # Create CSV content
     output = io.StringIO()
-    
-    fieldnames = [
-        'id', 'name', 'email', 'mobile_number', 'date_of_birth', 'gender', 
-        'nationality', 'children', 'employment_status', 'income_range', 'emirate',
-        'total_score', 'status_band', 'questions_answered', 'created_at'
-    ]
-    
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    
-    for response in responses:
-        profile = db.query(FinancialClinicProfile).filter(
-            FinancialClinicProfile.id == response.profile_id
-        ).first()
-        
-        if profile:
-            row = {
-                'id': response.id,
-                'name': profile.name,
-                'email': profile.email,
-                'mobile_number': profile.mobile_number or '',
-                'date_of_birth': profile.date_of_birth,
-                'gender': profile.gender,
-                'nationality': profile.nationality,
-                'children': profile.children,
-                'employment_status': profile.employment_status,
-                'income_range': profile.income_range,
-                'emirate': profile.emirate,
-                'total_score': response.total_score,
-                'status_band': response.status_band,
-                'questions_answered': response.questions_answered,
-                'created_at': response.created_at.isoformat() if response.created_at else ''
-            }
-            writer.writerow(row)
-    
-    # Prepare response
-    output.seek(0)
+    writer = csv.writer(output)
+    writer.writerow(FINANCIAL_CLINIC_EXPORT_FIELDS)
+    writer.writerows(financial_clinic_export_rows(
+        db, company.id if company else None, start_date, end_date
+    ))
     
     # Generate filename
     if company:
@@ -1313,6 +1363,8 @@ async def export_company_financial_clinic_csv(
     # Delegate to the general export endpoint with company filter
     return await export_all_financial_clinic_csv(
         company_url=company_url,
+        start_date=None,
+        end_date=None,
         db=db,
         current_user=current_user
     )
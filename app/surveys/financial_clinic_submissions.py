@@ -0,0 +1,303 @@
+"""
+Saving Financial Clinic submissions, directly or through the write-behind buffer.
+
+save_financial_clinic_submission() writes one scored submission: the profile
+upsert, the response with its category score and answer rows, the daily
+rollup, and the company assessment and running stats.
+
+With SUBMISSION_BUFFER_ENABLED the submit endpoint does not save on the
+request thread. It stages the scored submission in
+financial_clinic_pending_submissions with a single INSERT and returns the
+staged row's id as a provisional id. flush_pending_submissions(), scheduled
+every SUBMISSION_BUFFER_FLUSH_SECONDS, saves staged submissions in batches of
+SUBMISSION_BUFFER_BATCH_SIZE with one transaction per batch. A submission that
+fails to save is marked failed with its error and left for inspection.
+
+    python -m app.surveys.financial_clinic_submissions   # drain the buffer now
+"""
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import FinancialClinicPendingSubmission
+
+logger = logging.getLogger(__name__)
+
+# Saved staging rows are kept this long so clients can resolve their provisional id
+SAVED_RETENTION = timedelta(days=1)
+
+
+def convert_age_to_dob(age: int) -> str:
+    """
+    Convert age to approximate date of birth in DD/MM/YYYY format.
+    Uses January 1st of the calculated birth year.
+
+    Args:
+        age: Age in years
+
+    Returns:
+        Date of birth string in DD/MM/YYYY format
+    """
+    current_year = datetime.now().year
+    birth_year = current_year - age
+    return f"01/01/{birth_year}"
+
+
+def save_financial_clinic_submission(
+    db: Session,
+    submission: Dict[str, Any],
+    result: Dict[str, Any],
+    submitted_at: Optional[datetime] = None
+):
+    """
+    Write a scored submission (the caller commits).
+
+    Args:
+        db: Database session
+        submission: Submit request body (answers, profile, company_url)
+        result: Calculated results for the answers
+        submitted_at: When the user submitted (UTC), for buffered submissions saved later
+
+    Returns:
+        The flushed FinancialClinicResponse
+    """
+    from app.models import CompanyAssessment, CompanyTracker, FinancialClinicProfile, FinancialClinicResponse
+    from app.analytics.rollup import record_submission, retract_submission, profile_changes_rollup
+    from app.analytics.filters import parse_date_of_birth
+    from app.analytics.search import update_profile_search_fields
+    from app.analytics.category_scores import build_category_score_rows
+    from app.analytics.answers import build_answer_rows, sync_answer_nationality
+    from app.companies.stats import record_company_submission
+    from app.surveys.financial_clinic_profiles import claim_profile
+
+    answers = submission.get('answers') or {}
+
+    # 1. Check for company tracking
+    company_tracker_id = None
+    if submission.get('company_url'):
+        company = db.query(CompanyTracker).filter(
+            CompanyTracker.unique_url == submission['company_url'],
+            CompanyTracker.is_active == True
+        ).first()
+        if company:
+            company_tracker_id = company.id
+            logger.info(f"Survey linked to company: {company.company_name}")
+
+    # 2. Create or get profile
+    profile_data = dict(submission.get('profile') or {})
+    logger.info(f"📝 Profile data received: {profile_data}")
+
+    # Convert age to date_of_birth if age is provided but date_of_birth is not
+    if 'age' in profile_data and profile_data['age'] and not profile_data.get('date_of_birth'):
+        try:
+            age = int(profile_data['age'])
+            profile_data['date_of_birth'] = convert_age_to_dob(age)
+            logger.info(f"🔄 Converted age {age} to date_of_birth: {profile_data['date_of_birth']}")
+        except (ValueError, TypeError) as e:
+            logger.warning(f"⚠️ Failed to convert age to date_of_birth: {e}")
+            profile_data['date_of_birth'] = '01/01/1990'  # Fallback
+
+    # New profile with flexible fields for resumed surveys, used if none exists for this email
+    new_profile = FinancialClinicProfile(
+        name=profile_data.get('name', 'Anonymous User'),
+        date_of_birth=profile_data.get('date_of_birth', '01/01/1990'),
+        gender=profile_data.get('gender', 'Not Specified'),
+        nationality=profile_data.get('nationality', 'Not Specified'),
+        children=profile_data.get('children', 0),
+        employment_status=profile_data.get('employment_status', 'Not Specified'),
+        income_range=profile_data.get('income_range', 'Not Specified'),
+        emirate=profile_data.get('emirate', 'Not Specified'),
+        email=profile_data.get('email', ''),
+        mobile_number=profile_data.get('mobile_number')
+    )
+    # Keep the typed birth date (used by SQL age filters) in step with the DD/MM/YYYY string
+    new_profile.birth_date = parse_date_of_birth(new_profile.date_of_birth)
+    update_profile_search_fields(new_profile)
+
+    # Insert it, or lock the existing profile with the same normalized email
+    profile, created = claim_profile(db, new_profile)
+
+    if created:
+        logger.info(f"📝 Created new profile for: {profile.email}")
+    else:
+        # Demographic changes move the profile's earlier submissions to a new rollup slice
+        rekeyed_responses = []
+        if profile_changes_rollup(profile, profile_data):
+            rekeyed_responses = list(profile.survey_responses)
+            for previous_response in rekeyed_responses:
+                retract_submission(db, previous_response, profile)
+
+        # Update existing profile with non-empty values
+        previous_nationality = profile.nationality
+        for key, value in profile_data.items():
+            if hasattr(profile, key) and value is not None and value != "":
+                setattr(profile, key, value)
+        profile.birth_date = parse_date_of_birth(profile.date_of_birth)
+        update_profile_search_fields(profile)
+
+        # Answer facts carry the nationality, so earlier answers follow the profile
+        if profile.nationality != previous_nationality:
+            sync_answer_nationality(db, profile)
+
+        for previous_response in rekeyed_responses:
+            record_submission(db, previous_response, profile)
+        logger.info(f"📝 Updated existing profile for: {profile.email}")
+
+    # 3. Create survey response
+    survey_response = FinancialClinicResponse(
+        profile_id=profile.id,
+        company_tracker_id=company_tracker_id,
+        answers=answers,
+        total_score=result['total_score'],
+        status_band=result['status_band'],
+        category_scores=result['category_scores'],
+        insights=result.get('insights', []),
+        product_recommendations=result.get('products', []),
+        questions_answered=result.get('questions_answered', len(answers)),
+        total_questions=result.get('total_questions', 15),
+        completed_at=submitted_at or datetime.utcnow(),  # Set completion timestamp
+        category_score_rows=build_category_score_rows(result['category_scores']),
+        answer_rows=build_answer_rows(answers, profile.nationality, company_tracker_id)
+    )
+    if submitted_at is not None:
+        # Dated by submission, not by when the buffer was flushed
+        survey_response.created_at = submitted_at
+        for answer_row in survey_response.answer_rows:
+            answer_row.created_at = submitted_at
+    db.add(survey_response)
+    db.flush()
+
+    # Count it in the daily analytics rollup
+    record_submission(db, survey_response, profile)
+
+    # 4. Create CompanyAssessment record if linked to a company
+    if company_tracker_id:
+        db.add(CompanyAssessment(
+            company_tracker_id=company_tracker_id,
+            employee_id=None,  # Anonymous
+            department=profile_data.get('department'),
+            position_level=None,
+            responses=answers,
+            overall_score=result['total_score'],
+            category_scores=result['category_scores']
+        ))
+
+        # Update company statistics: one atomic increment of the running count and sum
+        record_company_submission(db, company_tracker_id, result['total_score'])
+
+    return survey_response
+
+
+def stage_submission(db: Session, submission: Dict[str, Any], result: Dict[str, Any]) -> FinancialClinicPendingSubmission:
+    """Queue a scored submission for the next flush (the caller commits)."""
+    pending = FinancialClinicPendingSubmission(
+        submission=submission,
+        result=result,
+        status="pending",
+        submitted_at=datetime.utcnow()
+    )
+    db.add(pending)
+    db.flush()
+    return pending
+
+
+def flush_pending_submissions(db: Session, batch_size: int) -> Tuple[int, int]:
+    """
+    Save up to batch_size staged submissions, oldest first, in one transaction.
+
+    Each submission is saved in a savepoint, so one that fails is marked
+    failed without losing the rest of the batch. Concurrent flushes skip
+    rows another flush has locked.
+
+    Returns:
+        Tuple of (saved, failed)
+    """
+    batch = db.query(FinancialClinicPendingSubmission).filter(
+        FinancialClinicPendingSubmission.status == "pending"
+    ).order_by(FinancialClinicPendingSubmission.id).limit(batch_size).with_for_update(skip_locked=True).all()
+
+    saved = failed = 0
+    for pending in batch:
+        try:
+            with db.begin_nested():
+                survey_response = save_financial_clinic_submission(
+                    db, pending.submission, pending.result, pending.submitted_at
+                )
+            pending.status = "saved"
+            pending.response_id = survey_response.id
+            saved += 1
+        except Exception as e:
+            logger.error(f"❌ Error saving pending submission {pending.id}: {e}")
+            pending.status = "failed"
+            pending.error = str(e)
+            failed += 1
+        pending.processed_at = datetime.utcnow()
+
+    # Saved rows only serve provisional id lookups; drop them once those are stale
+    db.query(FinancialClinicPendingSubmission).filter(
+        FinancialClinicPendingSubmission.status == "saved",
+        FinancialClinicPendingSubmission.processed_at < datetime.utcnow() - SAVED_RETENTION
+    ).delete(synchronize_session=False)
+    return saved, failed
+
+
+def submission_buffer_metrics(db: Session) -> Dict[str, Any]:
+    """Queue depth and lag of the write-behind buffer, for backpressure monitoring."""
+    counts = dict(db.query(
+        FinancialClinicPendingSubmission.status,
+        func.count(FinancialClinicPendingSubmission.id)
+    ).group_by(FinancialClinicPendingSubmission.status).all())
+    oldest_pending = db.query(func.min(FinancialClinicPendingSubmission.submitted_at)).filter(
+        FinancialClinicPendingSubmission.status == "pending"
+    ).scalar()
+
+    return {
+        "enabled": settings.SUBMISSION_BUFFER_ENABLED,
+        "pending": counts.get("pending", 0),
+        "failed": counts.get("failed", 0),
+        "saved_recently": counts.get("saved", 0),
+        "oldest_pending_seconds": (
+            round((datetime.utcnow() - oldest_pending).total_seconds(), 1) if oldest_pending else 0.0
+        ),
+        "batch_size": settings.SUBMISSION_BUFFER_BATCH_SIZE,
+        "flush_interval_seconds": settings.SUBMISSION_BUFFER_FLUSH_SECONDS,
+    }
+
+
+def run_submission_buffer_flush() -> int:
+    """Scheduled job: flush batches until the buffer is drained. Returns submissions saved."""
+    batch_size = settings.SUBMISSION_BUFFER_BATCH_SIZE
+    total_saved = total_failed = 0
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        while True:
+            saved, failed = flush_pending_submissions(db, batch_size)
+            db.commit()
+            total_saved += saved
+            total_failed += failed
+            if saved + failed < batch_size:
+                break
+        if total_saved or total_failed:
+            logger.info(
+                f"✅ Flushed submission buffer: {total_saved} saved, {total_failed} failed "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+        return total_saved
+    except Exception as e:
+        logger.error(f"❌ Error flushing submission buffer: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"Saved {run_submission_buffer_flush()} buffered submissions")
@@ -10,6 +10,8 @@ import csv
 import io
 from app.database import get_db
 from app.models import User, CustomerProfile, IncompleteSurvey, AuditLog, CompanyTracker
+from app.analytics.cache import cached_stats
+from app.analytics.filters import count_where
 from app.surveys.incomplete_schemas import (
     IncompleteSurveyCreate, IncompleteSurveyUpdate, IncompleteSurveyResponse,
     IncompleteSurveyStats, FollowUpRequest
@@ -309,65 +311,68 @@ async def get_incomplete_survey_stats(
     db: Session = Depends(get_db)
 ) -> Any:
     """Get statistics about incomplete surveys."""
+    return cached_stats(("incomplete_survey_stats",), lambda: incomplete_survey_stats(db))
+
+
+def incomplete_survey_stats(db: Session) -> IncompleteSurveyStats:
+    """
+    Mark stale surveys abandoned, then aggregate the stats in one grouped query.
+    
+    Rows are grouped by current_step, which gives the most common exit step
+    directly; the overall counts and average are summed from the groups.
+    """
+    from sqlalchemy import Float, cast
+    
     # First, auto-mark surveys as abandoned if they have no activity for 24+ hours
     cutoff_time = datetime.utcnow() - timedelta(hours=24)
-    surveys_to_mark = db.query(IncompleteSurvey).filter(
+    marked = db.query(IncompleteSurvey).filter(
         and_(
             IncompleteSurvey.last_activity < cutoff_time,
             IncompleteSurvey.is_abandoned == False
         )
-    ).all()
+    ).update({
+        IncompleteSurvey.is_abandoned: True,
+        IncompleteSurvey.abandoned_at: datetime.utcnow()
+    }, synchronize_session=False)
     
-    # Mark them as abandoned
-    for survey in surveys_to_mark:
-        survey.is_abandoned = True
-        survey.abandoned_at = datetime.utcnow()
-    
-    if surveys_to_mark:
+    if marked:
         db.commit()
     
-    # Total incomplete surveys
-    total_incomplete = db.query(IncompleteSurvey).count()
-    
-    # Abandoned surveys (using is_abandoned flag)
-    abandoned_count = db.query(IncompleteSurvey).filter(
-        IncompleteSurvey.is_abandoned == True
-    ).count()
-    
-    # Average completion rate (current_step / total_steps)
-    from sqlalchemy import Float
-    avg_completion = db.query(
-        func.avg(
-            func.cast(IncompleteSurvey.current_step, Float) / 
-            func.cast(IncompleteSurvey.total_steps, Float) * 100
-        )
-    ).scalar() or 0.0
-    
-    # Most common exit step
-    most_common_exit = db.query(
+    # Completion rate (current_step / total_steps); NULL where total_steps is 0
+    completion_rate = cast(IncompleteSurvey.current_step, Float) / cast(
+        func.nullif(IncompleteSurvey.total_steps, 0), Float
+    ) * 100
+    step_rows = db.query(
         IncompleteSurvey.current_step,
-        func.count(IncompleteSurvey.current_step).label('count')
-    ).group_by(IncompleteSurvey.current_step).order_by(
-        func.count(IncompleteSurvey.current_step).desc()
-    ).first()
-    
-    most_common_exit_step = most_common_exit[0] if most_common_exit else 0
-    
-    # Follow-up pending
-    follow_up_pending = db.query(IncompleteSurvey).filter(
-        and_(
+        func.count(IncompleteSurvey.id).label('total'),
+        count_where(IncompleteSurvey.is_abandoned == True).label('abandoned'),
+        count_where(and_(
             IncompleteSurvey.is_abandoned == True,
             IncompleteSurvey.follow_up_sent == False,
             IncompleteSurvey.email.isnot(None)
-        )
-    ).count()
+        )).label('follow_up_pending'),
+        func.sum(completion_rate).label('completion_sum'),
+        func.count(completion_rate).label('completion_count')
+    ).group_by(IncompleteSurvey.current_step).order_by(IncompleteSurvey.current_step).all()
+    
+    completion_sum = sum(row.completion_sum or 0.0 for row in step_rows)
+    completion_count = sum(row.completion_count for row in step_rows)
+    avg_completion = completion_sum / completion_count if completion_count else 0.0
+    
+    # Most common exit step (lowest step on ties)
+    most_common_exit = max(
+        (row for row in step_rows if row.current_step is not None),
+        key=lambda row: row.total,
+        default=None
+    )
+    most_common_exit_step = most_common_exit.current_step if most_common_exit else 0
     
     return IncompleteSurveyStats(
-        total_incomplete=total_incomplete,
-        abandoned_count=abandoned_count,
+        total_incomplete=sum(row.total for row in step_rows),
+        abandoned_count=sum(row.abandoned for row in step_rows),
         average_completion_rate=round(avg_completion, 2),
         most_common_exit_step=most_common_exit_step,
-        follow_up_pending=follow_up_pending
+        follow_up_pending=sum(row.follow_up_pending for row in step_rows)
     )
 
 
@@ -553,17 +558,32 @@ async def resume_survey_session(
     }
 
 
-@router.get("/admin/export")
-async def export_incomplete_surveys(
-    abandoned_only: bool = Query(False),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(1000, ge=1, le=10000),
-    current_admin: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
-) -> Any:
-    """Export incomplete surveys data in CSV format."""
-    
-    # Build query
+INCOMPLETE_SURVEY_EXPORT_HEADERS = [
+    'ID', 'Session ID', 'User Type', 'Email', 'Phone', 'Company URL', 'Company ID',
+    'Current Step', 'Total Steps', 'Completion %', 'Started At', 'Last Activity',
+    'Status', 'Hours Since Activity', 'Is Abandoned', 'Follow-up Sent', 
+    'Follow-up Count', 'Responses Count'
+]
+
+
+def incomplete_survey_export_query(
+    db: Session,
+    abandoned_only: bool = False,
+    skip: int = 0,
+    limit: Optional[int] = None
+):
+    """
+    Incomplete surveys to export, most recently started first.
+
+    Args:
+        db: Database session
+        abandoned_only: Only surveys abandoned (24h+ since last activity)
+        skip: Number of surveys to skip
+        limit: Maximum number of surveys (None for all)
+
+    Returns:
+        IncompleteSurvey query
+    """
     query = db.query(IncompleteSurvey)
     
     if abandoned_only:
@@ -576,8 +596,67 @@ async def export_incomplete_surveys(
             )
         )
     
+    query = query.order_by(IncompleteSurvey.started_at.desc(), IncompleteSurvey.id.desc()).offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def incomplete_survey_export_row(survey: IncompleteSurvey, now: Optional[datetime] = None) -> List[Any]:
+    """One export line, in INCOMPLETE_SURVEY_EXPORT_HEADERS order."""
+    # Calculate status - handle timezone awareness
+    now = now or datetime.utcnow()
+    # Ensure both datetimes are offset-naive for comparison
+    last_activity = survey.last_activity
+    if hasattr(last_activity, 'tzinfo') and last_activity.tzinfo is not None:
+        last_activity = last_activity.replace(tzinfo=None)
+    
+    hours_since_activity = (now - last_activity).total_seconds() / 3600
+    
+    if hours_since_activity < 24:
+        status = 'Active'
+    elif hours_since_activity < 72:
+        status = 'Stalled'
+    else:
+        status = 'Abandoned'
+    
+    completion_pct = round((survey.current_step / survey.total_steps) * 100, 1)
+    responses_count = len(survey.responses) if survey.responses else 0
+    
+    return [
+        survey.id,
+        survey.session_id,
+        'Registered' if survey.user_id else 'Guest',
+        survey.email or '',
+        survey.phone_number or '',
+        survey.company_url or '',
+        survey.company_id or '',
+        survey.current_step,
+        survey.total_steps,
+        completion_pct,
+        survey.started_at.isoformat(),
+        survey.last_activity.isoformat(),
+        status,
+        round(hours_since_activity, 1),
+        survey.is_abandoned,
+        survey.follow_up_sent,
+        survey.follow_up_count,
+        responses_count
+    ]
+
+
+@router.get("/admin/export")
+async def export_incomplete_surveys(
+    abandoned_only: bool = Query(False),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    current_admin: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+) -> Any:
+    """Export incomplete surveys data in CSV format."""
+    
     # Get surveys with pagination
-    surveys = query.order_by(IncompleteSurvey.started_at.desc()).offset(skip).limit(limit).all()
+    surveys = incomplete_survey_export_query(db, abandoned_only, skip, limit).all()
     
     return _export_as_csv(surveys, abandoned_only)
 
@@ -588,58 +667,12 @@ def _export_as_csv(surveys: List[IncompleteSurvey], abandoned_only: bool) -> Str
     # Create CSV content
     output = io.StringIO()
     writer = csv.writer(output)
-    
-    # CSV Headers
-    headers = [
-        'ID', 'Session ID', 'User Type', 'Email', 'Phone', 'Company URL', 'Company ID',
-        'Current Step', 'Total Steps', 'Completion %', 'Started At', 'Last Activity',
-        'Status', 'Hours Since Activity', 'Is Abandoned', 'Follow-up Sent', 
-        'Follow-up Count', 'Responses Count'
-    ]
-    writer.writerow(headers)
+    writer.writerow(INCOMPLETE_SURVEY_EXPORT_HEADERS)
     
     # Data rows
+    now = datetime.utcnow()
     for survey in surveys:
-        # Calculate status - handle timezone awareness
-        now = datetime.utcnow()
-        # Ensure both datetimes are offset-naive for comparison
-        last_activity = survey.last_activity
-        if hasattr(last_activity, 'tzinfo') and last_activity.tzinfo is not None:
-            last_activity = last_activity.replace(tzinfo=None)
-        
-        hours_since_activity = (now - last_activity).total_seconds() / 3600
-        
-        if hours_since_activity < 24:
-            status = 'Active'
-        elif hours_since_activity < 72:
-            status = 'Stalled'
-        else:
-            status = 'Abandoned'
-        
-        completion_pct = round((survey.current_step / survey.total_steps) * 100, 1)
-        responses_count = len(survey.responses) if survey.responses else 0
-        
-        row = [
-            survey.id,
-            survey.session_id,
-            'Registered' if survey.user_id else 'Guest',
-            survey.email or '',
-            survey.phone_number or '',
-            survey.company_url or '',
-            survey.company_id or '',
-            survey.current_step,
-            survey.total_steps,
-            completion_pct,
-            survey.started_at.isoformat(),
-            survey.last_activity.isoformat(),
-            status,
-            round(hours_since_activity, 1),
-            survey.is_abandoned,
-            survey.follow_up_sent,
-            survey.follow_up_count,
-            responses_count
-        ]
-        writer.writerow(row)
+        writer.writerow(incomplete_survey_export_row(survey, now))
     
     output.seek(0)
     
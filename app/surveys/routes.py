@@ -2,8 +2,10 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from app.database import get_db
 from app.models import User, CustomerProfile, SurveyResponse, Recommendation, AuditLog
+from app.analytics.cache import cached_stats
 from app.surveys.schemas import (
     SurveyResponseCreate, SurveyResponseUpdate, SurveyResponseResponse,
     SurveyResultResponse, SurveyHistoryResponse, RecommendationResponse,
@@ -438,33 +440,39 @@ async def get_survey_statistics(
     db: Session = Depends(get_db)
 ) -> Any:
     """Get survey statistics for admin dashboard."""
-    total_surveys = db.query(SurveyResponse).count()
-    
-    # Calculate average scores
-    avg_scores = db.query(
-        db.func.avg(SurveyResponse.overall_score).label('avg_overall'),
-        db.func.avg(SurveyResponse.budgeting_score).label('avg_budgeting'),
-        db.func.avg(SurveyResponse.savings_score).label('avg_savings'),
-        db.func.avg(SurveyResponse.debt_management_score).label('avg_debt'),
-        db.func.avg(SurveyResponse.financial_planning_score).label('avg_planning'),
-        db.func.avg(SurveyResponse.investment_knowledge_score).label('avg_investment')
-    ).first()
-    
-    # Risk tolerance distribution
+    return cached_stats(("survey_stats",), lambda: survey_statistics(db))
+
+
+def survey_statistics(db: Session) -> dict:
+    """
+    Survey count, average scores and risk tolerance distribution in one query.
+    
+    Rows are grouped by risk tolerance; the total and the averages are
+    computed from the per-group counts and score sums.
+    """
+    score_columns = {
+        "overall": SurveyResponse.overall_score,
+        "budgeting": SurveyResponse.budgeting_score,
+        "savings": SurveyResponse.savings_score,
+        "debt_management": SurveyResponse.debt_management_score,
+        "financial_planning": SurveyResponse.financial_planning_score,
+        "investment_knowledge": SurveyResponse.investment_knowledge_score,
+    }
     risk_distribution = db.query(
         SurveyResponse.risk_tolerance,
-        db.func.count(SurveyResponse.id).label('count')
+        func.count(SurveyResponse.id).label('count'),
+        *(func.sum(column).label(name) for name, column in score_columns.items())
     ).group_by(SurveyResponse.risk_tolerance).all()
     
+    total_surveys = sum(item.count for item in risk_distribution)
+    
     return {
         "total_surveys": total_surveys,
         "average_scores": {
-            "overall": round(avg_scores.avg_overall or 0, 2),
-            "budgeting": round(avg_scores.avg_budgeting or 0, 2),
-            "savings": round(avg_scores.avg_savings or 0, 2),
-            "debt_management": round(avg_scores.avg_debt or 0, 2),
-            "financial_planning": round(avg_scores.avg_planning or 0, 2),
-            "investment_knowledge": round(avg_scores.avg_investment or 0, 2)
+            name: round(
+                sum(getattr(item, name) or 0 for item in risk_distribution) / total_surveys, 2
+            ) if total_surveys else 0
+            for name in score_columns
         },
         "risk_tolerance_distribution": {
             item.risk_tolerance: item.count for item in risk_distribution
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark Financial Clinic Submit
+
+Fires concurrent POST /api/v1/financial-clinic/submit requests at a running
+server and reports throughput, latency percentiles and how many submits failed
+to save. With --shared-emails N the requests cycle through N addresses, so
+concurrent submits for the same person exercise the profile upsert.
+
+Run it against the same database before and after a change to compare
+requests per second.
+
+Usage:
+    python scripts/benchmark_financial_clinic_submit.py \
+        [--base-url http://localhost:8000] [--requests 500] [--concurrency 20] \
+        [--shared-emails 50] [--company-url acme]
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+
+def submit_payload(email, company_url=None):
+    return {
+        "answers": {f"fc_q{number}": (number % 5) + 1 for number in range(1, 16)},
+        "profile": {
+            "name": "Benchmark User",
+            "date_of_birth": "15/06/1990",
+            "gender": "Female",
+            "nationality": "Emirati",
+            "children": 1,
+            "employment_status": "Employed",
+            "income_range": "10,000 to 20,000",
+            "emirate": "Dubai",
+            "email": email,
+        },
+        "company_url": company_url,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent Financial Clinic submits")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=500, help="Total submits to send")
+    parser.add_argument("--concurrency", type=int, default=20, help="Submits in flight at once")
+    parser.add_argument("--shared-emails", type=int, default=0,
+                        help="Cycle through this many emails (0: a fresh email per submit)")
+    parser.add_argument("--company-url", default=None, help="Company unique URL to link submits to")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    url = f"{args.base_url.rstrip('/')}/api/v1/financial-clinic/submit"
+    client = httpx.Client(timeout=60.0, limits=httpx.Limits(max_connections=args.concurrency))
+
+    def send(number):
+        mailbox = number % args.shared_emails if args.shared_emails else number
+        email = f"bench-{run_id}-{mailbox}@example.com"
+        started = time.perf_counter()
+        response = client.post(url, json=submit_payload(email, args.company_url))
+        saved = response.status_code == 200 and response.json().get("survey_response_id") is not None
+        return time.perf_counter() - started, saved
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(send, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    latencies = sorted(latency for latency, _ in results)
+    failed = sum(1 for _, saved in results if not saved)
+    print(f"Submits:      {args.requests} ({args.concurrency} concurrent, run {run_id})")
+    print(f"Throughput:   {args.requests / elapsed:.1f} req/s")
+    print(f"Latency p50:  {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"Latency p95:  {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms")
+    print(f"Not saved:    {failed}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Rebuild Financial Clinic Daily Rollup
+
+Recomputes financial_clinic_daily_rollups from all Financial Clinic responses.
+Run once after the migration that creates the table (before setting
+ANALYTICS_ROLLUP_ENABLED=true), and again whenever the rollup may have drifted.
+
+Usage:
+    python scripts/database/rebuild_financial_clinic_rollup.py [--batch-size 1000]
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import argparse
+
+from app.database import SessionLocal
+from app.analytics.rollup import rebuild_rollup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the Financial Clinic daily analytics rollup")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Responses fetched per round trip")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_rollup(db, batch_size=args.batch_size)
+        print(f"✅ Rebuilt financial clinic rollup: {rows} rows")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Rollup rebuild failed: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,10 @@ from sqlalchemy.pool import StaticPool
 from app.main import app
 from app.database import Base, get_db
 from app.config import settings
+from app.analytics.cache import analytics_cache, stats_cache
+from app.analytics.companies import company_index
+from app.analytics.filter_options import filter_options_cache
+from app.surveys.financial_clinic_products import product_catalog
 
 
 # ============================================================================
@@ -25,6 +29,13 @@ def db():
     Create a fresh database for each test.
     Uses in-memory SQLite for speed.
     """
+    # Cached dashboard results belong to the previous test's database
+    analytics_cache.invalidate()
+    stats_cache.invalidate()
+    filter_options_cache.invalidate()
+    company_index.invalidate()
+    product_catalog.invalidate()
+    
     # Create in-memory SQLite database
     SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
     
@@ -72,6 +83,94 @@ def client(db):
     app.dependency_overrides.clear()
 
 
+# ============================================================================
+# DATA FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def make_profile(db):
+    """
+    Factory for Financial Clinic profiles.
+
+    Keyword arguments override the default demographics, and the typed birth
+    date follows date_of_birth unless given. The profile is added and flushed
+    unless save=False.
+    """
+    def _make_profile(email="user@example.com", save=True, **overrides):
+        from app.models import FinancialClinicProfile
+        from app.analytics.filters import parse_date_of_birth
+
+        fields = {
+            "name": "Test User",
+            "date_of_birth": "15/06/1990",
+            "gender": "Female",
+            "nationality": "Emirati",
+            "children": 0,
+            "employment_status": "Employed",
+            "income_range": "AED 10,000 to AED 20,000",
+            "emirate": "Dubai",
+            "email": email,
+            **overrides
+        }
+        profile = FinancialClinicProfile(**fields)
+        if "birth_date" not in overrides:
+            profile.birth_date = parse_date_of_birth(profile.date_of_birth)
+        if save:
+            db.add(profile)
+            db.flush()
+        return profile
+
+    return _make_profile
+
+
+@pytest.fixture
+def make_response(db, make_profile):
+    """
+    Factory for scored Financial Clinic responses.
+
+    Creates a profile for the email unless one is passed. Keyword arguments
+    naming response columns (total_score, status_band, created_at, ...)
+    override the response defaults; the rest override the profile's
+    demographics. Category score and answer fact rows are built from
+    category_scores and answers. The response is added and flushed; the
+    caller commits.
+    """
+    def _make_response(email="user@example.com", profile=None, answers=None, category_scores=None, **overrides):
+        from app.models import FinancialClinicResponse
+        from app.analytics.answers import build_answer_rows
+        from app.analytics.category_scores import build_category_score_rows
+
+        response_columns = set(FinancialClinicResponse.__table__.columns.keys())
+        response_fields = {key: value for key, value in overrides.items() if key in response_columns}
+        if profile is None:
+            profile = make_profile(email, **{
+                key: value for key, value in overrides.items() if key not in response_columns
+            })
+
+        answers = {"fc_q1": 3} if answers is None else answers
+        category_scores = {} if category_scores is None else category_scores
+        fields = {
+            "total_score": 60.0,
+            "status_band": "Good",
+            "questions_answered": 15,
+            "total_questions": 15,
+            **response_fields
+        }
+        response = FinancialClinicResponse(
+            profile_id=profile.id,
+            answers=answers,
+            category_scores=category_scores,
+            category_score_rows=build_category_score_rows(category_scores),
+            answer_rows=build_answer_rows(answers, profile.nationality, fields.get("company_tracker_id")),
+            **fields
+        )
+        db.add(response)
+        db.flush()
+        return response
+
+    return _make_response
+
+
 # ============================================================================
 # AUTHENTICATION FIXTURES
 # ============================================================================
@@ -0,0 +1,110 @@
+"""
+Tests for background export jobs.
+
+Verifies that:
+1. a queued job runs after the response, records its row count and serves
+   a gzip file with the same CSV as the synchronous export
+2. invalid parameters are rejected before a job is queued
+3. jobs left queued or running by a dead process are marked failed
+"""
+import csv
+import gzip
+import io
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.admin.export_jobs import fail_stale_export_jobs
+from app.admin.exports import EXPORT_HEADERS
+from app.config import settings
+from app.models import ExportJob, User
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "DOWNLOAD_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestExportJobs:
+    """Queue, poll and download."""
+
+    def test_csv_job(self, client, db, admin_auth_headers, make_response, export_dir):
+        now = datetime(2026, 3, 1, 9, 30)
+        make_response("older@example.com", created_at=now - timedelta(days=2))
+        make_response("newer@example.com", created_at=now)
+        make_response("male@example.com", gender="Male", created_at=now)
+        db.commit()
+
+        queued = client.post(
+            "/api/v1/admin/export-jobs",
+            json={"export_type": "responses", "file_format": "csv", "params": {"genders": "Female"}},
+            headers=admin_auth_headers
+        )
+        assert queued.status_code == 202
+        job_id = queued.json()["id"]
+
+        job = client.get(f"/api/v1/admin/export-jobs/{job_id}", headers=admin_auth_headers).json()
+        assert (job["status"], job["rows_processed"]) == ("completed", 2)
+        assert job["download_url"] == f"/api/v1/admin/export-jobs/{job_id}/download"
+
+        download = client.get(job["download_url"], headers=admin_auth_headers)
+        assert download.status_code == 200
+        assert download.headers["content-type"] == "application/gzip"
+        exported = gzip.decompress(download.content).decode("utf-8")
+        synchronous = client.get(
+            "/api/v1/admin/simple/export-csv", params={"genders": "Female"}, headers=admin_auth_headers
+        ).text
+        assert exported == synchronous
+
+        rows = list(csv.reader(io.StringIO(exported)))
+        assert rows[0] == EXPORT_HEADERS
+        assert [row[2] for row in rows[1:]] == ["newer@example.com", "older@example.com"]
+        assert list((export_dir / "exports").iterdir()) == [export_dir / "exports" / db.get(ExportJob, job_id).file_key]
+
+    def test_rejects_invalid_params(self, client, db, admin_auth_headers, export_dir):
+        response = client.post(
+            "/api/v1/admin/export-jobs",
+            json={"export_type": "financial_clinic", "params": {"company_url": "missing"}},
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 400
+        assert db.query(ExportJob).count() == 0
+
+    @pytest.mark.parametrize("export_type, params", [
+        ("responses", {"genders": ["Female"]}),
+        ("responses", {"children": 2}),
+        ("financial_clinic", {"start_date": 20260301}),
+        ("incomplete_surveys", {"skip": [1]}),
+    ])
+    def test_rejects_non_string_params(self, client, db, admin_auth_headers, export_dir, export_type, params):
+        response = client.post(
+            "/api/v1/admin/export-jobs",
+            json={"export_type": export_type, "params": params},
+            headers=admin_auth_headers
+        )
+        assert response.status_code == 400
+        assert db.query(ExportJob).count() == 0
+
+    def test_fails_stale_jobs(self, db, admin_auth_headers):
+        admin = db.query(User).filter(User.email == "admin@example.com").one()
+        now = datetime.utcnow()
+        stale = timedelta(minutes=settings.EXPORT_JOB_STALE_MINUTES + 1)
+        jobs = {
+            "running_stale": ExportJob(export_type="responses", status="running", started_at=now - stale),
+            "queued_stale": ExportJob(export_type="responses", status="queued", created_at=now - stale),
+            "running_recent": ExportJob(export_type="responses", status="running", started_at=now),
+            "completed": ExportJob(export_type="responses", status="completed", started_at=now - stale),
+        }
+        for job in jobs.values():
+            job.created_by = admin.id
+            db.add(job)
+        db.commit()
+
+        assert fail_stale_export_jobs(db) == 2
+        db.commit()
+        for job in jobs.values():
+            db.refresh(job)
+        assert [name for name, job in jobs.items() if job.status == "failed"] == ["running_stale", "queued_stale"]
+        assert jobs["running_stale"].error_message and jobs["running_stale"].completed_at
+        assert jobs["running_recent"].status == "running"
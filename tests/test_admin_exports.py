@@ -0,0 +1,83 @@
+"""
+Tests for the streaming admin response exports.
+
+Verifies that:
+1. the CSV export streams one line per filtered response, newest first,
+   and records the exported count in the audit log
+2. csv_chunks emits the header and rows in bounded chunks
+3. the Excel export continues on a new sheet past max_rows_per_sheet
+"""
+import csv
+import io
+from datetime import datetime, timedelta
+
+from openpyxl import load_workbook
+
+from app.admin.exports import EXPORT_HEADERS, csv_chunks
+from app.models import AuditLog
+
+
+EXPORTED = {
+    "total_score": 61.234,
+    "category_scores": {"Income Stream": {"score": 12.0}},
+    "insights": [{"text": "Build an emergency fund"}, "Review your debt"],
+}
+
+
+class TestCsvExport:
+    """Streaming CSV export."""
+
+    def test_streams_filtered_rows(self, client, db, admin_auth_headers, make_response):
+        now = datetime(2026, 3, 1, 9, 30)
+        make_response("older@example.com", created_at=now - timedelta(days=2), mobile_number="501234567", **EXPORTED)
+        make_response("newer@example.com", created_at=now, **EXPORTED)
+        make_response("male@example.com", gender="Male", created_at=now, **EXPORTED)
+        db.commit()
+
+        response = client.get(
+            "/api/v1/admin/simple/export-csv", params={"genders": "Female"}, headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        rows = list(csv.reader(io.StringIO(response.text)))
+
+        assert rows[0] == EXPORT_HEADERS
+        assert [row[2] for row in rows[1:]] == ["newer@example.com", "older@example.com"]
+        older = dict(zip(EXPORT_HEADERS, rows[2]))
+        assert older["Mobile Number"] == "+971 501234567"
+        assert older["Total Score"] == "61.23"
+        assert older["Income Stream Score"] == "12.0"
+        assert (older["Action Plan 1"], older["Action Plan 2"], older["Action Plan 3"]) == (
+            "Build an emergency fund", "Review your debt", ""
+        )
+        assert older["Submission Date"] == "2026-02-27 09:30:00"
+
+        audit = db.query(AuditLog).filter(AuditLog.action == "simple_admin_export_csv").one()
+        assert audit.details["exported_count"] == 2
+
+    def test_chunks(self):
+        chunks = list(csv_chunks(([i] for i in range(5)), rows_per_chunk=2))
+        assert len(chunks) == 3
+        assert b"".join(chunks).decode().splitlines() == [",".join(EXPORT_HEADERS), "0", "1", "2", "3", "4"]
+
+
+class TestExcelExport:
+    """Write-only workbook export."""
+
+    def test_rows_per_sheet(self, client, db, admin_auth_headers, make_response):
+        now = datetime(2026, 3, 1, 9, 30)
+        for day in range(3):
+            make_response(f"user{day}@example.com", created_at=now - timedelta(days=day))
+        db.commit()
+
+        response = client.get(
+            "/api/v1/admin/simple/export-excel", params={"max_rows_per_sheet": 2}, headers=admin_auth_headers
+        )
+        assert response.status_code == 200
+        workbook = load_workbook(io.BytesIO(response.content))
+
+        assert workbook.sheetnames == ["Financial Clinic Responses", "Financial Clinic Responses 2"]
+        first, second = (list(sheet.iter_rows(values_only=True)) for sheet in workbook.worksheets)
+        assert list(first[0]) == EXPORT_HEADERS and list(second[0]) == EXPORT_HEADERS
+        assert [row[2] for row in first[1:] + second[1:]] == [
+            "user0@example.com", "user1@example.com", "user2@example.com"
+        ]
@@ -0,0 +1,84 @@
+"""
+Query budgets for admin listing and analytics endpoints.
+
+Verifies that the number of SQL statements per request stays within a fixed
+budget and does not grow with the number of submissions or companies.
+"""
+from datetime import datetime, timedelta
+
+from app.analytics.cache import analytics_cache
+from app.analytics.companies import company_index
+from app.models import CompanyTracker, CustomerProfile, SurveyResponse, User
+
+
+def add_company(db, number):
+    company = CompanyTracker(
+        company_name=f"Company {number}",
+        company_email=f"hr{number}@example.com",
+        contact_person="HR",
+        unique_url=f"company-{number}",
+    )
+    db.add(company)
+    db.flush()
+    return company
+
+
+def add_old_survey(db, number):
+    user = User(email=f"old{number}@example.com", username=f"old{number}", hashed_password="hashed_password")
+    db.add(user)
+    db.flush()
+    profile = CustomerProfile(
+        user_id=user.id, first_name="Old", last_name="Survey", age=40, gender="Male",
+        nationality="Emirati", emirate="Dubai", employment_status="Employed",
+        monthly_income="15000-25000", household_size=3,
+    )
+    db.add(profile)
+    db.flush()
+    db.add(SurveyResponse(
+        user_id=user.id, customer_profile_id=profile.id, responses={"q1": 3},
+        overall_score=55.0, budgeting_score=50.0, savings_score=60.0, debt_management_score=55.0,
+        financial_planning_score=50.0, investment_knowledge_score=40.0, risk_tolerance="moderate",
+    ))
+
+
+def add_submissions(db, make_response, start, count):
+    now = datetime.now()
+    for number in range(start, start + count):
+        add_old_survey(db, number)
+        company = add_company(db, number)
+        make_response(
+            f"user{number}@example.com", created_at=now - timedelta(hours=number), company_tracker_id=company.id
+        )
+    db.commit()
+
+
+def queries_for(client, db, headers, url, params=None):
+    analytics_cache.invalidate()
+    company_index.invalidate()
+    db.expire_all()
+    response = client.get(url, params=params, headers=headers)
+    assert response.status_code == 200
+    assert "error" not in response.json()
+    return int(response.headers["X-DB-Query-Count"])
+
+
+class TestQueryBudget:
+    """Constant query count per request."""
+
+    ENDPOINTS = [
+        ("/api/v1/admin/simple/survey-submissions", None, 8),
+        ("/api/v1/admin/simple/companies-analytics", {"date_range": "all"}, 6),
+        ("/api/v1/admin/simple/score-analytics-table", {"date_range": "all"}, 6),
+        ("/api/v1/admin/simple/score-analytics-table", {"date_range": "all", "companies": "company-1"}, 8),
+    ]
+
+    def test_budget_independent_of_rows(self, client, db, admin_auth_headers, make_response):
+        add_submissions(db, make_response, 1, 3)
+        small = [queries_for(client, db, admin_auth_headers, url, params) for url, params, _ in self.ENDPOINTS]
+
+        add_submissions(db, make_response, 4, 9)
+        large = [queries_for(client, db, admin_auth_headers, url, params) for url, params, _ in self.ENDPOINTS]
+
+        assert small == large
+        for (url, params, budget), count in zip(self.ENDPOINTS, large):
+            assert count <= budget, f"{url} {params}: {count} queries, budget {budget}"
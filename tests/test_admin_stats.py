@@ -0,0 +1,50 @@
+"""
+Tests for the admin stats panels.
+
+Verifies that:
+1. submission and consultation stats come from one aggregate query each
+2. repeated requests within the TTL are served from the stats cache
+"""
+from datetime import datetime, timedelta
+
+from app.models import ConsultationRequest
+
+
+def get_stats(client, headers, url):
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    return response.json(), int(response.headers["X-DB-Query-Count"])
+
+
+class TestAdminStats:
+    """Conditional-aggregate stats behind a short-TTL cache."""
+
+    def test_submissions_stats(self, client, db, admin_auth_headers, make_response):
+        now = datetime.now()
+        make_response("today@example.com", created_at=now, total_score=61.234)
+        make_response("older@example.com", gender="Male", created_at=now - timedelta(days=40), total_score=61.234)
+        db.commit()
+
+        url = "/api/v1/admin/simple/submissions/stats"
+        stats, first_queries = get_stats(client, admin_auth_headers, url)
+        assert stats["total"] == 2
+        assert (stats["today"], stats["this_week"], stats["this_month"]) == (1, 1, 1)
+        assert stats["average_score"] == 61.23
+
+        make_response("later@example.com", created_at=now)
+        db.commit()
+        cached, cached_queries = get_stats(client, admin_auth_headers, url)
+        assert cached == stats
+        assert cached_queries == first_queries - 1
+
+    def test_consultation_stats(self, client, db, admin_auth_headers):
+        for status in ("pending", "pending", "scheduled", "completed"):
+            db.add(ConsultationRequest(
+                name="Test User", email="user@example.com", phone_number="0501234567", status=status
+            ))
+        db.commit()
+
+        stats, _ = get_stats(client, admin_auth_headers, "/api/v1/consultations/admin/stats")
+        assert (stats["total"], stats["pending"], stats["contacted"]) == (4, 2, 0)
+        assert (stats["scheduled"], stats["completed"], stats["this_week"]) == (1, 1, 4)
+        assert stats["conversion_rate"] == 50.0
@@ -0,0 +1,32 @@
+"""
+Tests for the Financial Clinic per-question answer facts.
+
+Verifies that:
+1. answers JSON maps to one integer fact per question, skipping non-numeric values
+2. a profile's nationality change is copied onto the facts of its earlier responses
+"""
+from app.analytics.answers import build_answer_rows, sync_answer_nationality
+from app.models import FinancialClinicAnswer
+
+
+class TestAnswerFacts:
+    """Per-question answer facts."""
+
+    def test_builds_one_row_per_numeric_answer(self):
+        rows = build_answer_rows({"fc_q1": 3, "fc_q2": 5.0, "fc_q3": "n/a", "fc_q4": True}, "Emirati", 7)
+
+        assert {r.question_id: r.value for r in rows} == {"fc_q1": 3, "fc_q2": 5}
+        assert {(r.nationality, r.company_tracker_id) for r in rows} == {("Emirati", 7)}
+        assert build_answer_rows(None, "Emirati", None) == []
+
+    def test_nationality_follows_profile(self, db, make_response):
+        profile = make_response(nationality="Non-Emirati", answers={"fc_q1": 2, "fc_q2": 4}).profile
+        db.commit()
+
+        profile.nationality = "Emirati"
+        assert sync_answer_nationality(db, profile) == 2
+        db.commit()
+
+        nationalities = {n for (n,) in db.query(FinancialClinicAnswer.nationality).all()}
+        assert nationalities == {"Emirati"}
+        assert sync_answer_nationality(db, profile) == 0
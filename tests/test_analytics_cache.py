@@ -0,0 +1,52 @@
+"""
+Tests for the admin analytics result cache.
+
+Verifies that:
+1. equivalent filter sets share a cache key
+2. repeated requests are served from the cache until a new submission advances the watermark
+3. the LRU evicts the least recently used entry beyond its size
+"""
+from app.analytics.cache import AnalyticsCache, analytics_cache, analytics_cache_key
+
+
+class TestAnalyticsCache:
+    """Filter-keyed, watermark-versioned LRU."""
+
+    def test_key_is_canonical(self):
+        key = analytics_cache_key("get_overview_metrics", {
+            "db": object(), "genders": "Male,Female", "companies": None, "unique_users_only": None
+        })
+        same = analytics_cache_key("get_overview_metrics", {
+            "db": object(), "genders": " Female,Male,Male", "companies": None, "unique_users_only": False
+        })
+        assert key == same
+        assert key != analytics_cache_key("get_overview_metrics", {"genders": "Male"})
+
+    def test_served_until_next_submission(self, client, db, admin_auth_headers, make_response):
+        make_response("first@example.com")
+        db.commit()
+        url = "/api/v1/admin/simple/gender-breakdown"
+        params = {"date_range": "all"}
+
+        first = client.get(url, params=params, headers=admin_auth_headers).json()
+        hits = analytics_cache.hits
+        assert client.get(url, params=params, headers=admin_auth_headers).json() == first
+        assert analytics_cache.hits == hits + 1
+
+        make_response("second@example.com")
+        db.commit()
+        assert client.get(url, params=params, headers=admin_auth_headers).json()["total"] == first["total"] + 1
+
+        stats = client.get("/api/v1/admin/simple/analytics-cache/stats", headers=admin_auth_headers).json()
+        assert stats["hits"] >= 1 and stats["misses"] >= 2
+
+    def test_lru_eviction(self):
+        cache = AnalyticsCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1, "A")
+        cache.set("b", 1, "B")
+        assert cache.get("a", 1) == (True, "A")
+        cache.set("c", 1, "C")
+
+        assert cache.get("b", 1) == (False, None)
+        assert cache.get("a", 2) == (False, None)  # Stale watermark
+        assert cache.evictions == 1
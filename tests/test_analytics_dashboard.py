@@ -0,0 +1,77 @@
+"""
+Tests for the single-pass admin dashboard aggregation.
+
+Verifies that:
+1. windowed widgets only count responses inside the date window, the others count all of them
+2. unique-user mode keeps the latest submission per email within each of those sets
+3. the time series covers every period of the date window, from SQL and from the rollup
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.analytics.dashboard import dashboard_payloads
+from app.analytics.rollup import local_day, rebuild_rollup
+from app.config import settings
+
+
+def income_stream(total_score):
+    return {"Income Stream": {"score": total_score / 10, "max_possible": 15.0, "status_level": "good"}}
+
+
+class TestDashboardPayloads:
+    """All widgets from one aggregation pass."""
+
+    def test_window_and_unique_users(self, db, make_response):
+        now = datetime.now()
+        for email, nationality, days_ago, total_score, status_band in (
+            ("repeat@example.com", "Emirati", 100, 40.0, "At Risk"),
+            ("repeat@example.com", "Emirati", 3, 80.0, "Excellent"),
+            ("old@example.com", "Non-Emirati", 200, 60.0, "Good"),
+        ):
+            make_response(
+                email, nationality=nationality, created_at=now - timedelta(days=days_ago),
+                total_score=total_score, status_band=status_band, category_scores=income_stream(total_score)
+            )
+        db.commit()
+
+        payloads = dashboard_payloads(db, {}, date_range="30d")
+        assert payloads["overview_metrics"]["total_submissions"] == 1
+        assert payloads["overview_metrics"]["excellent_count"] == 1
+        assert payloads["score_distribution"]["total"] == 1
+        assert payloads["nationality_breakdown"]["emirati"]["count"] == 2
+        assert payloads["nationality_breakdown"]["non_emirati"]["count"] == 1
+        income = payloads["category_performance"]["categories"][0]
+        assert (income["category"], income["response_count"]) == ("income_stream", 3)
+
+        unique = dashboard_payloads(db, {}, date_range="all", unique_users_only=True)
+        assert unique["overview_metrics"]["total_submissions"] == 3
+        assert unique["overview_metrics"]["unique_completions"] == 2
+        assert unique["nationality_breakdown"]["emirati"] == {"count": 1, "avg_score": 80.0}
+        assert sum(point["count"] for point in unique["time_series"]["time_series"]) == 2
+
+    @pytest.mark.parametrize("rollup", [False, True])
+    def test_time_series_window(self, client, db, admin_auth_headers, make_response, monkeypatch, rollup):
+        now = datetime.utcnow()
+        make_response("recent@example.com", created_at=now - timedelta(days=3), total_score=80.0)
+        make_response("old@example.com", created_at=now - timedelta(days=100), total_score=40.0)
+        db.commit()
+        rebuild_rollup(db)
+        monkeypatch.setattr(settings, "ANALYTICS_ROLLUP_ENABLED", rollup)
+
+        series = client.get(
+            "/api/v1/admin/simple/time-series", params={"date_range": "30d"}, headers=admin_auth_headers
+        ).json()["time_series"]
+        # Filled from the start of the window to today, with only the recent response in it
+        periods = [point["period"] for point in series]
+        assert periods[0] == local_day(datetime.now() - timedelta(days=30)).isoformat()
+        assert periods[-1] == local_day(now).isoformat()
+        assert [point["count"] for point in series if point["count"]] == [1]
+        assert series == dashboard_payloads(db, {}, date_range="30d")["time_series"]["time_series"]
+
+        custom = client.get(
+            "/api/v1/admin/simple/time-series",
+            params={"start_date": "2020-01-01", "end_date": "2020-03-15", "group_by": "month"},
+            headers=admin_auth_headers
+        ).json()["time_series"]
+        assert custom == [{"period": month, "count": 0, "avg_score": 0.0} for month in ("2020-01", "2020-02", "2020-03")]
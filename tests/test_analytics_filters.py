@@ -0,0 +1,146 @@
+"""
+Tests for the SQL dashboard filters in app.analytics.filters.
+
+Verifies that:
+1. birth-date range conditions agree with the age computed in Python,
+   including birthdays falling exactly on the group boundaries
+2. unique-user mode keeps only the latest submission per email
+3. SQL period buckets use the analytics timezone and ISO weeks, and gaps are filled
+   across the date window in that timezone, whatever the server's clock
+"""
+from datetime import date, datetime, timedelta
+
+from app.analytics import dashboard, filters
+from app.analytics.filters import (
+    AGE_GROUP_BOUNDS,
+    age_group_label,
+    apply_unique_users_filter,
+    build_filtered_query,
+    birth_date_condition,
+    age_group_expression,
+    period_expression,
+    period_label,
+    period_labels,
+    resolve_date_window,
+    years_before,
+)
+from app.analytics.dashboard import time_series_payload
+from app.models import FinancialClinicProfile, FinancialClinicResponse
+
+
+TODAY = date(2026, 3, 1)
+
+
+class ServerClock(datetime):
+    """A UTC server at 22:30 on 2026-03-01, already 2026-03-02 in Dubai."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2026, 3, 1, 22, 30)
+
+    @classmethod
+    def utcnow(cls):
+        return datetime(2026, 3, 1, 22, 30)
+
+
+class TestAgeGroupFilters:
+    """Age groups evaluated in SQL."""
+
+    def test_boundaries_match_python_ages(self, db, make_profile):
+        birth_dates = []
+        for years in (17, 18, 25, 26, 35, 36, 45, 46, 60, 61):
+            turned = years_before(TODAY, years)
+            birth_dates.extend([turned, date.fromordinal(turned.toordinal() + 1)])
+        for i, birth_date in enumerate(birth_dates):
+            make_profile(f"user{i}@example.com", date_of_birth=birth_date.strftime('%d/%m/%Y'))
+        db.commit()
+
+        for age_group in AGE_GROUP_BOUNDS:
+            matched = {
+                p.birth_date for p in
+                db.query(FinancialClinicProfile).filter(birth_date_condition(age_group, TODAY)).all()
+            }
+            expected = {b for b in birth_dates if age_group_label(b, TODAY) == age_group}
+            assert matched == expected, age_group
+
+        labels = dict(
+            db.query(FinancialClinicProfile.birth_date, age_group_expression(TODAY)).all()
+        )
+        assert labels == {b: age_group_label(b, TODAY) for b in birth_dates}
+
+    def test_unknown_age_group_has_no_condition(self):
+        assert birth_date_condition("bogus", TODAY) is None
+
+    def test_years_before_leap_day(self):
+        assert years_before(date(2024, 2, 29), 1) == date(2023, 2, 28)
+
+
+class TestUniqueUsersFilter:
+    """Latest submission per email, resolved in SQL."""
+
+    def test_keeps_latest_submission_per_email(self, db, make_profile, make_response):
+        first = make_profile("repeat@example.com")
+        second = make_profile("repeat@example.com")
+        other = make_profile("other@example.com")
+
+        base = datetime(2025, 5, 1, 12, 0)
+        created = [
+            make_response(profile=profile, status_band=band, created_at=base + timedelta(days=offset))
+            for profile, offset, band in ((first, 0, "Good"), (second, 2, "At Risk"), (first, 1, "Good"), (other, 0, "Excellent"))
+        ]
+        db.commit()
+
+        query = db.query(FinancialClinicResponse).join(
+            FinancialClinicProfile,
+            FinancialClinicResponse.profile_id == FinancialClinicProfile.id
+        )
+        latest = {r.id for r in apply_unique_users_filter(query).all()}
+        assert latest == {created[1].id, created[3].id}
+
+        # Deduplication runs over the filtered set: without At Risk, the latest Good one wins
+        good_only = apply_unique_users_filter(
+            query.filter(FinancialClinicResponse.status_band != "At Risk")
+        ).all()
+        assert {r.id for r in good_only} == {created[2].id, created[3].id}
+
+        assert build_filtered_query(
+            db, [FinancialClinicResponse.id], {}, unique_users_only=True
+        ).count() == 2
+
+
+class TestPeriodBuckets:
+    """Time-series periods in ANALYTICS_TIMEZONE (Asia/Dubai, UTC+4)."""
+
+    def test_sql_labels_match_python(self, db, make_response):
+        # 21:30 UTC on Sunday 2020-12-27 is Monday 2020-12-28 in Dubai (ISO 2020-W53)
+        make_response("series@example.com", created_at=datetime(2020, 12, 27, 21, 30))
+        db.commit()
+
+        labels = {
+            group_by: db.query(period_expression(db, group_by)).scalar()
+            for group_by in ("day", "week", "month", "year")
+        }
+        assert labels == {"day": "2020-12-28", "week": "2020-W53", "month": "2020-12", "year": "2020"}
+        assert period_label(date(2021, 1, 3), "week") == "2020-W53"
+
+    def test_gaps_are_filled(self):
+        assert period_labels("2020-W52", "2021-W02", "week") == ["2020-W52", "2020-W53", "2021-W01", "2021-W02"]
+        assert period_labels("2025-11", "2026-02", "month") == ["2025-11", "2025-12", "2026-01", "2026-02"]
+
+        payload = time_series_payload([("2026-01-01", 2, 40.0), ("2026-01-03", 1, 70.0)], "day")
+        assert [point["count"] for point in payload["time_series"]] == [2, 0, 1]
+        assert payload["time_series"][1] == {"period": "2026-01-02", "count": 0, "avg_score": 0.0}
+
+    def test_window_is_filled_in_analytics_timezone(self, monkeypatch):
+        monkeypatch.setattr(filters, "datetime", ServerClock)
+        monkeypatch.setattr(dashboard, "datetime", ServerClock)
+
+        # 7 days back from 22:30 UTC on 03-01 starts on 02-23 in Dubai and runs to today there, 03-02
+        payload = time_series_payload([("2026-03-02", 1, 50.0)], "day", resolve_date_window("7d"))
+        periods = [point["period"] for point in payload["time_series"]]
+        assert periods == [f"2026-02-{day}" for day in range(23, 29)] + ["2026-03-01", "2026-03-02"]
+        assert payload["time_series"][-1]["count"] == 1
+
+        # Explicit edges are labelled in Dubai too: 22:00 UTC starts 03-02 and 20:00 UTC is its midnight
+        window = (datetime(2026, 3, 1, 22, 0), datetime(2026, 3, 2, 20, 0))
+        assert [point["period"] for point in time_series_payload([], "day", window)["time_series"]] == ["2026-03-02"]
@@ -0,0 +1,103 @@
+"""
+Tests for the in-memory dashboard analytics snapshot.
+
+Verifies that:
+1. snapshot aggregates produce the same dashboard payloads as the SQL pass
+2. new submissions are appended incrementally and deletions trigger a rebuild
+3. aggregates() answers from the current arrays while a refresh is loading
+"""
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.analytics.dashboard import dashboard_payloads
+from app.analytics.snapshot import AnalyticsSnapshot
+
+
+ANSWERS = {"fc_q1": 3, "fc_q2": 4}
+
+
+def income_stream(total_score):
+    return {"Income Stream": {"score": total_score / 10, "max_possible": 15.0, "status_level": "good"}}
+
+
+def assert_same_payloads(db, snapshot, filters, **kwargs):
+    questions = [SimpleNamespace(id="fc_q1", number=1, text_en="Q1", category=SimpleNamespace(value="Income Stream"))]
+    expected = dashboard_payloads(db, filters, questions=questions, **kwargs)
+    assert dashboard_payloads(db, filters, questions=questions, snapshot=snapshot, **kwargs) == expected
+
+
+class TestAnalyticsSnapshot:
+    """NumPy snapshot mirrors dashboard_aggregates."""
+
+    def test_matches_sql_and_refreshes(self, db, make_response):
+        now = datetime.now()
+        for email, nationality, children, days_ago, total_score, status_band in (
+            ("repeat@example.com", "Emirati", 0, 100, 40.0, "At Risk"),
+            ("repeat@example.com", "Emirati", 6, 3, 80.0, "Excellent"),
+            ("old@example.com", "Non-Emirati", 2, 200, 60.0, "Good"),
+        ):
+            make_response(
+                email, nationality=nationality, children=children, created_at=now - timedelta(days=days_ago),
+                total_score=total_score, status_band=status_band,
+                answers=ANSWERS, category_scores=income_stream(total_score)
+            )
+        db.commit()
+
+        snapshot = AnalyticsSnapshot()
+        snapshot.refresh(db)
+        for filters, kwargs in (
+            ({}, {"date_range": "30d"}),
+            ({}, {"date_range": "all", "unique_users_only": True, "group_by": "week"}),
+            ({"children": ["5+"], "nationalities": ["Emirati"]}, {"date_range": "all"}),
+            ({"age_groups": ["26-35", "36-45"]}, {"date_range": "1y", "group_by": "month"}),
+            ({"companies": ["Missing Co"]}, {"date_range": "all"}),
+        ):
+            assert_same_payloads(db, snapshot, filters, **kwargs)
+
+        latest = make_response(
+            "new@example.com", nationality="Non-Emirati", created_at=now, total_score=70.0,
+            answers=ANSWERS, category_scores=income_stream(70.0)
+        )
+        db.commit()
+        snapshot.refresh(db)
+        assert (snapshot.size, snapshot.incremental_loads) == (4, 1)
+        assert_same_payloads(db, snapshot, {}, date_range="all")
+
+        db.delete(latest)
+        db.commit()
+        snapshot.refresh(db)
+        assert (snapshot.size, snapshot.full_loads) == (3, 2)
+        assert_same_payloads(db, snapshot, {}, date_range="all", unique_users_only=True)
+
+    def test_reads_during_refresh(self, db, make_response, monkeypatch):
+        now = datetime.now()
+        make_response("first@example.com", created_at=now - timedelta(days=1))
+        db.commit()
+        snapshot = AnalyticsSnapshot()
+        snapshot.refresh(db)
+        make_response("second@example.com", created_at=now)
+        db.commit()
+
+        load_companies = AnalyticsSnapshot._load_companies
+        during = {}
+
+        def read_then_load(staged, session):
+            reader = threading.Thread(target=lambda: during.update(snapshot.aggregates({}, date_range="all")))
+            reader.start()
+            reader.join(timeout=5)
+            during["finished"] = not reader.is_alive()
+            load_companies(staged, session)
+
+        monkeypatch.setattr(AnalyticsSnapshot, "_load_companies", read_then_load)
+        snapshot.refresh(db)
+
+        # The reader was not blocked by the refresh and saw the arrays from before it
+        assert during["finished"]
+        assert during["submissions"][0][3] == 1
+        assert snapshot.size == 2
+        assert snapshot.aggregates({}, date_range="all")["submissions"][0][3] == 2
@@ -0,0 +1,46 @@
+"""
+Tests for the normalized Financial Clinic category score rows.
+
+Verifies that:
+1. category_scores JSON (dict or bare number per category) maps to one row per category
+2. rows attached to a response are stored and removed with it
+"""
+from app.analytics.category_scores import build_category_score_rows
+from app.models import FinancialClinicCategoryScore
+
+
+class TestCategoryScoreRows:
+    """Normalized per-category score rows."""
+
+    def test_builds_one_row_per_category(self):
+        rows = build_category_score_rows({
+            "Income Stream": {"score": 12.0, "max_possible": 15.0, "percentage": 80.0, "status_level": "excellent"},
+            "Savings Habit": 40,
+            "Broken": "n/a",
+        })
+
+        values = {r.category: (r.score, r.max_possible, r.status_level) for r in rows}
+        assert values == {
+            "Income Stream": (12.0, 15.0, "excellent"),
+            "Savings Habit": (40.0, 100.0, None),
+        }
+        assert build_category_score_rows(None) == []
+
+    def test_rows_follow_response_lifecycle(self, db, make_response):
+        response = make_response(total_score=50.0, category_scores={
+            "Income Stream": {"score": 9.0, "max_possible": 15.0, "status_level": "good"},
+            "Debt Management": {"score": 3.0, "max_possible": 15.0, "status_level": "at_risk"},
+        })
+        db.commit()
+
+        stored = db.query(FinancialClinicCategoryScore).filter(
+            FinancialClinicCategoryScore.response_id == response.id
+        ).all()
+        assert {r.category: r.status_level for r in stored} == {
+            "Income Stream": "good",
+            "Debt Management": "at_risk",
+        }
+
+        db.delete(response)
+        db.commit()
+        assert db.query(FinancialClinicCategoryScore).count() == 0
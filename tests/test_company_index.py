@@ -0,0 +1,39 @@
+"""
+Tests for the in-process company identifier index.
+
+Verifies that:
+1. names and unique URLs resolve to company and variation set ids
+2. resolving from a current index runs no SQL
+3. invalidate() picks up new companies
+"""
+from app.analytics.companies import company_index
+from app.analytics.filters import resolve_company_ids
+from app.models import CompanyTracker
+from app.query_stats import track_queries
+
+
+def add_company(db, name, unique_url, variation_set_id=None):
+    db.add(CompanyTracker(
+        company_name=name, company_email="hr@example.com", contact_person="HR",
+        unique_url=unique_url, variation_set_id=variation_set_id,
+    ))
+    db.commit()
+
+
+class TestCompanyIndex:
+    """Company filter resolution without database round trips."""
+
+    def test_resolve(self, db):
+        add_company(db, "Acme", "acme")
+        add_company(db, "Globex", "globex-uae")
+
+        assert resolve_company_ids({"companies": ["acme", "Globex", "Missing"]}, db) == [1, 2]
+        with track_queries() as stats:
+            assert resolve_company_ids({"companies": ["globex-uae"]}, db) == [2]
+            assert company_index.resolve(db, ["Acme"])[0].variation_set_id is None
+        assert stats.count == 0
+
+        add_company(db, "Initech", "initech")
+        assert resolve_company_ids({"companies": ["initech"]}, db) == []
+        company_index.invalidate()
+        assert resolve_company_ids({"companies": ["initech"]}, db) == [3]
@@ -0,0 +1,51 @@
+"""
+Tests for running company statistics.
+
+Verifies that:
+1. recording and retracting submissions keep count, sum and average in step
+2. reconciliation corrects drifted counters from the responses
+"""
+from app.companies.stats import reconcile_company_stats, record_company_submission, retract_company_submission
+from app.models import CompanyTracker
+
+
+def make_company(db):
+    company = CompanyTracker(
+        company_name="Acme", company_email="hr@acme.example.com", contact_person="HR", unique_url="acme"
+    )
+    db.add(company)
+    db.commit()
+    return company
+
+
+class TestCompanyStats:
+    """Atomic increments and drift reconciliation."""
+
+    def test_record_and_retract(self, db):
+        company = make_company(db)
+        record_company_submission(db, company.id, 60.0)
+        record_company_submission(db, company.id, 80.0)
+        db.commit()
+        db.refresh(company)
+        assert (company.total_assessments, company.total_score_sum, company.average_score) == (2, 140.0, 70.0)
+
+        retract_company_submission(db, company.id, 80.0)
+        retract_company_submission(db, company.id, 60.0)
+        db.commit()
+        db.refresh(company)
+        assert (company.total_assessments, company.total_score_sum, company.average_score) == (0, 0.0, None)
+
+    def test_reconcile(self, db, make_response):
+        company = make_company(db)
+        for email in ("one@example.com", "two@example.com"):
+            make_response(email, company_tracker_id=company.id, total_score=61.234)
+        record_company_submission(db, company.id, 61.234)
+        db.commit()
+
+        assert reconcile_company_stats(db) == 1
+        db.commit()
+        db.refresh(company)
+        assert company.total_assessments == 2
+        assert round(company.total_score_sum, 3) == 122.468
+        assert round(company.average_score, 3) == 61.234
+        assert reconcile_company_stats(db) == 0
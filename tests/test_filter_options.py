@@ -0,0 +1,38 @@
+"""
+Tests for the precomputed dashboard filter options.
+
+Verifies that:
+1. the options carry an ETag and If-None-Match revalidates with 304
+2. creating or deactivating a company changes the payload and its ETag
+"""
+URL = "/api/v1/admin/simple/filter-options"
+
+
+class TestFilterOptions:
+    """Versioned filter options with ETag revalidation."""
+
+    def test_etag_revalidation(self, client, admin_auth_headers):
+        first = client.get(URL, headers=admin_auth_headers)
+        assert first.status_code == 200
+        assert first.json()["genders"] == ["Male", "Female"]
+        etag = first.headers["ETag"]
+
+        revalidated = client.get(URL, headers={**admin_auth_headers, "If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == etag
+
+    def test_company_changes(self, client, admin_auth_headers):
+        etag = client.get(URL, headers=admin_auth_headers).headers["ETag"]
+
+        created = client.post("/api/v1/companies/", headers=admin_auth_headers, json={
+            "company_name": "Acme Trading", "company_email": "hr@acme.example.com", "contact_person": "HR"
+        }).json()
+        response = client.get(URL, headers={**admin_auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert [c["name"] for c in response.json()["companies"]] == ["Acme Trading"]
+        etag = response.headers["ETag"]
+
+        client.put(f"/api/v1/companies/{created['id']}", headers=admin_auth_headers, json={"is_active": False})
+        response = client.get(URL, headers={**admin_auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["companies"] == []
@@ -0,0 +1,33 @@
+"""
+Tests for race-safe Financial Clinic profile claiming.
+
+Verifies that:
+1. the first claim for an email inserts the profile
+2. later claims, whatever the email's case, return that same profile
+"""
+from app.analytics.search import update_profile_search_fields
+from app.models import FinancialClinicProfile
+from app.surveys.financial_clinic_profiles import claim_profile
+
+
+class TestClaimProfile:
+    """Upsert on the normalized email."""
+
+    def test_claim(self, db, make_profile):
+        def new_profile(email, **overrides):
+            profile = make_profile(email, save=False, **overrides)
+            update_profile_search_fields(profile)
+            return profile
+
+        profile, created = claim_profile(db, new_profile("Repeat@Example.com"))
+        assert created and profile.id is not None
+        db.commit()
+
+        again, created = claim_profile(db, new_profile(" repeat@example.COM ", name="Other Name"))
+        assert not created
+        assert again.id == profile.id and again.name == "Test User"
+
+        other, created = claim_profile(db, new_profile("other@example.com"))
+        assert created and other.id != profile.id
+        db.commit()
+        assert db.query(FinancialClinicProfile).count() == 2
@@ -0,0 +1,127 @@
+"""
+Tests for Idempotency-Key handling.
+
+Verifies that:
+1. a completed key replays its stored response
+2. a key still being processed, or reused with another body, is rejected
+3. released and expired keys can be claimed again
+4. a retried submit returns the first response without saving again
+5. a retried report email is sent once, and a failed send can be retried
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.idempotency import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    purge_expired_idempotency_keys,
+    release_idempotency_key,
+    request_fingerprint
+)
+from app.models import FinancialClinicResponse, IdempotencyKey
+from app.surveys import financial_clinic_routes
+
+SCOPE = "test_scope"
+
+
+class TestIdempotencyKeys:
+    """Claim, replay, release and expiry."""
+
+    def test_fingerprint_ignores_key_order(self):
+        assert request_fingerprint({"a": 1, "b": 2}) == request_fingerprint({"b": 2, "a": 1})
+        assert request_fingerprint({"a": 1}) != request_fingerprint({"a": 2})
+
+    def test_replay(self, db):
+        assert claim_idempotency_key(db, SCOPE, "key-1", "hash") is None
+        complete_idempotency_key(db, SCOPE, "key-1", {"id": 7})
+        db.commit()
+
+        assert claim_idempotency_key(db, SCOPE, "key-1", "hash") == {"id": 7}
+        # Same key in another scope is independent
+        assert claim_idempotency_key(db, "other_scope", "key-1", "hash") is None
+
+    def test_rejected(self, db):
+        claim_idempotency_key(db, SCOPE, "key-1", "hash")
+
+        with pytest.raises(HTTPException) as in_progress:
+            claim_idempotency_key(db, SCOPE, "key-1", "hash")
+        assert in_progress.value.status_code == 409
+
+        with pytest.raises(HTTPException) as mismatch:
+            claim_idempotency_key(db, SCOPE, "key-1", "other-hash")
+        assert mismatch.value.status_code == 422
+
+    def test_release_and_expiry(self, db):
+        claim_idempotency_key(db, SCOPE, "key-1", "hash")
+        release_idempotency_key(db, SCOPE, "key-1")
+        assert claim_idempotency_key(db, SCOPE, "key-1", "hash") is None
+
+        db.query(IdempotencyKey).update({IdempotencyKey.expires_at: datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+        assert claim_idempotency_key(db, SCOPE, "key-1", "other-hash") is None
+
+        db.query(IdempotencyKey).update({IdempotencyKey.expires_at: datetime.utcnow() - timedelta(seconds=1)})
+        assert purge_expired_idempotency_keys(db) == 1
+        db.commit()
+        assert db.query(IdempotencyKey).count() == 0
+
+
+class TestIdempotentSubmit:
+    """Retried /financial-clinic/submit calls."""
+
+    def test_retry_replays(self, client, db):
+        payload = {
+            "answers": {f"fc_q{number}": 3 for number in range(1, 16)},
+            "profile": {"name": "Retry User", "date_of_birth": "15/06/1990", "gender": "Female",
+                        "nationality": "Emirati", "children": 1, "email": "retry@example.com"},
+        }
+        headers = {"Idempotency-Key": "submit-1"}
+
+        first = client.post("/api/v1/financial-clinic/submit", json=payload, headers=headers)
+        assert first.status_code == 200
+        assert first.json()["survey_response_id"] is not None
+        assert "Idempotent-Replayed" not in first.headers
+
+        retry = client.post("/api/v1/financial-clinic/submit", json=payload, headers=headers)
+        assert retry.status_code == 200
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert retry.json() == first.json()
+        assert db.query(FinancialClinicResponse).count() == 1
+
+        changed = client.post("/api/v1/financial-clinic/submit", json={**payload, "company_url": "acme"},
+                              headers=headers)
+        assert changed.status_code == 422
+
+
+class TestIdempotentReportEmail:
+    """Retried /financial-clinic/report/email calls."""
+
+    def test_retry_sends_once(self, client, db, monkeypatch):
+        sent = []
+
+        async def deliver(request, db):
+            sent.append(request.email)
+            return {"success": len(sent) > 1, "message": f"Attempt {len(sent)}", "email": request.email}
+
+        monkeypatch.setattr(financial_clinic_routes, "deliver_email_report", deliver)
+        payload = {"email": "report@example.com", "result": {"total_score": 70}}
+        headers = {"Idempotency-Key": "email-1"}
+
+        # A failed send releases the key, so the retry sends again
+        failed = client.post("/api/v1/financial-clinic/report/email", json=payload, headers=headers)
+        assert failed.json()["success"] is False
+
+        delivered = client.post("/api/v1/financial-clinic/report/email", json=payload, headers=headers)
+        assert delivered.json() == {"success": True, "message": "Attempt 2", "email": "report@example.com"}
+
+        retry = client.post("/api/v1/financial-clinic/report/email", json=payload, headers=headers)
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert retry.json() == delivered.json()
+        assert len(sent) == 2
+
+        other = client.post("/api/v1/financial-clinic/report/email", json={**payload, "email": "other@example.com"},
+                            headers=headers)
+        assert other.status_code == 422
+        assert len(sent) == 2
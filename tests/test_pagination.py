@@ -0,0 +1,77 @@
+"""
+Tests for keyset (cursor) pagination of submission listings.
+
+Verifies that:
+1. following next_cursor walks every submission once, newest first, with
+   created_at ties broken by id
+2. numbered pages still work and the total is optional
+3. malformed cursors are rejected
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import CompanyTracker
+from app.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def submissions(db, make_response):
+    now = datetime(2026, 3, 1, 9, 30)
+    for i in range(7):
+        # Pairs share a timestamp so ties have to be broken by id
+        make_response(f"user{i}@example.com", created_at=now - timedelta(days=i // 2))
+    db.commit()
+    return [f"user{i}@example.com" for i in (0, 1, 2, 3, 4, 5, 6)]
+
+
+class TestKeysetPagination:
+    """Cursor pages over (created_at, id)."""
+
+    def test_cursor_round_trip(self):
+        created_at = datetime(2026, 3, 1, 9, 30, 0)
+        assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_follow_cursor(self, client, admin_auth_headers, submissions):
+        url = "/api/v1/admin/simple/submissions"
+        first = client.get(url, params={"page_size": 3}, headers=admin_auth_headers).json()
+        assert (first["total"], first["total_pages"]) == (7, 3)
+
+        emails = [row["profile_email"] for row in first["submissions"]]
+        cursor = first["next_cursor"]
+        while cursor:
+            page = client.get(
+                url, params={"page_size": 3, "cursor": cursor, "include_total": False}, headers=admin_auth_headers
+            ).json()
+            assert page["total"] is None
+            emails += [row["profile_email"] for row in page["submissions"]]
+            cursor = page["next_cursor"]
+
+        expected = [email for pair in zip(submissions[1::2], submissions[0::2]) for email in pair] + [submissions[6]]
+        assert emails == expected
+
+        numbered = client.get(url, params={"page_size": 3, "page": 2}, headers=admin_auth_headers).json()
+        assert [row["profile_email"] for row in numbered["submissions"]] == expected[3:6]
+
+        assert client.get(url, params={"cursor": "bogus"}, headers=admin_auth_headers).status_code == 400
+
+    def test_company_submissions(self, client, db, admin_auth_headers, submissions):
+        company = CompanyTracker(
+            company_name="Acme", company_email="hr@acme.com", contact_person="HR", unique_url="acme"
+        )
+        db.add(company)
+        db.commit()
+        from app.models import FinancialClinicResponse
+        db.query(FinancialClinicResponse).update({"company_tracker_id": company.id})
+        db.commit()
+
+        url = "/api/v1/financial-clinic/company/acme/submissions"
+        first = client.get(url, params={"limit": 4}, headers=admin_auth_headers).json()
+        second = client.get(url, params={"limit": 4, "cursor": first["next_cursor"]}, headers=admin_auth_headers).json()
+
+        assert first["total_count"] == 7
+        ids = [row["id"] for row in first["submissions"] + second["submissions"]]
+        assert len(set(ids)) == 7 and second["next_cursor"] is None
+        assert first["submissions"][0]["demographics"]["gender"] == "Female"
@@ -0,0 +1,56 @@
+"""
+Tests for the in-memory product catalog behind Financial Clinic recommendations.
+
+Verifies that:
+1. recommendations apply the demographic filters and priorities
+2. a warm catalog serves recommendations without queries
+3. invalidate() picks up product changes
+"""
+from app.models import Product
+from app.query_stats import track_queries
+from app.surveys.financial_clinic_products import get_product_recommendations, product_catalog
+
+CATEGORY_SCORES = {
+    "Savings Habit": {"score": 5.0, "status_level": "at_risk"},
+    "Income Stream": {"score": 15.0, "status_level": "good"},
+}
+
+
+def add_product(db, name, category="Savings Habit", status_level="at_risk", priority=1, **filters):
+    db.add(Product(
+        name=name, category=category, status_level=status_level,
+        description=f"{name} description", priority=priority, active=True, **filters
+    ))
+    db.commit()
+
+
+def recommended(db, nationality="Emirati", gender="Female", children=0):
+    return [p["name"] for p in get_product_recommendations(db, CATEGORY_SCORES, nationality, gender, children)]
+
+
+class TestProductCatalog:
+    """Query-free, pre-filtered recommendations."""
+
+    def test_demographics(self, db):
+        add_product(db, "Emirati Saver", nationality_filter="Emirati", priority=1)
+        add_product(db, "Family Saver", children_filter="1+", priority=2)
+        add_product(db, "Women Saver", gender_filter="Female", priority=3)
+        add_product(db, "Income Plan", category="Income Stream", status_level="good")
+
+        assert recommended(db) == ["Emirati Saver", "Women Saver", "Income Plan"]
+        assert recommended(db, nationality="Non-Emirati", gender="Male", children=2) == ["Family Saver", "Income Plan"]
+        # Without a gender the gender filter does not apply
+        assert recommended(db, nationality="Non-Emirati", gender=None) == ["Women Saver", "Income Plan"]
+
+    def test_warm_catalog(self, db):
+        add_product(db, "Saver")
+        assert recommended(db) == ["Saver"]
+
+        with track_queries() as stats:
+            assert recommended(db) == ["Saver"]
+        assert stats.count == 0
+
+        add_product(db, "Better Saver", priority=0)
+        assert recommended(db) == ["Saver"]
+        product_catalog.invalidate()
+        assert recommended(db) == ["Better Saver", "Saver"]
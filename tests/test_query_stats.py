@@ -0,0 +1,43 @@
+"""
+Tests for per-request SQL statement counting.
+
+Verifies that:
+1. statement templates fold literals and IN lists
+2. track_queries() counts statements and flags repeated templates
+3. every response carries X-DB-Query-Count and X-DB-Time headers
+"""
+from datetime import datetime
+
+from app.models import FinancialClinicProfile
+from app.query_stats import statement_template, track_queries
+
+
+class TestQueryStats:
+    """Statement counting and N+1 detection."""
+
+    def test_statement_template(self):
+        assert statement_template("SELECT a\n  FROM t WHERE id IN (1, 2, 3) AND name = 'x'") == (
+            "SELECT a FROM t WHERE id IN (?) AND name = ?"
+        )
+        assert statement_template("SELECT * FROM t WHERE id = ? LIMIT 1") == statement_template(
+            "SELECT * FROM t WHERE id = ?  LIMIT 5"
+        )
+
+    def test_track_queries(self, db):
+        with track_queries() as stats:
+            for profile_id in range(1, 13):
+                db.query(FinancialClinicProfile).filter(FinancialClinicProfile.id == profile_id).first()
+        assert stats.count == 12
+        assert stats.duration > 0
+        [(template, count)] = stats.repeated(10)
+        assert count == 12 and "financial_clinic_profiles" in template
+        assert stats.repeated(12) == []
+
+    def test_response_headers(self, client, db, admin_auth_headers, make_response):
+        make_response("someone@example.com", created_at=datetime(2026, 3, 1, 9, 30))
+        db.commit()
+
+        response = client.get("/api/v1/admin/simple/submissions", headers=admin_auth_headers)
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Query-Count"]) >= 2
+        assert float(response.headers["X-DB-Time"]) >= 0
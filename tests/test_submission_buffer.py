@@ -0,0 +1,96 @@
+"""
+Tests for the write-behind submission buffer.
+
+Verifies that:
+1. buffered submits are queued with a provisional id instead of saved
+2. a flush saves them dated by submission and resolves the provisional id
+3. a submission that fails to save is marked failed without losing the batch
+4. the metrics report queue depth
+"""
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.models import FinancialClinicPendingSubmission, FinancialClinicResponse
+from app.surveys.financial_clinic_submissions import (
+    flush_pending_submissions,
+    stage_submission,
+    submission_buffer_metrics
+)
+
+SUBMIT_PAYLOAD = {
+    "answers": {f"fc_q{number}": 4 for number in range(1, 16)},
+    "profile": {"name": "Burst User", "date_of_birth": "15/06/1990", "gender": "Male",
+                "nationality": "Non-Emirati", "children": 1, "email": "burst@example.com"},
+}
+
+RESULT = {
+    "total_score": 70.0,
+    "status_band": "Good",
+    "category_scores": {"Savings Habit": {"score": 70.0}},
+    "insights": [],
+    "products": [],
+    "questions_answered": 15,
+    "total_questions": 15,
+}
+
+
+class TestSubmissionBuffer:
+    """Staging, batched flushes and metrics."""
+
+    def test_buffered_submit(self, client, db, monkeypatch):
+        monkeypatch.setattr(settings, "SUBMISSION_BUFFER_ENABLED", True)
+
+        submitted = client.post("/api/v1/financial-clinic/submit", json=SUBMIT_PAYLOAD)
+        assert submitted.status_code == 200
+        queued = submitted.json()
+        assert queued["queued"] is True and queued["survey_response_id"] is None
+        assert queued["total_score"] > 0
+        assert db.query(FinancialClinicResponse).count() == 0
+
+        pending_url = f"/api/v1/financial-clinic/pending/{queued['pending_submission_id']}"
+        status = client.get(pending_url).json()
+        assert (status["status"], status["survey_response_id"]) == ("pending", None)
+
+        assert flush_pending_submissions(db, 10) == (1, 0)
+        db.commit()
+
+        saved = db.query(FinancialClinicResponse).one()
+        assert saved.total_score == queued["total_score"]
+        assert saved.status_band == queued["status_band"]
+        assert saved.profile.email == "burst@example.com"
+        assert client.get(pending_url).json() == {
+            "pending_submission_id": queued["pending_submission_id"],
+            "status": "saved",
+            "survey_response_id": saved.id
+        }
+        assert client.get("/api/v1/financial-clinic/pending/999").status_code == 404
+
+    def test_flush(self, db):
+        submitted_at = datetime.utcnow() - timedelta(hours=2)
+        for email in ("one@example.com", "two@example.com"):
+            pending = stage_submission(db, {**SUBMIT_PAYLOAD, "profile": {**SUBMIT_PAYLOAD["profile"], "email": email}}, RESULT)
+            pending.submitted_at = submitted_at
+        broken = stage_submission(db, SUBMIT_PAYLOAD, {"status_band": "Good"})
+        db.commit()
+
+        metrics = submission_buffer_metrics(db)
+        assert metrics["pending"] == 3 and metrics["oldest_pending_seconds"] >= 7200
+
+        assert flush_pending_submissions(db, 10) == (2, 1)
+        db.commit()
+
+        responses = db.query(FinancialClinicResponse).all()
+        assert len(responses) == 2
+        assert all(response.created_at.replace(tzinfo=None) == submitted_at for response in responses)
+        assert all(
+            row.created_at.replace(tzinfo=None) == submitted_at
+            for response in responses for row in response.answer_rows
+        )
+        db.refresh(broken)
+        assert broken.status == "failed" and broken.error
+
+        metrics = submission_buffer_metrics(db)
+        assert (metrics["pending"], metrics["failed"], metrics["saved_recently"]) == (0, 1, 2)
+        assert db.query(FinancialClinicPendingSubmission).filter(
+            FinancialClinicPendingSubmission.status == "saved"
+        ).count() == 2
@@ -0,0 +1,50 @@
+"""
+Tests for indexed submission search.
+
+Verifies that:
+1. search fields are normalized (case, accents, phone separators)
+2. exact email, phone suffix, short prefix and substring terms each match
+   the expected submissions through /admin/simple/submissions
+"""
+from datetime import datetime
+
+from app.analytics.search import normalize_search_text, update_profile_search_fields
+from app.models import FinancialClinicProfile
+
+
+def search(client, headers, term):
+    response = client.get("/api/v1/admin/simple/submissions", params={"search": term}, headers=headers)
+    assert response.status_code == 200
+    return sorted(row["profile_email"] for row in response.json()["submissions"])
+
+
+class TestSubmissionSearch:
+    """Normalized columns and lookup paths."""
+
+    def test_normalize(self):
+        assert normalize_search_text("  Zoë   ALI ") == "zoe ali"
+        profile = FinancialClinicProfile(name="Zoë Ali", email=" Zoe@Example.com ", mobile_number="+971 50-123 4567")
+        update_profile_search_fields(profile)
+        assert profile.search_text == "zoe ali zoe@example.com 971501234567"
+        assert (profile.email_normalized, profile.mobile_reversed) == ("zoe@example.com", "765432105179")
+
+    def test_lookup_paths(self, client, db, admin_auth_headers, make_response):
+        now = datetime(2026, 3, 1, 9, 30)
+        make_response("Zoe.Ali@Example.com", created_at=now, mobile_number="+971 50 123 4567")
+        make_response("omar@example.com", gender="Male", created_at=now, mobile_number="0559994567")
+        make_response("aisha_k@example.com", created_at=now)
+        db.commit()
+        profiles = db.query(FinancialClinicProfile).all()
+        for profile, name in zip(profiles, ("Zoë Ali", "Omar Saeed", "Aisha 100% Khan")):
+            profile.name = name
+            update_profile_search_fields(profile)
+        db.commit()
+
+        assert search(client, admin_auth_headers, "zoe.ali@example.COM") == ["Zoe.Ali@Example.com"]
+        assert search(client, admin_auth_headers, "4567") == ["Zoe.Ali@Example.com", "omar@example.com"]
+        assert search(client, admin_auth_headers, "123-4567") == ["Zoe.Ali@Example.com"]
+        assert search(client, admin_auth_headers, "om") == ["omar@example.com"]
+        assert search(client, admin_auth_headers, "ZOE") == ["Zoe.Ali@Example.com"]
+        assert search(client, admin_auth_headers, "saeed") == ["omar@example.com"]
+        assert search(client, admin_auth_headers, "100%") == ["aisha_k@example.com"]
+        assert search(client, admin_auth_headers, "k@exa") == ["aisha_k@example.com"]